@@ -5,8 +5,15 @@ from typing import Any
 from django.http import HttpRequest
 from ninja import Router
 
-from chat.schemas import ErrorResponse, HealthResponse, SearchRequest, SearchResponse
+from chat.schemas import (
+    ErrorResponse,
+    HealthResponse,
+    NarrationResponse,
+    SearchRequest,
+    SearchResponse,
+)
 from chat.services import cache_service, search_service
+from chat.services.narration_service import get_narration_store
 from chat.utils.errors import UnderfootError
 from chat.utils.input_sanitizer import InputSanitizer, IntentParser
 from chat.utils.logger import get_logger
@@ -57,6 +64,7 @@ async def search(_request: HttpRequest, data: SearchRequest) -> Any:
             force=data.force,
             intent=intent,
             vector_query=vector_query,
+            response_mode=data.response_mode,
         )
         return 200, result
 
@@ -77,3 +85,28 @@ async def search(_request: HttpRequest, data: SearchRequest) -> Any:
             "request_id": "unknown",
             "timestamp": datetime.now(UTC).isoformat(),
         }
+
+
+@router.get(
+    "/search/narration/{narration_id}", response={200: NarrationResponse, 404: ErrorResponse}
+)
+async def search_narration(_request: HttpRequest, narration_id: str, wait: float = 0.0) -> Any:
+    """Fetch the narration for a response_mode="deferred" search.
+
+    wait (seconds, capped at 10) long-polls a pending narration.
+    """
+    try:
+        text = await get_narration_store().get(narration_id, wait_seconds=min(max(wait, 0.0), 10.0))
+    except KeyError:
+        return 404, {
+            "error": "NARRATION_NOT_FOUND",
+            "message": "Unknown or expired narration; repeat the search to regenerate it",
+            "request_id": "unknown",
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    return 200, {
+        "narration_id": narration_id,
+        "status": "pending" if text is None else "ready",
+        "response": text,
+    }
@@ -19,6 +19,15 @@ CACHE_TTL_SECONDS = 60
 SUPABASE_CACHE_TTL_MINUTES = 30
 LOCATION_CACHE_TTL_HOURS = 24
 
+INDEXING_QUEUE_SIZE = 500
+INDEXING_BATCH_SIZE = 32
+INDEXING_FLUSH_SECONDS = 2.0
+INDEXING_SEEN_CACHE_SIZE = 10_000
+
+VECTOR_SEARCH_LIMIT = 10
+VECTOR_SEARCH_THRESHOLD = 0.78
+VECTOR_LOCATION_OVERSAMPLE = 4  # Hits fetched per result kept when filtering by location
+
 SSE_MAX_CONNECTIONS = 100
 RATE_LIMIT_PER_MINUTE = 100
 
@@ -0,0 +1,167 @@
+"""US place names for the local query parser (chat/services/local_parser.py).
+
+CITY_STATES maps a lowercase city name to every state it is commonly searched
+in. A city listed with one state resolves on its own ("near Atlanta"); a city
+listed with several only resolves with an explicit state ("Portland Oregon").
+Cities missing here still parse when a state follows them.
+"""
+
+US_STATES = {
+    "alabama": "AL",
+    "alaska": "AK",
+    "arizona": "AZ",
+    "arkansas": "AR",
+    "california": "CA",
+    "colorado": "CO",
+    "connecticut": "CT",
+    "delaware": "DE",
+    "district of columbia": "DC",
+    "florida": "FL",
+    "georgia": "GA",
+    "hawaii": "HI",
+    "idaho": "ID",
+    "illinois": "IL",
+    "indiana": "IN",
+    "iowa": "IA",
+    "kansas": "KS",
+    "kentucky": "KY",
+    "louisiana": "LA",
+    "maine": "ME",
+    "maryland": "MD",
+    "massachusetts": "MA",
+    "michigan": "MI",
+    "minnesota": "MN",
+    "mississippi": "MS",
+    "missouri": "MO",
+    "montana": "MT",
+    "nebraska": "NE",
+    "nevada": "NV",
+    "new hampshire": "NH",
+    "new jersey": "NJ",
+    "new mexico": "NM",
+    "new york": "NY",
+    "north carolina": "NC",
+    "north dakota": "ND",
+    "ohio": "OH",
+    "oklahoma": "OK",
+    "oregon": "OR",
+    "pennsylvania": "PA",
+    "rhode island": "RI",
+    "south carolina": "SC",
+    "south dakota": "SD",
+    "tennessee": "TN",
+    "texas": "TX",
+    "utah": "UT",
+    "vermont": "VT",
+    "virginia": "VA",
+    "washington": "WA",
+    "west virginia": "WV",
+    "wisconsin": "WI",
+    "wyoming": "WY",
+}
+
+STATE_CODES = frozenset(US_STATES.values())
+
+CITY_STATES: dict[str, tuple[str, ...]] = {
+    "albuquerque": ("NM",),
+    "anchorage": ("AK",),
+    "ann arbor": ("MI",),
+    "asheville": ("NC",),
+    "athens": ("GA", "OH"),
+    "atlanta": ("GA",),
+    "austin": ("TX",),
+    "baltimore": ("MD",),
+    "baton rouge": ("LA",),
+    "bend": ("OR",),
+    "birmingham": ("AL",),
+    "boise": ("ID",),
+    "boston": ("MA",),
+    "boulder": ("CO",),
+    "bozeman": ("MT",),
+    "buffalo": ("NY",),
+    "burlington": ("VT", "NC", "IA"),
+    "charleston": ("SC", "WV"),
+    "charlotte": ("NC",),
+    "chattanooga": ("TN",),
+    "chicago": ("IL",),
+    "cincinnati": ("OH",),
+    "cleveland": ("OH", "TN"),
+    "colorado springs": ("CO",),
+    "columbia": ("SC", "MO"),
+    "columbus": ("OH", "GA"),
+    "dallas": ("TX",),
+    "denver": ("CO",),
+    "des moines": ("IA",),
+    "detroit": ("MI",),
+    "durham": ("NC",),
+    "el paso": ("TX",),
+    "eugene": ("OR",),
+    "fargo": ("ND",),
+    "flagstaff": ("AZ",),
+    "fort worth": ("TX",),
+    "fresno": ("CA",),
+    "gatlinburg": ("TN",),
+    "grand rapids": ("MI",),
+    "greenville": ("SC", "NC"),
+    "hartford": ("CT",),
+    "honolulu": ("HI",),
+    "houston": ("TX",),
+    "indianapolis": ("IN",),
+    "jackson": ("MS", "WY", "TN"),
+    "jacksonville": ("FL",),
+    "kansas city": ("MO", "KS"),
+    "key west": ("FL",),
+    "knoxville": ("TN",),
+    "las vegas": ("NV",),
+    "lexington": ("KY",),
+    "little rock": ("AR",),
+    "los angeles": ("CA",),
+    "louisville": ("KY",),
+    "madison": ("WI",),
+    "marfa": ("TX",),
+    "memphis": ("TN",),
+    "miami": ("FL",),
+    "milwaukee": ("WI",),
+    "minneapolis": ("MN",),
+    "missoula": ("MT",),
+    "moab": ("UT",),
+    "nashville": ("TN",),
+    "new haven": ("CT",),
+    "new orleans": ("LA",),
+    "new york city": ("NY",),
+    "newport": ("RI", "OR"),
+    "oakland": ("CA",),
+    "oklahoma city": ("OK",),
+    "omaha": ("NE",),
+    "orlando": ("FL",),
+    "philadelphia": ("PA",),
+    "phoenix": ("AZ",),
+    "pikeville": ("KY",),
+    "pittsburgh": ("PA",),
+    "portland": ("OR", "ME"),
+    "providence": ("RI",),
+    "raleigh": ("NC",),
+    "reno": ("NV",),
+    "richmond": ("VA",),
+    "sacramento": ("CA",),
+    "salt lake city": ("UT",),
+    "san antonio": ("TX",),
+    "san diego": ("CA",),
+    "san francisco": ("CA",),
+    "san jose": ("CA",),
+    "santa barbara": ("CA",),
+    "santa fe": ("NM",),
+    "savannah": ("GA",),
+    "scottsdale": ("AZ",),
+    "seattle": ("WA",),
+    "sedona": ("AZ",),
+    "spokane": ("WA",),
+    "springfield": ("IL", "MO", "MA"),
+    "st. louis": ("MO",),
+    "st louis": ("MO",),
+    "tampa": ("FL",),
+    "tucson": ("AZ",),
+    "tulsa": ("OK",),
+    "washington dc": ("DC",),
+    "wilmington": ("DE", "NC"),
+}
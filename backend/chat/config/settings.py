@@ -25,6 +25,32 @@ class Settings(BaseSettings):
     supabase_publishable_key: str = "test-publishable-key"
     supabase_secret_key: str | None = None
     supabase_key: str | None = None  # app_admin_user password for TimescaleDB + application roles
+    supabase_db_url: str | None = None  # Direct Postgres DSN for index maintenance commands
+
+    llm_provider: str = "openai"  # openai | stub (deterministic, offline; see llm_provider.py)
+    llm_stub_latency_ms: float = 0.0  # Stub: per-request latency
+    llm_stub_tokens_per_second: float = 0.0  # Stub: completion token rate (0 = instant)
+
+    llm_parse_models: list[str] = ["gpt-4o-mini"]  # Router candidates, preferred first
+    llm_generate_models: list[str] = ["gpt-4o-mini"]
+    llm_parse_p95_budget_ms: float = 2000.0  # Degrade to the next candidate above this
+    llm_generate_p95_budget_ms: float = 5000.0
+    llm_max_error_rate: float = 0.25
+    llm_parse_prompt_token_budget: int = 300  # Prompt tokens; user input is truncated above this
+    llm_generate_prompt_token_budget: int = 400  # Lower-ranked places are trimmed above this
+
+    parse_fast_path_threshold: float = 0.85  # Local parser confidence that skips the LLM
+    parse_shadow_sample_rate: float = 0.02  # Fast-path parses re-checked by the LLM
+
+    embedding_model: str = "text-embedding-ada-002"  # Must match places_embeddings column
+    embedding_dimensions: int = 1536
+    embedding_text_max_tokens: int = 256  # Budget for built place text (model max is 8191)
+    embedding_storage_mode: str = "full"  # full | halfvec | binary (see migration 009)
+    embedding_rerank_oversample: int = 4
+    embedding_exact_rerank_oversample: int = 0  # >0 enables NumPy exact rerank (migration 014)
+    embedding_candidate_probes: int | None = None  # ivfflat probes for the rerank candidate scan
+    embedding_local_index_dir: str | None = None  # Snapshot dir enables the local ANN index
+    embedding_local_index_poll_seconds: float = 30.0
 
 
 @lru_cache(maxsize=1)
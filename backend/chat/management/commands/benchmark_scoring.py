@@ -0,0 +1,67 @@
+"""Compare per-result and batch keyword scoring on synthetic results."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from chat.services.scoring_benchmark import (
+    DEFAULT_INTENT,
+    DEFAULT_KEYWORD_RATE,
+    DEFAULT_REPEAT,
+    DEFAULT_SIZES,
+    ScoringBenchmarkResult,
+    run_scoring_benchmark,
+)
+
+
+def int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time score_result() in a loop against batch score_results() at several result "
+        "counts and check that both give identical scores."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--sizes", type=int_list, default=list(DEFAULT_SIZES))
+        parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+        parser.add_argument("--intent", default=DEFAULT_INTENT)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--keyword-rate",
+            type=float,
+            default=DEFAULT_KEYWORD_RATE,
+            help="Share of synthetic words that are underground keywords",
+        )
+        parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        self.stdout.write("| results | loop ms | batch ms | speedup | identical |")
+        self.stdout.write("|---|---|---|---|---|")
+
+        results = run_scoring_benchmark(
+            options["sizes"],
+            repeat=options["repeat"],
+            intent=options["intent"],
+            seed=options["seed"],
+            keyword_rate=options["keyword_rate"],
+            on_result=self._write_row,
+        )
+
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(
+                json.dumps([r.to_dict() for r in results], indent=2)
+            )
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['json_path']}"))
+
+        if not all(r.identical for r in results):
+            raise CommandError("Batch scores differ from score_result()")
+
+    def _write_row(self, r: ScoringBenchmarkResult) -> None:
+        self.stdout.write(
+            f"| {r.size} | {r.loop_ms} | {r.batch_ms} | {r.speedup}x | {r.identical} |"
+        )
@@ -0,0 +1,28 @@
+"""Export places_embeddings into a local vector index snapshot."""
+
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from chat.config.settings import get_settings
+from chat.services.supabase_service import SupabaseService
+from chat.services.vector_index import build_snapshot
+
+
+class Command(BaseCommand):
+    help = "Write places_embeddings to a memory-mappable snapshot for the local ANN index."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dir",
+            default=get_settings().embedding_local_index_dir,
+            help="Snapshot directory (default: EMBEDDING_LOCAL_INDEX_DIR)",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        if not options["dir"]:
+            raise CommandError("Pass --dir or set EMBEDDING_LOCAL_INDEX_DIR")
+
+        rows = build_snapshot(SupabaseService().client, Path(options["dir"]))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} rows to {options['dir']}"))
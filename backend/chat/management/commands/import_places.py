@@ -0,0 +1,59 @@
+"""Bulk-import a JSONL or CSV place dataset into places_embeddings."""
+
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from chat.services.embedding_service import get_embedding_service
+from chat.services.import_service import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    ImportStats,
+    PlaceImporter,
+    iter_records,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a JSONL or CSV file of places, embed them in batches and insert new "
+        "(source, source_id) pairs into places_embeddings. Existing rows are left untouched."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path, help="JSONL or CSV file")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Default: file extension")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--source", help="Source for records without one")
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        path: Path = options["path"]
+        if not path.is_file():
+            raise CommandError(f"No such file: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be >= 1")
+
+        importer = PlaceImporter(
+            get_embedding_service(),
+            batch_size=options["batch_size"],
+            default_source=options["source"],
+        )
+
+        try:
+            stats = importer.run(iter_records(path, options["format"]), self._report)
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {stats.imported} of {stats.read} records "
+                f"({stats.existing} existing, {stats.duplicates} duplicate, "
+                f"{stats.invalid} invalid, {stats.failed} failed)"
+            )
+        )
+
+    def _report(self, stats: ImportStats) -> None:
+        self.stdout.write(
+            f"{stats.read} read, {stats.imported} imported ({stats.rows_per_second:.0f} rows/s)"
+        )
@@ -0,0 +1,97 @@
+"""Re-embed places_embeddings with a new model (resumable, swaps atomically)."""
+
+import asyncio
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from chat.config.settings import get_settings
+from chat.services.embedding_service import MAX_BATCH_ITEMS, EmbeddingError
+from chat.services.llm_provider import create_async_llm_client
+from chat.services.reembedding_service import (
+    DEFAULT_IVFFLAT_LISTS,
+    REEMBED_CONCURRENCY,
+    REEMBED_REQUESTS_PER_MINUTE,
+    REEMBED_TOKENS_PER_MINUTE,
+    Reembedder,
+    ReembedProgress,
+)
+from chat.services.supabase_service import get_async_supabase_client
+from chat.utils.rate_limiter import AsyncRateLimiter
+
+OPENAI_MAX_RETRIES = 6  # Backs off on 429s on top of the local rate limiter
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-embed every place with a new embedding model into a shadow table, "
+        "checkpointing progress, then swap the column and rebuild the vector indexes. "
+        "The target model must keep the live column's dimensions."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--job-id", required=True, help="Job name; re-use it to resume")
+        parser.add_argument("--model", required=True, help="Target model")
+        parser.add_argument(
+            "--dimensions",
+            type=int,
+            required=True,
+            help="Target dimensions (must equal EMBEDDING_DIMENSIONS, the live column size)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help=f"Rows per checkpoint (default: concurrency * {MAX_BATCH_ITEMS})",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=REEMBED_CONCURRENCY,
+            help="Embedding requests in flight (needs chunk-size >= concurrency * batch size)",
+        )
+        parser.add_argument("--requests-per-minute", type=int, default=REEMBED_REQUESTS_PER_MINUTE)
+        parser.add_argument("--tokens-per-minute", type=int, default=REEMBED_TOKENS_PER_MINUTE)
+        parser.add_argument("--lists", type=int, default=DEFAULT_IVFFLAT_LISTS)
+        parser.add_argument(
+            "--no-swap", action="store_true", help="Fill the shadow table but keep the live column"
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        live_dimensions = get_settings().embedding_dimensions
+        if options["dimensions"] != live_dimensions:
+            raise CommandError(
+                f"--dimensions {options['dimensions']} differs from the live column "
+                f"({live_dimensions}). The search RPCs and quantized indexes are typed "
+                f"vector({live_dimensions}); changing dimensions needs a schema migration."
+            )
+
+        try:
+            progress = asyncio.run(self._run(options))
+        except EmbeddingError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Job {progress.job_id}: {progress.processed} re-embedded, "
+                f"{progress.failed} failed, swapped={progress.swapped}"
+            )
+        )
+        if progress.swapped:
+            self.stdout.write(
+                f"Set EMBEDDING_MODEL={options['model']}, rebuild the local vector snapshot "
+                "if one is used, then restart workers."
+            )
+
+    async def _run(self, options: dict[str, Any]) -> ReembedProgress:
+        reembedder = Reembedder(
+            client=await get_async_supabase_client(),
+            openai_client=create_async_llm_client(max_retries=OPENAI_MAX_RETRIES),
+            job_id=options["job_id"],
+            model=options["model"],
+            dimensions=options["dimensions"],
+            chunk_size=options["chunk_size"],
+            concurrency=options["concurrency"],
+            limiter=AsyncRateLimiter(options["requests_per_minute"], options["tokens_per_minute"]),
+        )
+        return await reembedder.run(swap=not options["no_swap"], lists=options["lists"])
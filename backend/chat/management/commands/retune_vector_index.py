@@ -0,0 +1,77 @@
+"""Rebuild the ivfflat index and record probes when places_embeddings outgrows it."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from chat.config.settings import get_settings
+from chat.services.index_tuning import (
+    DEFAULT_DRIFT_THRESHOLD,
+    DEFAULT_LISTS_CHANGE_RATIO,
+    DEFAULT_MAINTENANCE_WORK_MEM,
+    IndexRetuner,
+    plan_retune,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Check places_embeddings growth and drift since the last ivfflat build; past the "
+        "thresholds, rebuild the index concurrently with lists sized to the row count and "
+        "record probes for the similarity RPCs."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dsn",
+            default=get_settings().supabase_db_url,
+            help="Direct Postgres connection as the table owner (default: SUPABASE_DB_URL)",
+        )
+        parser.add_argument("--drift-threshold", type=float, default=DEFAULT_DRIFT_THRESHOLD)
+        parser.add_argument("--lists-change-ratio", type=float, default=DEFAULT_LISTS_CHANGE_RATIO)
+        parser.add_argument("--probes", type=int, help="Default: sqrt(lists)")
+        parser.add_argument("--maintenance-work-mem", default=DEFAULT_MAINTENANCE_WORK_MEM)
+        parser.add_argument("--force", action="store_true", help="Rebuild regardless of drift")
+        parser.add_argument("--dry-run", action="store_true", help="Only print the plan")
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        if not options["dsn"]:
+            raise CommandError("Pass --dsn or set SUPABASE_DB_URL")
+        if options["probes"] is not None and options["probes"] < 1:
+            raise CommandError("--probes must be at least 1")
+
+        try:
+            import psycopg
+        except ImportError as e:
+            raise CommandError("psycopg is required: uv sync --group bench") from e
+
+        with psycopg.connect(options["dsn"], autocommit=True) as conn:
+            retuner = IndexRetuner(conn, options["maintenance_work_mem"])
+            status = retuner.status()
+            drift = "n/a" if status.drift is None else f"{status.drift:.2f}"
+            self.stdout.write(
+                f"{status.total_rows} rows, lists={status.index_lists}, "
+                f"probes={status.probes}, drift={drift}"
+            )
+
+            plan = plan_retune(
+                status,
+                drift_threshold=options["drift_threshold"],
+                lists_change_ratio=options["lists_change_ratio"],
+                probes=options["probes"],
+                force=options["force"],
+            )
+            if plan is None:
+                self.stdout.write(self.style.SUCCESS("Index is within thresholds"))
+                return
+
+            action = "Rebuild" if plan.rebuild else "Update"
+            self.stdout.write(
+                f"{action}: lists={plan.lists}, probes={plan.probes} ({'; '.join(plan.reasons)})"
+            )
+            if options["dry_run"]:
+                return
+
+            retuner.apply(plan)
+
+        self.stdout.write(self.style.SUCCESS(f"{action} done"))
@@ -2,7 +2,7 @@
 Django Ninja Schemas (Ported from src/models)
 """
 
-from typing import Any
+from typing import Any, Literal
 
 from ninja import Field, Schema
 from pydantic import ConfigDict, field_validator
@@ -77,6 +77,8 @@ class ScoringSummary(Schema):
 MIN_CHAT_INPUT_LENGTH = 2
 MAX_CHAT_INPUT_LENGTH = 500
 
+ResponseMode = Literal["fast", "standard", "deferred"]
+
 
 class SearchRequest(Schema):
     """Search request with comprehensive validation."""
@@ -92,6 +94,13 @@ class SearchRequest(Schema):
         description="User search query",
     )
     force: bool = Field(default=False, description="Force cache bypass")
+    response_mode: ResponseMode = Field(
+        default="standard",
+        description=(
+            "fast: template response, no LLM narration; standard: LLM narration; "
+            "deferred: places now, narration later via narration_id"
+        ),
+    )
 
     @field_validator("chat_input")
     @classmethod
@@ -140,9 +149,19 @@ class SearchResponse(Schema):
     user_location: str
     response: str
     places: list[dict[str, Any]] = Field(default_factory=list)
+    response_mode: ResponseMode = "standard"
+    narration_id: str | None = None  # Deferred mode: GET /search/narration/{narration_id}
     debug: DebugInfo
 
 
+class NarrationResponse(Schema):
+    """Deferred narration status."""
+
+    narration_id: str
+    status: Literal["pending", "ready"]
+    response: str | None = None
+
+
 class HealthResponse(Schema):
     """Health check response."""
 
@@ -0,0 +1,533 @@
+"""Async vector embedding service for use inside async views and search.
+
+Mirrors EmbeddingService (same validation rules, storage modes and cache) but
+awaits OpenAI and Supabase instead of blocking the event loop. Batch planning,
+the retry/split decision and result handling come from EmbeddingValidationMixin;
+this module only supplies the awaited I/O:
+
+- Embeddings via AsyncOpenAI; multi-input batches are sent concurrently
+- RPC and upserts via the async Supabase client (get_async_supabase_client)
+- pgvector is validated once per process, guarded by an asyncio.Lock so
+  concurrent first requests issue a single validation RPC
+- OpenAI and Supabase clients and the lock are per event loop (LoopLocal):
+  under WSGI each request runs on its own loop, and their connection pools
+  cannot be reused once that loop closes
+- The settings-driven local vector index (get_local_index) is shared with the
+  sync service and answers similarity searches before the RPC
+"""
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any
+
+from openai import AsyncOpenAI
+from supabase import AsyncClient
+
+from chat.config.settings import get_settings
+from chat.services.embedding_cache import EmbeddingCache
+from chat.services.embedding_service import (
+    EmbeddingBatchItem,
+    EmbeddingValidationMixin,
+    get_local_index,
+)
+from chat.services.exact_rerank import RerankStats, rerank_candidates
+from chat.services.llm_provider import create_async_llm_client
+from chat.services.search_result_cache import get_search_result_cache
+from chat.services.supabase_service import (
+    SupabaseService,
+    get_async_supabase_client,
+    response_rows,
+)
+from chat.utils.logger import get_logger
+from chat.utils.loop_local import LoopLocal
+
+logger = get_logger(__name__)
+
+MAX_CONCURRENT_BATCHES = 4  # Parallel multi-input embedding requests per call
+
+_openai_clients = LoopLocal(create_async_llm_client)
+_pgvector_locks = LoopLocal(asyncio.Lock)
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get the running event loop's async client for the configured LLM provider."""
+    return _openai_clients.get()
+
+
+class AsyncEmbeddingService(EmbeddingValidationMixin):
+    """Async counterpart of EmbeddingService.
+
+    Safe to share between concurrent tasks: per-call state lives in locals,
+    and the only shared mutable state (pgvector validation flag, embedding
+    cache) is lock-protected. Methods raise the same ValueError/EmbeddingError
+    as the sync service.
+    """
+
+    _pgvector_validated = False
+
+    def __init__(self, supabase: AsyncClient | None = None) -> None:
+        """Create the service.
+
+        Args:
+            supabase: Async Supabase client (default: the running event loop's
+                shared client, created on first use)
+        """
+        self._supabase = supabase
+
+        settings = get_settings()
+        self.embedding_model = settings.embedding_model  # Must match sync service / DB column
+        self.embedding_dimensions = settings.embedding_dimensions
+
+        # Cache tiers are blocking (thread-safe LRU + sync table client); run in threads
+        self.embedding_cache = EmbeddingCache(SupabaseService())
+
+        self.configure_storage(
+            settings.embedding_storage_mode, settings.embedding_rerank_oversample
+        )
+        self.configure_exact_rerank(
+            settings.embedding_exact_rerank_oversample, settings.embedding_candidate_probes
+        )
+        self.local_index = get_local_index()
+
+    @property
+    def openai_client(self) -> AsyncOpenAI:
+        """The running event loop's OpenAI client."""
+        return get_async_openai_client()
+
+    async def _client(self) -> AsyncClient:
+        """Return the injected async Supabase client, else the running loop's shared one."""
+        if self._supabase is not None:
+            return self._supabase
+        return await get_async_supabase_client()
+
+    async def _ensure_pgvector_ready(self) -> None:
+        """Validate pgvector once per process (see EmbeddingService._ensure_pgvector_ready).
+
+        Raises:
+            EmbeddingError: If pgvector is not available or RPC function is missing
+        """
+        cls = type(self)
+        if cls._pgvector_validated:
+            return
+
+        async with _pgvector_locks.get():
+            if cls._pgvector_validated:
+                return
+
+            try:
+                client = await self._client()
+                await client.rpc(
+                    "app_embeddings.search_places_by_similarity", self._pgvector_probe()
+                ).execute()
+
+                logger.info(
+                    "embedding.pgvector_validated",
+                    function="search_places_by_similarity",
+                    mode="async",
+                )
+                cls._pgvector_validated = True
+
+            except Exception as e:
+                raise self._pgvector_unavailable(e) from e
+
+    async def generate_embedding(self, text: str) -> list[float]:
+        """Generate embedding vector for text.
+
+        Args:
+            text: Text to embed (same rules as EmbeddingService.generate_embedding)
+
+        Returns:
+            Embedding vector (1536 dimensions for ada-002)
+
+        Raises:
+            ValueError: If text is empty or too long
+            EmbeddingError: If OpenAI API call fails or dimension mismatch
+        """
+        await self._ensure_pgvector_ready()
+
+        text = self._validate_text(text)
+
+        cached = await asyncio.to_thread(self.embedding_cache.get_many, self.cache_model, [text])
+        if cached:
+            return next(iter(cached.values()))
+
+        try:
+            response = await self.openai_client.embeddings.create(
+                **self._embedding_request(), input=text
+            )
+            embedding = self._checked_embedding(text, response)
+        except Exception as e:
+            raise self._failure("generate", e) from e
+
+        await asyncio.to_thread(self.embedding_cache.put_many, self.cache_model, {text: embedding})
+        return embedding
+
+    async def generate_embeddings(self, texts: list[str]) -> list[EmbeddingBatchItem]:
+        """Generate embeddings for many texts with concurrent multi-input requests.
+
+        Args:
+            texts: Texts to embed (same rules as generate_embedding)
+
+        Returns:
+            One EmbeddingBatchItem per input, in input order (see
+            EmbeddingService.generate_embeddings)
+
+        Raises:
+            EmbeddingError: If pgvector validation fails
+
+        Note: At most MAX_CONCURRENT_BATCHES requests are in flight at once.
+        """
+        await self._ensure_pgvector_ready()
+
+        items, pending = self._plan_embeddings(texts)
+        cached = await asyncio.to_thread(
+            self.embedding_cache.get_many, self.cache_model, [t for _, t in pending]
+        )
+        misses = self._apply_cached(pending, cached, items)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+        async def embed(batch: list[tuple[int, str]]) -> None:
+            async with semaphore:
+                await self._embed_batch(batch, items)
+
+        await asyncio.gather(*(embed(batch) for batch in self._pack_batches(misses)))
+
+        fresh = self._finish_embeddings(items, pending, misses)
+        await asyncio.to_thread(self.embedding_cache.put_many, self.cache_model, fresh)
+        return items
+
+    async def _embed_batch(
+        self, batch: list[tuple[int, str]], items: list[EmbeddingBatchItem], attempt: int = 0
+    ) -> None:
+        """Embed one packed batch, writing results into items by input index.
+
+        Failed requests are retried or split as _plan_batch_retry decides.
+        """
+        try:
+            response = await self.openai_client.embeddings.create(
+                **self._embedding_request(), input=[text for _, text in batch]
+            )
+            rows = self._batch_rows(batch, response)
+        except Exception as e:
+            retry = self._plan_batch_retry(batch, items, e, attempt)
+            if retry.delay:
+                await asyncio.sleep(retry.delay)
+            for follow_up, next_attempt in retry.requests:
+                await self._embed_batch(follow_up, items, next_attempt)
+            return
+
+        self._apply_batch_rows(batch, rows, items)
+
+    async def store_place_embedding(
+        self,
+        source: str,
+        source_id: str,
+        text: str,
+        metadata: dict[str, Any],
+    ) -> None:
+        """Generate and store place embedding.
+
+        Args:
+            source: Source type (serp, reddit, eventbrite)
+            source_id: Unique ID from source (format validated per source type)
+            text: Text to embed
+            metadata: Place metadata (MUST include 'name')
+
+        Raises:
+            ValueError: If source/source_id/text/metadata invalid
+            EmbeddingError: If embedding generation or storage fails
+        """
+        source_id = self.validate_place(source, source_id, metadata)
+
+        embedding = await self.generate_embedding(text)
+        row = self._place_row(source, source_id, embedding, metadata)
+
+        try:
+            client = await self._client()
+            await client.table("app_embeddings.places_embeddings").upsert(row).execute()
+        except Exception as e:
+            raise self._failure("store", e) from e
+
+        self._stored(source, source_id, metadata)
+
+    async def store_place_embeddings(
+        self, places: list[dict[str, Any]], overwrite: bool = True
+    ) -> list[EmbeddingBatchItem]:
+        """Generate and store many place embeddings with a single upsert.
+
+        Args:
+            places: Dicts with source, source_id, text and metadata keys
+            overwrite: Replace existing (source, source_id) rows; False inserts
+                new rows only (ON CONFLICT DO NOTHING)
+
+        Returns:
+            One EmbeddingBatchItem per input, in input order (see
+            EmbeddingService.store_place_embeddings)
+
+        Raises:
+            EmbeddingError: If the bulk upsert fails
+        """
+        items = [EmbeddingBatchItem(index=i) for i in range(len(places))]
+        valid = self._validate_places(places, items)
+        generated = await self.generate_embeddings([text for _, _, text in valid])
+        rows = self._collect_place_rows(places, valid, generated, items)
+
+        if not rows:
+            return items
+
+        try:
+            client = await self._client()
+            await (
+                client.table("app_embeddings.places_embeddings")
+                .upsert(
+                    list(rows.values()),
+                    on_conflict="source,source_id",
+                    ignore_duplicates=not overwrite,
+                )
+                .execute()
+            )
+        except Exception as e:
+            raise self._failure("bulk_store", e) from e
+
+        self._bulk_stored(len(rows), items)
+        return items
+
+    async def similarity_search(
+        self,
+        query_text: str,
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+    ) -> list[dict[str, Any]]:
+        """Search for similar places using vector similarity.
+
+        Args:
+            query_text: Search query (non-empty, whitespace-normalized)
+            limit: Maximum results to return (1-100)
+            similarity_threshold: Minimum similarity score (0-1, cosine similarity)
+
+        Returns:
+            List of matching places with metadata and similarity scores
+
+        Raises:
+            ValueError: If parameters are invalid
+            EmbeddingError: If search fails
+        """
+        await self._ensure_pgvector_ready()
+        self._validate_search_params(query_text, limit, similarity_threshold)
+
+        cache_key = self._search_cache_key(query_text, limit, similarity_threshold)
+        cached = self._cached_search(query_text, cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            query_embedding = await self.generate_embedding(query_text)
+
+            # In-memory NumPy scan (sub-millisecond); no thread hop needed
+            results = self._local_search(query_embedding, limit, similarity_threshold)
+            backend = "local"
+
+            if results is None:
+                if self.exact_rerank_oversample:
+                    results, _ = await self._rerank_search(
+                        query_embedding, limit, similarity_threshold, self.exact_rerank_oversample
+                    )
+                    backend = f"{self.storage_mode}+rerank"
+                else:
+                    function, params = self._search_rpc(
+                        query_embedding, limit, similarity_threshold
+                    )
+                    client = await self._client()
+                    response = await client.rpc(function, params).execute()
+                    results = response_rows(response.data)
+                    backend = self.storage_mode
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise self._failure("search", e) from e
+
+        return self._finish_search(query_text, cache_key, results, similarity_threshold, backend)
+
+    async def similarity_search_reranked(
+        self,
+        query_text: str,
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        oversample: int | None = None,
+    ) -> tuple[list[dict[str, Any]], RerankStats | None]:
+        """Two-stage search: oversampled approximate candidates, exact NumPy rerank.
+
+        Args:
+            query_text: Search query (same rules as similarity_search)
+            limit: Maximum results to return (1-100)
+            similarity_threshold: Minimum similarity score (0-1, cosine similarity)
+            oversample: Candidates per result (see EmbeddingService.similarity_search_reranked)
+
+        Returns:
+            (results, rerank stats); stats are None for result cache hits
+
+        Raises:
+            ValueError: If parameters are invalid
+            EmbeddingError: If search fails
+        """
+        await self._ensure_pgvector_ready()
+        self._validate_search_params(query_text, limit, similarity_threshold)
+        oversample = self._rerank_oversample(oversample)
+
+        cache_key = self._search_cache_key(query_text, limit, similarity_threshold, oversample)
+        cached = get_search_result_cache().get(cache_key)
+        if cached is not None:
+            return cached, None
+
+        try:
+            query_embedding = await self.generate_embedding(query_text)
+            results, stats = await self._rerank_search(
+                query_embedding, limit, similarity_threshold, oversample
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            raise self._failure("rerank_search", e) from e
+
+        get_search_result_cache().set(cache_key, results)
+        return results, stats
+
+    async def _rerank_search(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        similarity_threshold: float,
+        oversample: int,
+    ) -> tuple[list[dict[str, Any]], RerankStats]:
+        """Fetch candidates with their vectors and rerank them exactly.
+
+        Decoding runs in a worker thread: at the 1000-candidate cap it takes
+        tens of milliseconds, too long to hold the event loop.
+        """
+        started = time.perf_counter()
+        client = await self._client()
+        response = await client.rpc(
+            "app_embeddings.search_places_candidates",
+            self._candidate_params(query_embedding, limit, oversample),
+        ).execute()
+        candidate_ms = (time.perf_counter() - started) * 1000
+
+        results, stats = await asyncio.to_thread(
+            rerank_candidates,
+            query_embedding,
+            response_rows(response.data),
+            limit,
+            similarity_threshold,
+            candidate_ms,
+        )
+        self._log_rerank(stats)
+        return results, stats
+
+    async def similarity_search_many(
+        self,
+        query_texts: list[str],
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+    ) -> list[list[dict[str, Any]]]:
+        """Run several similarity searches with one embedding request and one RPC.
+
+        Args:
+            query_texts: Search queries (see EmbeddingService.similarity_search_many)
+            limit: Maximum results per query (1-100)
+            similarity_threshold: Minimum similarity score (0-1, cosine similarity)
+
+        Returns:
+            One result list per query, in input order
+
+        Raises:
+            ValueError: If parameters are invalid
+            EmbeddingError: If embedding any query or the search fails
+        """
+        await self._ensure_pgvector_ready()
+        self._validate_batch_queries(query_texts, limit, similarity_threshold)
+
+        keys, results, pending = self._plan_search_many(query_texts, limit, similarity_threshold)
+        found: list[list[dict[str, Any]] | None] = []
+        remote: list[int] = []
+
+        if pending:
+            items = await self.generate_embeddings([query_texts[i] for i in pending])
+            embeddings = self._query_embeddings(items)
+            found, remote = self._local_search_many(embeddings, limit, similarity_threshold)
+
+        if remote:
+            try:
+                client = await self._client()
+                response = await client.rpc(
+                    "app_embeddings.search_places_by_similarity_many",
+                    self._many_params([embeddings[j] for j in remote], limit, similarity_threshold),
+                ).execute()
+            except Exception as e:
+                raise self._failure("search_many", e) from e
+
+            grouped = self._group_by_query(response_rows(response.data), len(remote))
+            for j, rows in zip(remote, grouped, strict=True):
+                found[j] = rows
+
+        return self._finish_search_many(
+            keys, results, pending, found, len(remote), similarity_threshold
+        )
+
+    async def hybrid_search(
+        self,
+        query_text: str,
+        limit: int = 10,
+        full_text_weight: float = 1.0,
+        semantic_weight: float = 1.0,
+    ) -> list[dict[str, Any]]:
+        """Search places by full-text and vector similarity fused with RRF.
+
+        Args:
+            query_text: Search query (non-empty; used for both lists)
+            limit: Maximum results to return (1-100)
+            full_text_weight: RRF weight of the full-text ranking
+            semantic_weight: RRF weight of the vector ranking
+
+        Returns:
+            Places ordered by rrf_score (see EmbeddingService.hybrid_search)
+
+        Raises:
+            ValueError: If parameters are invalid
+            EmbeddingError: If search fails
+        """
+        await self._ensure_pgvector_ready()
+        self._validate_search_params(query_text, limit, 0.0)
+        self._validate_hybrid_weights(full_text_weight, semantic_weight)
+
+        try:
+            query_embedding = await self.generate_embedding(query_text)
+
+            client = await self._client()
+            response = await client.rpc(
+                "app_embeddings.search_places_hybrid",
+                self._hybrid_params(
+                    query_text, query_embedding, limit, full_text_weight, semantic_weight
+                ),
+            ).execute()
+            results = response_rows(response.data)
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise self._failure("hybrid_search", e) from e
+
+        self._log_hybrid_search(query_text, results, full_text_weight, semantic_weight)
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_async_embedding_service() -> AsyncEmbeddingService:
+    """Get cached AsyncEmbeddingService instance.
+
+    Note: Neither pgvector validation nor the async Supabase client are
+    created here; both happen on first awaited use.
+    """
+    return AsyncEmbeddingService()
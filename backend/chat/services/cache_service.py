@@ -11,32 +11,39 @@ from chat.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-def generate_cache_key(query: str, location: str = "") -> str:
+def generate_cache_key(query: str, location: str = "", response_mode: str = "standard") -> str:
     """Generate cache key from query and location.
 
     Args:
         query: Search query
         location: Optional location filter
+        response_mode: Search response mode; non-standard modes get their own
+            keys (standard keys are unchanged)
 
     Returns:
         Hash-based cache key
     """
     normalized = f"{query.strip().lower()}|{location.strip().lower()}"
+    if response_mode != "standard":
+        normalized = f"{normalized}|{response_mode}"
     return hashlib.sha256(normalized.encode()).hexdigest()[:32]
 
 
-async def get_cached_search_results(query: str, location: str) -> dict[str, Any] | None:
+async def get_cached_search_results(
+    query: str, location: str, response_mode: str = "standard"
+) -> dict[str, Any] | None:
     """Get cached search results from Supabase.
 
     Args:
         query: Search query
         location: Location filter
+        response_mode: Search response mode (cached separately)
 
     Returns:
         Cached results or None if not found
     """
     try:
-        query_hash = generate_cache_key(query, location)
+        query_hash = generate_cache_key(query, location, response_mode)
         result = supabase.get_search_results(query_hash)
 
         if result:
@@ -54,6 +61,7 @@ async def set_cached_search_results(
     location: str,
     results: dict[str, Any],
     ttl_minutes: int = SUPABASE_CACHE_TTL_MINUTES,
+    response_mode: str = "standard",
 ) -> bool:
     """Cache search results in Supabase.
 
@@ -62,12 +70,13 @@ async def set_cached_search_results(
         location: Location filter
         results: Results to cache
         ttl_minutes: Time to live in minutes
+        response_mode: Search response mode (cached separately)
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        query_hash = generate_cache_key(query, location)
+        query_hash = generate_cache_key(query, location, response_mode)
         success = supabase.store_search_results(
             query_hash=query_hash,
             location=location.strip(),
@@ -0,0 +1,172 @@
+"""Content-hash embedding cache.
+
+Embeddings are deterministic for a given model and input, so identical place
+descriptions and vector queries are served from cache instead of paying for
+another OpenAI round trip. Two tiers:
+
+- In-process LRU (MemoryCache) holding packed float32 bytes (~6 KB per 1536-d
+  vector instead of ~50 KB for a Python list of floats)
+- Persistent table app_embeddings.embedding_cache (bytea, see migration 010)
+
+The persistent tier is best-effort: failures are logged and treated as misses.
+"""
+
+import hashlib
+import sys
+import unicodedata
+from array import array
+from typing import Any
+
+from chat.utils.logger import get_logger
+from chat.utils.memory_cache import MemoryCache
+
+logger = get_logger(__name__)
+
+EMBEDDING_CACHE_MAX_ENTRIES = 2048  # ~12 MB of float32 1536-d vectors
+EMBEDDING_CACHE_TABLE = "app_embeddings.embedding_cache"
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Normalize text for cache keying (Unicode NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """Hash the model plus normalized text into a cache key.
+
+    Args:
+        model: Embedding model name (different models never share entries)
+        text: Embedding input text
+
+    Returns:
+        64-char SHA-256 hex digest
+    """
+    payload = f"{model}\n{normalize_embedding_text(text)}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def pack_embedding(embedding: list[float]) -> bytes:
+    """Pack an embedding as little-endian float32 bytes."""
+    packed = array("f", embedding)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_embedding(data: bytes) -> list[float]:
+    """Unpack little-endian float32 bytes into a list of floats."""
+    packed = array("f")
+    packed.frombytes(data)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+
+class EmbeddingCache:
+    """Two-tier (memory + Supabase table) embedding cache keyed on content hash."""
+
+    def __init__(
+        self,
+        supabase: Any | None,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Create the cache.
+
+        Args:
+            supabase: SupabaseService for the persistent tier (None = memory only)
+            max_entries: In-process LRU capacity
+        """
+        self.supabase = supabase
+        self.memory: MemoryCache[bytes] = MemoryCache(max_entries)
+
+    def get_many(self, model: str, texts: list[str]) -> dict[str, list[float]]:
+        """Look up cached embeddings.
+
+        Args:
+            model: Embedding model name
+            texts: Input texts
+
+        Returns:
+            Mapping of cache key to embedding for every hit (memory first,
+            then the persistent table; table hits are promoted to memory)
+        """
+        found: dict[str, list[float]] = {}
+        missing: set[str] = set()
+
+        for text in texts:
+            key = embedding_cache_key(model, text)
+            packed = self.memory.get(key)
+            if packed is not None:
+                found[key] = unpack_embedding(packed)
+            else:
+                missing.add(key)
+
+        if missing and self.supabase is not None:
+            for key, packed in self._read_persistent(sorted(missing)).items():
+                self.memory.set(key, packed)
+                found[key] = unpack_embedding(packed)
+
+        if texts:
+            logger.debug(
+                "embedding_cache.lookup", requested=len(texts), hits=len(found), model=model
+            )
+
+        return found
+
+    def put_many(self, model: str, embeddings: dict[str, list[float]]) -> None:
+        """Write embeddings to both tiers.
+
+        Args:
+            model: Embedding model name
+            embeddings: Mapping of input text to its embedding
+        """
+        rows = []
+
+        for text, embedding in embeddings.items():
+            key = embedding_cache_key(model, text)
+            packed = pack_embedding(embedding)
+            self.memory.set(key, packed)
+            rows.append(
+                {
+                    "content_hash": key,
+                    "model": model,
+                    "dimensions": len(embedding),
+                    "embedding": "\\x" + packed.hex(),
+                }
+            )
+
+        if not rows or self.supabase is None:
+            return
+
+        try:
+            self.supabase.client.table(EMBEDDING_CACHE_TABLE).upsert(
+                rows, on_conflict="content_hash", ignore_duplicates=True
+            ).execute()
+
+        except Exception as e:
+            logger.warning("embedding_cache.write_error", error=str(e), rows=len(rows))
+
+    def _read_persistent(self, keys: list[str]) -> dict[str, bytes]:
+        """Fetch packed embeddings from the persistent table."""
+        try:
+            response = (
+                self.supabase.client.table(EMBEDDING_CACHE_TABLE)  # type: ignore[union-attr]
+                .select("content_hash,embedding")
+                .in_("content_hash", keys)
+                .execute()
+            )
+
+            return {
+                row["content_hash"]: _decode_bytea(row["embedding"])
+                for row in response.data or []
+                if isinstance(row, dict)
+            }
+
+        except Exception as e:
+            logger.warning("embedding_cache.read_error", error=str(e), keys=len(keys))
+            return {}
+
+
+def _decode_bytea(value: str) -> bytes:
+    """Decode a PostgREST bytea value ("\\x" + hex)."""
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
@@ -12,20 +12,102 @@ See AGENTS.md for project philosophy on breaking changes.
 """
 
 import json
+import random
 import re
+import time
+from dataclasses import dataclass, field
 from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
-from openai import OpenAI
+from openai import (
+    APIConnectionError,
+    BadRequestError,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+    UnprocessableEntityError,
+)
 
 from chat.config.settings import get_settings
-from chat.services.supabase_service import SupabaseService
+from chat.services.embedding_cache import EmbeddingCache, embedding_cache_key
+from chat.services.exact_rerank import (
+    DEFAULT_EXACT_RERANK_OVERSAMPLE,
+    MAX_RERANK_CANDIDATES,
+    RerankStats,
+    rerank_candidates,
+)
+from chat.services.llm_provider import create_llm_client
+from chat.services.search_result_cache import get_search_result_cache
+from chat.services.supabase_service import SupabaseService, response_rows
+from chat.services.vector_index import LocalVectorIndex
 from chat.utils.errors import UnderfootError
 from chat.utils.logger import get_logger
+from chat.utils.tokenizer import count_tokens
 
 logger = get_logger(__name__)
 
-MAX_TEXT_LENGTH = 8000  # Conservative limit; ada-002 token budget ~8191 tokens (~32k chars)
+MAX_INPUT_TOKENS = 8191  # Per-input limit for ada-002 and text-embedding-3-*
+
+# Index storage modes (see supabase/migrations/009_quantized_embeddings.sql):
+# - full: ivfflat over vector(1536), exact similarity from the index scan
+# - halfvec: ivfflat over a float16 copy, candidates reranked against full vectors
+# - binary: ivfflat over a 1-bit copy (hamming), candidates reranked against full vectors
+EMBEDDING_STORAGE_MODES = ("full", "halfvec", "binary")
+MAX_RERANK_OVERSAMPLE = 20  # Matches oversample cap in search_places_by_similarity_quantized()
+
+# Batched generation budgets (OpenAI caps a request at 2048 inputs / 300k tokens)
+MAX_BATCH_ITEMS = 256
+MAX_BATCH_TOKENS = 100_000
+BATCH_MAX_ATTEMPTS = 4  # Whole-batch attempts on rate limits, 5xx and connection errors
+BATCH_RETRY_BASE_SECONDS = 1.0  # Doubles per attempt, with jitter
+
+# Hybrid search (see supabase/migrations/011_hybrid_search.sql)
+HYBRID_RRF_K = 60  # Standard RRF constant; damps the weight of top ranks
+HYBRID_CANDIDATE_MULTIPLIER = 5  # Candidates per list = limit * multiplier
+MAX_HYBRID_CANDIDATES = 500  # Matches candidate_count cap in search_places_hybrid()
+
+MAX_BATCH_QUERIES = 32  # Matches query_embeddings cap in search_places_by_similarity_many()
+
+MAX_CANDIDATE_PROBES = 1000  # Matches probes cap in search_places_candidates()
+
+VALID_SOURCES = {"serp", "reddit", "eventbrite"}
+
+# Models with a fixed output size (no `dimensions` request parameter)
+FIXED_DIMENSION_MODELS = {"text-embedding-ada-002"}
+
+STORAGE_HINT = "Check Supabase connection, RLS policies, and table schema."
+
+# (log event, message, hint) of the EmbeddingError raised when each operation fails
+_FAILURES = {
+    "generate": (
+        "embedding.generate_error",
+        "Failed to generate embedding",
+        "Check OpenAI API key, rate limits, and network connectivity.",
+    ),
+    "store": ("embedding.store_error", "Failed to store embedding", STORAGE_HINT),
+    "bulk_store": ("embedding.bulk_store_error", "Failed to store embeddings", STORAGE_HINT),
+    "search": (
+        "embedding.search_error",
+        "Similarity search failed",
+        "Check pgvector availability, RPC function exists, and network connectivity.",
+    ),
+    "rerank_search": (
+        "embedding.rerank_search_error",
+        "Reranked similarity search failed",
+        "Ensure migration 014_rerank_candidates.sql has been applied.",
+    ),
+    "search_many": (
+        "embedding.search_many_error",
+        "Batch similarity search failed",
+        "Ensure migration 013_batch_similarity.sql has been applied.",
+    ),
+    "hybrid_search": (
+        "embedding.hybrid_search_error",
+        "Hybrid search failed",
+        "Ensure migration 011_hybrid_search.sql has been applied.",
+    ),
+}
 
 
 class EmbeddingError(UnderfootError):
@@ -41,98 +123,231 @@ class EmbeddingError(UnderfootError):
     pass
 
 
-@lru_cache(maxsize=1)
-def get_openai_client() -> OpenAI:
-    """Get cached OpenAI client."""
-    settings = get_settings()
-    return OpenAI(api_key=settings.openai_api_key)
+@dataclass
+class EmbeddingBatchItem:
+    """Outcome for one input of a batched embedding call.
 
+    Items are returned in input order; exactly one of embedding/error is set.
+    """
 
-class EmbeddingService:
-    """Service for vector embeddings and similarity search.
+    index: int
+    embedding: list[float] | None = None
+    error: str | None = None
 
-    Singleton service that manages OpenAI embeddings and pgvector similarity search.
-    Uses text-embedding-ada-002 model (1536 dimensions).
+    @property
+    def ok(self) -> bool:
+        """True when the input was embedded (and stored, for bulk storage)."""
+        return self.error is None
 
-    CRITICAL: embedding_dimensions=1536 is HARD-CODED in:
-    - OpenAI ada-002 model output
-    - pgvector column: places_embeddings.embedding vector(1536)
-    - Database migration: 20251101000001_places_embeddings.sql
 
-    Changing models (e.g., text-embedding-3-small) requires:
-    1. ALTER TABLE places_embeddings ALTER COLUMN embedding TYPE vector(NEW_DIM)
-    2. Re-generate ALL embeddings (no dimension mismatch allowed)
-    3. Rebuild ivfflat index
+@dataclass
+class BatchRetry:
+    """Follow-up requests for a failed embedding batch.
 
-    Beta Status: This service has NO backwards compatibility.
-    All methods raise exceptions on failure (no silent False/[] returns).
+    Each request is a (batch, attempt) pair to send after sleeping delay
+    seconds; no requests means the batch has failed for good.
     """
 
-    _instance = None
+    delay: float = 0.0
+    requests: list[tuple[list[tuple[int, str]], int]] = field(default_factory=list)
 
-    def __new__(cls) -> "EmbeddingService":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
 
-    def __init__(self) -> None:
-        if hasattr(self, "_initialized"):
-            return
+def is_input_error(error: Exception) -> bool:
+    """True when OpenAI rejected a batch for its inputs (worth retrying them one by one)."""
+    return isinstance(error, BadRequestError | UnprocessableEntityError | EmbeddingError)
 
-        self.openai_client = get_openai_client()
-        self.supabase = SupabaseService()
-        self.embedding_model = "text-embedding-ada-002"  # Hard-coded: matches database column type
-        self.embedding_dimensions = (
-            1536  # Hard-coded: ada-002 output; changing requires DB migration
-        )
 
-        self._initialized = True
+def is_transient_error(error: Exception) -> bool:
+    """True for rate limits, 5xx and connection errors (retry the same batch later)."""
+    return isinstance(error, RateLimitError | InternalServerError | APIConnectionError)
 
-    def _ensure_pgvector_ready(self) -> None:
-        """Lazy validation of pgvector on first use (not in __init__).
 
-        Validates that:
-        - pgvector extension is installed
-        - search_places_by_similarity() RPC function exists
-        - Supabase connection is working
+def batch_retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt + 1 (exponential, with jitter)."""
+    return BATCH_RETRY_BASE_SECONDS * 2.0**attempt * random.uniform(0.5, 1.0)
+
+
+def _invalidate_search_results(_added: int) -> None:
+    """Local index refresh callback: results cached before the new rows are stale."""
+    get_search_result_cache().bump()
+
+
+def open_local_index(
+    snapshot_dir: Path, dimensions: int, poll_seconds: float | None, client: Any
+) -> LocalVectorIndex | None:
+    """Load a local vector index snapshot and start its background sync.
+
+    Args:
+        snapshot_dir: Directory written by `manage.py build_vector_snapshot`
+        dimensions: Expected embedding dimensions
+        poll_seconds: Poll places_embeddings for changed rows this often
+            (None = no background sync)
+        client: Sync Supabase client used for polling
+
+    Returns:
+        The loaded index, or None if the snapshot is missing or invalid
+    """
+    index = LocalVectorIndex(snapshot_dir, dimensions=dimensions)
+
+    try:
+        index.load()
+    except (OSError, ValueError) as e:
+        logger.warning("embedding.local_index_unavailable", error=str(e), path=str(snapshot_dir))
+        return None
+
+    if poll_seconds:
+        index.start_sync(client, poll_seconds, on_refresh=_invalidate_search_results)
+
+    get_search_result_cache().bump()
+    return index
+
+
+@lru_cache(maxsize=1)
+def get_local_index() -> LocalVectorIndex | None:
+    """Process-wide local index from settings, shared by the sync and async services.
+
+    Returns:
+        The index, or None when EMBEDDING_LOCAL_INDEX_DIR is unset or the
+        snapshot cannot be loaded
+    """
+    settings = get_settings()
+    if not settings.embedding_local_index_dir:
+        return None
+
+    return open_local_index(
+        Path(settings.embedding_local_index_dir),
+        settings.embedding_dimensions,
+        settings.embedding_local_index_poll_seconds,
+        SupabaseService().client,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Get cached client for the configured LLM provider."""
+    return create_llm_client()
+
+
+class EmbeddingValidationMixin:
+    """Validation, batching and result handling shared by the embedding services.
+
+    EmbeddingService, AsyncEmbeddingService and Reembedder only supply the
+    I/O (OpenAI requests, RPCs, upserts, cache reads and sleeps); planning,
+    the retry/split decision for failed batches and post-processing of
+    results live here.
+
+    Subclasses set embedding_model and embedding_dimensions and call
+    configure_storage() during initialization.
+    """
+
+    embedding_model: str
+    embedding_dimensions: int
+    storage_mode: str
+    rerank_oversample: int
+    exact_rerank_oversample: int = 0  # 0 = single-stage search (see configure_exact_rerank)
+    candidate_probes: int | None = None
+    local_index: LocalVectorIndex | None = None
+
+    @property
+    def cache_model(self) -> str:
+        """Embedding cache namespace (model, plus dimensions when requested explicitly)."""
+        if self.embedding_model in FIXED_DIMENSION_MODELS:
+            return self.embedding_model
+        return f"{self.embedding_model}:{self.embedding_dimensions}"
+
+    def _embedding_request(self) -> dict[str, Any]:
+        """Model arguments for embeddings.create()."""
+        if self.embedding_model in FIXED_DIMENSION_MODELS:
+            return {"model": self.embedding_model}
+        return {"model": self.embedding_model, "dimensions": self.embedding_dimensions}
+
+    def configure_storage(self, storage_mode: str, rerank_oversample: int = 4) -> None:
+        """Select which vector index similarity_search scans.
+
+        Args:
+            storage_mode: One of EMBEDDING_STORAGE_MODES (full, halfvec, binary)
+            rerank_oversample: Candidate multiplier for quantized modes (1-20).
+                The quantized index returns limit * rerank_oversample candidates,
+                which are reranked against full-precision vectors in SQL.
 
         Raises:
-            EmbeddingError: If pgvector is not available or RPC function is missing
+            ValueError: If storage_mode or rerank_oversample is invalid
 
-        Note: Validation happens on first real use to avoid:
-        - Test collection failures
-        - Unnecessary RPC calls during fixture setup
-        - CI/CD failures without local Supabase
+        Note: Full-precision vectors are always stored; modes only change the
+        index used for the candidate scan, so switching is safe at runtime and
+        lets recall/latency be compared on the same dataset.
         """
-        if hasattr(self, "_pgvector_validated"):
-            return
+        if storage_mode not in EMBEDDING_STORAGE_MODES:
+            raise ValueError(
+                f"Invalid storage_mode '{storage_mode}'. Must be one of {EMBEDDING_STORAGE_MODES}"
+            )
 
-        try:
-            dummy_embedding = [0.0] * self.embedding_dimensions
-            self.supabase.client.rpc(
-                "app_embeddings.search_places_by_similarity",
-                {
-                    "query_embedding": dummy_embedding,
-                    "match_threshold": 0.9999,
-                    "match_count": 1,
-                },
-            ).execute()
+        if not 1 <= rerank_oversample <= MAX_RERANK_OVERSAMPLE:
+            raise ValueError(
+                f"rerank_oversample must be between 1 and {MAX_RERANK_OVERSAMPLE}, "
+                f"got {rerank_oversample}"
+            )
 
-            logger.info("embedding.pgvector_validated", function="search_places_by_similarity")
-            self._pgvector_validated = True
+        self.storage_mode = storage_mode
+        self.rerank_oversample = rerank_oversample
 
-        except Exception as e:
-            logger.error(
-                "pgvector.validation_failed",
-                error=str(e),
-                function="search_places_by_similarity",
-                exc_info=True,
+        logger.info(
+            "embedding.storage_configured",
+            storage_mode=storage_mode,
+            rerank_oversample=rerank_oversample,
+        )
+
+    def configure_exact_rerank(self, oversample: int, probes: int | None = None) -> None:
+        """Enable two-stage search: approximate candidates, exact NumPy rerank.
+
+        Args:
+            oversample: Candidates fetched per result (limit * oversample, capped
+                at MAX_RERANK_CANDIDATES); 0 disables two-stage search
+            probes: ivfflat probes for the candidate scan (None = server default)
+
+        Raises:
+            ValueError: If oversample or probes is out of range
+        """
+        if not 0 <= oversample <= MAX_RERANK_CANDIDATES:
+            raise ValueError(
+                f"oversample must be between 0 and {MAX_RERANK_CANDIDATES}, got {oversample}"
             )
-            raise EmbeddingError(
-                "pgvector extension or search_places_by_similarity() function not available. "
-                "Ensure migrations have been applied. "
-                "See supabase/MIGRATION_NOTES.md for setup steps."
-            ) from e
+
+        if probes is not None and not 1 <= probes <= MAX_CANDIDATE_PROBES:
+            raise ValueError(f"probes must be between 1 and {MAX_CANDIDATE_PROBES}, got {probes}")
+
+        self.exact_rerank_oversample = oversample
+        self.candidate_probes = probes
+
+        logger.info("embedding.exact_rerank_configured", oversample=oversample, probes=probes)
+
+    def _candidate_params(
+        self, query_embedding: list[float], limit: int, oversample: int
+    ) -> dict[str, Any]:
+        """Build search_places_candidates() parameters."""
+        return {
+            "query_embedding": query_embedding,
+            "candidate_count": min(limit * oversample, MAX_RERANK_CANDIDATES),
+            "storage_mode": self.storage_mode,
+            "probes": self.candidate_probes,
+        }
+
+    def _search_rpc(
+        self, query_embedding: list[float], limit: int, similarity_threshold: float
+    ) -> tuple[str, dict[str, Any]]:
+        """Select the similarity RPC and its parameters for the storage mode."""
+        params: dict[str, Any] = {
+            "query_embedding": query_embedding,
+            "match_threshold": similarity_threshold,
+            "match_count": limit,
+        }
+
+        if self.storage_mode == "full":
+            return "app_embeddings.search_places_by_similarity", params
+
+        params["storage_mode"] = self.storage_mode
+        params["oversample"] = self.rerank_oversample
+        return "app_embeddings.search_places_by_similarity_quantized", params
 
     def _validate_source_id(self, source: str, source_id: str) -> None:
         """Validate source_id format matches expected pattern for source type.
@@ -191,11 +406,683 @@ class EmbeddingService:
                 f"Common issues: datetime objects, custom classes. Error: {e}"
             ) from e
 
+    def validate_place(self, source: str, source_id: str, metadata: dict[str, Any]) -> str:
+        """Validate a place row before embedding.
+
+        Args:
+            source: Source type (serp, reddit, eventbrite)
+            source_id: Unique ID from source
+            metadata: Place metadata
+
+        Returns:
+            Whitespace-normalized source_id
+
+        Raises:
+            ValueError: If source or source_id is invalid
+            EmbeddingError: If metadata is invalid
+        """
+        if source not in VALID_SOURCES:
+            raise ValueError(f"Invalid source '{source}'. Must be one of {VALID_SOURCES}")
+
+        if not source_id or not source_id.strip():
+            raise ValueError("source_id must be non-empty")
+
+        source_id = source_id.strip()
+        self._validate_source_id(source, source_id)
+        self._validate_metadata(metadata)
+        return source_id
+
+    def _validate_text(self, text: str) -> str:
+        """Normalize and validate embedding input text.
+
+        Args:
+            text: Raw text
+
+        Returns:
+            Whitespace-normalized text
+
+        Raises:
+            ValueError: If text is empty or too long
+        """
+        if not text or not text.strip():
+            raise ValueError("Text must be non-empty for embedding generation")
+
+        text = text.strip()
+
+        tokens = count_tokens(text, self.embedding_model)
+        if tokens > MAX_INPUT_TOKENS:
+            raise ValueError(
+                f"Text too long ({tokens} tokens). Maximum {MAX_INPUT_TOKENS} tokens. "
+                "Build place text with build_embedding_text() or use truncate_to_tokens()."
+            )
+
+        return text
+
+    def _validate_search_params(
+        self, query_text: str, limit: int, similarity_threshold: float
+    ) -> None:
+        """Validate similarity search parameters.
+
+        Raises:
+            ValueError: If query is empty, limit is outside 1-100 or threshold outside 0-1
+        """
+        if not query_text or not query_text.strip():
+            raise ValueError("query_text must be non-empty")
+
+        if not 1 <= limit <= 100:
+            raise ValueError(f"limit must be between 1 and 100, got {limit}")
+
+        if not 0 <= similarity_threshold <= 1:
+            raise ValueError(
+                f"similarity_threshold must be between 0 and 1, got {similarity_threshold}"
+            )
+
+    def _hybrid_params(
+        self,
+        query_text: str,
+        query_embedding: list[float],
+        limit: int,
+        full_text_weight: float,
+        semantic_weight: float,
+    ) -> dict[str, Any]:
+        """Build search_places_hybrid() parameters."""
+        return {
+            "query_text": query_text.strip(),
+            "query_embedding": query_embedding,
+            "match_count": limit,
+            "candidate_count": min(limit * HYBRID_CANDIDATE_MULTIPLIER, MAX_HYBRID_CANDIDATES),
+            "rrf_k": HYBRID_RRF_K,
+            "full_text_weight": full_text_weight,
+            "semantic_weight": semantic_weight,
+        }
+
+    def _validate_batch_queries(
+        self, query_texts: list[str], limit: int, similarity_threshold: float
+    ) -> None:
+        """Validate similarity_search_many parameters.
+
+        Raises:
+            ValueError: If there are no queries, more than MAX_BATCH_QUERIES, or
+                any query/limit/threshold is invalid
+        """
+        if not query_texts:
+            raise ValueError("query_texts must be non-empty")
+
+        if len(query_texts) > MAX_BATCH_QUERIES:
+            raise ValueError(
+                f"At most {MAX_BATCH_QUERIES} queries per call, got {len(query_texts)}"
+            )
+
+        for query_text in query_texts:
+            self._validate_search_params(query_text, limit, similarity_threshold)
+
+    def _group_by_query(self, rows: list[dict[str, Any]], count: int) -> list[list[dict[str, Any]]]:
+        """Split search_places_by_similarity_many() rows by query_index."""
+        grouped: list[list[dict[str, Any]]] = [[] for _ in range(count)]
+        for row in rows:
+            row = dict(row)
+            grouped[row.pop("query_index")].append(row)
+        return grouped
+
+    def _validate_hybrid_weights(self, full_text_weight: float, semantic_weight: float) -> None:
+        """Validate RRF list weights.
+
+        Raises:
+            ValueError: If a weight is negative or both are zero
+        """
+        if full_text_weight < 0 or semantic_weight < 0:
+            raise ValueError(
+                f"weights must be >= 0, got full_text_weight={full_text_weight}, "
+                f"semantic_weight={semantic_weight}"
+            )
+
+        if full_text_weight == 0 and semantic_weight == 0:
+            raise ValueError("At least one of full_text_weight or semantic_weight must be > 0")
+
+    def _pack_batches(self, pending: list[tuple[int, str]]) -> list[list[tuple[int, str]]]:
+        """Greedily pack (index, text) pairs under the item and token budgets."""
+        batches: list[list[tuple[int, str]]] = []
+        current: list[tuple[int, str]] = []
+        current_tokens = 0
+
+        for index, text in pending:
+            tokens = count_tokens(text, self.embedding_model)
+            if current and (
+                len(current) >= MAX_BATCH_ITEMS or current_tokens + tokens > MAX_BATCH_TOKENS
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append((index, text))
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def _search_cache_key(
+        self,
+        query_text: str,
+        limit: int,
+        similarity_threshold: float,
+        oversample: int | None = None,
+    ) -> str:
+        """Result cache key for similarity_search at the current index generation."""
+        cache = get_search_result_cache()
+        oversample = self.exact_rerank_oversample if oversample is None else oversample
+        config = (
+            f"{self.storage_mode}:{self.rerank_oversample}:{oversample}:{self.candidate_probes}"
+        )
+        return cache.key(
+            f"{self.cache_model}:{config}",
+            query_text,
+            limit,
+            similarity_threshold,
+            cache.generation,
+        )
+
+    def _validate_places(
+        self, places: list[dict[str, Any]], items: list[EmbeddingBatchItem]
+    ) -> list[tuple[int, str, str]]:
+        """Validate bulk place dicts, recording failures on items.
+
+        Returns:
+            (input index, normalized source_id, text) for each valid place
+        """
+        valid: list[tuple[int, str, str]] = []
+
+        for i, place in enumerate(places):
+            try:
+                source_id = self.validate_place(
+                    place.get("source", ""), place.get("source_id", ""), place.get("metadata", {})
+                )
+                valid.append((i, source_id, place.get("text", "")))
+            except (ValueError, EmbeddingError) as e:
+                items[i].error = str(e)
+
+        return valid
+
+    def _collect_place_rows(
+        self,
+        places: list[dict[str, Any]],
+        valid: list[tuple[int, str, str]],
+        generated: list[EmbeddingBatchItem],
+        items: list[EmbeddingBatchItem],
+    ) -> dict[tuple[str, str], dict[str, Any]]:
+        """Build upsert rows keyed on (source, source_id); last occurrence wins."""
+        rows: dict[tuple[str, str], dict[str, Any]] = {}
+
+        for (i, source_id, _), result in zip(valid, generated, strict=True):
+            if not result.ok:
+                items[i].error = result.error
+                continue
+
+            items[i].embedding = result.embedding
+            rows[(places[i]["source"], source_id)] = {
+                "source": places[i]["source"],
+                "source_id": source_id,
+                "embedding": result.embedding,
+                "metadata": places[i]["metadata"],
+            }
+
+        return rows
+
+    def _apply_batch_rows(
+        self, batch: list[tuple[int, str]], rows: list[Any], items: list[EmbeddingBatchItem]
+    ) -> None:
+        """Dimension-check the rows of one batch response and record them by input index."""
+        for (index, _), row in zip(batch, rows, strict=True):
+            if len(row.embedding) != self.embedding_dimensions:
+                items[index].error = (
+                    f"Dimension mismatch: Expected {self.embedding_dimensions}, "
+                    f"got {len(row.embedding)}. Model may have changed."
+                )
+            else:
+                items[index].embedding = row.embedding
+
+    def _fail_batch(
+        self, batch: list[tuple[int, str]], items: list[EmbeddingBatchItem], error: Exception
+    ) -> None:
+        """Record a request failure on every input of the batch."""
+        logger.error(
+            "embedding.generate_error", error=str(error), size=len(batch), index=batch[0][0]
+        )
+        for index, _ in batch:
+            items[index].error = f"Failed to generate embedding: {str(error)}"
+
+    def _local_search(
+        self, query_embedding: list[float], limit: int, similarity_threshold: float
+    ) -> list[dict[str, Any]] | None:
+        """Search the local index; None means "use the RPC"."""
+        if self.local_index is None or not self.local_index.ready:
+            return None
+
+        try:
+            return self.local_index.search(query_embedding, limit, similarity_threshold)
+        except Exception as e:
+            logger.warning("embedding.local_index_fallback", error=str(e))
+            return None
+
+    def _local_search_many(
+        self, embeddings: list[list[float]], limit: int, similarity_threshold: float
+    ) -> tuple[list[list[dict[str, Any]] | None], list[int]]:
+        """Answer what the local index can.
+
+        Returns:
+            (results per embedding, None where unanswered; indexes of the
+            embeddings left for the batch RPC)
+        """
+        found = [self._local_search(e, limit, similarity_threshold) for e in embeddings]
+        return found, [j for j, rows in enumerate(found) if rows is None]
+
+    def _many_params(
+        self, embeddings: list[list[float]], limit: int, similarity_threshold: float
+    ) -> dict[str, Any]:
+        """Build search_places_by_similarity_many() parameters."""
+        return {
+            "query_embeddings": embeddings,
+            "match_threshold": similarity_threshold,
+            "match_count": limit,
+        }
+
+    def _pgvector_probe(self) -> dict[str, Any]:
+        """search_places_by_similarity() parameters of the pgvector validation call."""
+        return {
+            "query_embedding": [0.0] * self.embedding_dimensions,
+            "match_threshold": 0.9999,
+            "match_count": 1,
+        }
+
+    def _pgvector_unavailable(self, error: Exception) -> EmbeddingError:
+        """Log a failed pgvector validation and build the error to raise."""
+        logger.error(
+            "pgvector.validation_failed",
+            error=str(error),
+            function="search_places_by_similarity",
+            exc_info=True,
+        )
+        return EmbeddingError(
+            "pgvector extension or search_places_by_similarity() function not available. "
+            "Ensure migrations have been applied. "
+            "See supabase/MIGRATION_NOTES.md for setup steps."
+        )
+
+    def _failure(self, operation: str, error: Exception) -> EmbeddingError:
+        """Log a failed OpenAI or Supabase call and build the error to raise.
+
+        Args:
+            operation: Key of _FAILURES (generate, store, search, ...)
+            error: The exception raised by the client
+        """
+        event, message, hint = _FAILURES[operation]
+        logger.error(event, error=str(error), exc_info=True)
+        return EmbeddingError(f"{message}: {str(error)}. {hint}")
+
+    def _checked_embedding(self, text: str, response: Any) -> list[float]:
+        """Dimension-check a single-input embeddings.create() response.
+
+        Raises:
+            EmbeddingError: If the vector does not have embedding_dimensions
+        """
+        embedding: list[float] = response.data[0].embedding
+
+        if len(embedding) != self.embedding_dimensions:
+            raise EmbeddingError(
+                f"Dimension mismatch: Expected {self.embedding_dimensions}, "
+                f"got {len(embedding)}. Model may have changed."
+            )
+
+        logger.info(
+            "embedding.generated",
+            text_length=len(text),
+            dimensions=len(embedding),
+            model=self.embedding_model,
+        )
+        return embedding
+
+    def _plan_embeddings(
+        self, texts: list[str]
+    ) -> tuple[list[EmbeddingBatchItem], list[tuple[int, str]]]:
+        """Validate texts for a batched call.
+
+        Returns:
+            (one item per input, invalid ones already failed; (index,
+            normalized text) of every valid input)
+        """
+        items = [EmbeddingBatchItem(index=i) for i in range(len(texts))]
+        pending: list[tuple[int, str]] = []
+
+        for i, text in enumerate(texts):
+            try:
+                pending.append((i, self._validate_text(text)))
+            except ValueError as e:
+                items[i].error = str(e)
+
+        return items, pending
+
+    def _apply_cached(
+        self,
+        pending: list[tuple[int, str]],
+        cached: dict[str, list[float]],
+        items: list[EmbeddingBatchItem],
+    ) -> list[tuple[int, str]]:
+        """Record embedding cache hits on items and return the misses."""
+        misses: list[tuple[int, str]] = []
+        for i, text in pending:
+            hit = cached.get(embedding_cache_key(self.cache_model, text))
+            if hit is not None:
+                items[i].embedding = hit
+            else:
+                misses.append((i, text))
+        return misses
+
+    def _finish_embeddings(
+        self,
+        items: list[EmbeddingBatchItem],
+        pending: list[tuple[int, str]],
+        misses: list[tuple[int, str]],
+    ) -> dict[str, list[float]]:
+        """Log a batched call and return the new embeddings to cache, keyed by text."""
+        failed = sum(1 for item in items if not item.ok)
+        logger.info(
+            "embedding.batch_generated",
+            inputs=len(items),
+            embedded=len(items) - failed,
+            cache_hits=len(pending) - len(misses),
+            failed=failed,
+            model=self.embedding_model,
+        )
+        return {
+            text: embedding for i, text in misses if (embedding := items[i].embedding) is not None
+        }
+
+    def _batch_rows(self, batch: list[tuple[int, str]], response: Any) -> list[Any]:
+        """Order a multi-input response's rows by input position.
+
+        Raises:
+            EmbeddingError: If the response does not have one row per input
+        """
+        rows = sorted(response.data, key=lambda row: row.index)
+        if len(rows) != len(batch):
+            raise EmbeddingError(
+                f"Batch size mismatch: sent {len(batch)} inputs, got {len(rows)} embeddings"
+            )
+        return rows
+
+    def _plan_batch_retry(
+        self,
+        batch: list[tuple[int, str]],
+        items: list[EmbeddingBatchItem],
+        error: Exception,
+        attempt: int,
+    ) -> BatchRetry:
+        """Decide how to recover from a failed multi-input request.
+
+        Rate limits, 5xx and connection errors retry the whole batch with
+        backoff; only input rejections (400/422) split it into single-input
+        requests, so one 429 never fans out into a request per item. Anything
+        else fails every input of the batch.
+        """
+        if is_transient_error(error) and attempt + 1 < BATCH_MAX_ATTEMPTS:
+            delay = batch_retry_delay(attempt)
+            logger.warning(
+                "embedding.batch_retry",
+                size=len(batch),
+                attempt=attempt + 1,
+                delay_s=round(delay, 2),
+                error=str(error),
+            )
+            return BatchRetry(delay, [(batch, attempt + 1)])
+
+        if len(batch) > 1 and is_input_error(error):
+            logger.warning("embedding.batch_retry_individually", size=len(batch), error=str(error))
+            return BatchRetry(requests=[([single], 0) for single in batch])
+
+        self._fail_batch(batch, items, error)
+        return BatchRetry()
+
+    def _place_row(
+        self, source: str, source_id: str, embedding: list[float], metadata: dict[str, Any]
+    ) -> dict[str, Any]:
+        """places_embeddings row for an upsert."""
+        return {
+            "source": source,
+            "source_id": source_id,
+            "embedding": embedding,
+            "metadata": metadata,
+        }
+
+    def _stored(self, source: str, source_id: str, metadata: dict[str, Any]) -> None:
+        """Invalidate cached search results and log a stored place."""
+        get_search_result_cache().bump()
+        logger.info(
+            "embedding.stored",
+            source=source,
+            source_id=source_id,
+            metadata_keys=list(metadata.keys()),
+        )
+
+    def _bulk_stored(self, rows: int, items: list[EmbeddingBatchItem]) -> None:
+        """Invalidate cached search results and log a bulk upsert."""
+        get_search_result_cache().bump()
+        logger.info("embedding.bulk_stored", rows=rows, failed=sum(1 for i in items if not i.ok))
+
+    def _cached_search(self, query_text: str, cache_key: str) -> list[dict[str, Any]] | None:
+        """similarity_search result cache lookup (logged on a hit)."""
+        cached = get_search_result_cache().get(cache_key)
+        if cached is not None:
+            logger.info(
+                "embedding.search_cache_hit",
+                query_length=len(query_text),
+                results_count=len(cached),
+            )
+        return cached
+
+    def _finish_search(
+        self,
+        query_text: str,
+        cache_key: str,
+        results: list[dict[str, Any]],
+        similarity_threshold: float,
+        backend: str,
+    ) -> list[dict[str, Any]]:
+        """Log and cache similarity_search results."""
+        logger.info(
+            "embedding.search",
+            query_length=len(query_text),
+            results_count=len(results),
+            threshold=similarity_threshold,
+            storage_mode=backend,
+        )
+        get_search_result_cache().set(cache_key, results)
+        return results
+
+    def _rerank_oversample(self, oversample: int | None) -> int:
+        """Oversample for similarity_search_reranked: argument, configured, default."""
+        return oversample or self.exact_rerank_oversample or DEFAULT_EXACT_RERANK_OVERSAMPLE
+
+    def _log_rerank(self, stats: RerankStats) -> None:
+        """Log the timings and counts of one reranked search."""
+        logger.info("embedding.rerank_search", storage_mode=self.storage_mode, **stats.to_dict())
+
+    def _plan_search_many(
+        self, query_texts: list[str], limit: int, similarity_threshold: float
+    ) -> tuple[list[str], list[list[dict[str, Any]] | None], list[int]]:
+        """Look up similarity_search_many queries in the result cache.
+
+        Returns:
+            (cache key per query, cached results per query (None for misses),
+            indexes of the queries to run)
+        """
+        cache = get_search_result_cache()
+        keys = [self._search_cache_key(q, limit, similarity_threshold) for q in query_texts]
+        results = [cache.get(key) for key in keys]
+        return keys, results, [i for i, cached in enumerate(results) if cached is None]
+
+    def _query_embeddings(self, items: list[EmbeddingBatchItem]) -> list[list[float]]:
+        """Unwrap batched query embeddings.
+
+        Raises:
+            EmbeddingError: If any query could not be embedded
+        """
+        embeddings: list[list[float]] = []
+        for item in items:
+            if item.embedding is None:
+                raise EmbeddingError(f"Failed to embed query {item.index}: {item.error}")
+            embeddings.append(item.embedding)
+        return embeddings
+
+    def _finish_search_many(
+        self,
+        keys: list[str],
+        results: list[list[dict[str, Any]] | None],
+        pending: list[int],
+        found: list[list[dict[str, Any]] | None],
+        rpc_queries: int,
+        similarity_threshold: float,
+    ) -> list[list[dict[str, Any]]]:
+        """Fill in and cache the queries that ran, then log the call."""
+        cache = get_search_result_cache()
+        for j, i in enumerate(pending):
+            results[i] = found[j] or []
+            cache.set(keys[i], results[i])  # type: ignore[arg-type]
+
+        logger.info(
+            "embedding.search_many",
+            queries=len(keys),
+            cache_hits=len(keys) - len(pending),
+            rpc_queries=rpc_queries,
+            threshold=similarity_threshold,
+        )
+        return results  # type: ignore[return-value]
+
+    def _log_hybrid_search(
+        self,
+        query_text: str,
+        results: list[dict[str, Any]],
+        full_text_weight: float,
+        semantic_weight: float,
+    ) -> None:
+        """Log one hybrid search."""
+        logger.info(
+            "embedding.hybrid_search",
+            query_length=len(query_text),
+            results_count=len(results),
+            full_text_weight=full_text_weight,
+            semantic_weight=semantic_weight,
+        )
+
+
+class EmbeddingService(EmbeddingValidationMixin):
+    """Service for vector embeddings and similarity search.
+
+    Singleton service that manages OpenAI embeddings and pgvector similarity search.
+    Uses text-embedding-ada-002 model (1536 dimensions) by default.
+
+    CRITICAL: EMBEDDING_MODEL / EMBEDDING_DIMENSIONS must match the
+    places_embeddings.embedding column (vector(1536) as created by migration 004).
+
+    Changing models (e.g., text-embedding-3-small) requires re-embedding ALL rows:
+    `python manage.py reembed_places --model text-embedding-3-small --dimensions 1536`
+    writes a shadow table with checkpoints, then swaps the column and rebuilds the
+    vector indexes atomically. Dimensions must stay at the column size. Update
+    EMBEDDING_MODEL when the swap completes.
+
+    Index storage mode (full, halfvec, binary) is configurable via
+    configure_storage() or EMBEDDING_STORAGE_MODE / EMBEDDING_RERANK_OVERSAMPLE.
+
+    Beta Status: This service has NO backwards compatibility.
+    All methods raise exceptions on failure (no silent False/[] returns).
+    """
+
+    _instance = None
+
+    def __new__(cls) -> "EmbeddingService":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_initialized"):
+            return
+
+        self.openai_client = get_openai_client()
+        self.supabase = SupabaseService()
+        settings = get_settings()
+        self.embedding_model = settings.embedding_model  # Must match places_embeddings column
+        self.embedding_dimensions = settings.embedding_dimensions
+
+        self.embedding_cache = EmbeddingCache(self.supabase)
+
+        self.configure_storage(
+            settings.embedding_storage_mode, settings.embedding_rerank_oversample
+        )
+        self.configure_exact_rerank(
+            settings.embedding_exact_rerank_oversample, settings.embedding_candidate_probes
+        )
+
+        self.local_index = get_local_index()
+
+        self._initialized = True
+
+    def enable_local_index(self, snapshot_dir: Path, poll_seconds: float | None = None) -> bool:
+        """Serve similarity_search from an in-process index instead of the RPC.
+
+        Args:
+            snapshot_dir: Directory written by `manage.py build_vector_snapshot`
+            poll_seconds: Poll places_embeddings for changed rows this often
+                (None = no background sync)
+
+        Returns:
+            True if the snapshot loaded. On failure the RPC stays in use.
+
+        Note: Only this service instance switches; the settings-driven index
+        (get_local_index) is what the async service shares.
+        """
+        index = open_local_index(
+            snapshot_dir, self.embedding_dimensions, poll_seconds, self.supabase.client
+        )
+        if index is None:
+            return False
+
+        self.local_index = index
+        return True
+
+    def _ensure_pgvector_ready(self) -> None:
+        """Lazy validation of pgvector on first use (not in __init__).
+
+        Validates that:
+        - pgvector extension is installed
+        - search_places_by_similarity() RPC function exists
+        - Supabase connection is working
+
+        Raises:
+            EmbeddingError: If pgvector is not available or RPC function is missing
+
+        Note: Validation happens on first real use to avoid:
+        - Test collection failures
+        - Unnecessary RPC calls during fixture setup
+        - CI/CD failures without local Supabase
+        """
+        if hasattr(self, "_pgvector_validated"):
+            return
+
+        try:
+            self.supabase.client.rpc(
+                "app_embeddings.search_places_by_similarity", self._pgvector_probe()
+            ).execute()
+
+            logger.info("embedding.pgvector_validated", function="search_places_by_similarity")
+            self._pgvector_validated = True
+
+        except Exception as e:
+            raise self._pgvector_unavailable(e) from e
+
     def generate_embedding(self, text: str) -> list[float]:
         """Generate embedding vector for text.
 
         Args:
-            text: Text to embed (non-empty, ≤8000 chars after whitespace normalization)
+            text: Text to embed (non-empty, ≤8191 tokens after whitespace normalization)
 
         Returns:
             Embedding vector (1536 dimensions for ada-002)
@@ -206,50 +1093,84 @@ class EmbeddingService:
             EmbeddingError: If OpenAI API call fails or dimension mismatch
 
         Note: text.strip() normalizes whitespace BEFORE length validation and embedding.
+        Results are cached by hash of model + normalized text (memory LRU, then
+        app_embeddings.embedding_cache), so repeated inputs skip the OpenAI call.
         OpenAI ada-002 token limit is ~8191 tokens (~32k chars), but shorter
         text produces better semantic embeddings.
         """
         self._ensure_pgvector_ready()
 
-        if not text or not text.strip():
-            raise ValueError("Text must be non-empty for embedding generation")
-
-        text = text.strip()
+        text = self._validate_text(text)
 
-        if len(text) > MAX_TEXT_LENGTH:
-            raise ValueError(
-                f"Text too long ({len(text)} chars). Maximum {MAX_TEXT_LENGTH} chars. "
-                "Consider summarizing or splitting the text."
-            )
+        cached = self.embedding_cache.get_many(self.cache_model, [text])
+        if cached:
+            return next(iter(cached.values()))
 
         try:
-            response = self.openai_client.embeddings.create(model=self.embedding_model, input=text)
+            response = self.openai_client.embeddings.create(**self._embedding_request(), input=text)
+            embedding = self._checked_embedding(text, response)
+        except Exception as e:
+            raise self._failure("generate", e) from e
 
-            embedding = response.data[0].embedding
+        self.embedding_cache.put_many(self.cache_model, {text: embedding})
+        return embedding
 
-            if len(embedding) != self.embedding_dimensions:
-                raise EmbeddingError(
-                    f"Dimension mismatch: Expected {self.embedding_dimensions}, "
-                    f"got {len(embedding)}. Model may have changed."
-                )
+    def generate_embeddings(self, texts: list[str]) -> list[EmbeddingBatchItem]:
+        """Generate embeddings for many texts with multi-input OpenAI requests.
 
-            logger.info(
-                "embedding.generated",
-                text_length=len(text),
-                dimensions=len(embedding),
-                model=self.embedding_model,
-            )
+        Inputs are packed into requests of at most MAX_BATCH_ITEMS items and
+        MAX_BATCH_TOKENS tokens. Each returned row is dimension-checked.
 
-            return embedding
+        Args:
+            texts: Texts to embed (same rules as generate_embedding)
 
-        except ValueError:
-            raise
+        Returns:
+            One EmbeddingBatchItem per input, in input order. Invalid inputs and
+            inputs whose request failed carry an error instead of an embedding.
+
+        Raises:
+            EmbeddingError: If pgvector validation fails
+
+        Note: Inputs already in the embedding cache are not sent to OpenAI.
+        A multi-input request rejected for its input (400/422) is retried one
+        input at a time so a single bad input does not fail its whole batch;
+        rate limits and server errors retry the whole batch with backoff.
+        """
+        self._ensure_pgvector_ready()
+
+        items, pending = self._plan_embeddings(texts)
+        cached = self.embedding_cache.get_many(self.cache_model, [t for _, t in pending])
+        misses = self._apply_cached(pending, cached, items)
+
+        for batch in self._pack_batches(misses):
+            self._embed_batch(batch, items)
+
+        self.embedding_cache.put_many(
+            self.cache_model, self._finish_embeddings(items, pending, misses)
+        )
+        return items
+
+    def _embed_batch(
+        self, batch: list[tuple[int, str]], items: list[EmbeddingBatchItem], attempt: int = 0
+    ) -> None:
+        """Embed one packed batch, writing results into items by input index.
+
+        Failed requests are retried or split as _plan_batch_retry decides.
+        """
+        try:
+            response = self.openai_client.embeddings.create(
+                **self._embedding_request(), input=[text for _, text in batch]
+            )
+            rows = self._batch_rows(batch, response)
         except Exception as e:
-            logger.error("embedding.generate_error", error=str(e), exc_info=True)
-            raise EmbeddingError(
-                f"Failed to generate embedding: {str(e)}. "
-                "Check OpenAI API key, rate limits, and network connectivity."
-            ) from e
+            retry = self._plan_batch_retry(batch, items, e, attempt)
+            if retry.delay:
+                time.sleep(retry.delay)
+            for follow_up, next_attempt in retry.requests:
+                self._embed_batch(follow_up, items, next_attempt)
+            return
+
+        self._apply_batch_rows(batch, rows, items)
 
     def store_place_embedding(
         self,
@@ -278,42 +1199,58 @@ class EmbeddingService:
             ...     metadata={"name": "Secret Cave", "location": "Pikeville, KY"}
             ... )
         """
-        valid_sources = {"serp", "reddit", "eventbrite"}
-        if source not in valid_sources:
-            raise ValueError(f"Invalid source '{source}'. Must be one of {valid_sources}")
+        source_id = self.validate_place(source, source_id, metadata)
 
-        if not source_id or not source_id.strip():
-            raise ValueError("source_id must be non-empty")
+        embedding = self.generate_embedding(text)
+        row = self._place_row(source, source_id, embedding, metadata)
 
-        source_id = source_id.strip()
-        self._validate_source_id(source, source_id)
-        self._validate_metadata(metadata)
+        try:
+            self.supabase.client.table("app_embeddings.places_embeddings").upsert(row).execute()
+        except Exception as e:
+            raise self._failure("store", e) from e
 
-        embedding = self.generate_embedding(text)
+        self._stored(source, source_id, metadata)
 
-        data = {
-            "source": source,
-            "source_id": source_id,
-            "embedding": embedding,
-            "metadata": metadata,
-        }
+    def store_place_embeddings(
+        self, places: list[dict[str, Any]], overwrite: bool = True
+    ) -> list[EmbeddingBatchItem]:
+        """Generate and store many place embeddings with a single upsert.
 
-        try:
-            self.supabase.client.table("app_embeddings.places_embeddings").upsert(data).execute()  # type: ignore[arg-type]
+        Args:
+            places: Dicts with source, source_id, text and metadata keys
+                (same rules as store_place_embedding)
+            overwrite: Replace existing (source, source_id) rows; False inserts
+                new rows only (ON CONFLICT DO NOTHING)
 
-            logger.info(
-                "embedding.stored",
-                source=source,
-                source_id=source_id,
-                metadata_keys=list(metadata.keys()),
-            )
+        Returns:
+            One EmbeddingBatchItem per input, in input order. Rows that failed
+            validation or embedding carry an error and are not stored.
+
+        Raises:
+            EmbeddingError: If the bulk upsert fails
 
+        Note: Rows are upserted on (source, source_id); when the same pair
+        appears more than once in a call, the last occurrence wins.
+        """
+        items = [EmbeddingBatchItem(index=i) for i in range(len(places))]
+        valid = self._validate_places(places, items)
+        generated = self.generate_embeddings([text for _, _, text in valid])
+        rows = self._collect_place_rows(places, valid, generated, items)
+
+        if not rows:
+            return items
+
+        try:
+            self.supabase.client.table("app_embeddings.places_embeddings").upsert(
+                list(rows.values()),
+                on_conflict="source,source_id",
+                ignore_duplicates=not overwrite,
+            ).execute()
         except Exception as e:
-            logger.error("embedding.store_error", error=str(e), exc_info=True)
-            raise EmbeddingError(
-                f"Failed to store embedding: {str(e)}. "
-                "Check Supabase connection, RLS policies, and table schema."
-            ) from e
+            raise self._failure("bulk_store", e) from e
+
+        self._bulk_stored(len(rows), items)
+        return items
 
     def similarity_search(
         self,
@@ -331,6 +1268,13 @@ class EmbeddingService:
         Returns:
             List of matching places with metadata and similarity scores.
             Empty list means "no matches above threshold".
+            Similarity is always computed on full-precision vectors, including
+            in halfvec/binary storage modes (quantized index only picks candidates).
+            When a local index is enabled it answers first; the RPC is the fallback.
+            With exact rerank enabled (configure_exact_rerank) the RPC step fetches
+            oversampled candidates and reranks them in NumPy.
+            Repeated searches are served from the result cache until embeddings
+            are stored (see search_result_cache).
 
         Raises:
             ValueError: If parameters are invalid
@@ -342,48 +1286,237 @@ class EmbeddingService:
             ...     print(f"{r['metadata']['name']}: {r['similarity']:.2f}")
         """
         self._ensure_pgvector_ready()
+        self._validate_search_params(query_text, limit, similarity_threshold)
 
-        if not query_text or not query_text.strip():
-            raise ValueError("query_text must be non-empty")
+        cache_key = self._search_cache_key(query_text, limit, similarity_threshold)
+        cached = self._cached_search(query_text, cache_key)
+        if cached is not None:
+            return cached
 
-        if not 1 <= limit <= 100:
-            raise ValueError(f"limit must be between 1 and 100, got {limit}")
+        try:
+            query_embedding = self.generate_embedding(query_text)
 
-        if not 0 <= similarity_threshold <= 1:
-            raise ValueError(
-                f"similarity_threshold must be between 0 and 1, got {similarity_threshold}"
+            results = self._local_search(query_embedding, limit, similarity_threshold)
+            backend = "local"
+
+            if results is None:
+                if self.exact_rerank_oversample:
+                    results, _ = self._rerank_search(
+                        query_embedding, limit, similarity_threshold, self.exact_rerank_oversample
+                    )
+                    backend = f"{self.storage_mode}+rerank"
+                else:
+                    function, params = self._search_rpc(
+                        query_embedding, limit, similarity_threshold
+                    )
+                    response = self.supabase.client.rpc(function, params).execute()
+                    results = response_rows(response.data)
+                    backend = self.storage_mode
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise self._failure("search", e) from e
+
+        return self._finish_search(query_text, cache_key, results, similarity_threshold, backend)
+
+    def similarity_search_reranked(
+        self,
+        query_text: str,
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        oversample: int | None = None,
+    ) -> tuple[list[dict[str, Any]], RerankStats | None]:
+        """Two-stage search: oversampled approximate candidates, exact NumPy rerank.
+
+        Args:
+            query_text: Search query (same rules as similarity_search)
+            limit: Maximum results to return (1-100)
+            similarity_threshold: Minimum similarity score (0-1, cosine similarity)
+            oversample: Candidates per result (default: configured value, else
+                DEFAULT_EXACT_RERANK_OVERSAMPLE)
+
+        Returns:
+            (results shaped like similarity_search, rerank stats). Stats are
+            None when the results came from the result cache.
+
+        Raises:
+            ValueError: If parameters are invalid
+            EmbeddingError: If search fails
+        """
+        self._ensure_pgvector_ready()
+        self._validate_search_params(query_text, limit, similarity_threshold)
+        oversample = self._rerank_oversample(oversample)
+
+        cache_key = self._search_cache_key(query_text, limit, similarity_threshold, oversample)
+        cached = get_search_result_cache().get(cache_key)
+        if cached is not None:
+            return cached, None
+
+        try:
+            query_embedding = self.generate_embedding(query_text)
+            results, stats = self._rerank_search(
+                query_embedding, limit, similarity_threshold, oversample
             )
+        except ValueError:
+            raise
+        except Exception as e:
+            raise self._failure("rerank_search", e) from e
+
+        get_search_result_cache().set(cache_key, results)
+        return results, stats
+
+    def _rerank_search(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        similarity_threshold: float,
+        oversample: int,
+    ) -> tuple[list[dict[str, Any]], RerankStats]:
+        """Fetch candidates with their vectors and rerank them exactly."""
+        started = time.perf_counter()
+        response = self.supabase.client.rpc(
+            "app_embeddings.search_places_candidates",
+            self._candidate_params(query_embedding, limit, oversample),
+        ).execute()
+        candidate_ms = (time.perf_counter() - started) * 1000
+
+        results, stats = rerank_candidates(
+            query_embedding, response_rows(response.data), limit, similarity_threshold, candidate_ms
+        )
+        self._log_rerank(stats)
+        return results, stats
+
+    def similarity_search_many(
+        self,
+        query_texts: list[str],
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+    ) -> list[list[dict[str, Any]]]:
+        """Run several similarity searches with one embedding request and one RPC.
+
+        Args:
+            query_texts: Search queries (1-MAX_BATCH_QUERIES, same rules as similarity_search)
+            limit: Maximum results per query (1-100)
+            similarity_threshold: Minimum similarity score (0-1, cosine similarity)
+
+        Returns:
+            One result list per query, in input order, each shaped like
+            similarity_search results. Cached queries are not re-run.
+
+        Raises:
+            ValueError: If parameters are invalid
+            EmbeddingError: If embedding any query or the search fails
+
+        Note: The batch RPC scans the full-precision index regardless of
+        storage_mode. Queries the local index can answer skip the RPC.
+        """
+        self._ensure_pgvector_ready()
+        self._validate_batch_queries(query_texts, limit, similarity_threshold)
+
+        keys, results, pending = self._plan_search_many(query_texts, limit, similarity_threshold)
+        found: list[list[dict[str, Any]] | None] = []
+        remote: list[int] = []
+
+        if pending:
+            items = self.generate_embeddings([query_texts[i] for i in pending])
+            embeddings = self._query_embeddings(items)
+            found, remote = self._local_search_many(embeddings, limit, similarity_threshold)
+
+        if remote:
+            try:
+                response = self.supabase.client.rpc(
+                    "app_embeddings.search_places_by_similarity_many",
+                    self._many_params([embeddings[j] for j in remote], limit, similarity_threshold),
+                ).execute()
+            except Exception as e:
+                raise self._failure("search_many", e) from e
+
+            grouped = self._group_by_query(response_rows(response.data), len(remote))
+            for j, rows in zip(remote, grouped, strict=True):
+                found[j] = rows
+
+        return self._finish_search_many(
+            keys, results, pending, found, len(remote), similarity_threshold
+        )
+
+    def hybrid_search(
+        self,
+        query_text: str,
+        limit: int = 10,
+        full_text_weight: float = 1.0,
+        semantic_weight: float = 1.0,
+    ) -> list[dict[str, Any]]:
+        """Search places by full-text and vector similarity fused with RRF.
+
+        Exact names and rare tokens ("catacombs", a venue name) are found by the
+        full-text list even when their embeddings rank low, so callers do not
+        need to over-fetch from similarity_search.
+
+        Args:
+            query_text: Search query (non-empty; used for both lists)
+            limit: Maximum results to return (1-100)
+            full_text_weight: RRF weight of the full-text ranking
+            semantic_weight: RRF weight of the vector ranking
+
+        Returns:
+            Places ordered by rrf_score, each with metadata, similarity
+            (cosine), text_rank (0 when only the vector list matched) and rrf_score
+
+        Raises:
+            ValueError: If parameters are invalid
+            EmbeddingError: If search fails
+
+        Example:
+            >>> results = service.hybrid_search("paris catacombs tour", limit=5)
+            >>> results[0]["metadata"]["name"]
+            'Catacombes de Paris'
+        """
+        self._ensure_pgvector_ready()
+        self._validate_search_params(query_text, limit, 0.0)
+        self._validate_hybrid_weights(full_text_weight, semantic_weight)
 
         try:
             query_embedding = self.generate_embedding(query_text)
 
             response = self.supabase.client.rpc(
-                "app_embeddings.search_places_by_similarity",
-                {
-                    "query_embedding": query_embedding,
-                    "match_threshold": similarity_threshold,
-                    "match_count": limit,
-                },
+                "app_embeddings.search_places_hybrid",
+                self._hybrid_params(
+                    query_text, query_embedding, limit, full_text_weight, semantic_weight
+                ),
             ).execute()
+            results = response_rows(response.data)
 
-            results = response.data or []
+        except ValueError:
+            raise
+        except Exception as e:
+            raise self._failure("hybrid_search", e) from e
 
-            logger.info(
-                "embedding.search",
-                query_length=len(query_text),
-                results_count=len(results),  # type: ignore[arg-type]
-                threshold=similarity_threshold,
-            )
+        self._log_hybrid_search(query_text, results, full_text_weight, semantic_weight)
+        return results
 
-            return results  # type: ignore[return-value]
+    def get_index_stats(self) -> list[dict[str, Any]]:
+        """Report on-disk size of each vector index on places_embeddings.
+
+        Returns:
+            One row per index (index_name, index_method, index_size_bytes,
+            index_size_pretty, table_rows). Used to compare full, halfvec and
+            binary index footprints alongside recall measurements.
+
+        Raises:
+            EmbeddingError: If the monitoring RPC fails
+        """
+        try:
+            response = self.supabase.client.rpc(
+                "app_monitoring.get_embedding_index_stats", {}
+            ).execute()
+            return response.data or []  # type: ignore[return-value]
 
-        except ValueError:
-            raise
         except Exception as e:
-            logger.error("embedding.search_error", error=str(e), exc_info=True)
+            logger.error("embedding.index_stats_error", error=str(e), exc_info=True)
             raise EmbeddingError(
-                f"Similarity search failed: {str(e)}. "
-                "Check pgvector availability, RPC function exists, and network connectivity."
+                f"Failed to read embedding index stats: {str(e)}. "
+                "Ensure migration 009_quantized_embeddings.sql has been applied."
             ) from e
 
 
@@ -0,0 +1,101 @@
+"""Build the text embedded for a place.
+
+One compact line per place: "name - description | location | place type".
+Empty and repeated fields are dropped and only the description is truncated,
+so the identifying fields always survive the token budget.
+
+The place type comes from metadata ("place_type", or an imported "category").
+SearchResult.category is the per-query ranking bucket (primary/nearby), not a
+property of the place, so it is never embedded; neither are those bucket
+values when older indexed metadata carries them.
+"""
+
+import re
+from collections.abc import Mapping
+from typing import Any
+
+from chat.config.settings import get_settings
+from chat.schemas import SearchResult
+from chat.utils.tokenizer import count_tokens, truncate_to_tokens
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+FIELD_SEPARATOR = " | "
+PLACE_TYPE_FIELDS = ("place_type", "category")
+RANKING_CATEGORIES = frozenset({"primary", "nearby"})  # SearchResult.category values
+
+
+def _clean(value: Any) -> str:
+    return WHITESPACE_PATTERN.sub(" ", str(value or "")).strip()
+
+
+def _place_type(metadata: Mapping[str, Any]) -> str:
+    """First place-type field that is not a ranking bucket."""
+    for key in PLACE_TYPE_FIELDS:
+        value = _clean(metadata.get(key))
+        if value and value.lower() not in RANKING_CATEGORIES:
+            return value
+    return ""
+
+
+def _place_fields(place: SearchResult | Mapping[str, Any]) -> tuple[str, str, str, str]:
+    """Extract (name, description, location, place type) from a result or metadata dict."""
+    if isinstance(place, SearchResult):
+        metadata = place.metadata or {}
+        return (
+            _clean(place.name),
+            _clean(place.description),
+            _clean(metadata.get("location")),
+            _place_type(metadata),
+        )
+
+    return (
+        _clean(place.get("name")),
+        _clean(place.get("description")),
+        _clean(place.get("location")),
+        _place_type(place),
+    )
+
+
+def build_embedding_text(
+    place: SearchResult | Mapping[str, Any],
+    max_tokens: int | None = None,
+    model: str | None = None,
+    location: str | None = None,
+) -> str:
+    """Build embedding input for a place within a token budget.
+
+    Args:
+        place: SearchResult or place metadata dict (name, description,
+            location, place_type)
+        max_tokens: Token budget (default: settings.embedding_text_max_tokens)
+        model: Model whose tokenizer counts the budget (default: settings.embedding_model)
+        location: Search location the place was found for; overrides the
+            place's own metadata location (live results rarely carry one)
+
+    Returns:
+        Embedding text, or "" if the place has no name or description
+    """
+    settings = get_settings()
+    max_tokens = settings.embedding_text_max_tokens if max_tokens is None else max_tokens
+    model = model or settings.embedding_model
+
+    name, description, place_location, place_type = _place_fields(place)
+    location_text = _clean(location) or place_location
+    lowered = f"{name} {description}".lower()
+    context = FIELD_SEPARATOR.join(
+        field for field in (location_text, place_type) if field and field.lower() not in lowered
+    )
+    suffix = f"{FIELD_SEPARATOR}{context}" if context else ""
+
+    if not name and not description:
+        return ""
+
+    head = f"{name} - " if name and description else name
+    fixed_tokens = count_tokens(f"{head}{suffix}", model)
+
+    if description and fixed_tokens < max_tokens:
+        truncated = truncate_to_tokens(description, max_tokens - fixed_tokens, model)
+        if truncated:
+            return f"{head}{truncated}{suffix}"
+
+    return truncate_to_tokens(f"{name or description}{suffix}", max_tokens, model)
@@ -51,6 +51,7 @@ async def search_local_events(location: str, keywords: list[str]) -> list[Search
                     source="eventbrite",
                     url=event.get("url"),
                     metadata={
+                        "event_id": event.get("id"),
                         "start": event.get("start", {}).get("local"),
                         "venue": event.get("venue", {}).get("name"),
                     },
@@ -0,0 +1,116 @@
+"""Exact cosine rerank of approximate pgvector candidates in NumPy.
+
+search_places_candidates() (migration 014) returns N x k candidates from the
+ivfflat scan with their full-precision vectors. They are decoded into one
+float32 matrix and scored against the query with a single matrix-vector
+product, so recall lost by the index scan (low probes, quantized index) is
+recovered without raising match_count in SQL.
+"""
+
+import base64
+import struct
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+
+from chat.services.vector_index import normalize_rows
+
+DEFAULT_EXACT_RERANK_OVERSAMPLE = 4
+MAX_RERANK_CANDIDATES = 1000  # Matches candidate_count cap in search_places_candidates()
+PGVECTOR_HEADER = struct.Struct(">HH")  # dimensions, unused
+
+
+@dataclass
+class RerankStats:
+    """Diagnostics for one two-stage search (reported in search debug info).
+
+    approx_recall is the share of the exact top-k that the approximate scan
+    already ranked in its own top-k: 1.0 means the rerank changed nothing,
+    lower values are results single-stage search would have missed.
+    """
+
+    candidates: int
+    returned: int
+    approx_recall: float
+    candidate_ms: float
+    rerank_ms: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def decode_pgvector(value: str) -> np.ndarray:
+    """Decode base64 pgvector binary (vector_send) into float32.
+
+    Raises:
+        ValueError: If the payload is truncated
+    """
+    raw = base64.b64decode(value)
+    dimensions, _ = PGVECTOR_HEADER.unpack_from(raw)
+    if len(raw) != PGVECTOR_HEADER.size + 4 * dimensions:
+        raise ValueError(f"Truncated pgvector payload: {len(raw)} bytes for {dimensions} dims")
+    return np.frombuffer(raw, dtype=">f4", offset=PGVECTOR_HEADER.size).astype(np.float32)
+
+
+def rerank_candidates(
+    query_embedding: list[float],
+    candidates: list[dict[str, Any]],
+    limit: int,
+    similarity_threshold: float,
+    candidate_ms: float = 0.0,
+) -> tuple[list[dict[str, Any]], RerankStats]:
+    """Order candidates by exact cosine similarity and keep the top limit.
+
+    Args:
+        query_embedding: Query vector
+        candidates: search_places_candidates() rows (embedding_b64, candidate_rank)
+        limit: Results to keep
+        similarity_threshold: Exclusive minimum similarity (as in the SQL RPCs)
+        candidate_ms: Candidate RPC latency, copied into the stats
+
+    Returns:
+        (rows shaped like search_places_by_similarity results, stats)
+
+    Raises:
+        ValueError: If a candidate vector does not match the query dimensions
+    """
+    started = time.perf_counter()
+
+    if not candidates:
+        return [], RerankStats(0, 0, 1.0, round(candidate_ms, 2), 0.0)
+
+    matrix = normalize_rows(np.vstack([decode_pgvector(c["embedding_b64"]) for c in candidates]))
+    query = np.asarray(query_embedding, dtype=np.float32)
+    if matrix.shape[1] != query.shape[0]:
+        raise ValueError(
+            f"Candidate vectors have {matrix.shape[1]} dimensions, query has {query.shape[0]}"
+        )
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+
+    similarities = matrix @ query
+    top = np.argsort(-similarities, kind="stable")[:limit]
+    order = top[similarities[top] > similarity_threshold]
+
+    results = [
+        {
+            "id": candidates[i]["id"],
+            "source": candidates[i]["source"],
+            "source_id": candidates[i]["source_id"],
+            "metadata": candidates[i]["metadata"],
+            "similarity": float(similarities[i]),
+        }
+        for i in order
+    ]
+
+    exact_top = {int(i) for i in top}
+    approx_top = {i for i, c in enumerate(candidates) if c["candidate_rank"] <= limit}
+    stats = RerankStats(
+        candidates=len(candidates),
+        returned=len(results),
+        approx_recall=round(len(exact_top & approx_top) / len(exact_top), 4),
+        candidate_ms=round(candidate_ms, 2),
+        rerank_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+    return results, stats
@@ -0,0 +1,232 @@
+"""Streaming bulk import of external place datasets into places_embeddings.
+
+Records are read lazily from JSONL or CSV, validated with the same rules as
+EmbeddingService, deduplicated on (source, source_id), embedded in batches
+and inserted with one multi-row INSERT ... ON CONFLICT DO NOTHING per batch.
+Memory stays bounded by the batch size plus a fixed-size LRU of recently
+seen keys, independent of file size.
+
+Record shape (JSONL object or CSV row):
+    source, source_id, name, description, url, location, category, text, metadata
+
+`metadata` may be an object (JSONL) or a JSON string (CSV); the flat fields
+are merged into it. `text` defaults to build_embedding_text(metadata).
+"""
+
+import csv
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from chat.services.embedding_service import EmbeddingError, EmbeddingService
+from chat.services.embedding_text import build_embedding_text
+from chat.services.supabase_service import response_rows
+from chat.utils.logger import get_logger
+from chat.utils.memory_cache import MemoryCache
+
+logger = get_logger(__name__)
+
+IMPORT_BATCH_SIZE = 256
+IMPORT_SEEN_CACHE_SIZE = 100_000  # Recent keys kept for in-file dedupe (~10 MB)
+METADATA_FIELDS = ("name", "description", "url", "location", "category")
+IMPORT_FORMATS = ("jsonl", "csv")
+
+
+@dataclass
+class ImportStats:
+    """Running counters for an import."""
+
+    read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    existing: int = 0
+    invalid: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+
+def iter_records(path: Path, file_format: str | None = None) -> Iterator[dict[str, Any]]:
+    """Yield raw records one at a time.
+
+    Args:
+        path: JSONL or CSV file
+        file_format: "jsonl" or "csv" (default: from the file extension)
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    file_format = file_format or path.suffix.lstrip(".").lower()
+    if file_format == "json":
+        file_format = "jsonl"
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format '{file_format}'. Use one of {IMPORT_FORMATS}")
+
+    with path.open(newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+            return
+
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"_error": f"line {line_number}: invalid JSON ({e.msg})"}
+
+
+def normalize_record(raw: dict[str, Any], default_source: str | None = None) -> dict[str, Any]:
+    """Convert a raw JSONL/CSV record to the store_place_embeddings shape.
+
+    Raises:
+        ValueError: If the record cannot be parsed
+    """
+    if "_error" in raw:
+        raise ValueError(raw["_error"])
+
+    metadata = raw.get("metadata") or {}
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"metadata is not valid JSON ({e.msg})") from e
+    if not isinstance(metadata, dict):
+        raise ValueError("metadata must be an object")
+
+    metadata = {**metadata, **{k: raw[k] for k in METADATA_FIELDS if raw.get(k)}}
+
+    return {
+        "source": str(raw.get("source") or default_source or ""),
+        "source_id": str(raw.get("source_id") or ""),
+        "text": raw.get("text") or build_embedding_text(metadata),
+        "metadata": metadata,
+    }
+
+
+def _chunks(records: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    chunk: list[dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class PlaceImporter:
+    """Validate, dedupe, embed and bulk-insert place records in batches."""
+
+    def __init__(
+        self,
+        service: EmbeddingService,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        seen_cache_size: int = IMPORT_SEEN_CACHE_SIZE,
+        default_source: str | None = None,
+    ) -> None:
+        self.service = service
+        self.batch_size = batch_size
+        self.default_source = default_source
+        self._seen: MemoryCache[bool] = MemoryCache(seen_cache_size)
+
+    def run(
+        self,
+        records: Iterable[dict[str, Any]],
+        on_progress: Callable[[ImportStats], None] | None = None,
+    ) -> ImportStats:
+        """Import records, reporting progress after each batch.
+
+        Args:
+            records: Raw records (e.g. from iter_records)
+            on_progress: Called with running stats after every batch
+
+        Returns:
+            Final stats
+        """
+        stats = ImportStats()
+
+        for chunk in _chunks(records, self.batch_size):
+            stats.read += len(chunk)
+            self._import_batch(chunk, stats)
+            if on_progress is not None:
+                on_progress(stats)
+
+        logger.info(
+            "import.complete",
+            read=stats.read,
+            imported=stats.imported,
+            duplicates=stats.duplicates,
+            existing=stats.existing,
+            invalid=stats.invalid,
+            failed=stats.failed,
+        )
+        return stats
+
+    def _import_batch(self, chunk: list[dict[str, Any]], stats: ImportStats) -> None:
+        places: dict[str, dict[str, Any]] = {}
+
+        for raw in chunk:
+            try:
+                place = normalize_record(raw, self.default_source)
+                place["source_id"] = self.service.validate_place(
+                    place["source"], place["source_id"], place["metadata"]
+                )
+            except (ValueError, EmbeddingError) as e:
+                stats.invalid += 1
+                logger.debug("import.invalid_record", error=str(e))
+                continue
+
+            key = f"{place['source']}:{place['source_id']}"
+            if self._seen.get(key):
+                stats.duplicates += 1  # Handled by an earlier batch
+                continue
+            if key in places:
+                stats.duplicates += 1
+            places[key] = place  # Last occurrence in a batch wins
+
+        existing = self._existing_keys(list(places.values()))
+        stats.existing += len(existing)
+        fresh = [place for key, place in places.items() if key not in existing]
+
+        for key in places:
+            self._seen.set(key, True)
+
+        if not fresh:
+            return
+
+        try:
+            items = self.service.store_place_embeddings(fresh, overwrite=False)
+        except EmbeddingError as e:
+            stats.failed += len(fresh)
+            logger.error("import.batch_failed", error=str(e), size=len(fresh))
+            return
+
+        stats.imported += sum(1 for item in items if item.ok)
+        stats.failed += sum(1 for item in items if not item.ok)
+
+    def _existing_keys(self, places: list[dict[str, Any]]) -> set[str]:
+        """Keys already in places_embeddings (skipped before paying for embeddings)."""
+        if not places:
+            return set()
+
+        try:
+            response = (
+                self.service.supabase.client.table("app_embeddings.places_embeddings")
+                .select("source,source_id")
+                .in_("source_id", sorted({p["source_id"] for p in places}))
+                .execute()
+            )
+        except Exception as e:
+            # ON CONFLICT DO NOTHING still prevents duplicates; only embedding cost is lost
+            logger.warning("import.existing_lookup_failed", error=str(e))
+            return set()
+
+        return {f"{row['source']}:{row['source_id']}" for row in response_rows(response.data)}
@@ -0,0 +1,394 @@
+"""Recall/latency benchmark for pgvector index parameters.
+
+Runs against a disposable Postgres with pgvector (never the Supabase project):
+
+1. Synthetic 1536-d embeddings are generated in deterministic blocks from a
+   skewed mixture of clusters, which is what real text embeddings look like
+   to an ivfflat index (uniform random vectors make every index look bad)
+2. Rows are streamed into an unlogged table with binary COPY while exact
+   top-k neighbours of the query set are tracked in NumPy, so the full matrix
+   is never held in memory
+3. At each scale every index configuration is built and every search setting
+   (ivfflat.probes / hnsw.ef_search) is timed query by query
+
+recall@k is measured against the exact NumPy neighbours. Scales are loaded
+incrementally: a larger scale is a superset of the smaller ones.
+"""
+
+import struct
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+
+from chat.services.vector_index import normalize_rows
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BENCH_SCHEMA = "vector_bench"
+BENCH_TABLE = f"{BENCH_SCHEMA}.embeddings"
+BENCH_DIMENSIONS = 1536
+BENCH_BLOCK_ROWS = 5_000  # Generation/COPY unit; also the seed granularity
+DEFAULT_CLUSTERS = 256
+DEFAULT_CLUSTER_SPREAD = 0.5  # Noise norm relative to the unit cluster centre
+DEFAULT_QUERIES = 200
+DEFAULT_K = 10
+DEFAULT_WARMUP_QUERIES = 10
+QUERY_STREAM = 2**31 - 1  # Block index reserved for the query set
+
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+
+
+@dataclass(frozen=True)
+class IndexConfig:
+    """One index to build: ivfflat, hnsw, or exact (no index, sequential scan)."""
+
+    kind: str
+    lists: int | None = None
+    m: int | None = None
+    ef_construction: int | None = None
+
+    @property
+    def label(self) -> str:
+        if self.kind == "ivfflat":
+            return f"ivfflat(lists={self.lists})"
+        if self.kind == "hnsw":
+            return f"hnsw(m={self.m},ef_construction={self.ef_construction})"
+        return "exact"
+
+    @property
+    def search_setting(self) -> str | None:
+        """GUC swept at query time for this index kind."""
+        return {"ivfflat": "ivfflat.probes", "hnsw": "hnsw.ef_search"}.get(self.kind)
+
+    def create_sql(self) -> str | None:
+        """CREATE INDEX statement (None for exact)."""
+        if self.kind == "ivfflat":
+            options = f"lists = {self.lists}"
+        elif self.kind == "hnsw":
+            options = f"m = {self.m}, ef_construction = {self.ef_construction}"
+        else:
+            return None
+
+        return (
+            f"CREATE INDEX embeddings_bench_idx ON {BENCH_TABLE} "
+            f"USING {self.kind} (embedding vector_cosine_ops) WITH ({options})"
+        )
+
+
+@dataclass
+class BenchmarkResult:
+    """Recall and latency for one scale x index x search setting."""
+
+    rows: int
+    index: str
+    setting: str
+    k: int
+    recall: float
+    p50_ms: float
+    p99_ms: float
+    build_seconds: float
+    index_mb: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SyntheticEmbeddings:
+    """Deterministic clustered unit vectors, generated block by block.
+
+    Cluster weights fall off as 1/sqrt(rank) so list sizes are uneven, as they
+    are for real categories of places.
+    """
+
+    dimensions: int = BENCH_DIMENSIONS
+    clusters: int = DEFAULT_CLUSTERS
+    spread: float = DEFAULT_CLUSTER_SPREAD
+    seed: int = 0
+    centers: np.ndarray = field(init=False, repr=False)
+    weights: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        rng = np.random.default_rng(self.seed)
+        self.centers = normalize_rows(rng.standard_normal((self.clusters, self.dimensions)))
+        weights = 1 / np.sqrt(np.arange(1, self.clusters + 1))
+        self.weights = weights / weights.sum()
+
+    def _sample(self, stream: int, count: int) -> np.ndarray:
+        rng = np.random.default_rng([self.seed, stream])
+        labels = rng.choice(self.clusters, size=count, p=self.weights)
+        noise = rng.standard_normal((count, self.dimensions)) * (
+            self.spread / np.sqrt(self.dimensions)
+        )
+        return normalize_rows(self.centers[labels] + noise)
+
+    def block(self, index: int) -> np.ndarray:
+        """Rows [index * BENCH_BLOCK_ROWS, (index + 1) * BENCH_BLOCK_ROWS)."""
+        return self._sample(index, BENCH_BLOCK_ROWS)
+
+    def rows(self, start: int, stop: int) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield (first_id, matrix) slices covering ids [start, stop)."""
+        for index in range(start // BENCH_BLOCK_ROWS, -(-stop // BENCH_BLOCK_ROWS)):
+            block_start = index * BENCH_BLOCK_ROWS
+            lo = max(start, block_start) - block_start
+            hi = min(stop, block_start + BENCH_BLOCK_ROWS) - block_start
+            yield block_start + lo, self.block(index)[lo:hi]
+
+    def queries(self, count: int) -> np.ndarray:
+        """Query vectors from the same mixture, disjoint from the rows."""
+        return self._sample(QUERY_STREAM, count)
+
+
+class ExactNeighbors:
+    """Running exact top-k (cosine) of a fixed query set over streamed rows."""
+
+    def __init__(self, queries: np.ndarray, k: int) -> None:
+        self.queries = queries
+        self.k = k
+        self.ids = np.empty((len(queries), 0), dtype=np.int64)
+        self.scores = np.empty((len(queries), 0), dtype=np.float32)
+
+    def add(self, first_id: int, matrix: np.ndarray) -> None:
+        """Merge a block of normalized rows whose ids start at first_id."""
+        block_ids = np.arange(first_id, first_id + len(matrix))
+        scores = np.concatenate([self.scores, self.queries @ matrix.T], axis=1)
+        ids = np.concatenate(
+            [self.ids, np.broadcast_to(block_ids, (len(self.queries), len(block_ids)))], axis=1
+        )
+        if scores.shape[1] > self.k:
+            keep = np.argpartition(-scores, self.k - 1, axis=1)[:, : self.k]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            ids = np.take_along_axis(ids, keep, axis=1)
+        self.scores, self.ids = scores, ids
+
+    def truth(self) -> list[set[int]]:
+        """Exact top-k ids per query (order does not matter for recall)."""
+        return [set(row.tolist()) for row in self.ids]
+
+
+def recall_at_k(found: Sequence[Sequence[int]], truth: Sequence[set[int]]) -> float:
+    """Mean fraction of the exact top-k returned per query."""
+    if not truth:
+        return 1.0
+    return float(np.mean([len(truth[i] & set(f)) / len(truth[i]) for i, f in enumerate(found)]))
+
+
+def copy_payload(first_id: int, matrix: np.ndarray) -> bytes:
+    """Encode (id int4, embedding vector) rows as COPY BINARY tuples.
+
+    The vector field is pgvector's binary format (int16 dims, int16 unused,
+    float32 big-endian), so loading needs no text parsing on either side.
+    """
+    dimensions = matrix.shape[1]
+    record = np.dtype(
+        [
+            ("fields", ">i2"),
+            ("id_len", ">i4"),
+            ("id", ">i4"),
+            ("vec_len", ">i4"),
+            ("dims", ">i2"),
+            ("unused", ">i2"),
+            ("vec", ">f4", (dimensions,)),
+        ]
+    )
+    tuples = np.zeros(len(matrix), dtype=record)
+    tuples["fields"] = 2
+    tuples["id_len"] = 4
+    tuples["id"] = np.arange(first_id, first_id + len(matrix))
+    tuples["vec_len"] = 4 + 4 * dimensions
+    tuples["dims"] = dimensions
+    tuples["vec"] = matrix
+    return tuples.tobytes()
+
+
+def vector_literal(vector: np.ndarray) -> str:
+    """pgvector text input for a query parameter."""
+    return "[" + ",".join(f"{x:.7g}" for x in vector.tolist()) + "]"
+
+
+class PgvectorBenchmark:
+    """Loads synthetic rows into Postgres and sweeps index parameters.
+
+    Args:
+        conn: psycopg 3 connection in autocommit mode
+        data: Synthetic embedding generator
+        queries: Query count
+        k: Neighbours per query (recall@k)
+        maintenance_work_mem: Set for index builds (ivfflat/hnsw builds spill
+            and slow down sharply when the graph or lists do not fit)
+    """
+
+    def __init__(
+        self,
+        conn: Any,
+        data: SyntheticEmbeddings,
+        queries: int = DEFAULT_QUERIES,
+        k: int = DEFAULT_K,
+        maintenance_work_mem: str = "1GB",
+    ) -> None:
+        self.conn = conn
+        self.data = data
+        self.k = k
+        self.maintenance_work_mem = maintenance_work_mem
+        self.query_vectors = data.queries(queries)
+        self.query_literals = [vector_literal(q) for q in self.query_vectors]
+        self.exact = ExactNeighbors(self.query_vectors, k)
+        self.loaded = 0
+
+    def setup(self) -> None:
+        """(Re)create the benchmark schema and unlogged table."""
+        with self.conn.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            cur.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+            cur.execute(
+                f"CREATE UNLOGGED TABLE {BENCH_TABLE} "
+                f"(id int PRIMARY KEY, embedding vector({self.data.dimensions}))"
+            )
+        self.loaded = 0
+
+    def teardown(self) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+
+    def load_to(self, rows: int) -> None:
+        """Append rows [loaded, rows) and fold them into the exact neighbours."""
+        if rows <= self.loaded:
+            return
+
+        started = time.perf_counter()
+        with (
+            self.conn.cursor() as cur,
+            cur.copy(f"COPY {BENCH_TABLE} (id, embedding) FROM STDIN WITH (FORMAT BINARY)") as copy,
+        ):
+            copy.write(PGCOPY_HEADER)
+            for first_id, matrix in self.data.rows(self.loaded, rows):
+                copy.write(copy_payload(first_id, matrix))
+                self.exact.add(first_id, matrix)
+            copy.write(PGCOPY_TRAILER)
+
+        with self.conn.cursor() as cur:
+            cur.execute(f"ANALYZE {BENCH_TABLE}")
+
+        logger.info(
+            "index_benchmark.loaded",
+            rows=rows,
+            added=rows - self.loaded,
+            seconds=round(time.perf_counter() - started, 1),
+        )
+        self.loaded = rows
+
+    def build_index(self, config: IndexConfig) -> tuple[float, float]:
+        """Drop any previous index and build config.
+
+        Returns:
+            (build seconds, index size in MB)
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(f"DROP INDEX IF EXISTS {BENCH_SCHEMA}.embeddings_bench_idx")
+            sql = config.create_sql()
+            if sql is None:
+                return 0.0, 0.0
+
+            cur.execute(f"SET maintenance_work_mem = '{self.maintenance_work_mem}'")
+            started = time.perf_counter()
+            cur.execute(sql)
+            build_seconds = time.perf_counter() - started
+            cur.execute(
+                f"SELECT pg_relation_size('{BENCH_SCHEMA}.embeddings_bench_idx') / 1048576.0"
+            )
+            index_mb = float(cur.fetchone()[0])
+
+        return build_seconds, index_mb
+
+    def run_queries(
+        self, setting: str | None, value: int | None
+    ) -> tuple[list[list[int]], list[float]]:
+        """Time every query (after a warm-up) under one search setting.
+
+        Returns:
+            (ids per query, latencies in ms)
+        """
+        found: list[list[int]] = []
+        latencies: list[float] = []
+        sql = f"SELECT id FROM {BENCH_TABLE} " "ORDER BY embedding <=> %s::vector LIMIT %s"
+
+        with self.conn.cursor() as cur:
+            if setting:
+                cur.execute(f"SET {setting} = {int(value or 0)}")
+
+            for literal in self.query_literals[:DEFAULT_WARMUP_QUERIES]:
+                cur.execute(sql, (literal, self.k))
+                cur.fetchall()
+
+            for literal in self.query_literals:
+                started = time.perf_counter()
+                cur.execute(sql, (literal, self.k))
+                rows = cur.fetchall()
+                latencies.append((time.perf_counter() - started) * 1000)
+                found.append([row[0] for row in rows])
+
+        return found, latencies
+
+    def sweep(
+        self,
+        scales: Sequence[int],
+        indexes: Callable[[int], Sequence[IndexConfig]],
+        probes: Sequence[int],
+        ef_search: Sequence[int],
+        on_result: Callable[[BenchmarkResult], None] | None = None,
+    ) -> list[BenchmarkResult]:
+        """Benchmark every scale x index x search setting.
+
+        Args:
+            scales: Row counts, loaded in ascending order
+            indexes: Index configurations to build for a given row count
+            probes: ivfflat.probes values (clipped to lists)
+            ef_search: hnsw.ef_search values
+            on_result: Called as each result is measured
+
+        Returns:
+            All results
+        """
+        results: list[BenchmarkResult] = []
+
+        for rows in sorted(set(scales)):
+            self.load_to(rows)
+            truth = self.exact.truth()
+
+            for config in indexes(rows):
+                build_seconds, index_mb = self.build_index(config)
+
+                if config.kind == "ivfflat":
+                    values: Sequence[int | None] = sorted(
+                        {min(p, config.lists or p) for p in probes}
+                    )
+                elif config.kind == "hnsw":
+                    values = sorted({max(e, self.k) for e in ef_search})
+                else:
+                    values = [None]
+
+                for value in values:
+                    found, latencies = self.run_queries(config.search_setting, value)
+                    result = BenchmarkResult(
+                        rows=rows,
+                        index=config.label,
+                        setting=f"{config.search_setting}={value}" if value else "-",
+                        k=self.k,
+                        recall=round(recall_at_k(found, truth), 4),
+                        p50_ms=round(float(np.percentile(latencies, 50)), 2),
+                        p99_ms=round(float(np.percentile(latencies, 99)), 2),
+                        build_seconds=round(build_seconds, 1),
+                        index_mb=round(index_mb, 1),
+                    )
+                    logger.info("index_benchmark.result", **result.to_dict())
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+
+        return results
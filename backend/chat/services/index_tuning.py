@@ -0,0 +1,211 @@
+"""Re-tune idx_places_embeddings_vector as places_embeddings grows.
+
+ivfflat quality depends on two things fixed at build time: `lists`, which
+should track the row count, and the centroids, which only reflect rows that
+existed then. plan_retune() compares index_tuning_status() (migration 015)
+against both; IndexRetuner rebuilds the index CONCURRENTLY under a temporary
+name, swaps it in and records lists/probes in app_embeddings.index_tuning,
+where the similarity RPCs read probes from.
+
+CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction, so this needs
+a direct Postgres connection (psycopg, autocommit) rather than a PostgREST RPC.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+VECTOR_INDEX_NAME = "idx_places_embeddings_vector"
+VECTOR_INDEX_NEXT_NAME = f"{VECTOR_INDEX_NAME}_next"
+MAX_IVFFLAT_LISTS = 32_768
+DEFAULT_DRIFT_THRESHOLD = 0.2  # Share of rows the centroids never saw
+DEFAULT_LISTS_CHANGE_RATIO = 1.5  # Rebuild when the ideal lists moved this far
+DEFAULT_MAINTENANCE_WORK_MEM = "512MB"
+
+
+def recommended_lists(rows: int) -> int:
+    """pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    lists = rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows))
+    return _clamp_lists(lists)
+
+
+def candidate_lists(rows: int) -> list[int]:
+    """Both pgvector rules (rows / 1000 and sqrt(rows)), for sweeping in benchmarks."""
+    return sorted({_clamp_lists(rows // 1000), _clamp_lists(int(math.sqrt(rows)))})
+
+
+def _clamp_lists(lists: int) -> int:
+    return min(max(lists, 1), MAX_IVFFLAT_LISTS)
+
+
+def recommended_probes(lists: int) -> int:
+    """pgvector guidance: sqrt(lists)."""
+    return max(1, min(round(math.sqrt(lists)), lists))
+
+
+@dataclass
+class TuningStatus:
+    """One row of index_tuning_status()."""
+
+    total_rows: int
+    rows_since_build: int | None = None
+    index_lists: int | None = None  # From the live index's reloptions
+    lists: int | None = None  # Recorded in index_tuning
+    probes: int | None = None
+    rows_at_build: int | None = None
+    built_at: datetime | None = None
+
+    @property
+    def drift(self) -> float | None:
+        """Share of current rows added or removed since the recorded build."""
+        if self.rows_at_build is None or self.rows_since_build is None:
+            return None
+        deleted = max(0, self.rows_at_build + self.rows_since_build - self.total_rows)
+        return (self.rows_since_build + deleted) / max(self.total_rows, 1)
+
+
+@dataclass
+class RetunePlan:
+    """What retune will do and why."""
+
+    lists: int
+    probes: int
+    rebuild: bool
+    reasons: list[str] = field(default_factory=list)
+
+
+def plan_retune(
+    status: TuningStatus,
+    drift_threshold: float = DEFAULT_DRIFT_THRESHOLD,
+    lists_change_ratio: float = DEFAULT_LISTS_CHANGE_RATIO,
+    probes: int | None = None,
+    force: bool = False,
+) -> RetunePlan | None:
+    """Decide whether to rebuild the index and/or change probes.
+
+    Args:
+        status: Current status
+        drift_threshold: Rebuild when this share of rows is newer or gone
+            since the last build
+        lists_change_ratio: Rebuild when recommended lists differs from the
+            live index's lists by this factor either way
+        probes: Explicit probes (e.g. from benchmark_vector_index); default
+            sqrt(lists)
+        force: Rebuild regardless of thresholds
+
+    Returns:
+        The plan, or None when nothing needs to change
+    """
+    reasons = []
+    lists = recommended_lists(status.total_rows)
+
+    if force:
+        reasons.append("forced")
+    if status.rows_at_build is None:
+        reasons.append("no recorded build")
+    elif status.index_lists != status.lists:
+        reasons.append(f"live index has lists={status.index_lists}, recorded {status.lists}")
+    if status.drift is not None and status.drift > drift_threshold:
+        reasons.append(f"drift {status.drift:.2f} > {drift_threshold:.2f}")
+    if status.index_lists and (
+        max(lists, status.index_lists) / min(lists, status.index_lists) >= lists_change_ratio
+    ):
+        reasons.append(f"lists {status.index_lists} -> {lists} for {status.total_rows} rows")
+
+    if reasons:
+        return RetunePlan(lists, probes or recommended_probes(lists), rebuild=True, reasons=reasons)
+
+    current_lists = status.lists or lists
+    target_probes = min(probes or recommended_probes(current_lists), current_lists)
+    if target_probes != status.probes:
+        return RetunePlan(
+            current_lists,
+            target_probes,
+            rebuild=False,
+            reasons=[f"probes {status.probes} -> {target_probes}"],
+        )
+
+    return None
+
+
+class IndexRetuner:
+    """Reads tuning status and applies RetunePlans over a psycopg connection.
+
+    Args:
+        conn: psycopg 3 connection in autocommit mode, as the table owner
+        maintenance_work_mem: Session setting for the index build
+    """
+
+    def __init__(self, conn: Any, maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM) -> None:
+        self.conn = conn
+        self.maintenance_work_mem = maintenance_work_mem
+
+    def status(self) -> TuningStatus:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT total_rows, rows_since_build, index_lists, lists, probes, "
+                "rows_at_build, built_at FROM app_embeddings.index_tuning_status(%s)",
+                (VECTOR_INDEX_NAME,),
+            )
+            return TuningStatus(*cur.fetchone())
+
+    def apply(self, plan: RetunePlan) -> None:
+        """Rebuild (if planned) and record lists/probes."""
+        status = self.status()
+        rows_at_build, built_at = status.rows_at_build, status.built_at
+
+        if plan.rebuild:
+            rows_at_build, built_at = self._rebuild(plan.lists)
+
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT app_embeddings.record_index_tuning(%s, %s, %s, %s, %s)",
+                (plan.lists, plan.probes, rows_at_build, built_at, VECTOR_INDEX_NAME),
+            )
+
+        logger.info(
+            "index_tuning.applied",
+            lists=plan.lists,
+            probes=plan.probes,
+            rebuilt=plan.rebuild,
+            rows_at_build=rows_at_build,
+            reasons=plan.reasons,
+        )
+
+    def _rebuild(self, lists: int) -> tuple[int, datetime]:
+        """Build the new index beside the live one, then swap names.
+
+        Search keeps using the old index until it is dropped. A build that
+        failed earlier leaves an INVALID _next index, which is dropped first.
+
+        Returns:
+            (rows when the build started, build start time)
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("SET search_path = app_embeddings, extensions, public")
+            cur.execute(f"SET maintenance_work_mem = '{self.maintenance_work_mem}'")
+            cur.execute(
+                f"DROP INDEX CONCURRENTLY IF EXISTS app_embeddings.{VECTOR_INDEX_NEXT_NAME}"
+            )
+
+            # Rows created after this point count as drift for the next run
+            cur.execute("SELECT now(), count(*) FROM app_embeddings.places_embeddings")
+            built_at, rows = cur.fetchone()
+
+            logger.info("index_tuning.rebuild_started", lists=lists, rows=rows)
+            cur.execute(
+                f"CREATE INDEX CONCURRENTLY {VECTOR_INDEX_NEXT_NAME} "
+                "ON app_embeddings.places_embeddings "
+                f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {int(lists)})"
+            )
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS app_embeddings.{VECTOR_INDEX_NAME}")
+            cur.execute(
+                f"ALTER INDEX app_embeddings.{VECTOR_INDEX_NEXT_NAME} RENAME TO {VECTOR_INDEX_NAME}"
+            )
+
+        return rows, built_at
@@ -0,0 +1,323 @@
+"""Background indexing of fresh search results into places_embeddings."""
+
+import asyncio
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from chat.config.constants import (
+    INDEXING_BATCH_SIZE,
+    INDEXING_FLUSH_SECONDS,
+    INDEXING_QUEUE_SIZE,
+    INDEXING_SEEN_CACHE_SIZE,
+)
+from chat.schemas import SearchResult
+from chat.services.embedding_service import get_embedding_service
+from chat.services.embedding_text import build_embedding_text
+from chat.utils.background import BackgroundLoop, get_background_loop
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REDDIT_POST_ID_PATTERN = re.compile(r"/comments/([a-z0-9_]+)", re.IGNORECASE)
+EVENTBRITE_EVENT_ID_PATTERN = re.compile(r"(\d+)/?(?:[?#].*)?$")
+
+
+@dataclass
+class EmbeddingJob:
+    """A search result prepared for EmbeddingService.store_place_embeddings."""
+
+    source: str
+    source_id: str
+    text: str
+    metadata: dict[str, Any]
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """Unique (source, source_id) pair, matching the table constraint."""
+        return (self.source, self.source_id)
+
+    def to_place(self) -> dict[str, Any]:
+        """Convert to the dict shape accepted by store_place_embeddings."""
+        return {
+            "source": self.source,
+            "source_id": self.source_id,
+            "text": self.text,
+            "metadata": self.metadata,
+        }
+
+
+def _hash_id(value: str) -> str:
+    """Stable 16-char lowercase hex ID (valid for serp and reddit formats)."""
+    return hashlib.sha256(value.strip().encode()).hexdigest()[:16]
+
+
+def derive_source_id(result: SearchResult) -> str | None:
+    """Derive a source_id in the format EmbeddingService._validate_source_id expects.
+
+    Args:
+        result: Search result from serp, reddit or eventbrite
+
+    Returns:
+        source_id, or None when no stable ID can be derived
+
+    Formats:
+        - serp: 16-char hash of the result URL (or name when URL is missing)
+        - reddit: lowercase post ID from metadata or permalink, else URL hash
+        - eventbrite: numeric event ID from metadata or the event URL
+    """
+    metadata = result.metadata or {}
+
+    if result.source == "serp":
+        return _hash_id(result.url or result.name)
+
+    if result.source == "reddit":
+        post_id = str(metadata.get("post_id") or "").lower()
+        if not post_id and result.url:
+            match = REDDIT_POST_ID_PATTERN.search(result.url)
+            post_id = match.group(1).lower() if match else ""
+        if re.fullmatch(r"[a-z0-9_]+", post_id):
+            return post_id
+        return _hash_id(result.url) if result.url else None
+
+    if result.source == "eventbrite":
+        event_id = str(metadata.get("event_id") or "")
+        if event_id.isdigit():
+            return event_id
+        if result.url:
+            match = EVENTBRITE_EVENT_ID_PATTERN.search(result.url)
+            if match:
+                return match.group(1)
+        return None
+
+    return None
+
+
+def build_embedding_jobs(results: list[SearchResult], location: str) -> list[EmbeddingJob]:
+    """Turn scored search results into embedding jobs.
+
+    Only query-independent fields are indexed: a result's category
+    (primary/nearby) and score describe how it ranked for this search, not the
+    place, so neither is stored nor embedded.
+
+    Args:
+        results: Scored search results
+        location: Normalized search location (stored in metadata)
+
+    Returns:
+        One job per result with a derivable source_id and a non-empty name.
+        Results from other sources (e.g. vector hits) are skipped.
+    """
+    jobs: list[EmbeddingJob] = []
+    seen: set[tuple[str, str]] = set()
+
+    for result in results:
+        if not result.name.strip():
+            continue
+
+        source_id = derive_source_id(result)
+        if source_id is None:
+            continue
+
+        metadata = {
+            "name": result.name.strip(),
+            "description": result.description,
+            "url": result.url,
+            "location": location,
+            "source_metadata": result.metadata or {},
+        }
+        job = EmbeddingJob(
+            source=result.source,
+            source_id=source_id,
+            text=build_embedding_text(metadata),
+            metadata=metadata,
+        )
+
+        if job.key not in seen:
+            seen.add(job.key)
+            jobs.append(job)
+
+    return jobs
+
+
+class EmbeddingIndexer:
+    """Bounded background worker that batches embedding jobs.
+
+    enqueue() never blocks and may be called from any thread or event loop:
+    jobs beyond max_queue_size (queued plus in flight) are dropped. The worker
+    runs on the process-wide background loop rather than the caller's, whose
+    leftover tasks are cancelled when a WSGI request ends, and performs
+    blocking embedding/Supabase calls in a thread, so indexing never adds
+    latency to the user response.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = INDEXING_QUEUE_SIZE,
+        batch_size: int = INDEXING_BATCH_SIZE,
+        flush_seconds: float = INDEXING_FLUSH_SECONDS,
+        seen_cache_size: int = INDEXING_SEEN_CACHE_SIZE,
+        background: BackgroundLoop | None = None,
+    ) -> None:
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.seen_cache_size = seen_cache_size
+
+        self._background = background
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._queue: asyncio.Queue[EmbeddingJob] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._seen: OrderedDict[tuple[str, str], None] = OrderedDict()
+
+    @property
+    def background(self) -> BackgroundLoop:
+        """Loop the worker runs on (the process-wide one unless injected)."""
+        return self._background or get_background_loop()
+
+    def enqueue(self, jobs: list[EmbeddingJob]) -> int:
+        """Queue jobs for background indexing without blocking.
+
+        Args:
+            jobs: Jobs to index
+
+        Returns:
+            Number of jobs accepted (recently seen and overflow jobs are dropped)
+        """
+        accepted: list[EmbeddingJob] = []
+        dropped = 0
+
+        with self._lock:
+            for job in jobs:
+                if job.key in self._seen:
+                    continue
+                if self._pending >= self.max_queue_size:
+                    dropped += 1
+                    continue
+                accepted.append(job)
+                self._pending += 1
+            pending = self._pending
+
+        if accepted:
+            self.background.call_soon(self._deliver, accepted)
+
+        if dropped:
+            logger.warning("indexing.queue_full", dropped=dropped, queue_size=self.max_queue_size)
+
+        logger.info("indexing.enqueued", accepted=len(accepted), queued=pending)
+        return len(accepted)
+
+    def _deliver(self, jobs: list[EmbeddingJob]) -> None:
+        """Put accepted jobs on the worker queue (runs on the background loop)."""
+        loop = asyncio.get_running_loop()
+
+        if self._queue is None or self._loop is not loop:
+            # First use, or the background loop was restarted (e.g. after a fork):
+            # jobs left on the old queue are lost, so they no longer count
+            lost = self._queue.qsize() if self._queue is not None else 0
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = None
+            with self._lock:
+                self._pending = max(self._pending - lost, 0)
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(self._queue))
+
+        for job in jobs:
+            self._queue.put_nowait(job)
+
+    async def _run(self, queue: asyncio.Queue[EmbeddingJob]) -> None:
+        """Collect jobs into batches and index them until cancelled."""
+        while True:
+            batch = [await queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.flush_seconds
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            try:
+                await asyncio.to_thread(self._index_batch, batch)
+            except Exception as e:
+                logger.error("indexing.batch_failed", error=str(e), size=len(batch))
+            finally:
+                with self._lock:
+                    self._pending = max(self._pending - len(batch), 0)
+
+    def _index_batch(self, jobs: list[EmbeddingJob]) -> None:
+        """Skip already-stored pairs, then embed and upsert the rest (blocking)."""
+        with self._lock:
+            unique = {job.key: job for job in jobs if job.key not in self._seen}
+        existing = self._existing_keys(list(unique.values()))
+        fresh = [job for key, job in unique.items() if key not in existing]
+
+        for key in existing:
+            self._remember(key)
+
+        if not fresh:
+            logger.info("indexing.batch_skipped", size=len(jobs), already_indexed=len(existing))
+            return
+
+        items = get_embedding_service().store_place_embeddings([job.to_place() for job in fresh])
+
+        for job, item in zip(fresh, items, strict=True):
+            if item.ok:
+                self._remember(job.key)
+
+        logger.info(
+            "indexing.batch_stored",
+            stored=sum(1 for item in items if item.ok),
+            failed=sum(1 for item in items if not item.ok),
+            already_indexed=len(existing),
+        )
+
+    def _existing_keys(self, jobs: list[EmbeddingJob]) -> set[tuple[str, str]]:
+        """Look up which (source, source_id) pairs are already stored."""
+        if not jobs:
+            return set()
+
+        response = (
+            get_embedding_service()
+            .supabase.client.table("app_embeddings.places_embeddings")
+            .select("source,source_id")
+            .in_("source_id", sorted({job.source_id for job in jobs}))
+            .execute()
+        )
+
+        rows = [row for row in response.data or [] if isinstance(row, dict)]
+        return {(str(row["source"]), str(row["source_id"])) for row in rows}
+
+    def _remember(self, key: tuple[str, str]) -> None:
+        """Record an indexed pair in the bounded in-process LRU."""
+        with self._lock:
+            self._seen[key] = None
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.seen_cache_size:
+                self._seen.popitem(last=False)
+
+
+indexer = EmbeddingIndexer()
+
+
+def index_search_results(results: list[SearchResult], location: str) -> int:
+    """Hand scored search results to the background indexer.
+
+    Args:
+        results: Scored search results from serp/reddit/eventbrite
+        location: Normalized search location
+
+    Returns:
+        Number of jobs accepted by the queue
+    """
+    return indexer.enqueue(build_embedding_jobs(results, location))
@@ -0,0 +1,364 @@
+"""LLM provider selection: the OpenAI SDK or a deterministic local stub.
+
+Services talk to the LLM through the subset of the OpenAI client surface they
+already use, which is the provider interface:
+
+- chat: client.chat.completions.create(model, messages, temperature, max_tokens)
+- stream: the same call with stream=True, iterated for ChatCompletionChunk
+  (stream_options={"include_usage": True} adds a final usage chunk)
+- embeddings: client.embeddings.create(model, input, dimensions=None)
+
+settings.llm_provider picks the implementation. "openai" returns the SDK
+clients. "stub" returns StubLLMClient / AsyncStubLLMClient, which answer
+without the network so load tests measure orchestration overhead on CI
+hardware:
+
+- Parse prompts (system message asks for JSON) get the local parser's result
+- Other chat prompts get hash-seeded filler text, capped at max_tokens
+- Embeddings are hash-seeded unit vectors (same text -> same vector)
+- Each request waits llm_stub_latency_ms, and completions additionally
+  llm_stub_tokens_per_second per generated token (streams pace each chunk)
+
+Stub responses are real openai.types objects, so callers cannot tell them
+apart from SDK responses.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import Any, cast
+
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
+from openai.types import CompletionUsage, CreateEmbeddingResponse, Embedding
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
+from openai.types.chat.chat_completion_chunk import ChoiceDelta
+from openai.types.create_embedding_response import Usage
+
+from chat.config.settings import get_settings
+from chat.services.local_parser import parse_locally
+
+LLM_PROVIDERS = ("openai", "stub")
+STUB_CHARS_PER_TOKEN = 4
+STUB_RESPONSE_TOKENS = 60  # Typical Stonewalker reply length
+_STUB_TEXT = (
+    "the paths near {place} hide quiet corners where locals wander at dusk and "
+    "old stones remember stories few travelers hear so walk slowly ask questions "
+    "and follow the trail past the familiar toward something worth finding"
+)
+_STUB_VOCABULARY = _STUB_TEXT.split()
+
+
+def create_llm_client(provider: str | None = None, **openai_kwargs: Any) -> OpenAI:
+    """Create a blocking client for the configured provider.
+
+    Args:
+        provider: One of LLM_PROVIDERS (default: settings.llm_provider)
+        **openai_kwargs: Extra OpenAI() arguments (e.g. max_retries)
+
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    settings = get_settings()
+    provider = _validate(provider or settings.llm_provider)
+    if provider == "stub":
+        # Implements the client surface listed in the module docstring
+        return cast(OpenAI, StubLLMClient(StubProfile.from_settings()))
+    return OpenAI(api_key=settings.openai_api_key, **openai_kwargs)
+
+
+def create_async_llm_client(provider: str | None = None, **openai_kwargs: Any) -> AsyncOpenAI:
+    """Create an async client for the configured provider.
+
+    Args:
+        provider: One of LLM_PROVIDERS (default: settings.llm_provider)
+        **openai_kwargs: Extra AsyncOpenAI() arguments (e.g. max_retries)
+
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    settings = get_settings()
+    provider = _validate(provider or settings.llm_provider)
+    if provider == "stub":
+        return cast(AsyncOpenAI, AsyncStubLLMClient(StubProfile.from_settings()))
+    return AsyncOpenAI(api_key=settings.openai_api_key, **openai_kwargs)
+
+
+def _validate(provider: str) -> str:
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"llm_provider must be one of {LLM_PROVIDERS}, got {provider!r}")
+    return provider
+
+
+@dataclass(frozen=True)
+class StubProfile:
+    """Timing and shape of stub responses."""
+
+    latency_ms: float = 0.0  # Per request, before the first token
+    tokens_per_second: float = 0.0  # Completion token rate; 0 = no per-token delay
+    embedding_dimensions: int = 1536  # When the request does not pass dimensions
+
+    @classmethod
+    def from_settings(cls) -> "StubProfile":
+        settings = get_settings()
+        return cls(
+            latency_ms=settings.llm_stub_latency_ms,
+            tokens_per_second=settings.llm_stub_tokens_per_second,
+            embedding_dimensions=settings.embedding_dimensions,
+        )
+
+    def token_delay(self, tokens: int) -> float:
+        """Seconds spent generating this many tokens."""
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars/token) for stub usage numbers."""
+    return max(1, math.ceil(len(text) / STUB_CHARS_PER_TOKEN))
+
+
+def stub_completion_text(messages: list[dict[str, Any]], max_tokens: int | None) -> str:
+    """Deterministic completion for a chat prompt."""
+    system = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+    user = next(
+        (str(m.get("content", "")) for m in reversed(messages) if m.get("role") == "user"), ""
+    )
+
+    if "JSON" in system:
+        parsed = parse_locally(user)
+        return json.dumps({"location": parsed.location, "intent": parsed.intent})
+
+    seed = _seed("chat", system, user)
+    place = parse_locally(user).location or "here"
+    words = min(max_tokens or STUB_RESPONSE_TOKENS, STUB_RESPONSE_TOKENS)
+    text = " ".join(
+        _STUB_VOCABULARY[(seed + i) % len(_STUB_VOCABULARY)] for i in range(words)
+    ).format(place=place)
+    return text[: (max_tokens or STUB_RESPONSE_TOKENS) * STUB_CHARS_PER_TOKEN]
+
+
+def stub_embedding(model: str, text: str, dimensions: int) -> list[float]:
+    """Hash-seeded unit vector: identical inputs always embed identically."""
+    rng = np.random.default_rng(_seed("embedding", model, text))
+    vector = rng.standard_normal(dimensions).astype(np.float32)
+    vector /= np.linalg.norm(vector)
+    return cast(list[float], vector.tolist())
+
+
+def _seed(*parts: str) -> int:
+    digest = hashlib.sha256("\n".join(parts).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def _chunks(text: str) -> list[str]:
+    """Split text into word chunks that concatenate back to the original."""
+    words = text.split(" ")
+    return [words[0], *(f" {word}" for word in words[1:])]
+
+
+class _StubResponses:
+    """Builds openai.types responses for both stub clients."""
+
+    def __init__(self, profile: StubProfile) -> None:
+        self.profile = profile
+
+    def completion(
+        self, model: str, messages: list[dict[str, Any]], max_tokens: int | None
+    ) -> ChatCompletion:
+        text = stub_completion_text(messages, max_tokens)
+        prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = estimate_tokens(text)
+        return ChatCompletion(
+            id=f"stub-{_seed(model, text):x}",
+            object="chat.completion",
+            created=int(time.time()),
+            model=model,
+            choices=[
+                Choice(
+                    index=0,
+                    finish_reason="stop",
+                    message=ChatCompletionMessage(role="assistant", content=text),
+                )
+            ],
+            usage=CompletionUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    def usage_chunk(self, completion: ChatCompletion) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id=completion.id,
+            object="chat.completion.chunk",
+            created=completion.created,
+            model=completion.model,
+            choices=[],
+            usage=completion.usage,
+        )
+
+    def chunk(
+        self, completion: ChatCompletion, text: str | None, finished: bool
+    ) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id=completion.id,
+            object="chat.completion.chunk",
+            created=completion.created,
+            model=completion.model,
+            choices=[
+                ChunkChoice(
+                    index=0,
+                    delta=ChoiceDelta(content=text),
+                    finish_reason="stop" if finished else None,
+                )
+            ],
+        )
+
+    def embeddings(
+        self, model: str, inputs: str | list[str], dimensions: int | None
+    ) -> CreateEmbeddingResponse:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        size = dimensions or self.profile.embedding_dimensions
+        tokens = sum(estimate_tokens(text) for text in texts)
+        return CreateEmbeddingResponse(
+            object="list",
+            model=model,
+            data=[
+                Embedding(object="embedding", index=i, embedding=stub_embedding(model, text, size))
+                for i, text in enumerate(texts)
+            ],
+            usage=Usage(prompt_tokens=tokens, total_tokens=tokens),
+        )
+
+
+class _SyncCompletions:
+    def __init__(self, responses: _StubResponses) -> None:
+        self._responses = responses
+
+    def create(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int | None = None,
+        stream: bool = False,
+        stream_options: dict[str, Any] | None = None,
+        **_: Any,
+    ) -> ChatCompletion | Iterator[ChatCompletionChunk]:
+        profile = self._responses.profile
+        completion = self._responses.completion(model, messages, max_tokens)
+        time.sleep(profile.latency_ms / 1000)
+
+        if stream:
+            return self._stream(completion, bool((stream_options or {}).get("include_usage")))
+
+        time.sleep(profile.token_delay(completion.usage.completion_tokens))  # type: ignore[union-attr]
+        return completion
+
+    def _stream(
+        self, completion: ChatCompletion, include_usage: bool
+    ) -> Iterator[ChatCompletionChunk]:
+        pieces = _chunks(completion.choices[0].message.content or "")
+        for piece in pieces:
+            time.sleep(self._responses.profile.token_delay(estimate_tokens(piece)))
+            yield self._responses.chunk(completion, piece, finished=False)
+        yield self._responses.chunk(completion, None, finished=True)
+        if include_usage:
+            yield self._responses.usage_chunk(completion)
+
+
+class _AsyncCompletions:
+    def __init__(self, responses: _StubResponses) -> None:
+        self._responses = responses
+
+    async def create(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int | None = None,
+        stream: bool = False,
+        stream_options: dict[str, Any] | None = None,
+        **_: Any,
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        profile = self._responses.profile
+        completion = self._responses.completion(model, messages, max_tokens)
+        await asyncio.sleep(profile.latency_ms / 1000)
+
+        if stream:
+            return self._stream(completion, bool((stream_options or {}).get("include_usage")))
+
+        await asyncio.sleep(profile.token_delay(completion.usage.completion_tokens))  # type: ignore[union-attr]
+        return completion
+
+    async def _stream(
+        self, completion: ChatCompletion, include_usage: bool
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        pieces = _chunks(completion.choices[0].message.content or "")
+        for piece in pieces:
+            await asyncio.sleep(self._responses.profile.token_delay(estimate_tokens(piece)))
+            yield self._responses.chunk(completion, piece, finished=False)
+        yield self._responses.chunk(completion, None, finished=True)
+        if include_usage:
+            yield self._responses.usage_chunk(completion)
+
+
+class _SyncEmbeddings:
+    def __init__(self, responses: _StubResponses) -> None:
+        self._responses = responses
+
+    def create(
+        self,
+        *,
+        model: str,
+        input: str | list[str],  # OpenAI keyword name
+        dimensions: int | None = None,
+        **_: Any,
+    ) -> CreateEmbeddingResponse:
+        time.sleep(self._responses.profile.latency_ms / 1000)
+        return self._responses.embeddings(model, input, dimensions)
+
+
+class _AsyncEmbeddings:
+    def __init__(self, responses: _StubResponses) -> None:
+        self._responses = responses
+
+    async def create(
+        self,
+        *,
+        model: str,
+        input: str | list[str],  # OpenAI keyword name
+        dimensions: int | None = None,
+        **_: Any,
+    ) -> CreateEmbeddingResponse:
+        await asyncio.sleep(self._responses.profile.latency_ms / 1000)
+        return self._responses.embeddings(model, input, dimensions)
+
+
+class _Chat:
+    def __init__(self, completions: Any) -> None:
+        self.completions = completions
+
+
+class StubLLMClient:
+    """Deterministic, offline stand-in for openai.OpenAI."""
+
+    def __init__(self, profile: StubProfile | None = None) -> None:
+        responses = _StubResponses(profile or StubProfile())
+        self.chat = _Chat(_SyncCompletions(responses))
+        self.embeddings = _SyncEmbeddings(responses)
+
+
+class AsyncStubLLMClient:
+    """Deterministic, offline stand-in for openai.AsyncOpenAI."""
+
+    def __init__(self, profile: StubProfile | None = None) -> None:
+        responses = _StubResponses(profile or StubProfile())
+        self.chat = _Chat(_AsyncCompletions(responses))
+        self.embeddings = _AsyncEmbeddings(responses)
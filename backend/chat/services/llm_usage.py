@@ -0,0 +1,112 @@
+"""Token accounting for LLM calls.
+
+Every chat call records the locally estimated prompt size (prompts module)
+next to the usage the API reports: prompt, completion and cached prompt
+tokens (usage.prompt_tokens_details.cached_tokens, the share served from the
+provider's prompt cache). Totals are kept per operation and model so the
+estimate's drift and the cache hit share can be watched over time, and each
+call is logged as "openai.usage".
+
+Streams only report usage when requested with
+stream_options={"include_usage": True}; it arrives on a final chunk with no
+choices.
+"""
+
+import threading
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any
+
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CallUsage:
+    """Tokens for one call (API fields are None when the response had no usage)."""
+
+    estimated_prompt_tokens: int
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    cached_tokens: int | None = None
+
+    @classmethod
+    def from_response(cls, estimated_prompt_tokens: int, usage: Any | None) -> "CallUsage":
+        """Build from an openai CompletionUsage (or None)."""
+        if usage is None:
+            return cls(estimated_prompt_tokens)
+        details = getattr(usage, "prompt_tokens_details", None)
+        return cls(
+            estimated_prompt_tokens,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_tokens=getattr(details, "cached_tokens", None) or 0,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class UsageTotals:
+    """Accumulated tokens for one operation and model."""
+
+    calls: int = 0
+    calls_without_usage: int = 0
+    estimated_prompt_tokens: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    def add(self, usage: CallUsage) -> None:
+        self.calls += 1
+        self.estimated_prompt_tokens += usage.estimated_prompt_tokens
+        if usage.prompt_tokens is None:
+            self.calls_without_usage += 1
+            return
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens or 0
+        self.cached_tokens += usage.cached_tokens or 0
+
+    def to_dict(self) -> dict[str, Any]:
+        reported = self.calls - self.calls_without_usage
+        return {
+            **asdict(self),
+            "avg_prompt_tokens": round(self.prompt_tokens / reported, 1) if reported else None,
+            "cached_share": (
+                round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0
+            ),
+        }
+
+
+class TokenLedger:
+    """Thread-safe per-operation, per-model token totals."""
+
+    def __init__(self) -> None:
+        self._totals: dict[tuple[str, str], UsageTotals] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, model: str, usage: CallUsage) -> None:
+        """Add one call's usage and log it."""
+        with self._lock:
+            self._totals.setdefault((operation, model), UsageTotals()).add(usage)
+        logger.info("openai.usage", operation=operation, model=model, **usage.to_dict())
+
+    def totals(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return operation -> model -> accumulated usage."""
+        with self._lock:
+            result: dict[str, dict[str, dict[str, Any]]] = {}
+            for (operation, model), totals in self._totals.items():
+                result.setdefault(operation, {})[model] = totals.to_dict()
+            return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+@lru_cache(maxsize=1)
+def get_token_ledger() -> TokenLedger:
+    """Process-wide token ledger."""
+    return TokenLedger()
@@ -0,0 +1,218 @@
+"""Deterministic query parser used before (and instead of) the OpenAI parse call.
+
+Most queries look like "<intent> in|near <city>[,] <state>". parse_locally()
+splits them with precompiled patterns, resolves the place against the
+gazetteer (chat/config/gazetteer.py) and scores how sure it is:
+
+| Signal | Score |
+|--------|-------|
+| City + valid state that the gazetteer agrees with | 0.65 |
+| City + valid state | 0.60 |
+| Gazetteer city in a single state, no state given | 0.55 |
+| Ambiguous or unknown place without a state | 0.30 |
+| Intent contains a known keyword | +0.30 |
+| Other short intent phrase | +0.15 |
+| Long query (more than 12 words) | -0.15 |
+| Place looks like several places ("x and y") | -0.30 |
+
+openai_service skips the LLM when the score reaches
+settings.parse_fast_path_threshold and logs agreement with the LLM otherwise,
+so the weights and threshold can be tuned from logs.
+"""
+
+import re
+
+from chat.config.constants import INTENT_KEYWORDS
+from chat.config.gazetteer import CITY_STATES, STATE_CODES, US_STATES
+from chat.schemas import ParsedInput
+
+DEFAULT_INTENT = "hidden gems"
+MAX_CONFIDENCE = 0.95
+LONG_QUERY_WORDS = 12
+MAX_BARE_PLACE_WORDS = 3
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.]+$")
+_PREPOSITION = re.compile(
+    r"\b(?:in|near|around|outside(?:\s+of)?|by|at|close\s+to)\s+", re.IGNORECASE
+)
+_LEADING_FILLER = re.compile(
+    r"^(?:(?:find|show|give|tell|list|recommend)(?:\s+me)?|what\s+are|where\s+are|"
+    r"looking\s+for|i\s+want|any|some|the|cool|best|good|fun)\s+",
+    re.IGNORECASE,
+)
+_TRAILING_FILLER = re.compile(
+    r"\s+(?:to\s+(?:do|see|visit|explore|check\s+out)|(?:i|we)\s+should\s+\w+)$", re.IGNORECASE
+)
+_COUNTRY_SUFFIX = re.compile(
+    r",?\s*\b(?:usa|u\.s\.a?\.?|united states(?: of america)?)$", re.IGNORECASE
+)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_MULTI_PLACE = re.compile(r"\b(?:and|or|between|vs)\b|/|&")
+_PLACE_PREFIX = re.compile(r"^(?:the\s+)?(?:city\s+of\s+)?", re.IGNORECASE)
+_INTENT_KEYWORDS = [
+    (keyword, re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE))
+    for keyword in INTENT_KEYWORDS
+]
+_STATE_NAMES_BY_LENGTH = sorted(US_STATES, key=lambda name: -len(name.split()))
+
+
+def _split_state(place: str) -> tuple[str, str | None]:
+    """Split a trailing state name or code off a place string.
+
+    Two-letter codes must be uppercase or follow a comma, so "portland or"
+    is not read as Oregon.
+    """
+    words = place.replace(",", " , ").split()
+    lowered = [w.lower() for w in words]
+
+    for name in _STATE_NAMES_BY_LENGTH:
+        size = len(name.split())
+        if len(words) > size and " ".join(lowered[-size:]) == name:
+            return " ".join(words[:-size]).rstrip(" ,"), US_STATES[name]
+
+    if len(words) >= 2:
+        code = words[-1].rstrip(".")
+        after_comma = words[-2] == ","
+        if code.upper() in STATE_CODES and (code.isupper() or after_comma):
+            return " ".join(words[:-1]).rstrip(" ,"), code.upper()
+
+    return place.replace(" ,", ","), None
+
+
+def _title(city: str) -> str:
+    return " ".join(w if w.isupper() else w.capitalize() for w in city.split())
+
+
+def _resolve_place(place: str) -> tuple[str, float, bool]:
+    """Resolve a place phrase to "City, ST".
+
+    Returns:
+        (location, location score, looks like several places)
+    """
+    place = _PLACE_PREFIX.sub("", place).strip(" ,")
+    multi = bool(_MULTI_PLACE.search(place))
+    city, state = _split_state(place)
+    known_states = CITY_STATES.get(city.lower(), ())
+
+    if state and city:
+        score = 0.65 if state in known_states else 0.6
+        return f"{_title(city)}, {state}", score, multi
+
+    if len(known_states) == 1:
+        return f"{_title(city)}, {known_states[0]}", 0.55, multi
+
+    return _title(city), 0.3 if city else 0.0, multi
+
+
+def _resolve_bare_place(words: list[str]) -> tuple[tuple[str, float, bool], str]:
+    """Find "City ST" at the end or start of a query without a preposition.
+
+    Shorter cities win unless a longer one is in the gazetteer, so
+    "dive bars Austin, TX" gives Austin and "Salt Lake City UT" stays whole.
+
+    Returns:
+        (resolved place, remaining intent text)
+    """
+    longest = MAX_BARE_PLACE_WORDS + 2  # Two-word state names
+    spans = [(len(words) - size, len(words)) for size in range(2, longest + 1)]
+    spans += [(0, size) for size in range(2, longest + 1)]
+    fallback: tuple[tuple[str, float, bool], str] = (("", 0.0, False), " ".join(words))
+
+    for start, end in spans:
+        if start < 0 or end > len(words):
+            continue
+        city, state = _split_state(" ".join(words[start:end]))
+        if not (city and state) or len(city.split()) > MAX_BARE_PLACE_WORDS:
+            continue
+        found = (_resolve_place(" ".join(words[start:end])), " ".join(words[:start] + words[end:]))
+        if state in CITY_STATES.get(city.lower(), ()):
+            return found
+        if not fallback[0][0]:
+            fallback = found
+
+    return fallback
+
+
+def _clean_intent(text: str) -> str:
+    intent = text.strip(" ,")
+    previous = None
+    while previous != intent:
+        previous = intent
+        intent = _LEADING_FILLER.sub("", intent)
+    return _TRAILING_FILLER.sub("", intent).strip(" ,")
+
+
+def parse_locally(user_input: str) -> ParsedInput:
+    """Parse location and intent without an LLM.
+
+    Args:
+        user_input: Raw user query
+
+    Returns:
+        Parsed input with a calibrated confidence (0 when no place was found).
+        location is "" when no place was found.
+    """
+    text = _TRAILING_PUNCTUATION.sub("", _WHITESPACE.sub(" ", user_input).strip())
+
+    best: tuple[str, float, bool] = ("", 0.0, False)
+    intent_text = text
+    # Prefer the last preposition whose place resolves best:
+    # "caves in the mountains near Asheville NC"
+    for match in _PREPOSITION.finditer(text):
+        resolved = _resolve_place(text[match.end() :])
+        if resolved[1] >= best[1]:
+            best, intent_text = resolved, text[: match.start()]
+
+    if not best[0]:
+        best, intent_text = _resolve_bare_place(text.split())
+
+    location, confidence, multi = best
+    intent = _clean_intent(intent_text)
+
+    keyword = next((k for k, pattern in _INTENT_KEYWORDS if pattern.search(intent)), None)
+    if keyword:
+        confidence += 0.3
+    elif intent and len(intent.split()) <= 5:
+        confidence += 0.15
+
+    if len(text.split()) > LONG_QUERY_WORDS:
+        confidence -= 0.15
+    if multi:
+        confidence -= 0.3
+
+    if not location:
+        confidence = 0.0
+
+    return ParsedInput(
+        location=location,
+        intent=intent.lower() or DEFAULT_INTENT,
+        confidence=round(max(0.0, min(confidence, MAX_CONFIDENCE)), 2),
+    )
+
+
+def _words(value: str) -> set[str]:
+    return {w for w in _NON_WORD.split(value.lower()) if w}
+
+
+def _location_words(location: str) -> set[str]:
+    city, state = _split_state(_COUNTRY_SUFFIX.sub("", location.strip()))
+    return _words(city) | ({state.lower()} if state else set())
+
+
+def parses_agree(local: ParsedInput, llm: ParsedInput) -> tuple[bool, bool]:
+    """Compare a local parse with the LLM's.
+
+    Returns:
+        (locations match, intents match). Locations match when they name the
+        same city and state (state names and codes are equivalent); intents
+        match when they share at least half of their words.
+    """
+    llm_location = _location_words(llm.location)
+    location_match = bool(llm_location) and llm_location == _location_words(local.location)
+
+    local_intent, llm_intent = _words(local.intent), _words(llm.intent)
+    union = local_intent | llm_intent
+    intent_match = bool(union) and len(local_intent & llm_intent) / len(union) >= 0.5
+
+    return location_match, intent_match
@@ -0,0 +1,198 @@
+"""Pick the LLM model per operation from observed latency and errors.
+
+Each operation (parse, generate) has an ordered candidate list, preferred
+model first (settings.llm_parse_models / llm_generate_models). The router
+keeps a rolling time window of latency and success samples per operation and
+model, and choose() returns the first candidate whose window is healthy:
+
+- Fewer than min_samples samples: healthy (not enough evidence yet)
+- Error rate above max_error_rate: degraded
+- p95 latency above the operation's budget: degraded
+
+When every candidate is degraded the decision is a template (the caller's
+non-LLM fallback). A degraded model gets no traffic, so its samples age out
+of the window and it is tried again after window_seconds; no separate probe
+is needed.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any
+
+from chat.config.settings import get_settings
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROUTER_WINDOW_SECONDS = 300.0
+ROUTER_MIN_SAMPLES = 5
+ROUTER_MAX_SAMPLES = 200  # Per operation and model
+
+
+@dataclass
+class RouteDecision:
+    """Model chosen for one LLM call (model None = use the template fallback)."""
+
+    operation: str
+    model: str | None
+    reason: str
+    p95_ms: float | None = None
+    error_rate: float | None = None
+
+    @property
+    def template(self) -> bool:
+        return self.model is None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class WindowStats:
+    """Summary of one model's recent samples."""
+
+    samples: int
+    p95_ms: float | None
+    error_rate: float | None
+
+
+class _Window:
+    """Time-bounded samples of (timestamp, latency_ms, ok)."""
+
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = window_seconds
+        self.samples: deque[tuple[float, float, bool]] = deque(maxlen=ROUTER_MAX_SAMPLES)
+
+    def add(self, now: float, latency_ms: float, ok: bool) -> None:
+        self.samples.append((now, latency_ms, ok))
+
+    def stats(self, now: float) -> WindowStats:
+        while self.samples and now - self.samples[0][0] > self.window_seconds:
+            self.samples.popleft()
+
+        if not self.samples:
+            return WindowStats(0, None, None)
+
+        latencies = sorted(latency for _, latency, _ in self.samples)
+        p95 = latencies[max(math.ceil(0.95 * len(latencies)) - 1, 0)]
+        errors = sum(1 for _, _, ok in self.samples if not ok)
+        return WindowStats(len(latencies), round(p95, 1), round(errors / len(latencies), 3))
+
+
+class ModelRouter:
+    """Rolling per-model statistics and candidate selection.
+
+    Args:
+        candidates: Operation -> models in order of preference
+        p95_budget_ms: Operation -> p95 latency budget
+        max_error_rate: Error share above which a model is degraded
+        window_seconds: Sample lifetime
+        min_samples: Samples needed before a model can be judged
+    """
+
+    def __init__(
+        self,
+        candidates: dict[str, list[str]],
+        p95_budget_ms: dict[str, float],
+        max_error_rate: float = 0.25,
+        window_seconds: float = ROUTER_WINDOW_SECONDS,
+        min_samples: int = ROUTER_MIN_SAMPLES,
+    ) -> None:
+        for operation in candidates:
+            if operation not in p95_budget_ms:
+                raise ValueError(f"No p95 budget for operation {operation!r}")
+
+        self.candidates = {op: list(models) for op, models in candidates.items()}
+        self.p95_budget_ms = p95_budget_ms
+        self.max_error_rate = max_error_rate
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self._windows: dict[tuple[str, str], _Window] = {}
+        self._lock = threading.Lock()
+
+    def choose(self, operation: str) -> RouteDecision:
+        """Pick the first healthy candidate for an operation.
+
+        Raises:
+            ValueError: If the operation has no candidates configured
+        """
+        models = self.candidates.get(operation)
+        if not models:
+            raise ValueError(f"No candidate models for operation {operation!r}")
+
+        budget = self.p95_budget_ms[operation]
+        skipped: list[str] = []
+        now = time.monotonic()
+
+        with self._lock:
+            for model in models:
+                stats = self._window(operation, model).stats(now)
+                problem = self._problem(stats, budget)
+                if problem is None:
+                    decision = RouteDecision(
+                        operation,
+                        model,
+                        "; ".join(skipped) if skipped else "preferred",
+                        stats.p95_ms,
+                        stats.error_rate,
+                    )
+                    break
+                skipped.append(f"{model} {problem}")
+            else:
+                decision = RouteDecision(operation, None, "; ".join(skipped))
+
+        if skipped:
+            logger.warning("llm_router.degraded", **decision.to_dict())
+        return decision
+
+    def record(self, operation: str, model: str, latency_ms: float, ok: bool) -> None:
+        """Add one call's outcome to the model's window."""
+        with self._lock:
+            self._window(operation, model).add(time.monotonic(), latency_ms, ok)
+
+    def stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return operation -> model -> window statistics for every candidate."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                operation: {
+                    model: asdict(self._window(operation, model).stats(now)) for model in models
+                }
+                for operation, models in self.candidates.items()
+            }
+
+    def _window(self, operation: str, model: str) -> _Window:
+        key = (operation, model)
+        if key not in self._windows:
+            self._windows[key] = _Window(self.window_seconds)
+        return self._windows[key]
+
+    def _problem(self, stats: WindowStats, budget_ms: float) -> str | None:
+        if stats.samples < self.min_samples:
+            return None
+        if stats.error_rate is not None and stats.error_rate > self.max_error_rate:
+            return f"error rate {stats.error_rate:.2f} > {self.max_error_rate:.2f}"
+        if stats.p95_ms is not None and stats.p95_ms > budget_ms:
+            return f"p95 {stats.p95_ms:.0f}ms > {budget_ms:.0f}ms"
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_model_router() -> ModelRouter:
+    """Process-wide router configured from settings."""
+    settings = get_settings()
+    return ModelRouter(
+        candidates={
+            "parse": settings.llm_parse_models,
+            "generate": settings.llm_generate_models,
+        },
+        p95_budget_ms={
+            "parse": settings.llm_parse_p95_budget_ms,
+            "generate": settings.llm_generate_p95_budget_ms,
+        },
+        max_error_rate=settings.llm_max_error_rate,
+    )
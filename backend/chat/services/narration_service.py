@@ -0,0 +1,131 @@
+"""Background Stonewalker narration for response_mode="deferred" searches.
+
+A deferred search returns its places immediately together with a narration
+id and generates the response text on the process-wide background loop (see
+chat.utils.background; a task on the request's loop would be cancelled when
+a WSGI view returns). The id is the
+response cache key (intent, location, top place names), so it is stable
+across repeated searches: a search served from the search cache re-schedules
+the same id, and scheduling an id that is pending or ready is a no-op.
+
+Narrations live in this process (MemoryCache with the search cache's TTL),
+so GET /search/narration/{id} must reach the worker that ran the search, or
+any worker after the search is repeated there.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from functools import lru_cache
+from typing import Any
+
+from chat.config.constants import OPENAI_MODEL, SUPABASE_CACHE_TTL_MINUTES
+from chat.services import openai_service
+from chat.services.response_cache import response_cache_key
+from chat.utils.background import BackgroundLoop, get_background_loop
+from chat.utils.logger import get_logger
+from chat.utils.memory_cache import MemoryCache
+
+logger = get_logger(__name__)
+
+NARRATION_MAX_ENTRIES = 1024
+NARRATION_TTL_SECONDS = SUPABASE_CACHE_TTL_MINUTES * 60.0  # Outlives the cached search
+
+
+class NarrationStore:
+    """Pending narrations plus a TTL cache of finished text (thread-safe)."""
+
+    def __init__(
+        self,
+        maxsize: int = NARRATION_MAX_ENTRIES,
+        ttl_seconds: float = NARRATION_TTL_SECONDS,
+        background: BackgroundLoop | None = None,
+    ) -> None:
+        self._ready: MemoryCache[str] = MemoryCache(maxsize, ttl_seconds)
+        self._pending: dict[str, concurrent.futures.Future[str]] = {}
+        self._lock = threading.Lock()
+        self._background = background
+
+    @property
+    def background(self) -> BackgroundLoop:
+        """Loop narrations run on (the process-wide one unless injected)."""
+        return self._background or get_background_loop()
+
+    def schedule(
+        self,
+        intent: str,
+        location: str,
+        places: list[dict[str, Any]],
+        summary: dict[str, Any],
+    ) -> str:
+        """Start generating a narration unless it is already pending or ready.
+
+        Returns:
+            Narration id
+        """
+        narration_id = response_cache_key(OPENAI_MODEL, intent, location, places)
+        with self._lock:
+            if narration_id in self._pending or self._ready.get(narration_id) is not None:
+                return narration_id
+            future = self.background.submit(
+                openai_service.generate_response(intent, location, places, summary)
+            )
+            self._pending[narration_id] = future
+
+        # Outside the lock: the callback runs right here if the future is already done
+        future.add_done_callback(lambda done: self._finish(narration_id, done))
+        logger.info("narration.scheduled", narration_id=narration_id, location=location)
+        return narration_id
+
+    async def get(self, narration_id: str, wait_seconds: float = 0.0) -> str | None:
+        """Return a finished narration, optionally waiting for a pending one.
+
+        Args:
+            narration_id: Id returned by schedule()
+            wait_seconds: How long to wait for a pending narration
+
+        Returns:
+            The narration, or None while it is still pending
+
+        Raises:
+            KeyError: If the id is unknown or expired
+        """
+        # Pending first: _finish stores the text before dropping the future
+        with self._lock:
+            future = self._pending.get(narration_id)
+        if future is None:
+            text = self._ready.get(narration_id)
+            if text is None:
+                raise KeyError(narration_id)
+            return text
+
+        if wait_seconds > 0:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), wait_seconds
+                )
+            except TimeoutError:
+                return None
+        return self._ready.get(narration_id)
+
+    def _finish(self, narration_id: str, future: concurrent.futures.Future[str]) -> None:
+        try:
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                # generate_response falls back instead of raising; this is a bug guard
+                logger.error(
+                    "narration.failed", narration_id=narration_id, error=str(future.exception())
+                )
+                return
+            self._ready.set(narration_id, future.result())
+            logger.info("narration.ready", narration_id=narration_id)
+        finally:
+            with self._lock:
+                self._pending.pop(narration_id, None)
+
+
+@lru_cache(maxsize=1)
+def get_narration_store() -> NarrationStore:
+    """Process-wide narration store."""
+    return NarrationStore()
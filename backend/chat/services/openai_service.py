@@ -1,12 +1,18 @@
 """OpenAI service for parsing and response generation."""
 
+import asyncio
+import concurrent.futures
 import json
+import random
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import Any
 
 from openai import AsyncOpenAI
 
 from chat.config.constants import (
-    INTENT_KEYWORDS,
     OPENAI_MAX_TOKENS_PARSE,
     OPENAI_MAX_TOKENS_RESPONSE,
     OPENAI_MODEL,
@@ -14,19 +20,77 @@ from chat.config.constants import (
 )
 from chat.config.settings import get_settings
 from chat.schemas import ParsedInput
+from chat.services.llm_provider import create_async_llm_client
+from chat.services.llm_usage import CallUsage, get_token_ledger
+from chat.services.local_parser import parse_locally, parses_agree
+from chat.services.model_router import get_model_router
+from chat.services.parse_cache import get_parse_cache
+from chat.services.prompts import Prompt, build_parse_prompt, build_response_prompt
+from chat.services.response_cache import get_response_cache, response_cache_key
+from chat.utils.background import get_background_loop
 from chat.utils.logger import get_logger
+from chat.utils.loop_local import LoopLocal
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+# One client per event loop: request loops and the background loop (shadow
+# checks, deferred narration) must not share an httpx connection pool.
+_clients = LoopLocal(create_async_llm_client)
 
 
-async def parse_user_input(user_input: str) -> ParsedInput:
+def get_client() -> AsyncOpenAI:
+    """The running event loop's LLM client."""
+    return _clients.get()
+
+
+@dataclass
+class ParseStats:
+    """In-process counters for the fast path and parse cache (logged with every parse)."""
+
+    fast_path: int = 0
+    cached: int = 0
+    llm: int = 0
+    compared: int = 0
+    location_agreed: int = 0
+    intent_agreed: int = 0
+
+    @property
+    def fast_path_rate(self) -> float:
+        total = self.fast_path + self.cached + self.llm
+        return round(self.fast_path / total, 3) if total else 0.0
+
+    def record_agreement(self, location_match: bool, intent_match: bool) -> None:
+        self.compared += 1
+        self.location_agreed += location_match
+        self.intent_agreed += intent_match
+
+
+parse_stats = ParseStats()
+_shadow_checks: set[concurrent.futures.Future[None]] = set()
+
+
+async def parse_user_input(
+    user_input: str, diagnostics: dict[str, Any] | None = None
+) -> ParsedInput:
     """Parse user input to extract location and intent.
 
+    The local parser runs first; when its confidence reaches
+    settings.parse_fast_path_threshold the OpenAI call is skipped. Otherwise
+    the parse cache (normalized input, see parse_cache) is checked, then the
+    LLM parses and the two results are compared and logged. A sample of
+    fast-path parses (settings.parse_shadow_sample_rate) is also checked
+    against the LLM in the background, so agreement is known above the
+    threshold too. The LLM model comes from the model router; when every
+    candidate is degraded the local parse is used instead. Only parses from
+    the primary model (OPENAI_MODEL) are cached. The LLM prompt is
+    trimmed to settings.llm_parse_prompt_token_budget (see prompts).
+
     Args:
         user_input: Raw user query
+        diagnostics: Optional dict filled with the parse source ("fast_path",
+            "cache", "llm", "template" or "fallback"), the route decision and,
+            after an LLM call, its token usage
 
     Returns:
         Parsed input with location, intent, and confidence
@@ -34,94 +98,190 @@ async def parse_user_input(user_input: str) -> ParsedInput:
     Raises:
         UpstreamError: If OpenAI API fails
     """
-    try:
-        completion = await client.chat.completions.create(
-            model=OPENAI_MODEL,
-            temperature=OPENAI_TEMPERATURE,
-            max_tokens=OPENAI_MAX_TOKENS_PARSE,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """Parse travel queries into location and intent. Return JSON with "location" and "intent" fields.
-
-Examples:
-"hidden gems in Pikeville KY" -> {"location": "Pikeville, KY", "intent": "hidden gems"}
-"cool underground spots near Atlanta" -> {"location": "Atlanta, GA", "intent": "underground spots"}
-"weird stuff to do in Portland Oregon" -> {"location": "Portland, OR", "intent": "weird stuff"}
-
-Extract the most specific location and the clearest intent description.""",
-                },
-                {"role": "user", "content": user_input},
-            ],
+    diagnostics = diagnostics if diagnostics is not None else {}
+    local = parse_locally(user_input)
+
+    if local.location and local.confidence >= settings.parse_fast_path_threshold:
+        parse_stats.fast_path += 1
+        logger.info(
+            "openai.parse_fast_path",
+            location=local.location,
+            intent=local.intent,
+            confidence=local.confidence,
+            fast_path_rate=parse_stats.fast_path_rate,
         )
-
-        result = json.loads(completion.choices[0].message.content or "{}")
-
-        return ParsedInput(
-            location=result.get("location", ""),
-            intent=result.get("intent", ""),
-            confidence=0.8,
+        diagnostics["source"] = "fast_path"
+        if random.random() < settings.parse_shadow_sample_rate:
+            # On the process-wide loop: a task on the request loop is cancelled
+            # when a WSGI view returns.
+            check = get_background_loop().submit(_compare_with_llm(user_input, local))
+            _shadow_checks.add(check)
+            check.add_done_callback(_shadow_checks.discard)
+        return local
+
+    cache = get_parse_cache()
+    cached = await asyncio.to_thread(cache.get, OPENAI_MODEL, user_input)
+    if cached is not None:
+        parse_stats.cached += 1
+        logger.info(
+            "openai.parse_cache_hit",
+            location=cached.location,
+            hit_rate=round(cache.stats()["total_hit_rate"], 3),
         )
+        diagnostics["source"] = "cache"
+        return cached
 
+    route = get_model_router().choose("parse")
+    diagnostics["route"] = route.to_dict()
+    if route.model is None:
+        diagnostics["source"] = "template"
+        return _parse_heuristically(user_input)
+
+    parse_stats.llm += 1
+    try:
+        parsed = await _parse_with_llm(user_input, route.model, diagnostics)
     except Exception as e:
         logger.warning(
             "openai.parse_failed",
             error=str(e),
+            model=route.model,
             input_preview=user_input[:100],
         )
+        diagnostics["source"] = "fallback"
         return _parse_heuristically(user_input)
 
+    diagnostics["source"] = "llm"
+    if route.model == OPENAI_MODEL:  # Entries are keyed on the primary model
+        await asyncio.to_thread(cache.set, OPENAI_MODEL, user_input, parsed)
+    _log_agreement(local, parsed, shadow=False)
+    return parsed
+
+
+async def _parse_with_llm(
+    user_input: str, model: str, diagnostics: dict[str, Any] | None = None
+) -> ParsedInput:
+    """Parse with the routed model (JSON location/intent), recording the outcome and usage."""
+    prompt = build_parse_prompt(user_input, model, settings.llm_parse_prompt_token_budget)
+    async with _routed_call("parse", model):
+        completion = await get_client().chat.completions.create(
+            model=model,
+            temperature=OPENAI_TEMPERATURE,
+            max_tokens=OPENAI_MAX_TOKENS_PARSE,
+            messages=prompt.messages,
+        )
+
+        result = json.loads(completion.choices[0].message.content or "{}")
+
+    _record_usage("parse", model, prompt, completion.usage, diagnostics)
+    return ParsedInput(
+        location=result.get("location", ""),
+        intent=result.get("intent", ""),
+        confidence=0.8,
+    )
+
+
+@asynccontextmanager
+async def _routed_call(operation: str, model: str) -> AsyncIterator[None]:
+    """Time an LLM call and record latency and success with the model router."""
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        get_model_router().record(operation, model, (time.perf_counter() - started) * 1000, ok)
+
+
+def _record_usage(
+    operation: str,
+    model: str,
+    prompt: Prompt,
+    usage: Any | None,
+    diagnostics: dict[str, Any] | None,
+) -> None:
+    """Add a call's estimated and reported tokens to the ledger and diagnostics."""
+    if prompt.trimmed:
+        logger.info(
+            "openai.prompt_trimmed",
+            operation=operation,
+            tokens=prompt.tokens,
+            budget=prompt.budget,
+        )
+    call = CallUsage.from_response(prompt.tokens, usage)
+    get_token_ledger().record(operation, model, call)
+    if diagnostics is not None:
+        diagnostics["tokens"] = {
+            **call.to_dict(),
+            "budget": prompt.budget,
+            "trimmed": prompt.trimmed,
+        }
+
+
+async def _compare_with_llm(user_input: str, local: ParsedInput) -> None:
+    """Shadow-check a fast-path parse against the LLM (never raises)."""
+    route = get_model_router().choose("parse")
+    if route.model is None:
+        return
+
+    try:
+        _log_agreement(local, await _parse_with_llm(user_input, route.model), shadow=True)
+    except Exception as e:
+        logger.warning("openai.parse_shadow_failed", error=str(e))
+
+
+def _log_agreement(local: ParsedInput, llm: ParsedInput, shadow: bool) -> None:
+    location_match, intent_match = parses_agree(local, llm)
+    parse_stats.record_agreement(location_match, intent_match)
+    logger.info(
+        "openai.parse_agreement",
+        shadow=shadow,
+        local_confidence=local.confidence,
+        location_match=location_match,
+        intent_match=intent_match,
+        local_location=local.location,
+        llm_location=llm.location,
+        fast_path_rate=parse_stats.fast_path_rate,
+        location_agreement=round(parse_stats.location_agreed / parse_stats.compared, 3),
+    )
+
 
 def _parse_heuristically(user_input: str) -> ParsedInput:
-    """Fallback heuristic parsing when OpenAI fails.
+    """Fallback parsing when OpenAI fails.
 
     Args:
         user_input: Raw user input
 
     Returns:
-        Heuristically parsed input
+        Local parse, whatever its confidence
     """
-    text = user_input.lower()
-
-    location_patterns = [
-        r"in\s+([^,]+,?\s*[a-z]{2})",
-        r"near\s+([^,]+)",
-        r"([^,]+,\s*[a-z]{2})",
-        r"([a-z\s]+(?:city|town|ville|burg|port))",
-    ]
-
-    import re
-
-    location = ""
-    for pattern in location_patterns:
-        match = re.search(pattern, user_input, re.IGNORECASE)
-        if match:
-            location = match.group(1).strip()
-            break
-
-    intent = "hidden gems"
-    for keyword in INTENT_KEYWORDS:
-        if keyword in text:
-            intent = keyword
-            break
-
-    return ParsedInput(
-        location=location or "unknown",
-        intent=intent,
-        confidence=0.6 if location else 0.3,
-    )
+    parsed = parse_locally(user_input)
+    if not parsed.location:
+        return ParsedInput(location="unknown", intent=parsed.intent, confidence=parsed.confidence)
+    return parsed
 
 
 async def generate_response(
-    intent: str, location: str, places: list[dict[str, Any]], summary: dict[str, Any]
+    intent: str,
+    location: str,
+    places: list[dict[str, Any]],
+    summary: dict[str, Any],
+    diagnostics: dict[str, Any] | None = None,
 ) -> str:
     """Generate Stonewalker-style response.
 
+    Responses are cached on intent, location and the top place names (see
+    response_cache); fallback text and replies from a degraded-route model are
+    never cached. The model comes from the model router; when every candidate
+    is degraded the template is used.
+
     Args:
         intent: User's search intent
         location: Normalized location
         places: List of discovered places
         summary: Scoring summary
+        diagnostics: Optional dict filled with the response source ("cache",
+            "llm", "template" or "fallback"), the route decision and, after an
+            LLM call, its token usage
 
     Returns:
         Generated response text
@@ -129,46 +289,166 @@ async def generate_response(
     Raises:
         UpstreamError: If OpenAI API fails
     """
+    diagnostics = diagnostics if diagnostics is not None else {}
+    cache = get_response_cache()
+    cache_key = response_cache_key(OPENAI_MODEL, intent, location, places)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info("openai.response_cache_hit", hit_rate=round(cache.stats()["hit_rate"], 3))
+        diagnostics["source"] = "cache"
+        return cached
+
+    route = get_model_router().choose("generate")
+    diagnostics["route"] = route.to_dict()
+    if route.model is None:
+        diagnostics["source"] = "template"
+        return _generate_fallback_response(intent, location, places)
+
+    prompt = _response_prompt(intent, location, places, summary, route.model)
     try:
-        places_text = "\n".join(
-            [f"• {p.get('name', 'Unknown')}: {p.get('description', '')[:100]}" for p in places[:5]]
-        )
+        async with _routed_call("generate", route.model):
+            completion = await get_client().chat.completions.create(
+                model=route.model,
+                temperature=0.4,
+                max_tokens=OPENAI_MAX_TOKENS_RESPONSE,
+                messages=prompt.messages,
+            )
 
-        completion = await client.chat.completions.create(
-            model=OPENAI_MODEL,
-            temperature=0.4,
-            max_tokens=OPENAI_MAX_TOKENS_RESPONSE,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are Stonewalker, a mystical and concise travel guide who uncovers hidden places.
+    except Exception as e:
+        logger.error("openai.generate_failed", error=str(e), model=route.model)
+        diagnostics["source"] = "fallback"
+        return _generate_fallback_response(intent, location, places)
 
-Respond with wisdom and brevity in 2-3 sentences. Be helpful but never overly enthusiastic.
-Reference the specific places found and give practical advice.
+    _record_usage("generate", route.model, prompt, completion.usage, diagnostics)
+    content = completion.choices[0].message.content
+    if not content:
+        diagnostics["source"] = "fallback"
+        return _generate_fallback_response(intent, location, places)
 
-Style: Mystical, wise, slightly mysterious, but practical and helpful.""",
-                },
-                {
-                    "role": "user",
-                    "content": f"""User seeks: {intent} in {location}
+    diagnostics["source"] = "llm"
+    if route.model == OPENAI_MODEL:  # The key names the primary model
+        cache.set(cache_key, content)
+    return content
+
+
+async def generate_response_stream(
+    intent: str,
+    location: str,
+    places: list[dict[str, Any]],
+    summary: dict[str, Any],
+    diagnostics: dict[str, Any] | None = None,
+) -> AsyncIterator[str]:
+    """Stream a Stonewalker-style response as text chunks.
+
+    Same prompt as generate_response(), but chunks are yielded as OpenAI
+    produces them so an HTTP layer can forward them (e.g. Django's
+    StreamingHttpResponse accepts the iterator directly). Never raises: if
+    the stream fails before any text, the fallback response is yielded
+    instead; if it fails mid-stream, the fallback follows the partial text as
+    a new paragraph so the reply still ends with usable guidance. Complete
+    streams are stored in the response cache, and a cache hit is yielded as a
+    single chunk. Routing works as in generate_response(); the router records
+    the time to the last chunk.
 
-Found places:
-{places_text}
+    Args:
+        intent: User's search intent
+        location: Normalized location
+        places: List of discovered places
+        summary: Scoring summary
+        diagnostics: Optional dict filled as in generate_response()
 
-Scoring summary: {summary.get("total_results", 0)} results, average score {summary.get("average_score", 0):.1f}/1.0
+    Yields:
+        Response text chunks
+    """
+    diagnostics = diagnostics if diagnostics is not None else {}
+    cache = get_response_cache()
+    cache_key = response_cache_key(OPENAI_MODEL, intent, location, places)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info("openai.response_cache_hit", hit_rate=round(cache.stats()["hit_rate"], 3))
+        diagnostics["source"] = "cache"
+        yield cached
+        return
+
+    router = get_model_router()
+    route = router.choose("generate")
+    diagnostics["route"] = route.to_dict()
+    if route.model is None:
+        diagnostics["source"] = "template"
+        yield _generate_fallback_response(intent, location, places)
+        return
+
+    prompt = _response_prompt(intent, location, places, summary, route.model)
+    started = time.perf_counter()
+    chunks: list[str] = []
+    usage = None
 
-Write a brief Stonewalker response.""",
-                },
-            ],
+    try:
+        stream = await get_client().chat.completions.create(
+            model=route.model,
+            temperature=0.4,
+            max_tokens=OPENAI_MAX_TOKENS_RESPONSE,
+            messages=prompt.messages,
+            stream=True,
+            stream_options={"include_usage": True},
         )
 
-        return completion.choices[0].message.content or _generate_fallback_response(
-            intent, location, places
-        )
+        async for chunk in stream:
+            usage = chunk.usage or usage  # Only the final, choice-less chunk carries usage
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if not text:
+                continue
+            if not chunks:
+                logger.debug(
+                    "openai.stream_first_chunk",
+                    first_chunk_ms=int((time.perf_counter() - started) * 1000),
+                )
+            chunks.append(text)
+            yield text
 
     except Exception as e:
-        logger.error("openai.generate_failed", error=str(e))
-        return _generate_fallback_response(intent, location, places)
+        router.record("generate", route.model, (time.perf_counter() - started) * 1000, ok=False)
+        logger.error(
+            "openai.stream_failed", error=str(e), model=route.model, chunks_emitted=len(chunks)
+        )
+        diagnostics["source"] = "fallback"
+        fallback = _generate_fallback_response(intent, location, places)
+        yield f"\n\n{fallback}" if chunks else fallback
+        return
+
+    router.record("generate", route.model, (time.perf_counter() - started) * 1000, ok=True)
+    _record_usage("generate", route.model, prompt, usage, diagnostics)
+    if not chunks:
+        diagnostics["source"] = "fallback"
+        yield _generate_fallback_response(intent, location, places)
+        return
+
+    diagnostics["source"] = "llm"
+    if route.model == OPENAI_MODEL:  # The key names the primary model
+        cache.set(cache_key, "".join(chunks))
+    logger.info(
+        "openai.stream_complete",
+        chunks=len(chunks),
+        elapsed_ms=int((time.perf_counter() - started) * 1000),
+    )
+
+
+def _response_prompt(
+    intent: str,
+    location: str,
+    places: list[dict[str, Any]],
+    summary: dict[str, Any],
+    model: str,
+) -> Prompt:
+    """Build the Stonewalker prompt shared by the blocking and streaming calls."""
+    return build_response_prompt(
+        intent, location, places, summary, model, settings.llm_generate_prompt_token_budget
+    )
+
+
+def generate_template_response(intent: str, location: str, places: list[dict[str, Any]]) -> str:
+    """Non-LLM response for clients that do not need narration (response_mode="fast")."""
+    return _generate_fallback_response(intent, location, places)
 
 
 def _generate_fallback_response(intent: str, location: str, places: list[dict[str, Any]]) -> str:
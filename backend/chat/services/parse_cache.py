@@ -0,0 +1,175 @@
+"""Cache of LLM parse results keyed on normalized input.
+
+A parse depends only on the input text and the model, and phrasings that
+differ only in case, punctuation or whitespace parse the same way, so
+parse_user_input() checks this cache before calling OpenAI. Two tiers:
+
+- In-process LRU (MemoryCache) with the same TTL as the table
+- Persistent table app_cache.parse_cache (see migration 016), shared by all
+  workers and surviving restarts
+
+The persistent tier is best-effort: failures are logged and treated as misses.
+Only LLM parses are stored; local fast-path parses are cheaper than a lookup.
+"""
+
+import hashlib
+import re
+import threading
+import unicodedata
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import Any
+
+from chat.schemas import ParsedInput
+from chat.services.supabase_service import SupabaseService
+from chat.utils.logger import get_logger
+from chat.utils.memory_cache import MemoryCache
+
+logger = get_logger(__name__)
+
+PARSE_CACHE_MAX_ENTRIES = 4096
+PARSE_CACHE_TTL_HOURS = 24 * 7  # Place names and phrasing don't change; bounds prompt edits
+PARSE_CACHE_TABLE = "parse_cache"
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_parse_input(text: str) -> str:
+    """Fold case, punctuation and whitespace (NFKC) for cache keying."""
+    folded = unicodedata.normalize("NFKC", text).casefold().replace("_", " ")
+    return " ".join(_NON_WORD.sub(" ", folded).split())
+
+
+def parse_cache_key(model: str, text: str) -> str:
+    """Hash the parse model plus normalized input into a 64-char hex key."""
+    payload = f"{model}\n{normalize_parse_input(text)}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ParseCache:
+    """Two-tier (memory + Supabase table) cache of ParsedInput."""
+
+    def __init__(
+        self,
+        supabase: Any | None,
+        max_entries: int = PARSE_CACHE_MAX_ENTRIES,
+        ttl_hours: float = PARSE_CACHE_TTL_HOURS,
+    ) -> None:
+        """Create the cache.
+
+        Args:
+            supabase: SupabaseService for the persistent tier (None = memory only)
+            max_entries: In-process LRU capacity
+            ttl_hours: Lifetime of an entry in both tiers
+        """
+        self.supabase = supabase
+        self.ttl_hours = ttl_hours
+        self.memory: MemoryCache[ParsedInput] = MemoryCache(max_entries, ttl_hours * 3600)
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, model: str, text: str) -> ParsedInput | None:
+        """Look up a parse (memory first; table hits are promoted to memory).
+
+        Args:
+            model: Parse model name (different models never share entries)
+            text: Raw user input
+
+        Returns:
+            A copy of the cached parse, or None on a miss
+        """
+        key = parse_cache_key(model, text)
+        parsed = self.memory.get(key)
+        if parsed is not None:
+            logger.debug("parse_cache.hit", tier="memory")
+            return parsed.model_copy()
+
+        if self.supabase is None:
+            return None
+
+        parsed = self._read_persistent(key)
+        with self._lock:
+            if parsed is None:
+                self.persistent_misses += 1
+                return None
+            self.persistent_hits += 1
+
+        self.memory.set(key, parsed)
+        logger.debug("parse_cache.hit", tier="persistent")
+        return parsed.model_copy()
+
+    def set(self, model: str, text: str, parsed: ParsedInput) -> None:
+        """Write a parse to both tiers.
+
+        Args:
+            model: Parse model name
+            text: Raw user input
+            parsed: LLM parse result
+        """
+        key = parse_cache_key(model, text)
+        self.memory.set(key, parsed.model_copy())
+
+        if self.supabase is None:
+            return
+
+        try:
+            self.supabase.client.table(PARSE_CACHE_TABLE).upsert(
+                {
+                    "input_hash": key,
+                    "normalized_input": normalize_parse_input(text),
+                    "location": parsed.location,
+                    "intent": parsed.intent,
+                    "confidence": parsed.confidence,
+                    "expires_at": (datetime.now(UTC) + timedelta(hours=self.ttl_hours)).isoformat(),
+                },
+                on_conflict="input_hash",
+            ).execute()
+
+        except Exception as e:
+            logger.warning("parse_cache.write_error", error=str(e))
+
+    def clear(self) -> None:
+        """Drop in-process entries and reset counters (the table is kept)."""
+        self.memory.clear()
+        with self._lock:
+            self.persistent_hits = 0
+            self.persistent_misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Return LRU statistics plus persistent-tier hits and misses."""
+        memory = self.memory.stats()
+        with self._lock:
+            hits = memory["hits"] + self.persistent_hits
+            lookups = memory["hits"] + memory["misses"]
+            return {
+                **memory,
+                "persistent_hits": self.persistent_hits,
+                "persistent_misses": self.persistent_misses,
+                "total_hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def _read_persistent(self, key: str) -> ParsedInput | None:
+        """Fetch an unexpired parse from the persistent table."""
+        try:
+            response = (
+                self.supabase.client.table(PARSE_CACHE_TABLE)  # type: ignore[union-attr]
+                .select("location,intent,confidence")
+                .eq("input_hash", key)
+                .gt("expires_at", datetime.now(UTC).isoformat())
+                .limit(1)
+                .execute()
+            )
+
+            rows = [row for row in response.data or [] if isinstance(row, dict)]
+            return ParsedInput(**rows[0]) if rows else None
+
+        except Exception as e:
+            logger.warning("parse_cache.read_error", error=str(e))
+            return None
+
+
+@lru_cache(maxsize=1)
+def get_parse_cache() -> ParseCache:
+    """Process-wide parse cache backed by the Supabase table."""
+    return ParseCache(SupabaseService())
@@ -0,0 +1,128 @@
+"""Prompt templates and per-request token budgets for the OpenAI calls.
+
+Each prompt is a static system message (instructions and examples, never
+interpolated) followed by one user message holding everything request
+specific, so edits belong in the system text and variables in the user text.
+A static prefix is what OpenAI's prompt caching would reuse, but it only
+applies to prompts of at least 1024 tokens; these are far shorter, so no
+caching benefit is expected (llm_usage reports cached_tokens as 0) unless
+the prompts grow past that threshold.
+
+Budgets count the whole request locally (chat.utils.tokenizer plus the
+chat format's per-message overhead). When a prompt would exceed its budget
+the variable part is trimmed, least important first:
+
+- generate: lower-ranked places lose their description, then are dropped
+- parse: the user input is truncated
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from openai.types.chat import ChatCompletionMessageParam
+
+from chat.utils.tokenizer import count_tokens, truncate_to_tokens
+
+TOKENS_PER_MESSAGE = 3  # Role and separators per chat message
+TOKENS_PER_REPLY = 3  # Assistant reply priming
+PROMPT_PLACES = 5
+PLACE_DESCRIPTION_CHARS = 100
+
+PARSE_SYSTEM_PROMPT = """Extract the location and intent of a travel query. Reply with JSON only: {"location": "City, ST", "intent": "short phrase"}.
+hidden gems in Pikeville KY -> {"location": "Pikeville, KY", "intent": "hidden gems"}
+cool underground spots near Atlanta -> {"location": "Atlanta, GA", "intent": "underground spots"}
+weird stuff to do in Portland Oregon -> {"location": "Portland, OR", "intent": "weird stuff"}"""
+
+RESPONSE_SYSTEM_PROMPT = """You are Stonewalker, a mystical, concise guide to hidden places.
+Reply in 2-3 sentences: wise, slightly mysterious, practical, never gushing.
+Name the specific places found and give practical advice."""
+
+
+@dataclass
+class Prompt:
+    """Messages for one call plus their local token count."""
+
+    messages: list[ChatCompletionMessageParam]
+    tokens: int
+    budget: int
+    trimmed: bool = False
+
+
+def count_message_tokens(contents: Sequence[str], model: str) -> int:
+    """Count a chat request's prompt tokens from its message contents."""
+    return (
+        sum(count_tokens(content, model) + TOKENS_PER_MESSAGE for content in contents)
+        + TOKENS_PER_REPLY
+    )
+
+
+def build_parse_prompt(user_input: str, model: str, budget: int) -> Prompt:
+    """Parse prompt, truncating the user input to fit the budget.
+
+    Args:
+        user_input: Raw user query
+        model: Model name (selects the tokenizer)
+        budget: Maximum prompt tokens
+    """
+    fixed = count_message_tokens([PARSE_SYSTEM_PROMPT, ""], model)
+    text = truncate_to_tokens(user_input, max(budget - fixed, 0), model)
+    return _prompt(PARSE_SYSTEM_PROMPT, text, model, budget, trimmed=text != user_input)
+
+
+def build_response_prompt(
+    intent: str,
+    location: str,
+    places: list[dict[str, Any]],
+    summary: dict[str, Any],
+    model: str,
+    budget: int,
+) -> Prompt:
+    """Stonewalker prompt with as many ranked places as fit the budget.
+
+    Places are added in rank order; one that does not fit with its
+    description is added by name alone, and the first that does not fit at
+    all ends the list.
+
+    Args:
+        intent: User's search intent
+        location: Normalized location
+        places: Places in rank order (at most PROMPT_PLACES are used)
+        summary: Scoring summary
+        model: Model name (selects the tokenizer)
+        budget: Maximum prompt tokens
+    """
+    head = f"Seeker wants: {intent} in {location}\nPlaces:"
+    tail = (
+        f"\n{summary.get('total_results', 0)} results, "
+        f"average score {summary.get('average_score', 0):.1f}/1.0"
+    )
+    remaining = budget - count_message_tokens([RESPONSE_SYSTEM_PROMPT, head + tail], model)
+
+    lines: list[str] = []
+    trimmed = False
+    for place in places[:PROMPT_PLACES]:
+        name = place.get("name", "Unknown")
+        description = str(place.get("description") or "")[:PLACE_DESCRIPTION_CHARS].strip()
+        for line in ([f"\n• {name}: {description}"] if description else []) + [f"\n• {name}"]:
+            cost = count_tokens(line, model)
+            if cost <= remaining:
+                lines.append(line)
+                remaining -= cost
+                break
+            trimmed = True
+        else:
+            break
+
+    return _prompt(
+        RESPONSE_SYSTEM_PROMPT, head + "".join(lines) + tail, model, budget, trimmed=trimmed
+    )
+
+
+def _prompt(system: str, user: str, model: str, budget: int, trimmed: bool) -> Prompt:
+    return Prompt(
+        messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+        tokens=count_message_tokens([system, user], model),
+        budget=budget,
+        trimmed=trimmed,
+    )
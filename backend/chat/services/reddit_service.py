@@ -45,6 +45,7 @@ async def search_reddit_rss(location: str, intent: str) -> list[SearchResult]:
                     source="reddit",
                     url=f"https://reddit.com{post.get('permalink', '')}",
                     metadata={
+                        "post_id": post.get("id"),
                         "subreddit": post.get("subreddit"),
                         "score": post.get("score"),
                     },
@@ -0,0 +1,302 @@
+"""Resumable re-embedding of places_embeddings for model migrations.
+
+Streams places_embeddings in keyset-paginated chunks (ORDER BY id), re-embeds
+each chunk in concurrent rate-limited batches with the target model, writes
+the vectors to app_embeddings.places_embeddings_shadow and checkpoints the
+cursor in app_embeddings.reembed_jobs (migration 012). Re-running with the
+same job_id resumes after the last checkpoint. Each shadow row records the
+source row's updated_at; rows changed after they were re-embedded are picked
+up again by the final sweep (migration 018).
+
+Once every row has a current shadow vector, swap_reembedded_embeddings()
+replaces the live column, rebuilds the vector indexes and records the new
+lists and probes in index_tuning, in one transaction. The target
+model must produce the live column's dimensions (the search RPCs are typed
+vector(1536)); the swap rejects any other size.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from openai import AsyncOpenAI
+from supabase import AsyncClient
+
+from chat.services.embedding_service import (
+    MAX_BATCH_ITEMS,
+    EmbeddingBatchItem,
+    EmbeddingError,
+    EmbeddingValidationMixin,
+)
+from chat.services.embedding_text import build_embedding_text
+from chat.services.index_tuning import recommended_probes
+from chat.services.supabase_service import response_rows
+from chat.utils.logger import get_logger
+from chat.utils.rate_limiter import AsyncRateLimiter
+from chat.utils.tokenizer import count_tokens
+
+logger = get_logger(__name__)
+
+PLACES_TABLE = "app_embeddings.places_embeddings"
+SHADOW_TABLE = "app_embeddings.places_embeddings_shadow"
+JOBS_TABLE = "app_embeddings.reembed_jobs"
+
+REEMBED_CONCURRENCY = 4
+REEMBED_REQUESTS_PER_MINUTE = 3_000
+REEMBED_TOKENS_PER_MINUTE = 1_000_000
+DEFAULT_IVFFLAT_LISTS = 100
+
+
+@dataclass
+class ReembedProgress:
+    """Counters reported after each checkpoint and at the end of a run."""
+
+    job_id: str
+    processed: int = 0
+    failed: int = 0
+    last_id: str | None = None
+    swapped: bool = False
+
+
+class Reembedder(EmbeddingValidationMixin):
+    """Re-embed every place with a target model into the shadow table.
+
+    Batches are sent concurrently within one chunk only, so at most
+    chunk_size / MAX_BATCH_ITEMS requests are in flight. The default chunk
+    (concurrency * MAX_BATCH_ITEMS rows) lets every concurrency slot fill.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        openai_client: AsyncOpenAI,
+        job_id: str,
+        model: str,
+        dimensions: int,
+        chunk_size: int | None = None,
+        concurrency: int = REEMBED_CONCURRENCY,
+        limiter: AsyncRateLimiter | None = None,
+    ) -> None:
+        self.client = client
+        self.openai_client = openai_client
+        self.job_id = job_id
+        self.embedding_model = model
+        self.embedding_dimensions = dimensions
+        self.chunk_size = chunk_size or concurrency * MAX_BATCH_ITEMS
+        self.limiter = limiter or AsyncRateLimiter(
+            REEMBED_REQUESTS_PER_MINUTE, REEMBED_TOKENS_PER_MINUTE
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(self, swap: bool = True, lists: int = DEFAULT_IVFFLAT_LISTS) -> ReembedProgress:
+        """Re-embed all remaining rows, then optionally swap.
+
+        Args:
+            swap: Swap the live column once every row has a shadow vector
+            lists: ivfflat lists for the rebuilt index
+
+        Returns:
+            Final progress
+
+        Raises:
+            EmbeddingError: If the job exists with a different model/dimensions,
+                was already swapped, or rows are still missing at swap time
+        """
+        progress = await self._load_or_create_job()
+
+        while rows := await self._next_chunk(progress.last_id):
+            written, failed = await self._reembed_rows(rows)
+            progress.processed += written
+            progress.failed += failed
+            progress.last_id = rows[-1]["id"]
+            await self._checkpoint(progress)
+
+        await self._sweep_missing(progress)
+
+        if swap:
+            await self._swap(lists)
+            progress.swapped = True
+
+        logger.info(
+            "reembed.complete",
+            job_id=self.job_id,
+            processed=progress.processed,
+            failed=progress.failed,
+            swapped=progress.swapped,
+        )
+        return progress
+
+    async def _load_or_create_job(self) -> ReembedProgress:
+        """Resume the job's checkpoint, or create it."""
+        response = (
+            await self.client.table(JOBS_TABLE).select("*").eq("job_id", self.job_id).execute()
+        )
+        jobs = response_rows(response.data)
+        job = jobs[0] if jobs else None
+
+        if job is None:
+            await self.client.table(JOBS_TABLE).insert(
+                {
+                    "job_id": self.job_id,
+                    "model": self.embedding_model,
+                    "dimensions": self.embedding_dimensions,
+                }
+            ).execute()
+            logger.info(
+                "reembed.job_created",
+                job_id=self.job_id,
+                model=self.embedding_model,
+                dimensions=self.embedding_dimensions,
+            )
+            return ReembedProgress(job_id=self.job_id)
+
+        if (job["model"], job["dimensions"]) != (self.embedding_model, self.embedding_dimensions):
+            raise EmbeddingError(
+                f"Job {self.job_id} targets {job['model']} ({job['dimensions']}d), "
+                f"not {self.embedding_model} ({self.embedding_dimensions}d)"
+            )
+        if job["status"] == "swapped":
+            raise EmbeddingError(f"Job {self.job_id} was already swapped")
+
+        logger.info("reembed.job_resumed", job_id=self.job_id, last_id=job["last_id"])
+        return ReembedProgress(
+            job_id=self.job_id,
+            processed=int(job["processed"]),
+            failed=int(job["failed"]),
+            last_id=job["last_id"],
+        )
+
+    async def _next_chunk(self, last_id: str | None) -> list[dict[str, Any]]:
+        """Fetch the next keyset page (id > last_id)."""
+        query = self.client.table(PLACES_TABLE).select("id,metadata,updated_at")
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        response = await query.order("id").limit(self.chunk_size).execute()
+        return response_rows(response.data)
+
+    async def _reembed_rows(self, rows: list[dict[str, Any]]) -> tuple[int, int]:
+        """Embed rows with the target model and upsert them into the shadow table.
+
+        Returns:
+            (rows written, rows failed)
+        """
+        items, pending = self._plan_embeddings(
+            [
+                build_embedding_text(row.get("metadata") or {}, model=self.embedding_model)
+                for row in rows
+            ]
+        )
+        await asyncio.gather(*(self._embed_batch(b, items) for b in self._pack_batches(pending)))
+
+        shadow_rows = [
+            {
+                "job_id": self.job_id,
+                "id": rows[item.index]["id"],
+                "embedding": item.embedding,
+                "source_updated_at": rows[item.index].get("updated_at"),
+            }
+            for item in items
+            if item.ok
+        ]
+        if shadow_rows:
+            await (
+                self.client.table(SHADOW_TABLE)
+                .upsert(shadow_rows, on_conflict="job_id,id")
+                .execute()
+            )
+
+        for item in items:
+            if not item.ok:
+                logger.warning(
+                    "reembed.row_failed",
+                    job_id=self.job_id,
+                    id=rows[item.index]["id"],
+                    error=item.error,
+                )
+
+        return len(shadow_rows), len(rows) - len(shadow_rows)
+
+    async def _embed_batch(
+        self, batch: list[tuple[int, str]], items: list[EmbeddingBatchItem], attempt: int = 0
+    ) -> None:
+        """Embed one packed batch within the rate limits.
+
+        Failed requests are retried or split as _plan_batch_retry decides;
+        backoff sleeps do not hold a concurrency slot.
+        """
+        tokens = sum(count_tokens(text, self.embedding_model) for _, text in batch)
+
+        try:
+            async with self._semaphore:
+                await self.limiter.acquire(tokens)
+                response = await self.openai_client.embeddings.create(
+                    **self._embedding_request(), input=[text for _, text in batch]
+                )
+            rows = self._batch_rows(batch, response)
+        except Exception as e:
+            retry = self._plan_batch_retry(batch, items, e, attempt)
+            if retry.delay:
+                await asyncio.sleep(retry.delay)
+            for follow_up, next_attempt in retry.requests:
+                await self._embed_batch(follow_up, items, next_attempt)
+            return
+
+        self._apply_batch_rows(batch, rows, items)
+
+    async def _checkpoint(self, progress: ReembedProgress) -> None:
+        """Persist the cursor after its chunk's shadow rows are written."""
+        await (
+            self.client.table(JOBS_TABLE)
+            .update(
+                {
+                    "last_id": progress.last_id,
+                    "processed": progress.processed,
+                    "failed": progress.failed,
+                    "updated_at": datetime.now(UTC).isoformat(),
+                }
+            )
+            .eq("job_id", self.job_id)
+            .execute()
+        )
+
+        logger.info(
+            "reembed.checkpoint",
+            job_id=self.job_id,
+            processed=progress.processed,
+            failed=progress.failed,
+            last_id=progress.last_id,
+        )
+
+    async def _sweep_missing(self, progress: ReembedProgress) -> None:
+        """Embed rows the keyset pass missed (inserted behind the cursor, failed or updated since).
+
+        Stops when nothing is missing or a page makes no progress.
+        """
+        while True:
+            response = await self.client.rpc(
+                "app_embeddings.get_reembed_missing",
+                {"p_job_id": self.job_id, "p_limit": self.chunk_size},
+            ).execute()
+            rows = response_rows(response.data)
+            if not rows:
+                return
+
+            written, _ = await self._reembed_rows(rows)
+            progress.processed += written
+            logger.info("reembed.sweep", job_id=self.job_id, missing=len(rows), written=written)
+
+            if written == 0:
+                return
+
+    async def _swap(self, lists: int) -> None:
+        """Swap the live column for the shadow vectors and rebuild the index."""
+        try:
+            response = await self.client.rpc(
+                "app_embeddings.swap_reembedded_embeddings",
+                {"p_job_id": self.job_id, "p_lists": lists, "p_probes": recommended_probes(lists)},
+            ).execute()
+        except Exception as e:
+            raise EmbeddingError(f"Swap failed for job {self.job_id}: {str(e)}") from e
+
+        logger.info("reembed.swapped", job_id=self.job_id, result=response.data)
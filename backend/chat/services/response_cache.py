@@ -0,0 +1,90 @@
+"""In-process cache of generated Stonewalker responses.
+
+The response prompt is dominated by the intent, the location and the top
+five places, so a search that gathers the same top places again gets an
+equivalent answer. Entries are keyed on the model, the normalized intent and
+location, and a fingerprint of the top place names in prompt order; the
+scoring summary and descriptions are deliberately left out. The TTL bounds
+how long a reply can outlive changes to those details.
+"""
+
+import hashlib
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+
+from chat.services.parse_cache import normalize_parse_input
+from chat.utils.logger import get_logger
+from chat.utils.memory_cache import MemoryCache
+
+logger = get_logger(__name__)
+
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+RESPONSE_CACHE_TTL_SECONDS = 30 * 60.0  # Matches the search result cache in Supabase
+RESPONSE_CACHE_TOP_PLACES = 5  # Places included in the prompt's places_text
+
+
+def places_fingerprint(places: Sequence[dict[str, Any]]) -> str:
+    """Hash the names of the places that go into the prompt, in order."""
+    names = "\n".join(
+        normalize_parse_input(str(p.get("name", ""))) for p in places[:RESPONSE_CACHE_TOP_PLACES]
+    )
+    return hashlib.sha256(names.encode()).hexdigest()[:16]
+
+
+def response_cache_key(
+    model: str, intent: str, location: str, places: Sequence[dict[str, Any]]
+) -> str:
+    """Build the cache key for one response.
+
+    Args:
+        model: Response model name
+        intent: Parsed intent
+        location: Normalized location
+        places: Places passed to the prompt (only the top names count)
+
+    Returns:
+        64-char SHA-256 hex digest
+    """
+    payload = "\n".join(
+        [
+            model,
+            normalize_parse_input(intent),
+            normalize_parse_input(location),
+            places_fingerprint(places),
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """TTL + LRU cache of generated response text."""
+
+    def __init__(
+        self,
+        maxsize: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float | None = RESPONSE_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._entries: MemoryCache[str] = MemoryCache(maxsize, ttl_seconds)
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response, or None on a miss."""
+        return self._entries.get(key)
+
+    def set(self, key: str, response: str) -> None:
+        """Cache a generated response (never the fallback text)."""
+        self._entries.set(key, response)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """Return LRU statistics."""
+        return self._entries.stats()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache."""
+    return ResponseCache()
@@ -0,0 +1,138 @@
+"""Micro-benchmark: per-result score_result() loop vs vectorized score_results().
+
+Synthetic results mix plain and keyword text (keyword_rate is the share of
+words that are underground keywords), every source, and the metadata cases
+that earn bonuses, drawn from a seeded generator so runs are comparable. Each size is timed best-of-repeat for both paths, with the
+vectorized path forced at every size (min_batch=0) so the crossover behind
+BATCH_SCORING_MIN_RESULTS is visible, and the scores are compared exactly.
+"""
+
+import random
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any
+
+from chat.schemas import SearchResult
+from chat.services.scoring_service import UNDERGROUND_KEYWORDS, score_result, score_results
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+DEFAULT_REPEAT = 3
+DEFAULT_INTENT = "hidden gems"
+DEFAULT_KEYWORD_RATE = 0.05  # ~1 keyword per result, like live SERP/Reddit text
+
+_FILLER_TEXT = (
+    "coffee bar museum trail park gallery river market bridge garden tavern "
+    "hall theater cave tunnel lake diner bookstore record shop brewery gems old town "
+    "street view family friendly open late near downtown"
+)
+_FILLER = _FILLER_TEXT.split()
+_SOURCES = ("serp", "reddit", "eventbrite", "vector", "import")
+
+
+@dataclass
+class ScoringBenchmarkResult:
+    """Timings for one batch size."""
+
+    size: int
+    loop_ms: float
+    batch_ms: float
+    speedup: float
+    identical: bool
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def synthetic_results(
+    count: int, seed: int = 0, keyword_rate: float = DEFAULT_KEYWORD_RATE
+) -> list[SearchResult]:
+    """Deterministic search results with realistic keyword and metadata mixes."""
+    rng = random.Random(seed)
+    keywords = [keyword.title() for keyword in UNDERGROUND_KEYWORDS]
+
+    def words(low: int, high: int) -> str:
+        return " ".join(
+            rng.choice(keywords) if rng.random() < keyword_rate else rng.choice(_FILLER)
+            for _ in range(rng.randint(low, high))
+        )
+
+    results = []
+    for i in range(count):
+        source = rng.choice(_SOURCES)
+        metadata: dict[str, Any] | None = None
+        if source == "reddit":
+            metadata = {"score": rng.randint(0, 300)}
+        elif source == "vector":
+            metadata = {"similarity": rng.uniform(0.3, 1.1)}
+        elif source == "eventbrite" and rng.random() < 0.5:
+            metadata = {"event_id": i}
+        results.append(
+            SearchResult(
+                name=words(1, 4),
+                description=words(0, 30),
+                source=source,
+                metadata=metadata,
+            )
+        )
+    return results
+
+
+def run_scoring_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    intent: str = DEFAULT_INTENT,
+    seed: int = 0,
+    keyword_rate: float = DEFAULT_KEYWORD_RATE,
+    on_result: Callable[[ScoringBenchmarkResult], None] | None = None,
+) -> list[ScoringBenchmarkResult]:
+    """Time both scoring paths at each size.
+
+    Args:
+        sizes: Result counts to benchmark
+        repeat: Runs per path; the fastest is reported
+        intent: Intent passed to both paths
+        seed: Synthetic data seed
+        keyword_rate: Share of synthetic words that are keywords
+        on_result: Called as each size finishes (for streaming output)
+
+    Returns:
+        One result per size
+    """
+    output = []
+    for size in sizes:
+        results = synthetic_results(size, seed, keyword_rate)
+
+        loop_ms = _best_ms(partial(_score_each, results, intent), repeat)
+        expected = [r.score for r in results]
+        for r in results:
+            r.score = -1.0
+        batch_ms = _best_ms(partial(score_results, results, intent, min_batch=0), repeat)
+        actual = [r.score for r in results]
+
+        result = ScoringBenchmarkResult(
+            size=size,
+            loop_ms=round(loop_ms, 3),
+            batch_ms=round(batch_ms, 3),
+            speedup=round(loop_ms / batch_ms, 2) if batch_ms else 0.0,
+            identical=actual == expected,
+        )
+        output.append(result)
+        if on_result:
+            on_result(result)
+    return output
+
+
+def _score_each(results: list[SearchResult], intent: str) -> None:
+    for result in results:
+        score_result(result, intent)
+
+
+def _best_ms(run: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        run()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
@@ -1,4 +1,18 @@
-"""Scoring and ranking service for search results."""
+"""Scoring and ranking service for search results.
+
+score_result() scores one result and is the reference definition.
+score_results() gives identical scores for a whole batch: the lowered texts
+are joined once (TextBatch) and each keyword is found with a single str.find
+scan instead of one `in` test per result, the per-result features become
+NumPy arrays, and the weights are added in the same order as score_result(),
+so every float operation (and thus every score) is the same. Batches below
+BATCH_SCORING_MIN_RESULTS use the per-result loop, which is as fast there
+(see the benchmark_scoring command).
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
 
 from chat.schemas import CategorizedResults, ScoringSummary, SearchResult
 from chat.utils.logger import get_logger
@@ -22,6 +36,62 @@ UNDERGROUND_KEYWORDS = [
     "locals only",
 ]
 
+INTENT_WEIGHT = 0.3
+KEYWORD_WEIGHT = 0.1
+KEYWORD_CAP = 0.4
+SOURCE_WEIGHTS = {"reddit": 0.2, "serp": 0.15}
+POPULAR_REDDIT_SCORE = 100
+POPULAR_REDDIT_WEIGHT = 0.1
+EVENTBRITE_WEIGHT = 0.1
+SIMILARITY_WEIGHT = 0.2
+TEXT_SEPARATOR = "\x00"  # Joins batch texts; no keyword contains it
+BATCH_SCORING_MIN_RESULTS = 100  # Below this the per-result loop is as fast (benchmark_scoring)
+
+
+class TextBatch:
+    """Lowercase texts joined into one string so a needle is found in one scan.
+
+    contains() runs str.find over the joined string and maps each hit back
+    to its text, so the Python-level work is proportional to the number of
+    hits rather than texts x needles.
+
+    Args:
+        texts: Lowercase texts
+    """
+
+    def __init__(self, texts: Sequence[str]) -> None:
+        self.texts = list(texts)
+        self._joined = TEXT_SEPARATOR.join(self.texts)
+        lengths = np.fromiter(map(len, self.texts), dtype=np.int64, count=len(self.texts))
+        self._starts = np.concatenate(([0], np.cumsum(lengths[:-1] + 1)))
+
+    def contains(self, needle: str) -> np.ndarray:
+        """Whether each text contains needle (same result as `needle in text`)."""
+        if not needle:
+            return np.ones(len(self.texts), dtype=bool)
+        if TEXT_SEPARATOR in needle:
+            # Could match across two texts in the joined string
+            return np.array([needle in text for text in self.texts], dtype=bool)
+
+        find = self._joined.find
+        positions = []
+        position = find(needle)
+        while position >= 0:
+            positions.append(position)
+            position = find(needle, position + len(needle))
+
+        hits = np.zeros(len(self.texts), dtype=bool)
+        if positions:
+            hits[np.searchsorted(self._starts, positions, side="right") - 1] = True
+        return hits
+
+    def count(self, needles: Sequence[str]) -> np.ndarray:
+        """Number of distinct needles in each text."""
+        counts = np.zeros(len(self.texts), dtype=np.int64)
+        for needle in needles:
+            counts += self.contains(needle)
+        return counts
+
 
 def score_result(result: SearchResult, intent: str) -> SearchResult:
     """Score a single search result based on relevance.
@@ -39,26 +109,78 @@ def score_result(result: SearchResult, intent: str) -> SearchResult:
     intent_lower = intent.lower()
 
     if intent_lower in text:
-        score += 0.3
+        score += INTENT_WEIGHT
 
     underground_count = sum(1 for keyword in UNDERGROUND_KEYWORDS if keyword in text)
-    score += min(underground_count * 0.1, 0.4)
+    score += min(underground_count * KEYWORD_WEIGHT, KEYWORD_CAP)
 
-    if result.source == "reddit":
-        score += 0.2
-    elif result.source == "serp":
-        score += 0.15
+    score += SOURCE_WEIGHTS.get(result.source, 0.0)
 
     if result.metadata:
-        if result.source == "reddit" and result.metadata.get("score", 0) > 100:
-            score += 0.1
+        if result.source == "reddit" and result.metadata.get("score", 0) > POPULAR_REDDIT_SCORE:
+            score += POPULAR_REDDIT_WEIGHT
         if result.source == "eventbrite":
-            score += 0.1
+            score += EVENTBRITE_WEIGHT
+        if result.source == "vector":
+            score += min(result.metadata.get("similarity", 0.0), 1.0) * SIMILARITY_WEIGHT
 
     result.score = min(score, 1.0)
     return result
 
 
+def score_results(
+    results: list[SearchResult],
+    intent: str,
+    min_batch: int = BATCH_SCORING_MIN_RESULTS,
+) -> list[SearchResult]:
+    """Score a batch of results; same scores as score_result() on each.
+
+    Args:
+        results: Search results to score (updated in place)
+        intent: User's search intent
+        min_batch: Smallest batch scored with the vectorized path
+
+    Returns:
+        The same results with updated scores
+    """
+    if not results or len(results) < min_batch:
+        for result in results:
+            score_result(result, intent)
+        return results
+
+    texts = TextBatch([f"{result.name} {result.description}".lower() for result in results])
+    keyword_counts = texts.count(UNDERGROUND_KEYWORDS)
+
+    source_bonus = np.array([SOURCE_WEIGHTS.get(result.source, 0.0) for result in results])
+    popular_bonus = np.zeros(len(results))
+    eventbrite_bonus = np.zeros(len(results))
+    similarity_bonus = np.zeros(len(results))
+    for i, result in enumerate(results):
+        if not result.metadata:
+            continue
+        if result.source == "reddit" and result.metadata.get("score", 0) > POPULAR_REDDIT_SCORE:
+            popular_bonus[i] = POPULAR_REDDIT_WEIGHT
+        elif result.source == "eventbrite":
+            eventbrite_bonus[i] = EVENTBRITE_WEIGHT
+        elif result.source == "vector":
+            similarity_bonus[i] = (
+                min(result.metadata.get("similarity", 0.0), 1.0) * SIMILARITY_WEIGHT
+            )
+
+    # Same additions in the same order as score_result(); adding 0.0 is exact
+    scores = texts.contains(intent.lower()) * INTENT_WEIGHT
+    scores += np.minimum(keyword_counts * KEYWORD_WEIGHT, KEYWORD_CAP)
+    scores += source_bonus
+    scores += popular_bonus
+    scores += eventbrite_bonus
+    scores += similarity_bonus
+    scores = np.minimum(scores, 1.0)
+
+    for result, score in zip(results, scores.tolist(), strict=True):
+        result.score = score
+    return results
+
+
 def score_and_rank_results(results: list[SearchResult], context: dict) -> list[SearchResult]:
     """Score and rank all results.
 
@@ -71,7 +193,7 @@ def score_and_rank_results(results: list[SearchResult], context: dict) -> list[S
     """
     intent = context.get("intent", "")
 
-    scored = [score_result(result, intent) for result in results]
+    scored = list(score_results(results, intent))
     scored.sort(key=lambda x: x.score, reverse=True)
 
     logger.info(
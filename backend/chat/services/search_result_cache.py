@@ -0,0 +1,105 @@
+"""In-process cache of vector search results.
+
+Popular queries repeat with identical parameters, so their similarity_search
+results are kept in an LRU keyed on the normalized query text, limit,
+threshold and search configuration. Every key also carries the index
+generation: a counter bumped whenever this process stores embeddings or its
+local index picks up new rows. A bump makes all earlier entries unreachable,
+so this process never serves results older than its own writes.
+
+The generation is per process. Embeddings stored by any other process (other
+web workers indexing their own searches, import and re-embed commands) do not
+invalidate this cache: other workers can serve stale results for up to
+SEARCH_RESULT_CACHE_TTL_SECONDS after any write they did not make.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Any
+
+from chat.services.embedding_cache import embedding_cache_key
+from chat.utils.logger import get_logger
+from chat.utils.memory_cache import MemoryCache
+
+logger = get_logger(__name__)
+
+SEARCH_RESULT_CACHE_MAX_ENTRIES = 1024
+SEARCH_RESULT_CACHE_TTL_SECONDS = 60.0  # Max staleness for writes made by other processes
+
+
+class SearchResultCache:
+    """Generation-versioned LRU of similarity search results."""
+
+    def __init__(
+        self,
+        maxsize: int = SEARCH_RESULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float | None = SEARCH_RESULT_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._entries: MemoryCache[tuple[dict[str, Any], ...]] = MemoryCache(maxsize, ttl_seconds)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Current index generation (read before searching, pass to key())."""
+        return self._generation
+
+    def bump(self) -> int:
+        """Invalidate all cached results after embeddings change.
+
+        Returns:
+            The new generation
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+
+        logger.debug("search_result_cache.invalidated", generation=generation)
+        return generation
+
+    def key(
+        self,
+        model: str,
+        query_text: str,
+        limit: int,
+        similarity_threshold: float,
+        generation: int,
+    ) -> str:
+        """Build the cache key for one search.
+
+        Args:
+            model: Embedding cache namespace (model and dimensions)
+            query_text: Search query (normalized like embedding cache keys)
+            limit: Result limit
+            similarity_threshold: Minimum similarity
+            generation: Generation read before the search started, so results
+                computed across a bump are stored under the old generation
+        """
+        return embedding_cache_key(
+            f"{model}|{limit}|{similarity_threshold!r}|{generation}", query_text
+        )
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        """Return a copy of cached results, or None on a miss."""
+        results = self._entries.get(key)
+        if results is None:
+            return None
+        return [dict(row) for row in results]
+
+    def set(self, key: str, results: list[dict[str, Any]]) -> None:
+        """Cache results (rows are copied so callers cannot mutate the entry)."""
+        self._entries.set(key, tuple(dict(row) for row in results))
+
+    def clear(self) -> None:
+        """Drop all entries (generation is kept)."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """Return LRU statistics plus the current generation."""
+        return {**self._entries.stats(), "generation": self._generation}
+
+
+@lru_cache(maxsize=1)
+def get_search_result_cache() -> SearchResultCache:
+    """Process-wide cache shared by the sync and async embedding services."""
+    return SearchResultCache()
@@ -10,11 +10,14 @@ from chat.services import (
     cache_service,
     eventbrite_service,
     geocoding_service,
+    indexing_service,
     openai_service,
     reddit_service,
     scoring_service,
     serp_service,
+    vector_search_service,
 )
+from chat.services.narration_service import get_narration_store
 from chat.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +28,7 @@ async def execute_search(
     force: bool = False,
     intent: dict | None = None,
     vector_query: str | None = None,
+    response_mode: str = "standard",
 ) -> dict:
     """Execute complete search orchestration.
 
@@ -33,6 +37,9 @@ async def execute_search(
         force: Force bypass cache
         intent: Parsed user intent
         vector_query: Optimized query for vector search
+        response_mode: "standard" narrates with the LLM, "fast" uses the
+            template response, "deferred" returns places with a narration_id
+            and narrates in the background. Each mode is cached separately.
 
     Returns:
         Complete search response
@@ -46,11 +53,20 @@ async def execute_search(
         input_preview=chat_input[:100],
         intent=intent,
         vector_query=vector_query,
+        response_mode=response_mode,
     )
 
     if not force:
-        cached = await cache_service.get_cached_search_results(chat_input, "")
+        cached = await cache_service.get_cached_search_results(chat_input, "", response_mode)
         if cached:
+            if response_mode == "deferred":
+                # Same id as before; a no-op if this process already has it
+                get_narration_store().schedule(
+                    cached["user_intent"],
+                    cached["user_location"],
+                    cached["places"],
+                    cached.get("debug", {}).get("scoring_summary", {}),
+                )
             elapsed_ms = int((time.perf_counter() - started) * 1000)
             logger.info(
                 "search.cache_hit",
@@ -67,7 +83,8 @@ async def execute_search(
                 },
             }
 
-    parsed = await openai_service.parse_user_input(chat_input)
+    llm_diagnostics: dict[str, dict[str, Any]] = {"parse": {}, "generate": {}}
+    parsed = await openai_service.parse_user_input(chat_input, llm_diagnostics["parse"])
     if not parsed.location or not parsed.intent:
         raise ValueError("Unable to parse location and intent from input")
 
@@ -82,11 +99,15 @@ async def execute_search(
         confidence=normalized.confidence,
     )
 
+    vector_diagnostics: dict[str, Any] = {}
     data_source_started = time.perf_counter()
     results = await asyncio.gather(
         serp_service.search_hidden_gems(search_context.location, parsed.intent),
         reddit_service.search_reddit_rss(search_context.location, parsed.intent),
         eventbrite_service.search_local_events(search_context.location, [parsed.intent]),
+        vector_search_service.search_indexed_places(
+            vector_query, search_context.location, diagnostics=vector_diagnostics
+        ),
         return_exceptions=True,
     )
 
@@ -94,13 +115,19 @@ async def execute_search(
     source_stats = {}
 
     for idx, result in enumerate(results):
-        source_name = ["serpapi", "reddit", "eventbrite"][idx]
+        source_name = ["serpapi", "reddit", "eventbrite", "vector"][idx]
         if isinstance(result, Exception):
             logger.error(f"{source_name}.failed", error=str(result))
             source_stats[source_name] = {"count": 0, "status": "failed", "error": str(result)}
-        else:
-            all_results.extend(result)  # type: ignore[arg-type]
-            source_stats[source_name] = {"count": len(result), "status": "success"}  # type: ignore[arg-type]
+            continue
+
+        if source_name == "vector":
+            result = vector_search_service.drop_live_duplicates(result, all_results)  # type: ignore[arg-type]
+
+        all_results.extend(result)  # type: ignore[arg-type]
+        source_stats[source_name] = {"count": len(result), "status": "success"}  # type: ignore[arg-type]
+        if source_name == "vector":
+            source_stats[source_name].update(vector_diagnostics)
 
     scored_results = scoring_service.score_and_rank_results(
         all_results, {"intent": parsed.intent, "location": search_context.location}
@@ -120,15 +147,32 @@ async def execute_search(
         for r in (categorized.primary + categorized.nearby)
     ]
 
-    response = await openai_service.generate_response(
-        parsed.intent, search_context.location, places_for_response, summary.model_dump()
-    )
+    narration_id = None
+    if response_mode == "fast":
+        response = openai_service.generate_template_response(
+            parsed.intent, search_context.location, places_for_response
+        )
+    elif response_mode == "deferred":
+        response = ""
+        narration_id = get_narration_store().schedule(
+            parsed.intent, search_context.location, places_for_response, summary.model_dump()
+        )
+    else:
+        response = await openai_service.generate_response(
+            parsed.intent,
+            search_context.location,
+            places_for_response,
+            summary.model_dump(),
+            diagnostics=llm_diagnostics["generate"],
+        )
 
     final_result = {
         "user_intent": parsed.intent,
         "user_location": search_context.location,
         "response": response,
         "places": places_for_response,
+        "response_mode": response_mode,
+        "narration_id": narration_id,
         "debug": {
             "request_id": request_id,
             "execution_time_ms": int((time.perf_counter() - started) * 1000),
@@ -137,14 +181,20 @@ async def execute_search(
             "normalized_location": normalized.model_dump(),
             "source_stats": source_stats,
             "scoring_summary": summary.model_dump(),
+            "llm": llm_diagnostics,
             "cache_status": "miss",
         },
     }
 
     await cache_service.set_cached_search_results(
-        chat_input, search_context.location, final_result, 30
+        chat_input, search_context.location, final_result, 30, response_mode
     )
 
+    try:
+        indexing_service.index_search_results(scored_results, search_context.location)
+    except Exception as e:
+        logger.warning("search.indexing_enqueue_failed", request_id=request_id, error=str(e))
+
     elapsed_ms = int((time.perf_counter() - started) * 1000)
     logger.info(
         "search.complete",
@@ -1,17 +1,26 @@
 """Supabase database service."""
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from functools import lru_cache
 from typing import Any, cast
 
-from supabase import Client, create_client
+from supabase import AsyncClient, Client, acreate_client, create_client
 
 from chat.config.settings import get_settings
 from chat.utils.logger import get_logger
+from chat.utils.loop_local import LoopLocal
 
 logger = get_logger(__name__)
 
 
+def response_rows(data: Any) -> list[dict[str, Any]]:
+    """Object rows of a table or RPC response's data (anything else yields no rows)."""
+    if not isinstance(data, list):
+        return []
+    return [row for row in data if isinstance(row, dict)]
+
+
 @lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
     """Get cached Supabase client.
@@ -34,6 +43,44 @@ def get_supabase_client() -> Client:
     return create_client(settings.supabase_url, api_key)
 
 
+_async_clients: LoopLocal[AsyncClient] = LoopLocal()
+_async_client_locks = LoopLocal(asyncio.Lock)
+
+
+async def get_async_supabase_client() -> AsyncClient:
+    """Get cached async Supabase client (created once per event loop).
+
+    The client's HTTP pool is bound to the loop that opened it, and under
+    WSGI every request runs on a new loop (see chat.utils.loop_local).
+
+    Returns:
+        Async Supabase client instance
+
+    Raises:
+        ValueError: If neither supabase_key nor supabase_secret_key is set
+    """
+    client = _async_clients.peek()
+    if client is not None:
+        return client
+
+    async with _async_client_locks.get():
+        client = _async_clients.peek()
+        if client is None:
+            settings = get_settings()
+            api_key = settings.supabase_key or settings.supabase_secret_key or ""
+
+            if not api_key:
+                raise ValueError(
+                    "Missing SUPABASE_KEY or SUPABASE_SECRET_KEY in .env. "
+                    "See supabase/DEPLOYMENT_CHECKLIST.md for setup."
+                )
+
+            client = await acreate_client(settings.supabase_url, api_key)
+            _async_clients.set(client)
+
+    return client
+
+
 class SupabaseService:
     """Service for Supabase operations."""
 
@@ -0,0 +1,452 @@
+"""In-process approximate nearest-neighbour index mirroring places_embeddings.
+
+Optional local alternative to the pgvector RPC for sub-millisecond lookups.
+
+Snapshot layout (written by build_snapshot / `manage.py build_vector_snapshot`):
+
+- vectors.npy: contiguous float32 (rows, 1536) matrix of L2-normalized
+  embeddings, loaded with mmap_mode="r" so every worker process on a host
+  shares the same page-cache pages
+- records.json: row-aligned id/source/source_id/metadata/created_at/updated_at,
+  plus the updated_at watermark used for incremental sync
+- ivf_centroids.npy / ivf_offsets.npy: only for snapshots larger than
+  BRUTE_FORCE_MAX_ROWS. Rows are stored grouped by IVF list so each list is a
+  contiguous slice of the matrix
+
+Search is exact NumPy brute force for small snapshots, and IVF (probe the
+nearest `probes` centroids, score their lists exactly) for large ones. Rows
+inserted or updated after the snapshot are pulled by polling updated_at
+(migration 017) and kept in an in-memory delta that is always scanned exactly;
+a changed row hides its older version.
+
+Deleted rows are not observed, and a re-embedding swap (migration 012)
+rewrites every row, so the whole table lands in the delta. Rebuild the
+snapshot (`manage.py build_vector_snapshot`) after either and restart the
+workers; refresh() logs "vector_index.rebuild_recommended" once the delta
+outgrows the snapshot.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+RECORDS_FILE = "records.json"
+IVF_CENTROIDS_FILE = "ivf_centroids.npy"
+IVF_OFFSETS_FILE = "ivf_offsets.npy"
+
+BRUTE_FORCE_MAX_ROWS = 20_000  # Above this, snapshots get an IVF partition
+IVF_DEFAULT_PROBES = 8
+IVF_TRAIN_ITERATIONS = 10
+IVF_TRAIN_SAMPLE_PER_LIST = 64
+SYNC_PAGE_SIZE = 500
+PLACES_EMBEDDINGS_TABLE = "app_embeddings.places_embeddings"
+RECORD_COLUMNS = "id,source,source_id,metadata,created_at,updated_at"
+
+
+def parse_embedding(value: str | list[float]) -> np.ndarray:
+    """Convert a PostgREST vector value ("[0.1,...]" or list) to float32."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=np.float32)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so dot products are cosine similarities."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1, norms)).astype(np.float32, copy=False)
+
+
+def train_ivf(
+    matrix: np.ndarray, lists: int, iterations: int = IVF_TRAIN_ITERATIONS, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means over normalized rows.
+
+    Args:
+        matrix: (rows, dims) L2-normalized float32 matrix
+        lists: Number of IVF lists (centroids)
+        iterations: Lloyd iterations on the training sample
+        seed: RNG seed (snapshots are reproducible)
+
+    Returns:
+        (centroids, assignments) — normalized (lists, dims) centroids and the
+        list index of every row
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(matrix), lists * IVF_TRAIN_SAMPLE_PER_LIST)
+    sample = matrix[rng.choice(len(matrix), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        for i in range(lists):
+            members = sample[labels == i]
+            if len(members):
+                centroids[i] = members.sum(axis=0)
+        centroids = normalize_rows(centroids)
+
+    assignments = np.argmax(matrix @ centroids.T, axis=1)
+    return centroids, assignments
+
+
+def _version(record: dict[str, Any]) -> str:
+    """Change timestamp of a row (created_at for snapshots predating migration 017)."""
+    return str(record.get("updated_at") or record["created_at"])
+
+
+def _write_atomic(path: Path, write: Any) -> None:
+    """Write via a temp file in the same directory, then rename into place."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_snapshot(
+    snapshot_dir: Path,
+    records: list[dict[str, Any]],
+    vectors: np.ndarray,
+    brute_force_max_rows: int = BRUTE_FORCE_MAX_ROWS,
+) -> None:
+    """Write a snapshot, adding an IVF partition for large row counts.
+
+    Args:
+        snapshot_dir: Directory to (over)write
+        records: Row metadata (id, source, source_id, metadata, created_at, updated_at)
+        vectors: (rows, dims) embeddings, row-aligned with records
+        brute_force_max_rows: Row count above which an IVF partition is built
+    """
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+    offsets = None
+
+    if len(records) > brute_force_max_rows:
+        lists = max(1, int(np.sqrt(len(records))))
+        centroids, assignments = train_ivf(vectors, lists)
+        order = np.argsort(assignments, kind="stable")
+        vectors = vectors[order]
+        records = [records[i] for i in order]
+        offsets = np.searchsorted(assignments[order], np.arange(lists + 1)).astype(np.int64)
+
+        _write_atomic(snapshot_dir / IVF_CENTROIDS_FILE, lambda f: np.save(f, centroids))
+        _write_atomic(snapshot_dir / IVF_OFFSETS_FILE, lambda f: np.save(f, offsets))
+    else:
+        for name in (IVF_CENTROIDS_FILE, IVF_OFFSETS_FILE):
+            (snapshot_dir / name).unlink(missing_ok=True)
+
+    # PostgREST timestamps share one offset format, so string max() is chronological
+    watermark = max((_version(r) for r in records), default=None)
+    payload = json.dumps({"watermark": watermark, "records": records}).encode()
+
+    _write_atomic(snapshot_dir / VECTORS_FILE, lambda f: np.save(f, vectors))
+    _write_atomic(snapshot_dir / RECORDS_FILE, lambda f: f.write(payload))
+
+    logger.info(
+        "vector_index.snapshot_written",
+        rows=len(records),
+        ivf_lists=0 if offsets is None else len(offsets) - 1,
+        path=str(snapshot_dir),
+    )
+
+
+def iter_place_rows(
+    client: Any, since: str | None = None, page_size: int = SYNC_PAGE_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Page through places_embeddings in updated_at order.
+
+    Args:
+        client: Supabase client
+        since: Only rows with updated_at >= since (None = all rows)
+        page_size: Rows per request
+
+    Yields:
+        Rows with RECORD_COLUMNS plus embedding
+    """
+    start = 0
+
+    while True:
+        query = client.table(PLACES_EMBEDDINGS_TABLE).select(f"{RECORD_COLUMNS},embedding")
+        if since is not None:
+            query = query.gte("updated_at", since)
+        response = (
+            query.order("updated_at").order("id").range(start, start + page_size - 1).execute()
+        )
+
+        rows = response.data or []
+        yield from rows
+
+        if len(rows) < page_size:
+            return
+        start += page_size
+
+
+def build_snapshot(client: Any, snapshot_dir: Path) -> int:
+    """Export places_embeddings into a snapshot directory.
+
+    Returns:
+        Number of rows written
+    """
+    records: list[dict[str, Any]] = []
+    vectors: list[np.ndarray] = []
+
+    for row in iter_place_rows(client):
+        vectors.append(parse_embedding(row.pop("embedding")))
+        records.append(row)
+
+    matrix = np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+    write_snapshot(snapshot_dir, records, matrix)
+    return len(records)
+
+
+@dataclass(frozen=True)
+class _IndexState:
+    """Immutable view swapped atomically on load/refresh (readers never lock)."""
+
+    base: np.ndarray
+    delta: np.ndarray
+    records: list[dict[str, Any]]
+    alive: np.ndarray
+    keys: dict[tuple[str, str], int]
+    versions: dict[str, str]
+    centroids: np.ndarray | None = None
+    offsets: np.ndarray | None = None
+    watermark: str | None = None
+    loaded: bool = True
+
+
+class LocalVectorIndex:
+    """Memory-mapped snapshot of places_embeddings with incremental sync."""
+
+    def __init__(
+        self, snapshot_dir: Path, dimensions: int = 1536, probes: int = IVF_DEFAULT_PROBES
+    ) -> None:
+        self.snapshot_dir = snapshot_dir
+        self.dimensions = dimensions
+        self.probes = probes
+
+        empty = np.empty((0, dimensions), dtype=np.float32)
+        self._state = _IndexState(
+            base=empty,
+            delta=empty,
+            records=[],
+            alive=np.empty(0, dtype=bool),
+            keys={},
+            versions={},
+            loaded=False,
+        )
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def ready(self) -> bool:
+        """True once a snapshot has been loaded."""
+        return self._state.loaded
+
+    def __len__(self) -> int:
+        return int(self._state.alive.sum())
+
+    def load(self) -> None:
+        """Memory-map the snapshot from disk (replaces any previous state).
+
+        Raises:
+            FileNotFoundError: If the snapshot has not been built
+            ValueError: If the snapshot files are inconsistent or dimensions differ
+        """
+        base = np.load(self.snapshot_dir / VECTORS_FILE, mmap_mode="r")
+        payload = json.loads((self.snapshot_dir / RECORDS_FILE).read_text())
+        records: list[dict[str, Any]] = payload["records"]
+
+        if len(records) != base.shape[0]:
+            raise ValueError(
+                f"Snapshot rows mismatch: {base.shape[0]} vectors, {len(records)} records "
+                "(snapshot may be mid-rewrite)"
+            )
+        if len(records) and base.shape[1] != self.dimensions:
+            raise ValueError(f"Snapshot has {base.shape[1]} dimensions, expected {self.dimensions}")
+        if len(records) == 0:
+            base = np.empty((0, self.dimensions), dtype=np.float32)
+
+        centroids = offsets = None
+        if (self.snapshot_dir / IVF_OFFSETS_FILE).exists():
+            centroids = np.load(self.snapshot_dir / IVF_CENTROIDS_FILE)
+            offsets = np.load(self.snapshot_dir / IVF_OFFSETS_FILE)
+
+        with self._write_lock:
+            self._state = _IndexState(
+                base=base,
+                delta=np.empty((0, self.dimensions), dtype=np.float32),
+                records=records,
+                alive=np.ones(len(records), dtype=bool),
+                keys={(r["source"], r["source_id"]): i for i, r in enumerate(records)},
+                versions={r["id"]: _version(r) for r in records},
+                centroids=centroids,
+                offsets=offsets,
+                watermark=payload.get("watermark"),
+            )
+
+        logger.info(
+            "vector_index.loaded",
+            rows=len(records),
+            ivf_lists=0 if offsets is None else len(offsets) - 1,
+        )
+
+    def refresh(self, client: Any) -> int:
+        """Append rows inserted or updated since the snapshot watermark.
+
+        A new version of a row, or a new row for an existing (source,
+        source_id), hides the row it replaces.
+
+        Returns:
+            Number of new rows added
+        """
+        with self._write_lock:
+            state = self._state
+            new_rows = [
+                row
+                for row in iter_place_rows(client, since=state.watermark)
+                if state.versions.get(row["id"]) != _version(row)
+            ]
+            if not new_rows:
+                return 0
+
+            vectors = normalize_rows(
+                np.vstack([parse_embedding(r.pop("embedding")) for r in new_rows])
+            )
+            records = state.records + new_rows
+            alive = np.concatenate([state.alive, np.ones(len(new_rows), dtype=bool)])
+            keys = dict(state.keys)
+
+            for i, row in enumerate(new_rows, start=len(state.records)):
+                key = (row["source"], row["source_id"])
+                if key in keys:
+                    alive[keys[key]] = False
+                keys[key] = i
+
+            self._state = _IndexState(
+                base=state.base,
+                delta=np.vstack([state.delta, vectors]),
+                records=records,
+                alive=alive,
+                keys=keys,
+                versions=state.versions | {r["id"]: _version(r) for r in new_rows},
+                centroids=state.centroids,
+                offsets=state.offsets,
+                watermark=max(filter(None, [state.watermark, *map(_version, new_rows)])),
+            )
+
+        logger.info("vector_index.refreshed", added=len(new_rows), rows=len(records))
+        if len(state.delta) <= len(state.base) < len(self._state.delta):
+            logger.warning(
+                "vector_index.rebuild_recommended",
+                delta_rows=len(self._state.delta),
+                snapshot_rows=len(state.base),
+            )
+        return len(new_rows)
+
+    def start_sync(
+        self,
+        client: Any,
+        poll_seconds: float,
+        on_refresh: Callable[[int], None] | None = None,
+    ) -> None:
+        """Poll for new rows every poll_seconds on a daemon thread.
+
+        Args:
+            client: Supabase client
+            poll_seconds: Poll interval
+            on_refresh: Called with the number of rows added, when non-zero
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run() -> None:
+            while not self._stop.wait(poll_seconds):
+                try:
+                    added = self.refresh(client)
+                    if added and on_refresh is not None:
+                        on_refresh(added)
+                except Exception as e:
+                    logger.warning("vector_index.refresh_failed", error=str(e))
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name="vector-index-sync", daemon=True)
+        self._thread.start()
+
+    def stop_sync(self) -> None:
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def search(
+        self, query_embedding: list[float], limit: int, similarity_threshold: float
+    ) -> list[dict[str, Any]]:
+        """Return the same row shape as search_places_by_similarity().
+
+        Args:
+            query_embedding: Query vector (normalized here)
+            limit: Maximum results
+            similarity_threshold: Minimum cosine similarity (exclusive, like the RPC)
+
+        Returns:
+            Rows with id, source, source_id, metadata and similarity, best first
+        """
+        state = self._state
+        query = normalize_rows(np.asarray(query_embedding, dtype=np.float32))
+
+        rows, scores = self._candidate_scores(state, query)
+        delta_scores = state.delta @ query
+        rows = np.concatenate([rows, np.arange(len(delta_scores)) + len(state.base)])
+        scores = np.concatenate([scores, delta_scores])
+
+        keep = state.alive[rows] & (scores > similarity_threshold)
+        rows, scores = rows[keep], scores[keep]
+
+        if len(rows) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            rows, scores = rows[top], scores[top]
+
+        order = np.argsort(-scores, kind="stable")
+
+        return [
+            {
+                "id": state.records[i]["id"],
+                "source": state.records[i]["source"],
+                "source_id": state.records[i]["source_id"],
+                "metadata": state.records[i]["metadata"],
+                "similarity": float(s),
+            }
+            for i, s in zip(rows[order], scores[order], strict=True)
+        ]
+
+    def _candidate_scores(
+        self, state: _IndexState, query: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score snapshot rows: all of them, or the probed IVF lists."""
+        if state.centroids is None or state.offsets is None:
+            return np.arange(len(state.base)), state.base @ query
+
+        probes = min(self.probes, len(state.centroids))
+        nearest = np.argpartition(-(state.centroids @ query), probes - 1)[:probes]
+        bounds = [(int(state.offsets[c]), int(state.offsets[c + 1])) for c in nearest]
+
+        rows = np.concatenate([np.arange(start, end) for start, end in bounds])
+        scores = np.concatenate([state.base[start:end] @ query for start, end in bounds])
+        return rows, scores
@@ -0,0 +1,136 @@
+"""Vector store search as a result source alongside serp/reddit/eventbrite."""
+
+import re
+from typing import Any
+
+from chat.config.constants import (
+    VECTOR_LOCATION_OVERSAMPLE,
+    VECTOR_SEARCH_LIMIT,
+    VECTOR_SEARCH_THRESHOLD,
+)
+from chat.schemas import SearchResult
+from chat.services.async_embedding_service import get_async_embedding_service
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_VECTOR_FETCH = 100  # similarity_search limit cap
+LOCATION_PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+
+
+def _location_key(location: Any) -> str:
+    """Case, punctuation and whitespace-insensitive form of a location."""
+    return " ".join(LOCATION_PUNCTUATION_PATTERN.sub(" ", str(location or "")).lower().split())
+
+
+async def search_indexed_places(
+    vector_query: str | None,
+    location: str | None = None,
+    limit: int = VECTOR_SEARCH_LIMIT,
+    similarity_threshold: float = VECTOR_SEARCH_THRESHOLD,
+    diagnostics: dict[str, Any] | None = None,
+) -> list[SearchResult]:
+    """Search previously indexed places by vector similarity.
+
+    Args:
+        vector_query: Query from IntentParser.extract_vector_query
+        location: Normalized search location; only places indexed for the
+            same location are kept (None = no filter)
+        limit: Maximum results
+        similarity_threshold: Minimum cosine similarity
+        diagnostics: Filled with rerank recall/latency when two-stage search is
+            enabled (merged into the search debug info)
+
+    Returns:
+        Results with source="vector" (empty on missing query or failure)
+
+    Note: Similarity alone cannot tell "caves" in Pikeville from "caves" in
+    Austin, so with a location the search fetches VECTOR_LOCATION_OVERSAMPLE
+    times more hits and keeps those whose metadata.location matches.
+    """
+    if not vector_query or not vector_query.strip():
+        return []
+
+    wanted = _location_key(location)
+    fetch = min(limit * VECTOR_LOCATION_OVERSAMPLE, MAX_VECTOR_FETCH) if wanted else limit
+
+    try:
+        service = get_async_embedding_service()
+        local = service.local_index is not None and service.local_index.ready
+
+        # A loaded local index answers inside similarity_search; rerank is the RPC path
+        if service.exact_rerank_oversample and not local:
+            rows, rerank = await service.similarity_search_reranked(
+                vector_query, limit=fetch, similarity_threshold=similarity_threshold
+            )
+            if diagnostics is not None:
+                diagnostics["rerank"] = rerank.to_dict() if rerank else {"cache": "hit"}
+        else:
+            rows = await service.similarity_search(
+                vector_query, limit=fetch, similarity_threshold=similarity_threshold
+            )
+
+        matched = [
+            row
+            for row in rows
+            if not wanted or _location_key((row.get("metadata") or {}).get("location")) == wanted
+        ]
+        results = [result for row in matched if (result := _to_search_result(row)) is not None]
+        results = results[:limit]
+
+        logger.info(
+            "vector.search_complete",
+            vector_query=vector_query,
+            result_count=len(results),
+            other_locations=len(rows) - len(matched),
+            local_index=local,
+        )
+
+        return results
+
+    except Exception as e:
+        logger.error("vector.search_failed", error=str(e), vector_query=vector_query)
+        return []
+
+
+def _to_search_result(row: dict) -> SearchResult | None:
+    """Convert a similarity RPC row into a SearchResult."""
+    metadata = row.get("metadata") or {}
+    name = str(metadata.get("name") or "").strip()
+    if not name:
+        return None
+
+    return SearchResult(
+        name=name,
+        description=metadata.get("description") or "",
+        source="vector",
+        url=metadata.get("url"),
+        metadata={
+            "similarity": row.get("similarity", 0.0),
+            "indexed_source": row.get("source"),
+            "source_id": row.get("source_id"),
+            "location": metadata.get("location"),
+        },
+    )
+
+
+def drop_live_duplicates(
+    vector_results: list[SearchResult], live_results: list[SearchResult]
+) -> list[SearchResult]:
+    """Remove vector hits already returned by a live source (same URL or name).
+
+    Args:
+        vector_results: Results from search_indexed_places
+        live_results: Results from serp/reddit/eventbrite for this request
+
+    Returns:
+        Vector results not present in live_results
+    """
+    urls = {r.url for r in live_results if r.url}
+    names = {r.name.strip().lower() for r in live_results}
+
+    return [
+        r
+        for r in vector_results
+        if not (r.url and r.url in urls) and r.name.strip().lower() not in names
+    ]
@@ -0,0 +1,96 @@
+"""Process-wide event loop for work that must outlive the request.
+
+Under WSGI (runserver, gunicorn) Django runs async views through asgiref's
+async_to_sync, which cancels tasks still pending on the request's event loop
+when the view returns. Background work (search result indexing, deferred
+narration, shadow parse checks) is therefore submitted to one long-lived loop
+on a daemon thread instead, which behaves the same under WSGI and ASGI.
+
+The thread starts on first use and is restarted after a fork (e.g. gunicorn
+--preload), since threads do not survive into the child process.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from collections.abc import Callable, Coroutine
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """An asyncio loop running forever on a daemon thread.
+
+    Args:
+        name: Thread name (shows up in thread dumps)
+    """
+
+    def __init__(self, name: str = "underfoot-background") -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pid: int | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running background loop (started on first access)."""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid() or self._loop.is_closed():
+                self._loop = self._start()
+                self._pid = os.getpid()
+            return self._loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """Run a coroutine on the background loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback: Callable[..., object], *args: Any) -> None:
+        """Schedule a plain callback on the background loop from any thread."""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel pending work and stop the thread (tests; the process loop runs until exit)."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread.ident != threading.get_ident():
+            thread.join(timeout)
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            try:
+                loop.run_forever()
+            finally:
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.info("background.loop_started", thread=self.name, pid=os.getpid())
+        return loop
+
+
+@lru_cache(maxsize=1)
+def get_background_loop() -> BackgroundLoop:
+    """Process-wide background loop."""
+    return BackgroundLoop()
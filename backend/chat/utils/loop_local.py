@@ -0,0 +1,67 @@
+"""Per-event-loop values for process-wide async clients and locks.
+
+httpx.AsyncClient (behind AsyncOpenAI and the async Supabase client) pools
+connections bound to the loop that opened them, and asyncio.Lock binds to the
+first loop that waits on it. Under WSGI, asgiref's async_to_sync runs each
+request on a new event loop, so a process-wide instance created on one
+request's loop fails on the next ("Event loop is closed"). LoopLocal keeps one
+value per running loop instead; entries go away with their loop.
+"""
+
+import asyncio
+import threading
+import weakref
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):  # noqa: UP046
+    """One value per running event loop.
+
+    Args:
+        factory: Builds the value on first get() in a loop (called inside that
+            loop, so it may create tasks, locks or clients). Without a factory,
+            values are stored with set().
+    """
+
+    def __init__(self, factory: Callable[[], T] | None = None) -> None:
+        self._factory = factory
+        self._values: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Return the running loop's value, creating it with the factory if needed.
+
+        Raises:
+            RuntimeError: If no event loop is running
+            LookupError: If the loop has no value and there is no factory
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop in self._values:
+                return self._values[loop]
+            if self._factory is None:
+                raise LookupError("No value set for the running event loop")
+            value = self._values[loop] = self._factory()
+            return value
+
+    def peek(self) -> T | None:
+        """Return the running loop's value, or None if it has none yet."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._values.get(loop)
+
+    def set(self, value: T) -> None:
+        """Store a value for the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._values[loop] = value
+
+    def clear(self) -> None:
+        """Drop the values of every loop (tests)."""
+        with self._lock:
+            self._values.clear()
@@ -0,0 +1,67 @@
+"""Async token-bucket rate limiter for outbound API calls."""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """Limit requests and tokens per minute across concurrent tasks.
+
+    Both budgets refill continuously. acquire() waits until the request and
+    its token estimate fit, so bursts never exceed one minute of budget.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int | None = None) -> None:
+        if requests_per_minute < 1:
+            raise ValueError(f"requests_per_minute must be >= 1, got {requests_per_minute}")
+        if tokens_per_minute is not None and tokens_per_minute < 1:
+            raise ValueError(f"tokens_per_minute must be >= 1, got {tokens_per_minute}")
+
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request of `tokens` estimated tokens is within budget.
+
+        Args:
+            tokens: Estimated tokens for the request (ignored without a token budget;
+                clamped to one minute of budget so oversized requests still proceed)
+        """
+        if self.tokens_per_minute is not None:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = self._wait_seconds(tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            self._requests -= 1
+            if self.tokens_per_minute is not None:
+                self._tokens -= tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+
+        self._requests = min(
+            self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60
+        )
+        if self.tokens_per_minute is not None:
+            self._tokens = min(
+                self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    def _wait_seconds(self, tokens: int) -> float:
+        wait = max(0.0, (1 - self._requests) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute is not None:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
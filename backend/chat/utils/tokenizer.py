@@ -0,0 +1,82 @@
+"""Local token counting for OpenAI embedding inputs.
+
+Uses tiktoken's BPE for the configured model. tiktoken downloads its encoding
+file on first use (cached under TIKTOKEN_CACHE_DIR); when that is not possible,
+counts fall back to a conservative character estimate so limits still hold.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any
+
+import tiktoken
+
+from chat.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"  # ada-002 and text-embedding-3-*
+FALLBACK_CHARS_PER_TOKEN = 3  # Over-counts English (~4 chars/token) so budgets stay safe
+
+
+@lru_cache(maxsize=8)
+def get_encoding(model: str) -> Any | None:
+    """Return the tiktoken encoding for a model, or None if it cannot be loaded."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        name = DEFAULT_ENCODING
+    except Exception as e:
+        logger.warning("tokenizer.unavailable", model=model, error=str(e))
+        return None
+
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning("tokenizer.unavailable", model=model, error=str(e))
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count the tokens a model will bill for text.
+
+    Args:
+        text: Input text
+        model: Model name (selects the encoding)
+
+    Returns:
+        Exact BPE token count, or a conservative estimate without an encoding
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / FALLBACK_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Cut text to at most max_tokens, dropping trailing partial words.
+
+    Args:
+        text: Input text
+        max_tokens: Token budget (>= 0)
+        model: Model name (selects the encoding)
+
+    Returns:
+        text unchanged if it fits, otherwise its longest fitting prefix
+    """
+    encoding = get_encoding(model)
+
+    if encoding is None:
+        max_chars = max_tokens * FALLBACK_CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        truncated = text[:max_chars]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        truncated = encoding.decode(tokens[:max_tokens])
+
+    # Prefer a word boundary; a cut word embeds as noise
+    head, _, _ = truncated.rpartition(" ")
+    return (head or truncated).rstrip()
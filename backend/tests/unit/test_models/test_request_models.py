@@ -12,6 +12,15 @@ def test_search_request_valid():
 
     assert request.chat_input == "hidden gems in Portland"
     assert request.force is False
+    assert request.response_mode == "standard"
+
+
+def test_search_request_response_mode():
+    """Test response_mode accepts known modes only."""
+    assert SearchRequest(chat_input="caves", response_mode="deferred").response_mode == "deferred"
+
+    with pytest.raises(ValidationError):
+        SearchRequest(chat_input="caves", response_mode="verbose")
 
 
 def test_search_request_sanitize():
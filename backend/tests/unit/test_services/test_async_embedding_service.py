@@ -0,0 +1,339 @@
+"""Unit tests for AsyncEmbeddingService."""
+
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from openai import AsyncOpenAI
+
+from chat.services import async_embedding_service
+from chat.services.async_embedding_service import AsyncEmbeddingService
+from chat.services.embedding_service import EmbeddingError
+from chat.services.search_result_cache import get_search_result_cache
+from chat.utils.loop_local import LoopLocal
+
+
+def _embedding_response(count: int = 1) -> MagicMock:
+    return MagicMock(data=[MagicMock(index=i, embedding=[0.1] * 1536) for i in range(count)])
+
+
+@pytest.fixture
+def supabase():
+    """Async Supabase client mock (builders are sync, execute() is awaited)."""
+    client = MagicMock()
+    client.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data=[]))
+    client.table.return_value.upsert.return_value.execute = AsyncMock(
+        return_value=MagicMock(data=[])
+    )
+    return client
+
+
+@pytest.fixture
+def service(supabase):
+    """AsyncEmbeddingService with mocked OpenAI, Supabase and cache tiers."""
+    AsyncEmbeddingService._pgvector_validated = False
+    get_search_result_cache().clear()
+
+    with (
+        patch("chat.services.async_embedding_service.get_async_openai_client") as mock_openai,
+        patch("chat.services.async_embedding_service.SupabaseService") as mock_sync_supabase,
+    ):
+        mock_openai.return_value.embeddings.create = AsyncMock(
+            side_effect=lambda **kwargs: _embedding_response(
+                len(kwargs["input"]) if isinstance(kwargs["input"], list) else 1
+            )
+        )
+        mock_sync_supabase.return_value = None
+
+        instance = AsyncEmbeddingService(supabase=supabase)
+        instance.embedding_cache.supabase = None  # memory tier only
+
+        yield instance
+
+    AsyncEmbeddingService._pgvector_validated = False
+
+
+async def test_generate_embedding(service):
+    """Test embedding is awaited from AsyncOpenAI."""
+    embedding = await service.generate_embedding("  Secret Cave  ")
+
+    assert len(embedding) == 1536
+    service.openai_client.embeddings.create.assert_awaited_once_with(
+        model="text-embedding-ada-002", input="Secret Cave"
+    )
+
+
+async def test_generate_embedding_uses_cache(service):
+    """Test repeated text is served from the embedding cache."""
+    await service.generate_embedding("Secret Cave")
+    await service.generate_embedding("Secret   Cave")
+
+    assert service.openai_client.embeddings.create.await_count == 1
+
+
+async def test_generate_embedding_validation_matches_sync(service):
+    """Test empty and too-long text raise ValueError like the sync service."""
+    with pytest.raises(ValueError, match="empty"):
+        await service.generate_embedding("   ")
+
+    with pytest.raises(ValueError, match="too long"):
+        await service.generate_embedding("word " * 9000)
+
+
+async def test_generate_embedding_dimension_mismatch(service):
+    """Test wrong dimension count raises EmbeddingError."""
+    service.openai_client.embeddings.create = AsyncMock(
+        return_value=MagicMock(data=[MagicMock(embedding=[0.1] * 10)])
+    )
+
+    with pytest.raises(EmbeddingError, match="Dimension mismatch"):
+        await service.generate_embedding("test")
+
+
+async def test_pgvector_validated_once_under_concurrency(service, supabase):
+    """Test concurrent first calls issue a single validation RPC."""
+    await asyncio.gather(*(service.generate_embedding(f"text {i}") for i in range(5)))
+
+    assert supabase.rpc.call_count == 1
+    assert AsyncEmbeddingService._pgvector_validated is True
+
+
+async def test_pgvector_validation_failure(service, supabase):
+    """Test validation failure raises EmbeddingError and is retried next call."""
+    supabase.rpc.return_value.execute = AsyncMock(side_effect=Exception("function missing"))
+
+    with pytest.raises(EmbeddingError, match="pgvector extension"):
+        await service.generate_embedding("test")
+
+    assert AsyncEmbeddingService._pgvector_validated is False
+
+
+async def test_generate_embeddings_batch(service):
+    """Test batch returns items in input order with per-item errors."""
+    items = await service.generate_embeddings(["alpha", "", "beta"])
+
+    assert [item.ok for item in items] == [True, False, True]
+    assert "empty" in items[1].error
+    service.openai_client.embeddings.create.assert_awaited_once_with(
+        model="text-embedding-ada-002", input=["alpha", "beta"]
+    )
+
+
+def _api_error(error_cls, status_code):
+    return error_cls("bad input", response=MagicMock(status_code=status_code), body=None)
+
+
+async def test_generate_embeddings_retries_failed_batch_individually(service):
+    """Test a batch rejected for its input falls back to single-input requests."""
+    from openai import BadRequestError
+
+    async def create(**kwargs):
+        input = kwargs["input"]
+        if (isinstance(input, list) and len(input) > 1) or input == ["bad"]:
+            raise _api_error(BadRequestError, 400)
+        return _embedding_response(1)
+
+    service.openai_client.embeddings.create = AsyncMock(side_effect=create)
+
+    items = await service.generate_embeddings(["good", "bad"])
+
+    assert items[0].ok
+    assert not items[1].ok
+    assert "bad input" in items[1].error
+
+
+async def test_generate_embeddings_retries_rate_limited_batch_whole(service, monkeypatch):
+    """Test a 429 retries the whole batch with backoff instead of splitting it."""
+    from openai import RateLimitError
+
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("chat.services.async_embedding_service.asyncio.sleep", sleep)
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs["input"])
+        if len(calls) < 3:
+            raise _api_error(RateLimitError, 429)
+        return _embedding_response(len(kwargs["input"]))
+
+    service.openai_client.embeddings.create = AsyncMock(side_effect=create)
+
+    items = await service.generate_embeddings(["a", "b", "c"])
+
+    assert all(item.ok for item in items)
+    assert calls == [["a", "b", "c"]] * 3
+    assert len(sleeps) == 2
+
+
+async def test_store_place_embeddings_single_upsert(service, supabase):
+    """Test bulk store awaits one upsert keyed on source and source_id."""
+    places = [
+        {"source": "reddit", "source_id": "abc123", "text": "Cave", "metadata": {"name": "Cave"}},
+        {"source": "reddit", "source_id": "BAD ID", "text": "Falls", "metadata": {"name": "F"}},
+    ]
+
+    items = await service.store_place_embeddings(places)
+
+    assert [item.ok for item in items] == [True, False]
+    upsert = supabase.table.return_value.upsert
+    upsert.assert_called_once()
+    rows = upsert.call_args.args[0]
+    assert [row["source_id"] for row in rows] == ["abc123"]
+    assert upsert.call_args.kwargs == {
+        "on_conflict": "source,source_id",
+        "ignore_duplicates": False,
+    }
+
+
+async def test_store_place_embedding_failure(service, supabase):
+    """Test storage failure raises EmbeddingError."""
+    supabase.table.return_value.upsert.return_value.execute = AsyncMock(
+        side_effect=Exception("RLS denied")
+    )
+
+    with pytest.raises(EmbeddingError, match="Failed to store embedding"):
+        await service.store_place_embedding("reddit", "abc123", "Cave", {"name": "Cave"})
+
+
+async def test_similarity_search_full_mode(service, supabase):
+    """Test full storage mode calls the exact similarity RPC."""
+    supabase.rpc.return_value.execute = AsyncMock(
+        return_value=MagicMock(data=[{"source_id": "abc123", "similarity": 0.9}])
+    )
+
+    results = await service.similarity_search("caves", limit=5, similarity_threshold=0.8)
+
+    assert results == [{"source_id": "abc123", "similarity": 0.9}]
+    function, params = supabase.rpc.call_args.args
+    assert function == "app_embeddings.search_places_by_similarity"
+    assert params["match_count"] == 5
+    assert params["match_threshold"] == 0.8
+
+
+async def test_similarity_search_quantized_mode(service, supabase):
+    """Test quantized storage modes call the rerank RPC with oversample."""
+    service.configure_storage("binary", rerank_oversample=8)
+
+    await service.similarity_search("caves", limit=5)
+
+    function, params = supabase.rpc.call_args.args
+    assert function == "app_embeddings.search_places_by_similarity_quantized"
+    assert params["storage_mode"] == "binary"
+    assert params["oversample"] == 8
+
+
+async def test_similarity_search_many(service, supabase):
+    """Test batch search splits one RPC response by query index."""
+    supabase.rpc.return_value.execute = AsyncMock(
+        return_value=MagicMock(data=[{"query_index": 1, "id": "b", "similarity": 0.8}])
+    )
+
+    results = await service.similarity_search_many(["caves", "mines"], limit=3)
+
+    assert results == [[], [{"id": "b", "similarity": 0.8}]]
+    function, params = supabase.rpc.call_args.args
+    assert function == "app_embeddings.search_places_by_similarity_many"
+    assert len(params["query_embeddings"]) == 2
+    assert params["match_count"] == 3
+
+
+async def test_similarity_search_uses_local_index(service, supabase):
+    """Test the shared local index answers before the RPC, per query in batches."""
+    service.local_index = MagicMock(ready=True)
+    service.local_index.search.return_value = [{"id": "local", "similarity": 0.9}]
+    AsyncEmbeddingService._pgvector_validated = True
+
+    single = await service.similarity_search("caves", limit=5)
+    many = await service.similarity_search_many(["mines", "falls"], limit=5)
+
+    assert single == [{"id": "local", "similarity": 0.9}]
+    assert many == [single, single]
+    supabase.rpc.assert_not_called()
+
+
+async def test_similarity_search_invalid_params(service):
+    """Test parameter validation matches the sync service."""
+    with pytest.raises(ValueError, match="limit"):
+        await service.similarity_search("caves", limit=0)
+
+    with pytest.raises(ValueError, match="threshold"):
+        await service.similarity_search("caves", similarity_threshold=1.5)
+
+
+async def test_hybrid_search(service, supabase):
+    """Test async hybrid search awaits the RRF RPC."""
+    rows = [{"id": "1", "rrf_score": 0.03}]
+    supabase.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data=rows))
+
+    results = await service.hybrid_search("paris catacombs", limit=5)
+
+    assert results == rows
+    function, params = supabase.rpc.call_args.args
+    assert function == "app_embeddings.search_places_hybrid"
+    assert params["query_text"] == "paris catacombs"
+    assert params["candidate_count"] == 25
+
+
+class _EmbeddingsHandler(BaseHTTPRequestHandler):
+    """Keep-alive /embeddings endpoint, so clients pool their connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(
+            {
+                "object": "list",
+                "data": [{"object": "embedding", "index": 0, "embedding": [0.1] * 1536}],
+                "model": "text-embedding-ada-002",
+                "usage": {"prompt_tokens": 2, "total_tokens": 2},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@pytest.fixture
+def embeddings_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EmbeddingsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_service_is_reusable_across_event_loops(supabase, embeddings_url):
+    """Test a shared service keeps working when each call runs on a new loop (WSGI views).
+
+    A client whose pooled connection belongs to a closed loop fails with
+    "Event loop is closed", so every loop must get its own client.
+    """
+    clients = LoopLocal(lambda: AsyncOpenAI(api_key="test", base_url=embeddings_url, max_retries=0))
+
+    with (
+        patch.object(async_embedding_service, "_openai_clients", clients),
+        patch("chat.services.async_embedding_service.SupabaseService", return_value=None),
+    ):
+        instance = AsyncEmbeddingService(supabase=supabase)
+        instance.embedding_cache.supabase = None
+
+        first = asyncio.run(instance.generate_embedding("Secret Cave"))
+        second = asyncio.run(instance.generate_embedding("Hidden Falls"))
+        third = asyncio.run(instance.generate_embedding("Moonbow Trail"))
+
+    assert len(first) == len(second) == len(third) == 1536
+    AsyncEmbeddingService._pgvector_validated = False
@@ -37,6 +37,17 @@ class TestCacheService:
         key5 = generate_cache_key("pizza", "Chicago")
         assert key1 != key5
 
+    def test_generate_cache_key_response_mode(self):
+        """Test that response modes are cached separately."""
+        standard = generate_cache_key("pizza", "New York")
+
+        assert generate_cache_key("pizza", "New York", "standard") == standard
+        assert generate_cache_key("pizza", "New York", "fast") != standard
+        assert generate_cache_key("pizza", "New York", "deferred") not in (
+            standard,
+            generate_cache_key("pizza", "New York", "fast"),
+        )
+
     @pytest.mark.asyncio
     @patch("chat.services.cache_service.supabase")
     async def test_get_cached_search_results_success(self, mock_supabase):
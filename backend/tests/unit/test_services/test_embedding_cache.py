@@ -0,0 +1,63 @@
+"""Unit tests for content-hash embedding cache."""
+
+from unittest.mock import MagicMock
+
+from chat.services.embedding_cache import (
+    EmbeddingCache,
+    embedding_cache_key,
+    pack_embedding,
+    unpack_embedding,
+)
+
+
+def test_cache_key_normalizes_whitespace_and_includes_model():
+    """Test keys ignore whitespace differences but not model changes."""
+    key = embedding_cache_key("text-embedding-ada-002", "Secret  Cave\n")
+
+    assert key == embedding_cache_key("text-embedding-ada-002", " Secret Cave")
+    assert key != embedding_cache_key("text-embedding-3-small", "Secret Cave")
+    assert key != embedding_cache_key("text-embedding-ada-002", "secret cave")
+
+
+def test_pack_roundtrip_is_float32():
+    """Test embeddings are stored as 4 bytes per dimension."""
+    packed = pack_embedding([0.5, -0.25, 1.0])
+
+    assert len(packed) == 12
+    assert unpack_embedding(packed) == [0.5, -0.25, 1.0]
+
+
+def test_memory_tier_hit_skips_persistent_lookup():
+    """Test memory hits never query Supabase."""
+    supabase = MagicMock()
+    cache = EmbeddingCache(supabase)
+
+    cache.put_many("m", {"cave": [0.5] * 4})
+    supabase.reset_mock()
+
+    assert list(cache.get_many("m", ["cave"]).values()) == [[0.5] * 4]
+    supabase.client.table.assert_not_called()
+
+
+def test_persistent_tier_hit_promotes_to_memory():
+    """Test table hits are decoded from bytea and promoted to memory."""
+    key = embedding_cache_key("m", "cave")
+    supabase = MagicMock()
+    supabase.client.table.return_value.select.return_value.in_.return_value.execute.return_value = (
+        MagicMock(data=[{"content_hash": key, "embedding": "\\x" + pack_embedding([0.5]).hex()}])
+    )
+    cache = EmbeddingCache(supabase)
+
+    assert cache.get_many("m", ["cave"]) == {key: [0.5]}
+    assert len(cache.memory) == 1
+
+
+def test_persistent_tier_errors_are_misses():
+    """Test Supabase failures degrade to cache misses."""
+    supabase = MagicMock()
+    supabase.client.table.side_effect = Exception("connection refused")
+    cache = EmbeddingCache(supabase)
+
+    assert cache.get_many("m", ["cave"]) == {}
+    cache.put_many("m", {"cave": [0.5]})
+    assert len(cache.memory) == 1
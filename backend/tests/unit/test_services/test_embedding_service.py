@@ -1,16 +1,22 @@
 """Unit tests for Embedding service."""
 
-from unittest.mock import MagicMock, patch
+import base64
+import struct
+from unittest.mock import ANY, MagicMock, patch
 
+import numpy as np
 import pytest
 
 from chat.services.embedding_service import EmbeddingError, EmbeddingService
+from chat.services.search_result_cache import get_search_result_cache
+from chat.services.vector_index import write_snapshot
 
 
 @pytest.fixture
 def embedding_service():
     """Create fresh EmbeddingService instance with mocked dependencies."""
     EmbeddingService._instance = None
+    get_search_result_cache().clear()
 
     with (
         patch("chat.services.embedding_service.get_openai_client") as mock_openai,
@@ -94,7 +100,7 @@ def test_generate_embedding_empty_text(embedding_service):
 
 def test_generate_embedding_text_too_long(embedding_service):
     """Test embedding generation fails with text exceeding limit."""
-    long_text = "a" * 8001
+    long_text = "word " * 9000  # > 8191 tokens
 
     with pytest.raises(ValueError, match="Text too long"):
         embedding_service.generate_embedding(long_text)
@@ -402,6 +408,89 @@ def test_similarity_search_success(embedding_service):
     )
 
 
+def test_similarity_search_result_cache_invalidated_by_store(embedding_service):
+    """Test repeated searches skip the RPC until embeddings are stored."""
+    embedding_service.openai_client.embeddings.create.return_value = MagicMock(
+        data=[MagicMock(embedding=[0.1] * 1536, index=0)]
+    )
+    rpc = embedding_service.supabase.client.rpc
+    rpc.return_value.execute.return_value = MagicMock(data=[{"id": "1", "similarity": 0.9}])
+
+    first = embedding_service.similarity_search("underground caves")
+    first[0]["similarity"] = 0.0  # Callers get copies
+    second = embedding_service.similarity_search("  underground   caves ")
+    searches = [c for c in rpc.call_args_list if c[0][1]["match_count"] == 10]
+
+    assert second == [{"id": "1", "similarity": 0.9}]
+    assert len(searches) == 1
+
+    embedding_service.similarity_search("underground caves", limit=5)
+    embedding_service.store_place_embeddings(
+        [{"source": "serp", "source_id": "12345678", "text": "Cave", "metadata": {"name": "C"}}]
+    )
+    embedding_service.similarity_search("underground caves")
+
+    assert len([c for c in rpc.call_args_list if c[0][1]["match_count"] == 10]) == 2
+    assert len([c for c in rpc.call_args_list if c[0][1]["match_count"] == 5]) == 1
+
+
+def test_search_cache_key_covers_search_configuration(embedding_service):
+    """Test results cached under one probes/oversample setting are not reused by another."""
+    embedding_service.configure_exact_rerank(4, probes=10)
+    key = embedding_service._search_cache_key("caves", 10, 0.7)
+
+    embedding_service.configure_exact_rerank(4, probes=20)
+    assert embedding_service._search_cache_key("caves", 10, 0.7) != key
+
+    embedding_service.configure_exact_rerank(4, probes=10)
+    assert embedding_service._search_cache_key("caves", 10, 0.7) == key
+    embedding_service.configure_storage("halfvec", rerank_oversample=8)
+    assert embedding_service._search_cache_key("caves", 10, 0.7) != key
+
+
+def test_similarity_search_many_single_rpc(embedding_service):
+    """Test batch search embeds and searches uncached queries in one call each."""
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response(
+        [[0.1] * 1536, [0.2] * 1536, [0.3] * 1536]
+    )
+    rpc = embedding_service.supabase.client.rpc
+    rpc.return_value.execute.return_value = MagicMock(
+        data=[
+            {"query_index": 1, "id": "b", "similarity": 0.8},
+            {"query_index": 0, "id": "a", "similarity": 0.9},
+        ]
+    )
+
+    results = embedding_service.similarity_search_many(["caves", "mines", "tunnels"])
+
+    assert results == [[{"id": "a", "similarity": 0.9}], [{"id": "b", "similarity": 0.8}], []]
+    rpc.assert_called_with(
+        "app_embeddings.search_places_by_similarity_many",
+        {
+            "query_embeddings": [[0.1] * 1536, [0.2] * 1536, [0.3] * 1536],
+            "match_threshold": 0.7,
+            "match_count": 10,
+        },
+    )
+    assert embedding_service.openai_client.embeddings.create.call_count == 1
+
+    rpc.reset_mock()
+    assert embedding_service.similarity_search("mines") == [{"id": "b", "similarity": 0.8}]
+    rpc.assert_not_called()
+
+
+def test_similarity_search_many_validation(embedding_service):
+    """Test batch search rejects empty, oversized and invalid query lists."""
+    with pytest.raises(ValueError, match="query_texts must be non-empty"):
+        embedding_service.similarity_search_many([])
+
+    with pytest.raises(ValueError, match="At most 32 queries"):
+        embedding_service.similarity_search_many(["q"] * 33)
+
+    with pytest.raises(ValueError, match="query_text must be non-empty"):
+        embedding_service.similarity_search_many(["caves", " "])
+
+
 def test_similarity_search_empty_query(embedding_service):
     """Test search fails with empty query."""
     with pytest.raises(ValueError, match="query_text must be non-empty"):
@@ -416,7 +505,7 @@ def test_similarity_search_empty_query(embedding_service):
     [
         ("", "query_text must be non-empty"),
         ("   ", "query_text must be non-empty"),
-        ("a" * 8001, "Text too long"),
+        ("word " * 9000, "Text too long"),
     ],
 )
 def test_similarity_search_query_validation(embedding_service, query_text, error_match):
@@ -470,3 +559,420 @@ def test_similarity_search_no_results(embedding_service):
     results = embedding_service.similarity_search("nonexistent place")
 
     assert results == []
+
+
+def test_configure_storage_defaults_to_full(embedding_service):
+    """Test storage mode defaults to the full-precision index."""
+    assert embedding_service.storage_mode == "full"
+
+
+def test_configure_storage_invalid(embedding_service):
+    """Test storage configuration rejects unknown modes and oversample values."""
+    with pytest.raises(ValueError, match="Invalid storage_mode"):
+        embedding_service.configure_storage("int8")
+
+    with pytest.raises(ValueError, match="rerank_oversample must be between"):
+        embedding_service.configure_storage("halfvec", rerank_oversample=0)
+
+    with pytest.raises(ValueError, match="rerank_oversample must be between"):
+        embedding_service.configure_storage("binary", rerank_oversample=21)
+
+
+@pytest.mark.parametrize("storage_mode", ["halfvec", "binary"])
+def test_similarity_search_quantized_mode(embedding_service, storage_mode):
+    """Test quantized storage modes call the oversample-and-rerank RPC."""
+    mock_embedding_response = MagicMock()
+    mock_embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_embedding_response
+
+    mock_search_response = MagicMock()
+    mock_search_response.data = [{"id": "1", "metadata": {"name": "Cave"}, "similarity": 0.91}]
+    embedding_service.supabase.client.rpc.return_value.execute.return_value = mock_search_response
+
+    embedding_service.configure_storage(storage_mode, rerank_oversample=8)
+    results = embedding_service.similarity_search("underground caves", limit=5)
+
+    assert results[0]["similarity"] == 0.91
+    embedding_service.supabase.client.rpc.assert_called_with(
+        "app_embeddings.search_places_by_similarity_quantized",
+        {
+            "query_embedding": [0.1] * 1536,
+            "match_threshold": 0.7,
+            "match_count": 5,
+            "storage_mode": storage_mode,
+            "oversample": 8,
+        },
+    )
+
+
+def test_similarity_search_reranked(embedding_service):
+    """Test two-stage search fetches oversampled candidates and reranks them."""
+    mock_embedding_response = MagicMock()
+    mock_embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_embedding_response
+
+    vector = np.full(1536, 0.1, dtype=">f4")
+    embedding_b64 = base64.b64encode(struct.pack(">HH", 1536, 0) + vector.tobytes()).decode()
+    embedding_service.supabase.client.rpc.return_value.execute.return_value = MagicMock(
+        data=[
+            {
+                "id": "1",
+                "source": "serp",
+                "source_id": "cave_0001",
+                "metadata": {"name": "Cave"},
+                "embedding_b64": embedding_b64,
+                "candidate_rank": 1,
+            }
+        ]
+    )
+
+    embedding_service.configure_exact_rerank(8, probes=20)
+    results, stats = embedding_service.similarity_search_reranked("underground caves", limit=5)
+
+    assert results[0]["id"] == "1"
+    assert results[0]["similarity"] == pytest.approx(1.0)
+    assert stats.candidates == 1
+    assert stats.approx_recall == 1.0
+    embedding_service.supabase.client.rpc.assert_called_with(
+        "app_embeddings.search_places_candidates",
+        {
+            "query_embedding": [0.1] * 1536,
+            "candidate_count": 40,
+            "storage_mode": "full",
+            "probes": 20,
+        },
+    )
+
+    rpc_calls = embedding_service.supabase.client.rpc.call_count
+    cached, cached_stats = embedding_service.similarity_search_reranked(
+        "underground caves", limit=5
+    )
+    assert cached == results
+    assert cached_stats is None
+    assert embedding_service.similarity_search("underground caves", limit=5) == results
+    assert embedding_service.supabase.client.rpc.call_count == rpc_calls
+
+
+def test_configure_exact_rerank_invalid(embedding_service):
+    """Test exact rerank settings are validated."""
+    with pytest.raises(ValueError, match="oversample must be between"):
+        embedding_service.configure_exact_rerank(-1)
+
+    with pytest.raises(ValueError, match="probes must be between"):
+        embedding_service.configure_exact_rerank(4, probes=0)
+
+
+def test_similarity_search_uses_local_index(embedding_service, tmp_path):
+    """Test a loaded local index answers instead of the pgvector RPC."""
+    record = {
+        "id": "1",
+        "source": "serp",
+        "source_id": "a1b2c3d4e5f60718",
+        "metadata": {"name": "Cave"},
+        "created_at": "2025-01-01T00:00:00+00:00",
+    }
+    write_snapshot(tmp_path, [record], np.full((1, 1536), 0.1, dtype=np.float32))
+    assert embedding_service.enable_local_index(tmp_path)
+
+    mock_embedding_response = MagicMock()
+    mock_embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_embedding_response
+    embedding_service._pgvector_validated = True
+
+    results = embedding_service.similarity_search("underground caves", limit=5)
+
+    assert [r["source_id"] for r in results] == ["a1b2c3d4e5f60718"]
+    assert results[0]["similarity"] == pytest.approx(1.0)
+    embedding_service.supabase.client.rpc.assert_not_called()
+
+
+def test_similarity_search_local_index_falls_back_to_rpc(embedding_service, tmp_path):
+    """Test a missing snapshot or failing local search falls back to the RPC."""
+    assert not embedding_service.enable_local_index(tmp_path)
+    assert embedding_service.local_index is None
+
+    embedding_service.local_index = MagicMock(ready=True)
+    embedding_service.local_index.search.side_effect = RuntimeError("corrupt")
+
+    mock_embedding_response = MagicMock()
+    mock_embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_embedding_response
+    embedding_service.supabase.client.rpc.return_value.execute.return_value = MagicMock(
+        data=[{"id": "1", "similarity": 0.8}]
+    )
+
+    results = embedding_service.similarity_search("underground caves")
+
+    assert results == [{"id": "1", "similarity": 0.8}]
+
+
+def test_hybrid_search(embedding_service):
+    """Test hybrid search sends text and embedding to the RRF RPC in one call."""
+    mock_embedding_response = MagicMock()
+    mock_embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_embedding_response
+
+    rows = [{"id": "1", "metadata": {"name": "Catacombs"}, "similarity": 0.6, "rrf_score": 0.03}]
+    embedding_service.supabase.client.rpc.return_value.execute.return_value = MagicMock(data=rows)
+
+    results = embedding_service.hybrid_search("  paris catacombs ", limit=5, full_text_weight=2.0)
+
+    assert results == rows
+    embedding_service.supabase.client.rpc.assert_called_with(
+        "app_embeddings.search_places_hybrid",
+        {
+            "query_text": "paris catacombs",
+            "query_embedding": [0.1] * 1536,
+            "match_count": 5,
+            "candidate_count": 25,
+            "rrf_k": 60,
+            "full_text_weight": 2.0,
+            "semantic_weight": 1.0,
+        },
+    )
+
+
+def test_hybrid_search_candidate_count_capped(embedding_service):
+    """Test candidate_count never exceeds the RPC cap."""
+    mock_embedding_response = MagicMock()
+    mock_embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_embedding_response
+
+    embedding_service.hybrid_search("caves", limit=100)
+
+    params = embedding_service.supabase.client.rpc.call_args.args[1]
+    assert params["candidate_count"] == 500
+
+
+def test_hybrid_search_invalid_weights(embedding_service):
+    """Test negative or all-zero weights raise ValueError."""
+    with pytest.raises(ValueError, match="weights must be >= 0"):
+        embedding_service.hybrid_search("caves", full_text_weight=-1)
+
+    with pytest.raises(ValueError, match="At least one"):
+        embedding_service.hybrid_search("caves", full_text_weight=0, semantic_weight=0)
+
+
+def test_hybrid_search_rpc_error(embedding_service):
+    """Test hybrid RPC failures raise EmbeddingError."""
+    mock_embedding_response = MagicMock()
+    mock_embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_embedding_response
+    embedding_service._pgvector_validated = True
+    embedding_service.supabase.client.rpc.return_value.execute.side_effect = Exception("no fn")
+
+    with pytest.raises(EmbeddingError, match="Hybrid search failed"):
+        embedding_service.hybrid_search("caves")
+
+
+def test_get_index_stats(embedding_service):
+    """Test index stats are read from the monitoring RPC."""
+    stats = [{"index_name": "idx_places_embeddings_binary", "index_size_bytes": 8192}]
+    embedding_service.supabase.client.rpc.return_value.execute.return_value = MagicMock(data=stats)
+
+    assert embedding_service.get_index_stats() == stats
+    embedding_service.supabase.client.rpc.assert_called_with(
+        "app_monitoring.get_embedding_index_stats", {}
+    )
+
+
+def test_get_index_stats_error(embedding_service):
+    """Test index stats failures raise EmbeddingError."""
+    embedding_service.supabase.client.rpc.return_value.execute.side_effect = Exception("denied")
+
+    with pytest.raises(EmbeddingError, match="Failed to read embedding index stats"):
+        embedding_service.get_index_stats()
+
+
+def _batch_response(vectors):
+    """Build a mock multi-input embeddings response (rows returned out of order)."""
+    rows = [MagicMock(embedding=vector, index=i) for i, vector in enumerate(vectors)]
+    return MagicMock(data=list(reversed(rows)))
+
+
+def test_generate_embeddings_preserves_order(embedding_service):
+    """Test batched generation sends one request and keeps input order."""
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response(
+        [[0.1] * 1536, [0.2] * 1536, [0.3] * 1536]
+    )
+
+    items = embedding_service.generate_embeddings(["first", "  second  ", "third"])
+
+    assert [item.embedding[0] for item in items] == [0.1, 0.2, 0.3]
+    assert all(item.ok for item in items)
+    embedding_service.openai_client.embeddings.create.assert_called_once_with(
+        model="text-embedding-ada-002", input=["first", "second", "third"]
+    )
+
+
+def test_generate_embeddings_invalid_inputs_reported_per_item(embedding_service):
+    """Test empty and oversized inputs get item errors without an API call."""
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response([[0.1] * 1536])
+
+    items = embedding_service.generate_embeddings(["", "valid", "word " * 9000])
+
+    assert "non-empty" in items[0].error
+    assert items[1].ok
+    assert "Text too long" in items[2].error
+    assert embedding_service.openai_client.embeddings.create.call_args[1]["input"] == ["valid"]
+
+
+def test_generate_embeddings_dimension_checked_per_row(embedding_service):
+    """Test a wrong-dimension row fails only that item."""
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response(
+        [[0.1] * 1536, [0.1] * 512]
+    )
+
+    items = embedding_service.generate_embeddings(["good", "bad"])
+
+    assert items[0].ok
+    assert "Dimension mismatch" in items[1].error
+
+
+def _api_error(error_cls, status_code):
+    return error_cls("error", response=MagicMock(status_code=status_code), body=None)
+
+
+def test_generate_embeddings_isolates_failing_input(embedding_service):
+    """Test a batch rejected for its input is retried per item so one bad input is isolated."""
+    from openai import BadRequestError
+
+    def create(**kwargs):
+        input = kwargs["input"]
+        if len(input) > 1 or input == ["poison"]:
+            raise _api_error(BadRequestError, 400)
+        return _batch_response([[0.5] * 1536])
+
+    embedding_service.openai_client.embeddings.create.side_effect = create
+
+    items = embedding_service.generate_embeddings(["ok one", "poison", "ok two"])
+
+    assert items[0].ok and items[2].ok
+    assert "Failed to generate embedding" in items[1].error
+
+
+def test_generate_embeddings_retries_rate_limited_batch_whole(embedding_service, monkeypatch):
+    """Test a 429 retries the whole batch with backoff instead of splitting it."""
+    from openai import RateLimitError
+
+    sleeps = []
+    monkeypatch.setattr("chat.services.embedding_service.time.sleep", sleeps.append)
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs["input"])
+        if len(calls) < 3:
+            raise _api_error(RateLimitError, 429)
+        return _batch_response([[0.1] * 1536] * len(kwargs["input"]))
+
+    embedding_service.openai_client.embeddings.create.side_effect = create
+
+    items = embedding_service.generate_embeddings(["a", "b", "c"])
+
+    assert all(item.ok for item in items)
+    assert calls == [["a", "b", "c"]] * 3
+    assert 0.5 <= sleeps[0] <= 1.0 <= sleeps[1] <= 2.0
+
+
+def test_generate_embeddings_gives_up_after_max_attempts(embedding_service, monkeypatch):
+    """Test a persistent 5xx fails every item after BATCH_MAX_ATTEMPTS requests."""
+    from openai import InternalServerError
+
+    monkeypatch.setattr("chat.services.embedding_service.time.sleep", lambda _s: None)
+    embedding_service.openai_client.embeddings.create.side_effect = _api_error(
+        InternalServerError, 503
+    )
+
+    items = embedding_service.generate_embeddings(["a", "b"])
+
+    assert not any(item.ok for item in items)
+    assert embedding_service.openai_client.embeddings.create.call_count == 4
+
+
+def test_generate_embeddings_respects_item_budget(embedding_service, monkeypatch):
+    """Test inputs are split across requests at MAX_BATCH_ITEMS."""
+    monkeypatch.setattr("chat.services.embedding_service.MAX_BATCH_ITEMS", 2)
+    embedding_service.openai_client.embeddings.create.side_effect = lambda **kwargs: (
+        _batch_response([[0.1] * 1536] * len(kwargs["input"]))
+    )
+
+    items = embedding_service.generate_embeddings(["a", "b", "c", "d", "e"])
+
+    assert all(item.ok for item in items)
+    assert embedding_service.openai_client.embeddings.create.call_count == 3
+
+
+def test_store_place_embeddings_single_upsert(embedding_service):
+    """Test bulk storage upserts all valid rows in one call."""
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response(
+        [[0.1] * 1536, [0.2] * 1536]
+    )
+
+    items = embedding_service.store_place_embeddings(
+        [
+            {"source": "reddit", "source_id": "abc123", "text": "Cave", "metadata": {"name": "A"}},
+            {"source": "reddit", "source_id": "BAD-ID", "text": "Bad", "metadata": {"name": "B"}},
+            {
+                "source": "eventbrite",
+                "source_id": " 42 ",
+                "text": "Show",
+                "metadata": {"name": "C"},
+            },
+        ]
+    )
+
+    assert items[0].ok and items[2].ok
+    assert "Invalid Reddit source_id" in items[1].error
+
+    table = embedding_service.supabase.client.table
+    tables = [c[0][0] for c in table.call_args_list]
+    assert tables.count("app_embeddings.places_embeddings") == 1
+
+    upsert = table.return_value.upsert
+    upsert.assert_any_call(ANY, on_conflict="source,source_id", ignore_duplicates=False)
+    rows = next(c[0][0] for c in upsert.call_args_list if c[1].get("on_conflict") != "content_hash")
+    assert [(r["source"], r["source_id"]) for r in rows] == [
+        ("reddit", "abc123"),
+        ("eventbrite", "42"),
+    ]
+
+
+def test_store_place_embeddings_db_error(embedding_service):
+    """Test bulk storage raises when the upsert fails."""
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response([[0.1] * 1536])
+    embedding_service.supabase.client.table.return_value.upsert.return_value.execute.side_effect = (
+        Exception("DB error")
+    )
+
+    with pytest.raises(EmbeddingError, match="Failed to store embeddings"):
+        embedding_service.store_place_embeddings(
+            [{"source": "serp", "source_id": "12345678", "text": "x", "metadata": {"name": "X"}}]
+        )
+
+
+def test_generate_embedding_served_from_cache(embedding_service):
+    """Test repeated text (modulo whitespace) skips the OpenAI call."""
+    mock_response = MagicMock()
+    mock_response.data = [MagicMock(embedding=[0.25] * 1536)]
+    embedding_service.openai_client.embeddings.create.return_value = mock_response
+
+    first = embedding_service.generate_embedding("Secret   Cave")
+    second = embedding_service.generate_embedding("  Secret Cave ")
+
+    assert first == second
+    embedding_service.openai_client.embeddings.create.assert_called_once()
+
+
+def test_generate_embeddings_only_sends_cache_misses(embedding_service):
+    """Test batched generation checks the cache before calling OpenAI."""
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response([[0.5] * 1536])
+    embedding_service.generate_embeddings(["cached text"])
+
+    embedding_service.openai_client.embeddings.create.return_value = _batch_response(
+        [[0.75] * 1536]
+    )
+    items = embedding_service.generate_embeddings(["cached text", "new text"])
+
+    assert items[0].embedding[0] == 0.5
+    assert items[1].embedding[0] == 0.75
+    assert embedding_service.openai_client.embeddings.create.call_args[1]["input"] == ["new text"]
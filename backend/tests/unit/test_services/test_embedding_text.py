@@ -0,0 +1,69 @@
+"""Unit tests for place embedding text building."""
+
+from unittest.mock import patch
+
+import pytest
+
+from chat.schemas import SearchResult
+from chat.services.embedding_text import build_embedding_text
+
+
+@pytest.fixture(autouse=True)
+def char_tokens():
+    """Count one token per character so budgets are easy to reason about."""
+    with (
+        patch("chat.services.embedding_text.count_tokens", side_effect=lambda text, _: len(text)),
+        patch(
+            "chat.services.embedding_text.truncate_to_tokens",
+            side_effect=lambda text, n, _: text[:n].rstrip(),
+        ),
+    ):
+        yield
+
+
+def test_builds_from_metadata_dropping_empty_and_repeated_fields():
+    """Test compact formatting from a metadata dict."""
+    text = build_embedding_text(
+        {
+            "name": "  Secret   Cave ",
+            "description": "Jazz nights\nin Pikeville",
+            "location": "Pikeville",
+            "place_type": "music venue",
+        }
+    )
+
+    assert text == "Secret Cave - Jazz nights in Pikeville | music venue"
+
+
+def test_builds_from_search_result_without_ranking_category():
+    """Test the ranking bucket is not embedded and the search location is used."""
+    result = SearchResult(
+        name="Cave",
+        description="Dark",
+        source="serp",
+        category="primary",
+        metadata={"place_type": "landmark"},
+    )
+
+    assert build_embedding_text(result) == "Cave - Dark | landmark"
+    assert (
+        build_embedding_text(result, location="Austin, TX") == "Cave - Dark | Austin, TX | landmark"
+    )
+
+
+def test_ignores_ranking_buckets_in_stored_metadata():
+    """Test metadata indexed with a primary/nearby category falls back to no type."""
+    assert build_embedding_text({"name": "Cave", "category": "nearby"}) == "Cave"
+    assert build_embedding_text({"name": "Cave", "category": "Sinkhole"}) == "Cave | Sinkhole"
+
+
+def test_truncates_description_first():
+    """Test the description absorbs the budget and identifying fields survive."""
+    place = {"name": "Cave", "description": "x" * 100, "place_type": "grotto"}
+
+    text = build_embedding_text(place, max_tokens=30)
+
+    assert text == "Cave - " + "x" * 14 + " | grotto"
+    assert len(text) == 30
+    assert build_embedding_text(place, max_tokens=6) == "Cave |"
+    assert build_embedding_text({"name": "", "description": " "}) == ""
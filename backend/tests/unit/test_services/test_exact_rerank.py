@@ -0,0 +1,80 @@
+"""Unit tests for exact rerank of pgvector candidates."""
+
+import base64
+import struct
+
+import numpy as np
+import pytest
+
+from chat.services.exact_rerank import decode_pgvector, rerank_candidates
+
+
+def encode_pgvector(values: list[float]) -> str:
+    """Encode like encode(vector_send(v), 'base64')."""
+    raw = struct.pack(">HH", len(values), 0) + np.asarray(values, dtype=">f4").tobytes()
+    return base64.b64encode(raw).decode()
+
+
+def candidate(index: int, vector: list[float], rank: int) -> dict:
+    return {
+        "id": str(index),
+        "source": "serp",
+        "source_id": f"place_{index:04d}",
+        "metadata": {"name": f"Place {index}"},
+        "embedding_b64": encode_pgvector(vector),
+        "candidate_rank": rank,
+    }
+
+
+def test_decode_pgvector_round_trip():
+    """Test pgvector binary payloads decode to float32."""
+    decoded = decode_pgvector(encode_pgvector([0.5, -1.25, 3.0]))
+
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == [0.5, -1.25, 3.0]
+
+
+def test_decode_pgvector_truncated():
+    """Test truncated payloads are rejected."""
+    raw = base64.b64decode(encode_pgvector([1.0, 2.0]))[:-2]
+
+    with pytest.raises(ValueError, match="Truncated pgvector payload"):
+        decode_pgvector(base64.b64encode(raw).decode())
+
+
+def test_rerank_candidates_orders_by_exact_similarity():
+    """Test exact cosine order replaces the approximate order."""
+    candidates = [
+        candidate(0, [0.0, 1.0], rank=1),  # approximate scan ranked it first, similarity 0
+        candidate(1, [1.0, 0.1], rank=2),
+        candidate(2, [2.0, 0.0], rank=3),  # unnormalized, similarity 1
+    ]
+
+    results, stats = rerank_candidates([1.0, 0.0], candidates, limit=2, similarity_threshold=0.5)
+
+    assert [r["id"] for r in results] == ["2", "1"]
+    assert results[0]["similarity"] == pytest.approx(1.0)
+    assert set(results[0]) == {"id", "source", "source_id", "metadata", "similarity"}
+    assert stats.candidates == 3
+    assert stats.returned == 2
+    assert stats.approx_recall == 0.5
+
+
+def test_rerank_candidates_threshold_and_empty():
+    """Test the threshold is exclusive and empty candidates report full recall."""
+    candidates = [candidate(0, [1.0, 0.0], rank=1), candidate(1, [0.0, 1.0], rank=2)]
+
+    results, stats = rerank_candidates([1.0, 0.0], candidates, limit=2, similarity_threshold=0.0)
+
+    assert [r["id"] for r in results] == ["0"]
+    assert stats.approx_recall == 1.0
+
+    results, stats = rerank_candidates([1.0, 0.0], [], limit=5, similarity_threshold=0.5)
+    assert results == []
+    assert stats.to_dict()["candidates"] == 0
+
+
+def test_rerank_candidates_dimension_mismatch():
+    """Test candidates must match the query dimensions."""
+    with pytest.raises(ValueError, match="dimensions"):
+        rerank_candidates([1.0, 0.0, 0.0], [candidate(0, [1.0, 0.0], 1)], 1, 0.5)
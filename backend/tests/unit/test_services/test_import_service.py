@@ -0,0 +1,116 @@
+"""Unit tests for the bulk place importer."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from chat.services.embedding_service import (
+    EmbeddingBatchItem,
+    EmbeddingError,
+    EmbeddingValidationMixin,
+)
+from chat.services.import_service import PlaceImporter, iter_records, normalize_record
+
+
+class FakeEmbeddingService(EmbeddingValidationMixin):
+    """Real validation; storage recorded in memory."""
+
+    def __init__(self, existing: list[tuple[str, str]] | None = None) -> None:
+        self.stored: list[list[dict]] = []
+        self.overwrite: list[bool] = []
+        self.fail = False
+        self.supabase = MagicMock()
+        query = self.supabase.client.table.return_value.select.return_value.in_.return_value
+        query.execute.return_value = MagicMock(
+            data=[{"source": s, "source_id": i} for s, i in existing or []]
+        )
+
+    def store_place_embeddings(self, places, overwrite=True):
+        if self.fail:
+            raise EmbeddingError("Failed to store embeddings: DB error")
+        self.stored.append(places)
+        self.overwrite.append(overwrite)
+        return [EmbeddingBatchItem(index=i, embedding=[0.1]) for i in range(len(places))]
+
+
+def _record(source_id: str, name: str = "Cave", **extra) -> dict:
+    return {"source": "serp", "source_id": source_id, "name": name, **extra}
+
+
+def test_iter_records_jsonl_and_csv(tmp_path):
+    """Test both formats stream dicts and bad JSON lines become error records."""
+    jsonl = tmp_path / "places.jsonl"
+    jsonl.write_text(json.dumps(_record("11111111")) + "\n\n{broken\n")
+    csv_file = tmp_path / "places.csv"
+    csv_file.write_text('source,source_id,name,metadata\nserp,22222222,Hall,"{""x"": 1}"\n')
+
+    rows = list(iter_records(jsonl))
+    assert rows[0]["source_id"] == "11111111"
+    assert "line 3: invalid JSON" in rows[1]["_error"]
+
+    assert list(iter_records(csv_file))[0]["name"] == "Hall"
+
+    with pytest.raises(ValueError, match="Unsupported import format"):
+        list(iter_records(tmp_path / "places.xml"))
+
+
+def test_normalize_record_merges_flat_fields():
+    """Test flat columns merge into metadata and build the default text."""
+    place = normalize_record(
+        {"source_id": "1", "name": "Cave", "description": "Jazz", "metadata": '{"x": 1}'},
+        default_source="serp",
+    )
+
+    assert place == {
+        "source": "serp",
+        "source_id": "1",
+        "text": "Cave - Jazz",
+        "metadata": {"x": 1, "name": "Cave", "description": "Jazz"},
+    }
+
+    with pytest.raises(ValueError, match="metadata is not valid JSON"):
+        normalize_record({"metadata": "{oops"})
+
+
+def test_run_dedupes_and_skips_invalid_and_existing():
+    """Test duplicates, invalid and already-stored rows are not embedded."""
+    service = FakeEmbeddingService(existing=[("serp", "33333333")])
+    records = [
+        _record("11111111", "First"),
+        _record("11111111", "Second"),
+        _record("22222222"),
+        _record("33333333"),
+        {"source": "nope", "source_id": "1"},
+        _record("11111111", "Third"),  # Seen in an earlier batch
+    ]
+
+    stats = PlaceImporter(service, batch_size=5).run(records)  # type: ignore[arg-type]
+
+    assert (stats.read, stats.imported, stats.duplicates, stats.existing, stats.invalid) == (
+        6,
+        2,
+        2,
+        1,
+        1,
+    )
+    assert service.overwrite == [False]
+    stored = service.stored[0]
+    assert [p["source_id"] for p in stored] == ["11111111", "22222222"]
+    assert stored[0]["metadata"]["name"] == "Second"
+
+
+def test_run_counts_failed_batches_and_reports_progress():
+    """Test a failed batch is counted and the import continues."""
+    service = FakeEmbeddingService()
+    service.fail = True
+    progress = []
+
+    stats = PlaceImporter(service, batch_size=1).run(  # type: ignore[arg-type]
+        [_record("11111111"), _record("22222222")],
+        on_progress=lambda s: progress.append(s.read),
+    )
+
+    assert stats.failed == 2
+    assert stats.imported == 0
+    assert progress == [1, 2]
@@ -0,0 +1,84 @@
+"""Unit tests for the pgvector index benchmark harness."""
+
+import base64
+import struct
+
+import numpy as np
+import pytest
+
+from chat.services.exact_rerank import decode_pgvector
+from chat.services.index_benchmark import (
+    BENCH_BLOCK_ROWS,
+    ExactNeighbors,
+    IndexConfig,
+    SyntheticEmbeddings,
+    copy_payload,
+    recall_at_k,
+)
+
+DIMS = 16
+
+
+@pytest.fixture
+def data():
+    return SyntheticEmbeddings(dimensions=DIMS, clusters=8, seed=3)
+
+
+def test_synthetic_rows_are_deterministic_and_sliceable(data):
+    """Test any id range regenerates the same unit vectors."""
+    whole = np.vstack([m for _, m in data.rows(0, BENCH_BLOCK_ROWS + 10)])
+    first_id, part = next(data.rows(BENCH_BLOCK_ROWS - 5, BENCH_BLOCK_ROWS + 10))
+
+    assert whole.shape == (BENCH_BLOCK_ROWS + 10, DIMS)
+    assert first_id == BENCH_BLOCK_ROWS - 5
+    assert np.array_equal(part, whole[BENCH_BLOCK_ROWS - 5 : BENCH_BLOCK_ROWS])
+    assert np.allclose(np.linalg.norm(whole, axis=1), 1.0, atol=1e-5)
+    assert not np.allclose(data.queries(4), whole[:4])
+
+
+def test_exact_neighbors_streaming_matches_brute_force(data):
+    """Test the running top-k equals a full scan."""
+    queries = data.queries(5)
+    matrix = np.vstack([m for _, m in data.rows(0, 300)])
+    exact = ExactNeighbors(queries, k=7)
+
+    for start in range(0, 300, 64):
+        exact.add(start, matrix[start : start + 64])
+
+    expected = [set(np.argsort(-(matrix @ q))[:7].tolist()) for q in queries]
+    assert exact.truth() == expected
+    assert recall_at_k([sorted(t) for t in expected], expected) == 1.0
+
+
+def test_recall_at_k():
+    """Test recall is averaged per query."""
+    assert recall_at_k([[1, 2], [3, 9]], [{1, 2}, {3, 4}]) == 0.75
+    assert recall_at_k([], []) == 1.0
+
+
+def test_copy_payload_layout():
+    """Test COPY BINARY tuples carry ids and pgvector binary vectors."""
+    matrix = np.array([[0.5, -1.0, 2.0], [1.0, 0.0, 0.0]], dtype=np.float32)
+
+    payload = copy_payload(41, matrix)
+
+    tuple_size = 2 + 4 + 4 + 4 + 4 + 3 * 4
+    assert len(payload) == 2 * tuple_size
+    fields, id_len, row_id, vec_len = struct.unpack_from(">hiii", payload)
+    assert (fields, id_len, row_id, vec_len) == (2, 4, 41, 16)
+    vector = payload[14:tuple_size]
+    assert decode_pgvector(base64.b64encode(vector).decode()).tolist() == [0.5, -1.0, 2.0]
+    assert struct.unpack_from(">i", payload, tuple_size + 6)[0] == 42
+
+
+def test_index_config_sql_and_labels():
+    """Test index DDL and swept settings per index kind."""
+    ivf = IndexConfig("ivfflat", lists=100)
+    hnsw = IndexConfig("hnsw", m=16, ef_construction=64)
+
+    assert "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)" in ivf.create_sql()
+    assert ivf.search_setting == "ivfflat.probes"
+    assert "WITH (m = 16, ef_construction = 64)" in hnsw.create_sql()
+    assert hnsw.label == "hnsw(m=16,ef_construction=64)"
+    assert IndexConfig("exact").create_sql() is None
+    assert IndexConfig("exact").search_setting is None
@@ -0,0 +1,121 @@
+"""Unit tests for ivfflat index re-tuning."""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from chat.services.index_tuning import (
+    IndexRetuner,
+    RetunePlan,
+    TuningStatus,
+    candidate_lists,
+    plan_retune,
+    recommended_lists,
+    recommended_probes,
+)
+
+BUILT_AT = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def tuned(total_rows: int, rows_since_build: int, rows_at_build: int, lists: int = 100):
+    return TuningStatus(
+        total_rows=total_rows,
+        rows_since_build=rows_since_build,
+        index_lists=lists,
+        lists=lists,
+        probes=recommended_probes(lists),
+        rows_at_build=rows_at_build,
+        built_at=BUILT_AT,
+    )
+
+
+@pytest.mark.parametrize(
+    ("rows", "lists"), [(0, 1), (50_000, 50), (1_000_000, 1000), (4_000_000, 2000)]
+)
+def test_recommended_lists(rows, lists):
+    """Test rows/1000 up to 1M rows, sqrt(rows) beyond."""
+    assert recommended_lists(rows) == lists
+
+
+def test_candidate_lists():
+    """Test both pgvector rules of thumb are swept, deduplicated and clamped."""
+    assert candidate_lists(10_000) == [10, 100]
+    assert candidate_lists(1_000_000) == [1000]
+    assert candidate_lists(100) == [1, 10]
+    assert candidate_lists(100_000_000_000) == [32_768]
+
+
+def test_recommended_probes():
+    """Test probes follow sqrt(lists) and never exceed lists."""
+    assert recommended_probes(100) == 10
+    assert recommended_probes(1) == 1
+
+
+def test_drift_counts_inserts_and_deletes():
+    """Test drift is the share of rows the centroids never saw."""
+    assert tuned(120_000, 20_000, 100_000).drift == pytest.approx(20_000 / 120_000)
+    assert tuned(90_000, 0, 100_000).drift == pytest.approx(10_000 / 90_000)
+    assert TuningStatus(total_rows=10).drift is None
+
+
+def test_plan_retune_within_thresholds():
+    """Test no plan while drift and lists are within thresholds."""
+    assert plan_retune(tuned(110_000, 10_000, 100_000)) is None
+
+
+def test_plan_retune_rebuilds_on_drift_and_growth():
+    """Test drift and a stale lists value both trigger a rebuild."""
+    plan = plan_retune(tuned(400_000, 300_000, 100_000))
+
+    assert plan.rebuild
+    assert plan.lists == 400
+    assert plan.probes == 20
+    assert any(r.startswith("drift 0.75") for r in plan.reasons)
+    assert "lists 100 -> 400 for 400000 rows" in plan.reasons
+
+
+def test_plan_retune_untracked_index():
+    """Test an index without a tuning record is rebuilt."""
+    status = TuningStatus(total_rows=50_000, index_lists=100)
+
+    plan = plan_retune(status, probes=8)
+
+    assert plan.rebuild
+    assert (plan.lists, plan.probes) == (50, 8)
+    assert "no recorded build" in plan.reasons
+
+
+def test_plan_retune_probes_only():
+    """Test an explicit probes change is recorded without a rebuild."""
+    plan = plan_retune(tuned(110_000, 10_000, 100_000), probes=25)
+
+    assert plan == RetunePlan(100, 25, rebuild=False, reasons=["probes 10 -> 25"])
+
+
+def test_retuner_rebuilds_concurrently_and_records():
+    """Test the index is built under a temporary name, swapped and recorded."""
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.side_effect = [
+        (120_000, 20_000, 100, 100, 10, 100_000, BUILT_AT),
+        (BUILT_AT, 120_000),
+    ]
+
+    IndexRetuner(conn).apply(RetunePlan(120, 11, rebuild=True, reasons=["forced"]))
+
+    statements = [c.args[0] for c in cur.execute.call_args_list]
+    create = next(i for i, s in enumerate(statements) if s.startswith("CREATE INDEX"))
+    assert "CONCURRENTLY idx_places_embeddings_vector_next" in statements[create]
+    assert "WITH (lists = 120)" in statements[create]
+    assert statements[create + 1] == (
+        "DROP INDEX CONCURRENTLY IF EXISTS app_embeddings.idx_places_embeddings_vector"
+    )
+    assert "RENAME TO idx_places_embeddings_vector" in statements[create + 2]
+    assert cur.execute.call_args.args[1] == (
+        120,
+        11,
+        120_000,
+        BUILT_AT,
+        "idx_places_embeddings_vector",
+    )
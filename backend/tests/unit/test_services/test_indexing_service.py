@@ -0,0 +1,202 @@
+"""Unit tests for background indexing service."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from chat.schemas import SearchResult
+from chat.services.embedding_service import EmbeddingBatchItem, EmbeddingService
+from chat.services.indexing_service import (
+    EmbeddingIndexer,
+    build_embedding_jobs,
+    derive_source_id,
+)
+from chat.utils.background import BackgroundLoop
+
+
+@pytest.fixture
+def background():
+    """Private background loop, stopped (cancelling the worker) after the test."""
+    loop = BackgroundLoop(name="test-indexing")
+    yield loop
+    loop.stop()
+
+
+@pytest.fixture
+def validator():
+    """EmbeddingService instance used only for its source_id validation."""
+    return EmbeddingService.__new__(EmbeddingService)
+
+
+def test_derive_source_id_serp_is_stable_hash(validator):
+    """Test SERP IDs are stable URL hashes valid for the serp format."""
+    result = SearchResult(
+        name="Cave", description="", source="serp", url="https://example.com/cave"
+    )
+
+    source_id = derive_source_id(result)
+
+    assert source_id == derive_source_id(result)
+    assert len(source_id) == 16
+    validator._validate_source_id("serp", source_id)
+
+
+def test_derive_source_id_reddit_from_metadata_and_permalink(validator):
+    """Test Reddit IDs come from post metadata, falling back to the permalink."""
+    from_metadata = SearchResult(
+        name="Post", description="", source="reddit", metadata={"post_id": "1AbC2d"}
+    )
+    from_permalink = SearchResult(
+        name="Post",
+        description="",
+        source="reddit",
+        url="https://reddit.com/r/kentucky/comments/xyz789/secret_cave/",
+    )
+
+    assert derive_source_id(from_metadata) == "1abc2d"
+    assert derive_source_id(from_permalink) == "xyz789"
+    validator._validate_source_id("reddit", derive_source_id(from_permalink))
+
+
+def test_derive_source_id_eventbrite_numeric(validator):
+    """Test Eventbrite IDs are numeric event IDs from metadata or URL."""
+    from_metadata = SearchResult(
+        name="Show", description="", source="eventbrite", metadata={"event_id": "123456789"}
+    )
+    from_url = SearchResult(
+        name="Show",
+        description="",
+        source="eventbrite",
+        url="https://www.eventbrite.com/e/cave-concert-tickets-987654321",
+    )
+    no_id = SearchResult(name="Show", description="", source="eventbrite")
+
+    assert derive_source_id(from_metadata) == "123456789"
+    assert derive_source_id(from_url) == "987654321"
+    assert derive_source_id(no_id) is None
+    validator._validate_source_id("eventbrite", derive_source_id(from_url))
+
+
+def test_build_embedding_jobs_skips_unknown_and_duplicates():
+    """Test job building dedupes pairs and skips sources without IDs."""
+    results = [
+        SearchResult(name="Cave", description="Dark", source="serp", url="https://a.com/x"),
+        SearchResult(name="Cave again", description="", source="serp", url="https://a.com/x"),
+        SearchResult(name="Vector hit", description="", source="vector"),
+        SearchResult(name="Show", description="", source="eventbrite"),
+    ]
+
+    jobs = build_embedding_jobs(results, "Pikeville, KY")
+
+    assert len(jobs) == 1
+    assert jobs[0].text == "Cave - Dark | Pikeville, KY"
+    assert jobs[0].metadata["name"] == "Cave"
+    assert jobs[0].metadata["location"] == "Pikeville, KY"
+    # Ranking fields depend on the query, not the place
+    assert "category" not in jobs[0].metadata
+    assert "score" not in jobs[0].metadata
+
+
+@pytest.mark.asyncio
+async def test_indexer_batches_and_skips_existing(background):
+    """Test the worker batches jobs and skips pairs already stored."""
+    jobs = build_embedding_jobs(
+        [
+            SearchResult(name="Old", description="", source="reddit", metadata={"post_id": "old1"}),
+            SearchResult(name="New", description="", source="reddit", metadata={"post_id": "new1"}),
+        ],
+        "Portland, OR",
+    )
+
+    service = MagicMock()
+    service.supabase.client.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(
+        data=[{"source": "reddit", "source_id": "old1"}]
+    )
+    service.store_place_embeddings.return_value = [EmbeddingBatchItem(index=0, embedding=[0.1])]
+
+    indexer = EmbeddingIndexer(batch_size=2, flush_seconds=0.05, background=background)
+
+    with patch("chat.services.indexing_service.get_embedding_service", return_value=service):
+        assert indexer.enqueue(jobs) == 2
+        for _ in range(50):
+            if service.store_place_embeddings.called:
+                break
+            await asyncio.sleep(0.01)
+
+        places = service.store_place_embeddings.call_args[0][0]
+        assert [p["source_id"] for p in places] == ["new1"]
+
+        # Both pairs are now known; re-enqueueing is a no-op
+        assert indexer.enqueue(jobs) == 0
+
+
+@pytest.mark.asyncio
+async def test_indexer_drops_when_queue_full(background):
+    """Test enqueue never blocks and drops overflow jobs."""
+    jobs = build_embedding_jobs(
+        [
+            SearchResult(name=f"P{i}", description="", source="serp", url=f"https://a.com/{i}")
+            for i in range(5)
+        ],
+        "Atlanta, GA",
+    )
+    indexer = EmbeddingIndexer(max_queue_size=2, flush_seconds=10, background=background)
+
+    assert indexer.enqueue(jobs) == 2
+    # The two accepted jobs are still waiting for the flush, so nothing fits
+    assert indexer.enqueue(jobs) == 0
+
+
+def test_indexer_counts_jobs_enqueued_before_the_worker_starts(background):
+    """Test every accepted job counts toward the bound, not only the first delivery."""
+    jobs = build_embedding_jobs(
+        [
+            SearchResult(name=f"P{i}", description="", source="serp", url=f"https://a.com/{i}")
+            for i in range(6)
+        ],
+        "Atlanta, GA",
+    )
+    indexer = EmbeddingIndexer(max_queue_size=5, flush_seconds=10, background=background)
+    gate = threading.Event()
+    background.call_soon(gate.wait, 2)  # Hold the loop so both deliveries are queued
+
+    assert indexer.enqueue(jobs[:2]) == 2
+    assert indexer.enqueue(jobs[2:5]) == 3
+    gate.set()
+    background.submit(asyncio.sleep(0)).result(timeout=2)
+
+    assert indexer.enqueue(jobs[5:]) == 0
+
+
+def test_indexer_outlives_the_calling_event_loop(background):
+    """Test jobs enqueued from a short-lived loop are still indexed after it closes.
+
+    Under WSGI each request runs on its own event loop that asgiref tears down
+    (cancelling leftover tasks) when the view returns.
+    """
+    jobs = build_embedding_jobs(
+        [SearchResult(name="Cave", description="", source="serp", url="https://a.com/c")],
+        "Austin, TX",
+    )
+    service = MagicMock()
+    service.supabase.client.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(
+        data=[]
+    )
+    stored = threading.Event()
+
+    def store(_places):
+        stored.set()
+        return [EmbeddingBatchItem(index=0, embedding=[0.1])]
+
+    service.store_place_embeddings.side_effect = store
+
+    indexer = EmbeddingIndexer(batch_size=1, flush_seconds=0.01, background=background)
+
+    async def request() -> int:
+        return indexer.enqueue(jobs)
+
+    with patch("chat.services.indexing_service.get_embedding_service", return_value=service):
+        assert asyncio.run(request()) == 1
+        assert stored.wait(2)
@@ -0,0 +1,131 @@
+"""Unit tests for LLM provider selection and the local stub."""
+
+import json
+import time
+
+import numpy as np
+import pytest
+from openai import AsyncOpenAI, OpenAI
+
+from chat.services.llm_provider import (
+    AsyncStubLLMClient,
+    StubLLMClient,
+    StubProfile,
+    create_async_llm_client,
+    create_llm_client,
+)
+
+PARSE_MESSAGES = [
+    {"role": "system", "content": "Parse travel queries. Return JSON with location and intent."},
+    {"role": "user", "content": "hidden gems in Pikeville KY"},
+]
+RESPONSE_MESSAGES = [
+    {"role": "system", "content": "You are Stonewalker."},
+    {"role": "user", "content": "User seeks: hidden gems in Pikeville, KY"},
+]
+
+
+def test_create_clients_by_provider():
+    """Test that the provider name selects the SDK or the stub."""
+    assert isinstance(create_llm_client("openai"), OpenAI)
+    assert isinstance(create_async_llm_client("openai"), AsyncOpenAI)
+    assert isinstance(create_llm_client("stub"), StubLLMClient)
+    assert isinstance(create_async_llm_client("stub"), AsyncStubLLMClient)
+
+    with pytest.raises(ValueError, match="llm_provider"):
+        create_llm_client("other")
+
+
+def test_stub_parse_returns_local_parser_json():
+    """Test that parse prompts get a JSON location/intent answer."""
+    completion = StubLLMClient().chat.completions.create(
+        model="gpt-4o-mini", messages=PARSE_MESSAGES, max_tokens=100
+    )
+
+    assert json.loads(completion.choices[0].message.content) == {
+        "location": "Pikeville, KY",
+        "intent": "hidden gems",
+    }
+    assert completion.usage.total_tokens > 0
+
+
+def test_stub_response_is_deterministic_and_capped():
+    """Test that chat text repeats for the same prompt and respects max_tokens."""
+    client = StubLLMClient()
+    first = client.chat.completions.create(model="m", messages=RESPONSE_MESSAGES, max_tokens=300)
+    second = client.chat.completions.create(model="m", messages=RESPONSE_MESSAGES, max_tokens=300)
+    short = client.chat.completions.create(model="m", messages=RESPONSE_MESSAGES, max_tokens=5)
+
+    assert first.choices[0].message.content == second.choices[0].message.content
+    assert "Pikeville, KY" in first.choices[0].message.content
+    assert short.usage.completion_tokens <= 5
+
+
+def test_stub_embeddings_are_hash_seeded_unit_vectors():
+    """Test that embeddings are stable per text, unit length and sized by request."""
+    client = StubLLMClient(StubProfile(embedding_dimensions=8))
+
+    response = client.embeddings.create(model="m", input=["a", "b", "a"])
+    vectors = [np.array(row.embedding) for row in response.data]
+
+    assert [row.index for row in response.data] == [0, 1, 2]
+    assert len(vectors[0]) == 8
+    assert np.allclose(vectors[0], vectors[2])
+    assert not np.allclose(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[1]), 1.0, atol=1e-5)
+    assert len(client.embeddings.create(model="m", input="a", dimensions=4).data[0].embedding) == 4
+
+
+def test_stub_latency_and_token_rate():
+    """Test that the profile's latency and token rate are applied."""
+    client = StubLLMClient(StubProfile(latency_ms=20, tokens_per_second=1000))
+
+    started = time.perf_counter()
+    completion = client.chat.completions.create(model="m", messages=RESPONSE_MESSAGES)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.02 + completion.usage.completion_tokens / 1000 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_async_stub_stream_matches_completion():
+    """Test that streamed chunks concatenate to the non-streamed text."""
+    client = AsyncStubLLMClient()
+    completion = await client.chat.completions.create(model="m", messages=RESPONSE_MESSAGES)
+    stream = await client.chat.completions.create(
+        model="m", messages=RESPONSE_MESSAGES, stream=True
+    )
+
+    chunks = [chunk async for chunk in stream]
+
+    assert len(chunks) > 2
+    assert chunks[-1].choices[0].finish_reason == "stop"
+    text = "".join(chunk.choices[0].delta.content or "" for chunk in chunks)
+    assert text == completion.choices[0].message.content
+
+
+@pytest.mark.asyncio
+async def test_async_stub_stream_reports_usage_when_requested():
+    """Test that include_usage adds a final choice-less chunk with usage."""
+    client = AsyncStubLLMClient()
+    stream = await client.chat.completions.create(
+        model="m",
+        messages=RESPONSE_MESSAGES,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+
+    chunks = [chunk async for chunk in stream]
+
+    assert chunks[-1].choices == []
+    assert chunks[-1].usage.completion_tokens > 0
+    assert all(chunk.usage is None for chunk in chunks[:-1])
+
+
+@pytest.mark.asyncio
+async def test_async_stub_embeddings_match_sync():
+    """Test that both stub clients embed identically."""
+    sync_vector = StubLLMClient().embeddings.create(model="m", input="x").data[0].embedding
+    response = await AsyncStubLLMClient().embeddings.create(model="m", input="x")
+
+    assert response.data[0].embedding == sync_vector
@@ -0,0 +1,49 @@
+"""Unit tests for LLM token accounting."""
+
+from openai.types import CompletionUsage
+from openai.types.completion_usage import PromptTokensDetails
+
+from chat.services.llm_usage import CallUsage, TokenLedger
+
+
+def test_call_usage_reads_cached_tokens():
+    """Test that cached prompt tokens come from prompt_tokens_details."""
+    usage = CompletionUsage(
+        prompt_tokens=1200,
+        completion_tokens=40,
+        total_tokens=1240,
+        prompt_tokens_details=PromptTokensDetails(cached_tokens=1024),
+    )
+
+    call = CallUsage.from_response(1180, usage)
+
+    assert call.to_dict() == {
+        "estimated_prompt_tokens": 1180,
+        "prompt_tokens": 1200,
+        "completion_tokens": 40,
+        "cached_tokens": 1024,
+    }
+    assert CallUsage.from_response(10, None).prompt_tokens is None
+
+
+def test_ledger_totals_per_operation_and_model():
+    """Test that totals accumulate separately and count calls without usage."""
+    ledger = TokenLedger()
+    ledger.record("parse", "m", CallUsage(100, 110, 10, 0))
+    ledger.record("parse", "m", CallUsage(100, 90, 12, 45))
+    ledger.record("parse", "m", CallUsage(100))
+    ledger.record("generate", "m", CallUsage(300, 320, 60, 0))
+
+    totals = ledger.totals()
+    parse = totals["parse"]["m"]
+
+    assert parse["calls"] == 3
+    assert parse["calls_without_usage"] == 1
+    assert parse["estimated_prompt_tokens"] == 300
+    assert parse["prompt_tokens"] == 200
+    assert parse["avg_prompt_tokens"] == 100.0
+    assert parse["cached_share"] == 0.225
+    assert totals["generate"]["m"]["completion_tokens"] == 60
+
+    ledger.clear()
+    assert ledger.totals() == {}
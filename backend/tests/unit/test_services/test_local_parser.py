@@ -0,0 +1,67 @@
+"""Unit tests for the local query parser."""
+
+import pytest
+
+from chat.schemas import ParsedInput
+from chat.services.local_parser import parse_locally, parses_agree
+
+
+@pytest.mark.parametrize(
+    ("query", "location", "intent"),
+    [
+        ("hidden gems in Pikeville KY", "Pikeville, KY", "hidden gems"),
+        ("cool underground spots near Atlanta", "Atlanta, GA", "underground spots"),
+        ("weird stuff to do in Portland Oregon", "Portland, OR", "weird stuff"),
+        ("Salt Lake City UT secret spots", "Salt Lake City, UT", "secret spots"),
+        ("caves in the mountains near Asheville NC", "Asheville, NC", "caves in the mountains"),
+    ],
+)
+def test_parse_locally_confident(query, location, intent):
+    """Test that common query shapes parse above the fast-path threshold."""
+    result = parse_locally(query)
+
+    assert result.location == location
+    assert result.intent == intent
+    assert result.confidence >= 0.8
+
+
+def test_parse_locally_unknown_city_is_not_confident():
+    """Test that a bare city missing from the gazetteer scores low."""
+    result = parse_locally("any hidden gems near Hazard")
+
+    assert result.location == "Hazard"
+    assert result.confidence < 0.8
+
+
+def test_parse_locally_ambiguous_city_is_not_confident():
+    """Test that a city in several states needs an explicit state."""
+    assert parse_locally("hidden gems in Portland").confidence < 0.8
+    assert parse_locally("hidden gems in Portland, ME").location == "Portland, ME"
+
+
+def test_parse_locally_lowercase_or_is_not_a_state():
+    """Test that "or" is not read as Oregon without a comma or capitals."""
+    result = parse_locally("bars in portland or seattle")
+
+    assert result.location != "Portland, OR"
+    assert result.confidence < 0.8
+
+
+def test_parse_locally_no_location():
+    """Test that queries without a place get zero confidence."""
+    result = parse_locally("show me something weird")
+
+    assert result.location == ""
+    assert result.confidence == 0.0
+
+
+def test_parses_agree():
+    """Test that state names, codes and a country suffix compare equal."""
+    local = ParsedInput(location="Pikeville, KY", intent="hidden gems", confidence=0.95)
+
+    assert parses_agree(
+        local,
+        ParsedInput(location="Pikeville, Kentucky, USA", intent="hidden gems", confidence=0.8),
+    ) == (True, True)
+    other = ParsedInput(location="Lexington, KY", intent="breweries", confidence=0.8)
+    assert parses_agree(local, other) == (False, False)
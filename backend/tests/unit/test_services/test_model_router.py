@@ -0,0 +1,86 @@
+"""Unit tests for the LLM model router."""
+
+from unittest.mock import patch
+
+import pytest
+
+from chat.services.model_router import ModelRouter
+
+
+@pytest.fixture
+def router():
+    return ModelRouter(
+        candidates={"parse": ["mini", "nano"], "generate": ["mini"]},
+        p95_budget_ms={"parse": 1000, "generate": 3000},
+        max_error_rate=0.2,
+        window_seconds=60,
+        min_samples=5,
+    )
+
+
+def test_choose_prefers_first_candidate_without_evidence(router):
+    """Test that models are healthy until min_samples are recorded."""
+    for _ in range(4):
+        router.record("parse", "mini", 5000, ok=False)
+
+    decision = router.choose("parse")
+
+    assert decision.model == "mini"
+    assert decision.reason == "preferred"
+
+
+def test_choose_degrades_on_p95(router):
+    """Test that a p95 over budget moves to the next candidate."""
+    for latency in [100] * 18 + [1500, 1600]:
+        router.record("parse", "mini", latency, ok=True)
+
+    decision = router.choose("parse")
+
+    assert decision.model == "nano"
+    assert "mini p95 1500ms > 1000ms" in decision.reason
+
+
+def test_choose_degrades_on_error_rate(router):
+    """Test that an error rate over the limit moves to the next candidate."""
+    for ok in [True, True, True, False, False]:
+        router.record("parse", "mini", 100, ok=ok)
+
+    assert router.choose("parse").model == "nano"
+
+
+def test_choose_template_when_all_degraded(router):
+    """Test that a template decision is returned when no candidate is healthy."""
+    for _ in range(5):
+        router.record("generate", "mini", 4000, ok=True)
+
+    decision = router.choose("generate")
+
+    assert decision.template
+    assert decision.to_dict()["model"] is None
+
+
+def test_samples_age_out_of_window(router):
+    """Test that a degraded model is retried once its samples expire."""
+    with patch("chat.services.model_router.time.monotonic", return_value=0.0):
+        for _ in range(5):
+            router.record("parse", "mini", 100, ok=False)
+        assert router.choose("parse").model == "nano"
+
+    with patch("chat.services.model_router.time.monotonic", return_value=61.0):
+        assert router.choose("parse").model == "mini"
+        assert router.stats()["parse"]["mini"]["samples"] == 0
+
+
+def test_stats_and_validation(router):
+    """Test stats shape and configuration errors."""
+    router.record("generate", "mini", 250, ok=True)
+
+    assert router.stats()["generate"]["mini"] == {
+        "samples": 1,
+        "p95_ms": 250,
+        "error_rate": 0.0,
+    }
+    with pytest.raises(ValueError, match="No candidate models"):
+        router.choose("summarize")
+    with pytest.raises(ValueError, match="No p95 budget"):
+        ModelRouter({"parse": ["mini"]}, {})
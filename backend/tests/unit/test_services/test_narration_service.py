@@ -0,0 +1,90 @@
+"""Unit tests for deferred narration."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from chat.services.narration_service import NarrationStore
+from chat.utils.background import BackgroundLoop
+
+PLACES = [{"name": "Secret Cave", "description": "A mysterious underground cavern"}]
+
+
+@pytest.fixture
+def background():
+    """Private background loop, stopped after the test."""
+    loop = BackgroundLoop(name="test-narration")
+    yield loop
+    loop.stop()
+
+
+@pytest.fixture
+def generate_response():
+    with patch(
+        "chat.services.narration_service.openai_service.generate_response",
+        AsyncMock(return_value="Seek the Secret Cave."),
+    ) as mock_generate:
+        yield mock_generate
+
+
+async def test_schedule_and_get(generate_response, background):
+    """Test that a narration generated in the background becomes ready."""
+    store = NarrationStore(background=background)
+
+    narration_id = store.schedule("hidden gems", "Pikeville, KY", PLACES, {})
+
+    assert await store.get(narration_id, wait_seconds=1) == "Seek the Secret Cave."
+    assert await store.get(narration_id) == "Seek the Secret Cave."
+    generate_response.assert_awaited_once_with("hidden gems", "Pikeville, KY", PLACES, {})
+
+
+async def test_schedule_is_idempotent(generate_response, background):
+    """Test that the same search reuses its narration id and task."""
+    store = NarrationStore(background=background)
+
+    first = store.schedule("hidden gems", "Pikeville, KY", PLACES, {})
+    second = store.schedule("Hidden Gems", "pikeville, ky", PLACES, {"total_results": 1})
+    await store.get(first, wait_seconds=1)
+    third = store.schedule("hidden gems", "Pikeville, KY", PLACES, {})
+
+    assert first == second == third
+    assert generate_response.await_count == 1
+
+
+async def test_get_unknown_raises():
+    """Test that unknown or expired ids raise KeyError."""
+    with pytest.raises(KeyError):
+        await NarrationStore().get("missing")
+
+
+async def test_wait_times_out_while_pending(background):
+    """Test that waiting returns None when the narration is still running."""
+    release = threading.Event()
+
+    async def slow_response(*_args):
+        await asyncio.to_thread(release.wait, 2)
+        return "done"
+
+    with patch("chat.services.narration_service.openai_service.generate_response", slow_response):
+        store = NarrationStore(background=background)
+        narration_id = store.schedule("hidden gems", "Pikeville, KY", PLACES, {})
+
+        assert await store.get(narration_id) is None
+        assert await store.get(narration_id, wait_seconds=0.01) is None
+        release.set()
+        assert await store.get(narration_id, wait_seconds=1) == "done"
+
+
+def test_narration_outlives_the_scheduling_loop(generate_response, background):
+    """Test a narration scheduled inside a short-lived loop (WSGI view) still finishes."""
+    store = NarrationStore(background=background)
+
+    async def request() -> str:
+        return store.schedule("hidden gems", "Pikeville, KY", PLACES, {})
+
+    narration_id = asyncio.run(request())
+
+    assert asyncio.run(store.get(narration_id, wait_seconds=1)) == "Seek the Secret Cave."
+    generate_response.assert_awaited_once()
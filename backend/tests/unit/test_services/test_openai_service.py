@@ -1,51 +1,163 @@
 """Unit tests for OpenAI service."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from openai.types import CompletionUsage
+from openai.types.completion_usage import PromptTokensDetails
 
 from chat.services import openai_service
+from chat.services.llm_provider import AsyncStubLLMClient
+from chat.services.llm_usage import TokenLedger
+from chat.services.model_router import ModelRouter
+from chat.services.parse_cache import ParseCache
+from chat.services.prompts import PARSE_SYSTEM_PROMPT
+from chat.services.response_cache import ResponseCache
+from chat.utils.background import BackgroundLoop
+
+
+@pytest.fixture(autouse=True)
+def llm_client():
+    """One LLM client for every event loop the test touches (the background loop included)."""
+    client = openai_service.create_async_llm_client()
+    with patch.object(openai_service, "get_client", return_value=client):
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def parse_cache():
+    """Use a memory-only parse cache so tests never reach Supabase."""
+    cache = ParseCache(None)
+    with patch.object(openai_service, "get_parse_cache", return_value=cache):
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def model_router():
+    """Use a fresh router per test (primary plus a faster fallback model)."""
+    router = ModelRouter(
+        candidates={"parse": ["gpt-4o-mini"], "generate": ["gpt-4o-mini", "fast-model"]},
+        p95_budget_ms={"parse": 2000, "generate": 5000},
+        min_samples=3,
+    )
+    with patch.object(openai_service, "get_model_router", return_value=router):
+        yield router
+
+
+@pytest.fixture(autouse=True)
+def response_cache():
+    """Use a fresh response cache per test."""
+    cache = ResponseCache()
+    with patch.object(openai_service, "get_response_cache", return_value=cache):
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def token_ledger():
+    """Use a fresh token ledger per test."""
+    ledger = TokenLedger()
+    with patch.object(openai_service, "get_token_ledger", return_value=ledger):
+        yield ledger
 
 
 @pytest.mark.asyncio
-async def test_parse_user_input_success():
+async def test_parse_user_input_success(llm_client):
     """Test successful user input parsing with OpenAI."""
     mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(message=MagicMock(content='{"location": "Hazard, KY", "intent": "hidden gems"}'))
+    ]
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = mock_response
+
+        # Unknown city without a state: below the fast-path threshold
+        result = await openai_service.parse_user_input("any hidden gems near Hazard")
+
+        assert result.location == "Hazard, KY"
+        assert result.intent == "hidden gems"
+        assert result.confidence == 0.8
+        mock_create.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_parse_user_input_cached_for_equivalent_phrasing(parse_cache, llm_client):
+    """Test that a repeat phrasing differing in case/punctuation skips OpenAI."""
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(message=MagicMock(content='{"location": "Hazard, KY", "intent": "hidden gems"}'))
+    ]
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = mock_response
+
+        first = await openai_service.parse_user_input("any hidden gems near Hazard")
+        second = await openai_service.parse_user_input("Any hidden gems near  HAZARD?!")
+
+        assert second == first
+        mock_create.assert_called_once()
+        assert parse_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_parse_user_input_fast_path_skips_openai(llm_client):
+    """Test that a confident local parse is returned without calling OpenAI."""
+    with (
+        patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create,
+        patch.object(openai_service.settings, "parse_shadow_sample_rate", 0.0),
+    ):
+        result = await openai_service.parse_user_input("hidden gems in Pikeville KY")
+
+        assert result.location == "Pikeville, KY"
+        assert result.intent == "hidden gems"
+        assert result.confidence >= openai_service.settings.parse_fast_path_threshold
+        mock_create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_user_input_shadow_compares_with_openai(llm_client):
+    """Test that sampled fast-path parses are checked against OpenAI in the background."""
+    mock_response = MagicMock()
     mock_response.choices = [
         MagicMock(
-            message=MagicMock(content='{"location": "Pikeville, KY", "intent": "hidden gems"}')
+            message=MagicMock(
+                content='{"location": "Pikeville, Kentucky", "intent": "hidden gems"}'
+            )
         )
     ]
 
-    with patch.object(
-        openai_service.client.chat.completions, "create", new_callable=AsyncMock
-    ) as mock_create:
+    with (
+        patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create,
+        patch.object(openai_service.settings, "parse_shadow_sample_rate", 1.0),
+    ):
         mock_create.return_value = mock_response
+        compared = openai_service.parse_stats.compared
+        agreed = openai_service.parse_stats.location_agreed
 
         result = await openai_service.parse_user_input("hidden gems in Pikeville KY")
+        await asyncio.gather(*map(asyncio.wrap_future, openai_service._shadow_checks.copy()))
 
         assert result.location == "Pikeville, KY"
-        assert result.intent == "hidden gems"
-        assert result.confidence == 0.8
         mock_create.assert_called_once()
+        assert openai_service.parse_stats.compared == compared + 1
+        assert openai_service.parse_stats.location_agreed == agreed + 1
 
 
 @pytest.mark.asyncio
-async def test_parse_user_input_fallback():
+async def test_parse_user_input_fallback(llm_client):
     """Test fallback parsing when OpenAI fails."""
-    with patch.object(
-        openai_service.client.chat.completions, "create", new_callable=AsyncMock
-    ) as mock_create:
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
         mock_create.side_effect = Exception("API error")
 
-        result = await openai_service.parse_user_input("hidden gems in Pikeville KY")
+        result = await openai_service.parse_user_input("any hidden gems near Hazard")
 
-        assert "Pikeville" in result.location
+        assert "Hazard" in result.location
         assert result.confidence < 0.8
 
 
 @pytest.mark.asyncio
-async def test_generate_response_success():
+async def test_generate_response_success(llm_client):
     """Test successful response generation with OpenAI."""
     mock_response = MagicMock()
     mock_response.choices = [
@@ -56,9 +168,7 @@ async def test_generate_response_success():
         )
     ]
 
-    with patch.object(
-        openai_service.client.chat.completions, "create", new_callable=AsyncMock
-    ) as mock_create:
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
         mock_create.return_value = mock_response
 
         places = [{"name": "Secret Cave", "description": "A mysterious underground cavern"}]
@@ -74,11 +184,9 @@ async def test_generate_response_success():
 
 
 @pytest.mark.asyncio
-async def test_generate_response_fallback():
+async def test_generate_response_fallback(llm_client):
     """Test fallback response when OpenAI fails."""
-    with patch.object(
-        openai_service.client.chat.completions, "create", new_callable=AsyncMock
-    ) as mock_create:
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
         mock_create.side_effect = Exception("API error")
 
         places = [{"name": "Test Place", "description": "Test description"}]
@@ -90,3 +198,289 @@ async def test_generate_response_fallback():
 
         assert "Pikeville" in result
         assert "hidden gems" in result
+
+
+class FakeStream:
+    """Stand-in for an OpenAI chat completion stream."""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for text in self.chunks:
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+        if self.error:
+            raise self.error
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+STREAM_ARGS = (
+    "hidden gems",
+    "Pikeville, KY",
+    [{"name": "Secret Cave", "description": "A mysterious underground cavern"}],
+    {"total_results": 1, "average_score": 0.8},
+)
+
+
+@pytest.mark.asyncio
+async def test_generate_response_stream_yields_chunks(llm_client):
+    """Test that streamed text is yielded chunk by chunk."""
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = FakeStream(["The paths ", None, "of Pikeville", " beckon."])
+
+        chunks = await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+        assert chunks == ["The paths ", "of Pikeville", " beckon."]
+        assert mock_create.call_args.kwargs["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_generate_response_stream_falls_back_before_first_chunk(llm_client):
+    """Test that a failed request yields the fallback response."""
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.side_effect = Exception("API error")
+
+        chunks = await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+        assert chunks == [openai_service._generate_fallback_response(*STREAM_ARGS[:3])]
+
+
+@pytest.mark.asyncio
+async def test_generate_response_stream_falls_back_mid_stream(llm_client):
+    """Test that a stream failing after some text ends with the fallback paragraph."""
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = FakeStream(["The paths "], error=Exception("reset"))
+
+        chunks = await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+        fallback = openai_service._generate_fallback_response(*STREAM_ARGS[:3])
+        assert chunks == ["The paths ", f"\n\n{fallback}"]
+
+
+@pytest.mark.asyncio
+async def test_generate_response_stream_empty_stream_falls_back(llm_client):
+    """Test that a stream with no text yields the fallback response."""
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = FakeStream([None, ""])
+
+        chunks = await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+        assert chunks == [openai_service._generate_fallback_response(*STREAM_ARGS[:3])]
+
+
+@pytest.mark.asyncio
+async def test_generate_response_cached_for_same_top_places(response_cache, llm_client):
+    """Test that the same intent, location and top places skip OpenAI."""
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="Seek the Secret Cave."))]
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = mock_response
+        intent, location, places, summary = STREAM_ARGS
+
+        first = await openai_service.generate_response(intent, location, places, summary)
+        second = await openai_service.generate_response(
+            "Hidden Gems", "pikeville, ky", [dict(places[0], description="new")], {}
+        )
+        chunks = await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+        assert first == second == "Seek the Secret Cave."
+        assert chunks == [first]
+        mock_create.assert_called_once()
+        assert response_cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_response_different_places_miss(llm_client):
+    """Test that a different top place regenerates the response."""
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="Seek the caves."))]
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = mock_response
+        intent, location, places, summary = STREAM_ARGS
+
+        await openai_service.generate_response(intent, location, places, summary)
+        await openai_service.generate_response(
+            intent, location, [{"name": "Old Mill"}, *places], summary
+        )
+
+        assert mock_create.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_response_fallback_not_cached(response_cache, llm_client):
+    """Test that fallback text is never cached."""
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.side_effect = Exception("API error")
+
+        await openai_service.generate_response(*STREAM_ARGS)
+        await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+        assert response_cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_generate_response_stream_populates_cache(llm_client):
+    """Test that a complete stream is cached for the blocking call."""
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = FakeStream(["The paths ", "beckon."])
+
+        await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+        result = await openai_service.generate_response(*STREAM_ARGS)
+
+        assert result == "The paths beckon."
+        mock_create.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_parse_and_generate_with_stub_provider():
+    """Test that the service runs end to end against the local stub provider."""
+    with patch.object(openai_service, "get_client", return_value=AsyncStubLLMClient()):
+        parsed = await openai_service.parse_user_input("any hidden gems near Hazard")
+        response = await openai_service.generate_response(*STREAM_ARGS)
+        chunks = await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+    assert parsed.location == "Hazard"
+    assert "Pikeville, KY" in response
+    assert chunks == [response]  # Served from the response cache
+
+
+@pytest.mark.asyncio
+async def test_generate_response_degrades_to_faster_model(model_router, response_cache, llm_client):
+    """Test that a slow primary routes generation to the next candidate, uncached."""
+    for _ in range(3):
+        model_router.record("generate", "gpt-4o-mini", 9000, ok=True)
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="Quick words."))]
+    diagnostics = {}
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = mock_response
+
+        result = await openai_service.generate_response(*STREAM_ARGS, diagnostics=diagnostics)
+
+    assert result == "Quick words."
+    assert mock_create.call_args.kwargs["model"] == "fast-model"
+    assert diagnostics["source"] == "llm"
+    assert diagnostics["route"]["model"] == "fast-model"
+    assert "gpt-4o-mini p95" in diagnostics["route"]["reason"]
+    assert model_router.stats()["generate"]["fast-model"]["samples"] == 1
+    assert response_cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_generate_response_uses_template_when_all_degraded(model_router, llm_client):
+    """Test that generation skips OpenAI when every candidate is failing."""
+    for model in ("gpt-4o-mini", "fast-model"):
+        for _ in range(3):
+            model_router.record("generate", model, 100, ok=False)
+    diagnostics = {}
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        result = await openai_service.generate_response(*STREAM_ARGS, diagnostics=diagnostics)
+        chunks = await collect(openai_service.generate_response_stream(*STREAM_ARGS))
+
+    mock_create.assert_not_called()
+    assert result == openai_service._generate_fallback_response(*STREAM_ARGS[:3])
+    assert chunks == [result]
+    assert diagnostics["source"] == "template"
+    assert diagnostics["route"]["model"] is None
+
+
+@pytest.mark.asyncio
+async def test_parse_user_input_records_route_and_failures(model_router, llm_client):
+    """Test that parse diagnostics carry the route and failures feed the router."""
+    diagnostics = {}
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.side_effect = Exception("API error")
+
+        await openai_service.parse_user_input("any hidden gems near Hazard", diagnostics)
+
+    assert diagnostics["source"] == "fallback"
+    assert diagnostics["route"]["model"] == "gpt-4o-mini"
+    stats = model_router.stats()["parse"]["gpt-4o-mini"]
+    assert stats["samples"] == 1
+    assert stats["error_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_parse_user_input_records_token_usage(token_ledger, llm_client):
+    """Test that API usage, cached tokens and the local estimate are recorded."""
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(message=MagicMock(content='{"location": "Hazard, KY", "intent": "hidden gems"}'))
+    ]
+    mock_response.usage = CompletionUsage(
+        prompt_tokens=120,
+        completion_tokens=15,
+        total_tokens=135,
+        prompt_tokens_details=PromptTokensDetails(cached_tokens=64),
+    )
+    diagnostics = {}
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = mock_response
+
+        await openai_service.parse_user_input("any hidden gems near Hazard", diagnostics)
+
+    messages = mock_create.call_args.kwargs["messages"]
+    assert messages[0]["content"] == PARSE_SYSTEM_PROMPT
+    assert messages[1]["content"] == "any hidden gems near Hazard"
+    tokens = diagnostics["tokens"]
+    assert tokens["prompt_tokens"] == 120
+    assert tokens["cached_tokens"] == 64
+    assert 0 < tokens["estimated_prompt_tokens"] <= tokens["budget"]
+    assert tokens["trimmed"] is False
+    totals = token_ledger.totals()["parse"]["gpt-4o-mini"]
+    assert totals["calls"] == 1
+    assert totals["cached_share"] == round(64 / 120, 3)
+
+
+@pytest.mark.asyncio
+async def test_generate_response_stream_records_final_chunk_usage(token_ledger, llm_client):
+    """Test that the stream asks for usage and records it from the last chunk."""
+    usage = CompletionUsage(prompt_tokens=90, completion_tokens=3, total_tokens=93)
+
+    async def iterate():
+        yield MagicMock(choices=[MagicMock(delta=MagicMock(content="Walk on."))], usage=None)
+        yield MagicMock(choices=[], usage=usage)
+
+    diagnostics = {}
+
+    with patch.object(llm_client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = iterate()
+
+        chunks = await collect(
+            openai_service.generate_response_stream(*STREAM_ARGS, diagnostics=diagnostics)
+        )
+
+    assert chunks == ["Walk on."]
+    assert mock_create.call_args.kwargs["stream_options"] == {"include_usage": True}
+    assert diagnostics["tokens"]["prompt_tokens"] == 90
+    assert diagnostics["tokens"]["completion_tokens"] == 3
+    assert token_ledger.totals()["generate"]["gpt-4o-mini"]["calls"] == 1
+
+
+def test_background_loop_gets_its_own_client():
+    """Test shadow checks and narrations (background loop) never share a request loop's client."""
+    background = BackgroundLoop(name="test-llm-client")
+
+    async def loop_client():
+        return openai_service._clients.get()
+
+    try:
+        request_client = asyncio.run(loop_client())
+        background_client = background.submit(loop_client()).result(timeout=2)
+        assert request_client is not background_client
+        assert background.submit(loop_client()).result(timeout=2) is background_client
+    finally:
+        background.stop()
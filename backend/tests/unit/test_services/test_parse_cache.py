@@ -0,0 +1,80 @@
+"""Unit tests for the parse result cache."""
+
+from unittest.mock import MagicMock
+
+from chat.schemas import ParsedInput
+from chat.services.parse_cache import ParseCache, normalize_parse_input, parse_cache_key
+
+PARSED = ParsedInput(location="Pikeville, KY", intent="hidden gems", confidence=0.8)
+
+
+def test_normalize_parse_input_folds_case_punctuation_whitespace():
+    """Test that equivalent phrasings normalize to the same text."""
+    assert normalize_parse_input("  Hidden gems in Pikeville, KY!! ") == (
+        "hidden gems in pikeville ky"
+    )
+    assert normalize_parse_input("hidden\tgems in pikeville ky") == "hidden gems in pikeville ky"
+
+
+def test_parse_cache_key_is_model_scoped():
+    """Test that keys match across phrasings but not across models."""
+    assert parse_cache_key("m", "Pikeville KY") == parse_cache_key("m", "pikeville, ky")
+    assert parse_cache_key("m", "Pikeville KY") != parse_cache_key("other", "Pikeville KY")
+
+
+def test_memory_tier_round_trip():
+    """Test that memory hits return copies and count as hits."""
+    cache = ParseCache(None)
+    cache.set("m", "hidden gems in Pikeville KY", PARSED)
+
+    hit = cache.get("m", "Hidden Gems in Pikeville, KY")
+    assert hit == PARSED
+    assert hit is not PARSED
+    assert cache.get("m", "something else") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_persistent_tier_hit_is_promoted():
+    """Test that a table hit is served and then kept in memory."""
+    supabase = MagicMock()
+    query = supabase.client.table.return_value.select.return_value.eq.return_value
+    query.gt.return_value.limit.return_value.execute.return_value = MagicMock(
+        data=[{"location": "Pikeville, KY", "intent": "hidden gems", "confidence": 0.8}]
+    )
+    cache = ParseCache(supabase)
+
+    assert cache.get("m", "hidden gems in Pikeville KY") == PARSED
+    assert cache.get("m", "hidden gems in Pikeville KY") == PARSED
+
+    supabase.client.table.assert_called_once_with("parse_cache")
+    stats = cache.stats()
+    assert stats["persistent_hits"] == 1
+    assert stats["hits"] == 1
+    assert stats["total_hit_rate"] == 1.0
+
+
+def test_persistent_tier_errors_are_misses():
+    """Test that table failures degrade to misses and never raise."""
+    supabase = MagicMock()
+    supabase.client.table.side_effect = Exception("connection refused")
+    cache = ParseCache(supabase)
+
+    assert cache.get("m", "hidden gems in Pikeville KY") is None
+    cache.set("m", "hidden gems in Pikeville KY", PARSED)
+    assert cache.get("m", "hidden gems in Pikeville KY") == PARSED
+    assert cache.stats()["persistent_misses"] == 1
+
+
+def test_persistent_write_sets_expiry():
+    """Test that writes upsert the normalized input with an expiry."""
+    supabase = MagicMock()
+    cache = ParseCache(supabase, ttl_hours=1)
+
+    cache.set("m", "Hidden gems in Pikeville, KY", PARSED)
+
+    row = supabase.client.table.return_value.upsert.call_args.args[0]
+    assert row["input_hash"] == parse_cache_key("m", "hidden gems in pikeville ky")
+    assert row["normalized_input"] == "hidden gems in pikeville ky"
+    assert row["location"] == "Pikeville, KY"
+    assert "expires_at" in row
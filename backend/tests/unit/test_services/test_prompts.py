@@ -0,0 +1,69 @@
+"""Unit tests for prompt templates and token budgets."""
+
+from chat.services.prompts import (
+    PARSE_SYSTEM_PROMPT,
+    RESPONSE_SYSTEM_PROMPT,
+    build_parse_prompt,
+    build_response_prompt,
+    count_message_tokens,
+)
+
+MODEL = "gpt-4o-mini"
+SUMMARY = {"total_results": 3, "average_score": 0.72}
+
+
+def place(name: str, description: str = "A quiet spot few visitors ever find") -> dict:
+    return {"name": name, "description": description}
+
+
+def test_system_prompts_are_static_prefixes():
+    """Test that request data only ever appears after the shared system message."""
+    first = build_response_prompt("caves", "Pikeville, KY", [place("A")], SUMMARY, MODEL, 400)
+    second = build_response_prompt("food", "Austin, TX", [place("B")], {}, MODEL, 400)
+    parse = build_parse_prompt("hidden gems in Hazard", MODEL, 300)
+
+    assert first.messages[0] == second.messages[0]
+    assert first.messages[0]["content"] == RESPONSE_SYSTEM_PROMPT
+    assert parse.messages[0]["content"] == PARSE_SYSTEM_PROMPT
+    assert "JSON" in PARSE_SYSTEM_PROMPT  # The stub provider keys on it
+    assert "Pikeville, KY" in first.messages[1]["content"]
+
+
+def test_response_prompt_within_budget_keeps_top_places():
+    """Test that an ample budget includes the top five places with descriptions."""
+    places = [place(f"Place {i}") for i in range(7)]
+
+    prompt = build_response_prompt("caves", "Pikeville, KY", places, SUMMARY, MODEL, 1000)
+    user = prompt.messages[1]["content"]
+
+    assert not prompt.trimmed
+    assert "• Place 4: A quiet spot" in user
+    assert "Place 5" not in user
+    assert "3 results, average score 0.7/1.0" in user
+    assert prompt.tokens == count_message_tokens([RESPONSE_SYSTEM_PROMPT, user], MODEL)
+
+
+def test_response_prompt_trims_lower_ranked_places_first():
+    """Test that a tight budget drops descriptions, then places, from the bottom."""
+    places = [place(f"Place {i}", "x " * 50) for i in range(5)]
+    full = build_response_prompt("caves", "Pikeville, KY", places, SUMMARY, MODEL, 1000)
+    budget = full.tokens - 20
+
+    prompt = build_response_prompt("caves", "Pikeville, KY", places, SUMMARY, MODEL, budget)
+    user = prompt.messages[1]["content"]
+
+    assert prompt.trimmed
+    assert prompt.tokens <= budget
+    assert "• Place 0: x x" in user
+    assert "• Place 4: x" not in user
+
+
+def test_parse_prompt_truncates_long_input():
+    """Test that oversized user input is truncated to the budget."""
+    fixed = count_message_tokens([PARSE_SYSTEM_PROMPT, ""], MODEL)
+
+    prompt = build_parse_prompt("hidden gems in Hazard " * 200, MODEL, fixed + 20)
+
+    assert prompt.trimmed
+    assert prompt.tokens <= fixed + 20
+    assert prompt.messages[1]["content"].startswith("hidden gems in Hazard")
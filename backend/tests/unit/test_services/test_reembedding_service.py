@@ -0,0 +1,283 @@
+"""Unit tests for the re-embedding job."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from chat.services.embedding_service import MAX_BATCH_ITEMS, EmbeddingError
+from chat.services.reembedding_service import Reembedder
+from chat.utils.rate_limiter import AsyncRateLimiter
+
+PLACES = [
+    {
+        "id": f"00000000-0000-0000-0000-00000000000{i}",
+        "metadata": {"name": f"Place {i}"},
+        "updated_at": "2026-01-01T00:00:00+00:00",
+    }
+    for i in range(5)
+]
+
+
+class FakeQuery:
+    """Minimal async PostgREST builder over in-memory tables."""
+
+    def __init__(self, db: "FakeDB", table: str) -> None:
+        self.db, self.table, self.op, self.payload = db, table, "select", None
+        self.filters: list[tuple[str, str, object]] = []
+        self.limit_count: int | None = None
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(("eq", column, value))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(("gt", column, value))
+        return self
+
+    def order(self, *_):
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def insert(self, payload):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, **_):
+        self.op, self.payload = "upsert", payload
+        return self
+
+    def update(self, payload):
+        self.op, self.payload = "update", payload
+        return self
+
+    async def execute(self):
+        return MagicMock(data=self.db.apply(self))
+
+
+class FakeDB:
+    def __init__(self) -> None:
+        self.places = [dict(place) for place in PLACES]
+        self.jobs: dict[str, dict] = {}
+        self.shadow: dict[tuple[str, str], list[float]] = {}
+        self.shadow_versions: dict[tuple[str, str], str] = {}
+        self.checkpoints: list[dict] = []
+        self.rpc_calls: list[tuple[str, dict]] = []
+        self.fail_chunk_after: int | None = None
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: dict) -> MagicMock:
+        self.rpc_calls.append((name, params))
+        builder = MagicMock()
+        if name.endswith("get_reembed_missing"):
+            missing = [
+                p
+                for p in self.places
+                if self.shadow_versions.get((params["p_job_id"], p["id"]), "") < p["updated_at"]
+            ]
+            builder.execute = AsyncMock(return_value=MagicMock(data=missing[: params["p_limit"]]))
+        else:
+            builder.execute = AsyncMock(return_value=MagicMock(data=[]))
+        return builder
+
+    def apply(self, q: FakeQuery) -> list[dict]:
+        if q.table.endswith("reembed_jobs"):
+            job_id = next(v for op, c, v in q.filters if c == "job_id") if q.filters else None
+            if q.op == "insert":
+                self.jobs[q.payload["job_id"]] = {
+                    **q.payload,
+                    "last_id": None,
+                    "processed": 0,
+                    "failed": 0,
+                    "status": "running",
+                }
+            elif q.op == "update":
+                self.jobs[job_id].update(q.payload)
+                self.checkpoints.append(dict(q.payload))
+            else:
+                return [self.jobs[job_id]] if job_id in self.jobs else []
+            return []
+
+        if q.table.endswith("places_embeddings_shadow"):
+            for row in q.payload:
+                self.shadow[(row["job_id"], row["id"])] = row["embedding"]
+                self.shadow_versions[(row["job_id"], row["id"])] = row["source_updated_at"]
+            return []
+
+        rows = self.places
+        for op, column, value in q.filters:
+            if op == "gt":
+                rows = [r for r in rows if r[column] > value]
+        rows = sorted(rows, key=lambda r: r["id"])[: q.limit_count]
+        if self.fail_chunk_after is not None and rows and rows[0]["id"] > self.fail_chunk_after:
+            raise RuntimeError("connection lost")
+        return rows
+
+
+def _openai(dimensions: int = 256) -> MagicMock:
+    client = MagicMock()
+    client.embeddings.create = AsyncMock(
+        side_effect=lambda **kwargs: MagicMock(
+            data=[
+                MagicMock(index=i, embedding=[0.1] * dimensions)
+                for i in range(len(kwargs["input"]))
+            ]
+        )
+    )
+    return client
+
+
+def _reembedder(db: FakeDB, openai: MagicMock, **kwargs) -> Reembedder:
+    return Reembedder(
+        client=db,  # type: ignore[arg-type]
+        openai_client=openai,
+        job_id="to-3-small",
+        model="text-embedding-3-small",
+        dimensions=256,
+        chunk_size=2,
+        limiter=AsyncRateLimiter(10_000),
+        **kwargs,
+    )
+
+
+async def test_run_reembeds_all_rows_and_swaps():
+    """Test every row gets a shadow vector, checkpoints advance, then swap runs."""
+    db, openai = FakeDB(), _openai()
+
+    progress = await _reembedder(db, openai).run(lists=50)
+
+    assert progress.processed == 5
+    assert progress.swapped
+    assert len(db.shadow) == 5
+    assert [c["last_id"] for c in db.checkpoints] == [
+        PLACES[1]["id"],
+        PLACES[3]["id"],
+        PLACES[4]["id"],
+    ]
+    assert db.rpc_calls[-1] == (
+        "app_embeddings.swap_reembedded_embeddings",
+        {"p_job_id": "to-3-small", "p_lists": 50, "p_probes": 7},
+    )
+    assert openai.embeddings.create.await_args.kwargs["dimensions"] == 256
+    assert openai.embeddings.create.await_args.kwargs["model"] == "text-embedding-3-small"
+
+
+async def test_run_resumes_from_checkpoint():
+    """Test a crashed run resumes after its last checkpoint."""
+    db, openai = FakeDB(), _openai()
+    db.fail_chunk_after = PLACES[1]["id"]
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        await _reembedder(db, openai).run()
+
+    assert db.jobs["to-3-small"]["last_id"] == PLACES[1]["id"]
+    first_run_calls = openai.embeddings.create.await_count
+
+    db.fail_chunk_after = None
+    progress = await _reembedder(db, openai).run()
+
+    assert progress.processed == 5
+    resumed_inputs = [
+        text
+        for call in openai.embeddings.create.await_args_list[first_run_calls:]
+        for text in call.kwargs["input"]
+    ]
+    assert "Place 0" not in resumed_inputs
+
+
+async def test_sweep_reembeds_rows_updated_after_their_chunk():
+    """Test a place upserted again after it was re-embedded gets a fresh shadow vector."""
+    db, openai = FakeDB(), _openai()
+    await _reembedder(db, openai).run(swap=False)
+    first_run_calls = openai.embeddings.create.await_count
+
+    db.places[2].update(
+        metadata={"name": "Place 2 renamed"}, updated_at="2026-02-01T00:00:00+00:00"
+    )
+    progress = await _reembedder(db, openai).run()
+
+    resumed_inputs = [
+        text
+        for call in openai.embeddings.create.await_args_list[first_run_calls:]
+        for text in call.kwargs["input"]
+    ]
+    assert resumed_inputs == ["Place 2 renamed"]
+    assert db.shadow_versions[("to-3-small", PLACES[2]["id"])] == "2026-02-01T00:00:00+00:00"
+    assert progress.swapped
+
+
+async def test_run_rejects_mismatched_job():
+    """Test resuming a job with a different target model fails."""
+    db = FakeDB()
+    db.jobs["to-3-small"] = {
+        "job_id": "to-3-small",
+        "model": "text-embedding-3-large",
+        "dimensions": 256,
+        "status": "running",
+    }
+
+    with pytest.raises(EmbeddingError, match="targets text-embedding-3-large"):
+        await _reembedder(db, _openai()).run()
+
+
+async def test_dimension_mismatch_rows_are_not_written():
+    """Test wrong-size vectors are not written to the shadow table."""
+    db, openai = FakeDB(), _openai(dimensions=1536)
+
+    progress = await _reembedder(db, openai).run(swap=False)
+
+    assert db.shadow == {}
+    assert progress.failed == 5
+    assert not progress.swapped
+    assert all(name != "app_embeddings.swap_reembedded_embeddings" for name, _ in db.rpc_calls)
+
+
+async def test_rate_limited_batch_is_retried_not_failed(monkeypatch):
+    """Test the re-embedder shares the services' retry decision for 429s."""
+    from openai import RateLimitError
+
+    sleeps: list[float] = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("chat.services.reembedding_service.asyncio.sleep", sleep)
+    db, openai = FakeDB(), _openai()
+    respond = openai.embeddings.create.side_effect
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs["input"])
+        if len(calls) == 1:
+            raise RateLimitError("slow down", response=MagicMock(status_code=429), body=None)
+        return respond(**kwargs)
+
+    openai.embeddings.create.side_effect = create
+
+    progress = await _reembedder(db, openai).run(swap=False)
+
+    assert progress.processed == 5
+    assert progress.failed == 0
+    assert calls[0] == calls[1]
+    assert len(sleeps) == 1
+
+
+def test_default_chunk_fills_every_concurrency_slot():
+    """Test the default chunk holds one full batch per concurrent request."""
+    reembedder = Reembedder(
+        client=FakeDB(),  # type: ignore[arg-type]
+        openai_client=_openai(),
+        job_id="to-3-small",
+        model="text-embedding-3-small",
+        dimensions=256,
+        concurrency=6,
+    )
+
+    assert reembedder.chunk_size == 6 * MAX_BATCH_ITEMS
@@ -0,0 +1,38 @@
+"""Unit tests for the response cache."""
+
+from chat.services.response_cache import ResponseCache, places_fingerprint, response_cache_key
+
+PLACES = [{"name": f"Place {i}", "description": f"Description {i}"} for i in range(8)]
+
+
+def test_places_fingerprint_uses_top_five_names_in_order():
+    """Test that only the prompt's top place names affect the fingerprint."""
+    changed_tail = PLACES[:5] + [{"name": "Other"}]
+    changed_description = [dict(p, description="new") for p in PLACES]
+
+    assert places_fingerprint(PLACES) == places_fingerprint(changed_tail)
+    assert places_fingerprint(PLACES) == places_fingerprint(changed_description)
+    assert places_fingerprint(PLACES) != places_fingerprint(list(reversed(PLACES[:5])))
+
+
+def test_response_cache_key_normalizes_intent_and_location():
+    """Test that case and punctuation do not change the key."""
+    key = response_cache_key("m", "hidden gems", "Pikeville, KY", PLACES)
+
+    assert key == response_cache_key("m", "Hidden Gems", "pikeville ky", PLACES)
+    assert key != response_cache_key("m", "breweries", "Pikeville, KY", PLACES)
+    assert key != response_cache_key("other", "hidden gems", "Pikeville, KY", PLACES)
+
+
+def test_response_cache_ttl_and_eviction():
+    """Test that entries expire and the LRU stays bounded."""
+    cache = ResponseCache(maxsize=2, ttl_seconds=0)
+    cache.set("a", "text")
+    assert cache.get("a") is None
+
+    cache = ResponseCache(maxsize=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    assert cache.stats()["size"] == 2
@@ -0,0 +1,23 @@
+"""Unit tests for the scoring micro-benchmark."""
+
+from chat.services.scoring_benchmark import run_scoring_benchmark, synthetic_results
+
+
+def test_synthetic_results_are_deterministic():
+    """Test the same seed regenerates the same results."""
+    first = synthetic_results(50, seed=4)
+    second = synthetic_results(50, seed=4)
+
+    assert [r.model_dump() for r in first] == [r.model_dump() for r in second]
+    assert {r.source for r in first} >= {"serp", "reddit", "vector"}
+
+
+def test_run_scoring_benchmark_reports_each_size():
+    """Test every size is timed and both paths agree."""
+    seen = []
+
+    results = run_scoring_benchmark([5, 120], repeat=1, on_result=seen.append)
+
+    assert [r.size for r in results] == [5, 120]
+    assert seen == results
+    assert all(r.identical and r.loop_ms >= 0 and r.batch_ms >= 0 for r in results)
@@ -1,5 +1,7 @@
 """Unit tests for scoring service."""
 
+import pytest
+
 from chat.schemas import SearchResult
 from chat.services import scoring_service
 
@@ -100,3 +102,70 @@ def test_generate_scoring_summary_empty():
     assert summary.average_score == 0.0
     assert summary.max_score == 0.0
     assert summary.min_score == 0.0
+
+
+def test_score_result_vector_similarity_bonus():
+    """Test vector results earn a bonus proportional to similarity."""
+    weak = SearchResult(name="Cave", description="", source="vector", metadata={"similarity": 0.5})
+    strong = SearchResult(
+        name="Cave", description="", source="vector", metadata={"similarity": 0.95}
+    )
+
+    assert scoring_service.score_result(weak, "museums").score == pytest.approx(0.1)
+    assert scoring_service.score_result(strong, "museums").score == pytest.approx(0.19)
+
+
+EDGE_RESULTS = [
+    SearchResult(name="Locals Only Bar", description="a locals-only dive", source="reddit"),
+    SearchResult(
+        name="Big Thread", description="hidden gems", source="reddit", metadata={"score": 250}
+    ),
+    SearchResult(name="Gig", description="indie night", source="eventbrite", metadata={}),
+    SearchResult(name="Gig", description="quirky", source="eventbrite", metadata={"id": 1}),
+    SearchResult(name="Cave", description="", source="vector", metadata={"similarity": 1.3}),
+    SearchResult(name="ΟΔΟΣ Secret", description="İstanbul weird", source="serp"),
+    SearchResult(
+        name="Everything",
+        description="underground hidden secret local offbeat alternative indie dive "
+        "authentic quirky weird unique undiscovered",
+        source="serp",
+    ),
+    SearchResult(name="", description="", source="import"),
+]
+
+
+def _scores(results, intent, min_batch):
+    copies = [result.model_copy(deep=True) for result in results]
+    return [r.score for r in scoring_service.score_results(copies, intent, min_batch=min_batch)]
+
+
+@pytest.mark.parametrize("intent", ["hidden gems", "", "Secret", "gig\x00indie"])
+def test_score_results_vectorized_matches_score_result(intent):
+    """Test the vectorized path gives bit-identical scores to score_result()."""
+    results = EDGE_RESULTS * 20
+
+    expected = [scoring_service.score_result(r.model_copy(), intent).score for r in results]
+
+    assert _scores(results, intent, min_batch=0) == expected
+    assert _scores(results, intent, min_batch=len(results) + 1) == expected
+
+
+def test_text_batch_does_not_match_across_texts():
+    """Test needles never span the separator between joined texts."""
+    batch = scoring_service.TextBatch(["under", "ground", "underground", ""])
+
+    assert batch.contains("underground").tolist() == [False, False, True, False]
+    assert batch.contains("r\x00g").tolist() == [False, False, False, False]
+    assert batch.contains("").tolist() == [True, True, True, True]
+    assert batch.count(["under", "ground"]).tolist() == [1, 1, 2, 0]
+
+
+def test_score_and_rank_results_large_batch_sorted():
+    """Test ranking uses batch scores and keeps the input list untouched."""
+    results = [r.model_copy() for r in EDGE_RESULTS * 20]
+    original = list(results)
+
+    ranked = scoring_service.score_and_rank_results(results, {"intent": "hidden gems"})
+
+    assert results == original
+    assert [r.score for r in ranked] == sorted((r.score for r in ranked), reverse=True)
@@ -0,0 +1,32 @@
+"""Unit tests for the vector search result cache."""
+
+from chat.services.search_result_cache import SearchResultCache
+
+
+def test_bump_makes_older_generation_keys_unreachable():
+    """Test results stored under an old generation are never served after a bump."""
+    cache = SearchResultCache(maxsize=8)
+    before = cache.generation
+    key = cache.key("ada", "caves", 10, 0.7, before)
+    cache.set(key, [{"id": "1"}])
+
+    assert cache.get(cache.key("ada", " caves ", 10, 0.7, cache.generation)) == [{"id": "1"}]
+
+    cache.bump()
+    cache.set(key, [{"id": "stale"}])  # A search that started before the bump finishing late
+
+    assert cache.generation == before + 1
+    assert cache.get(cache.key("ada", "caves", 10, 0.7, cache.generation)) is None
+
+
+def test_key_covers_search_parameters():
+    """Test limit, threshold and model each produce distinct keys."""
+    cache = SearchResultCache()
+    keys = {
+        cache.key("ada", "caves", 10, 0.7, 0),
+        cache.key("ada", "caves", 5, 0.7, 0),
+        cache.key("ada", "caves", 10, 0.8, 0),
+        cache.key("3-small:512", "caves", 10, 0.7, 0),
+    }
+
+    assert len(keys) == 4
@@ -0,0 +1,117 @@
+"""Unit tests for search response modes."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from chat.schemas import NormalizedLocation, ParsedInput, SearchResult
+from chat.services import search_service
+
+LIVE = [SearchResult(name="Secret Cave", description="local cavern", source="serp")]
+
+
+@pytest.fixture
+def sources():
+    """Patch every upstream of execute_search."""
+    narration_store = MagicMock()
+    narration_store.schedule.return_value = "narration-1"
+
+    with (
+        patch.object(
+            search_service.cache_service, "get_cached_search_results", AsyncMock()
+        ) as get_cached,
+        patch.object(
+            search_service.cache_service, "set_cached_search_results", AsyncMock()
+        ) as set_cached,
+        patch.object(
+            search_service.openai_service,
+            "parse_user_input",
+            AsyncMock(return_value=ParsedInput(location="Pikeville", intent="caves", confidence=1)),
+        ),
+        patch.object(
+            search_service.openai_service, "generate_response", AsyncMock(return_value="prose")
+        ) as generate,
+        patch.object(
+            search_service.geocoding_service,
+            "normalize_location",
+            AsyncMock(return_value=NormalizedLocation(normalized="Pikeville, KY", confidence=1)),
+        ),
+        patch.object(
+            search_service.serp_service, "search_hidden_gems", AsyncMock(return_value=LIVE)
+        ),
+        patch.object(
+            search_service.reddit_service, "search_reddit_rss", AsyncMock(return_value=[])
+        ),
+        patch.object(
+            search_service.eventbrite_service, "search_local_events", AsyncMock(return_value=[])
+        ),
+        patch.object(
+            search_service.vector_search_service,
+            "search_indexed_places",
+            AsyncMock(return_value=[]),
+        ),
+        patch.object(search_service.indexing_service, "index_search_results"),
+        patch.object(search_service, "get_narration_store", return_value=narration_store),
+    ):
+        get_cached.return_value = None
+        yield MagicMock(
+            get_cached=get_cached,
+            set_cached=set_cached,
+            generate=generate,
+            narration_store=narration_store,
+        )
+
+
+async def test_standard_mode_narrates(sources):
+    """Test that standard mode keeps the LLM narration."""
+    result = await search_service.execute_search("caves in Pikeville")
+
+    assert result["response"] == "prose"
+    assert result["response_mode"] == "standard"
+    assert result["narration_id"] is None
+    sources.get_cached.assert_awaited_once_with("caves in Pikeville", "", "standard")
+
+
+async def test_fast_mode_skips_llm_narration(sources):
+    """Test that fast mode uses the template response and its own cache entry."""
+    result = await search_service.execute_search("caves in Pikeville", response_mode="fast")
+
+    sources.generate.assert_not_called()
+    assert "Pikeville, KY" in result["response"]
+    assert result["places"][0]["name"] == "Secret Cave"
+    sources.get_cached.assert_awaited_once_with("caves in Pikeville", "", "fast")
+    assert sources.set_cached.call_args.args[-1] == "fast"
+
+
+async def test_deferred_mode_returns_narration_handle(sources):
+    """Test that deferred mode returns places now and schedules narration."""
+    result = await search_service.execute_search("caves in Pikeville", response_mode="deferred")
+
+    sources.generate.assert_not_called()
+    assert result["response"] == ""
+    assert result["narration_id"] == "narration-1"
+    assert result["places"][0]["name"] == "Secret Cave"
+    intent, location, places, _summary = sources.narration_store.schedule.call_args.args
+    assert (intent, location, places) == ("caves", "Pikeville, KY", result["places"])
+
+
+async def test_deferred_cache_hit_reschedules_narration(sources):
+    """Test that a cached deferred search keeps its narration reachable."""
+    cached = {
+        "user_intent": "caves",
+        "user_location": "Pikeville, KY",
+        "response": "",
+        "places": [{"name": "Secret Cave"}],
+        "response_mode": "deferred",
+        "narration_id": "narration-1",
+        "debug": {"scoring_summary": {"total_results": 1}},
+    }
+    sources.get_cached.return_value = cached
+
+    result = await search_service.execute_search("caves in Pikeville", response_mode="deferred")
+
+    assert result["narration_id"] == "narration-1"
+    assert result["debug"]["cache"] == "hit"
+    sources.narration_store.schedule.assert_called_once_with(
+        "caves", "Pikeville, KY", [{"name": "Secret Cave"}], {"total_results": 1}
+    )
@@ -1,11 +1,17 @@
 """Unit tests for Supabase service."""
 
+import asyncio
 from datetime import UTC, datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from chat.services.supabase_service import SupabaseService
+from chat.services.supabase_service import (
+    SupabaseService,
+    get_async_supabase_client,
+    response_rows,
+)
+from chat.utils.loop_local import LoopLocal
 
 
 @pytest.fixture
@@ -214,3 +220,35 @@ def test_get_stats_error(supabase_service):
 
     assert stats["connected"] is False
     assert "error" in stats
+
+
+def test_response_rows_keeps_only_objects():
+    """Test response data is narrowed to object rows."""
+    assert response_rows([{"id": 1}, "x", None, {"id": 2}]) == [{"id": 1}, {"id": 2}]
+    assert response_rows(None) == []
+    assert response_rows({"id": 1}) == []
+
+
+def test_async_client_is_created_once_per_event_loop():
+    """Test each event loop gets its own async client (WSGI runs every request on a new loop)."""
+
+    async def two_lookups():
+        return await get_async_supabase_client(), await get_async_supabase_client()
+
+    with (
+        patch("chat.services.supabase_service._async_clients", LoopLocal()),
+        patch(
+            "chat.services.supabase_service.get_settings",
+            return_value=MagicMock(supabase_url="https://x.supabase.co", supabase_key="key"),
+        ),
+        patch(
+            "chat.services.supabase_service.acreate_client",
+            AsyncMock(side_effect=lambda *_: MagicMock()),
+        ) as mock_create,
+    ):
+        first, again = asyncio.run(two_lookups())
+        second, _ = asyncio.run(two_lookups())
+
+    assert first is again
+    assert first is not second
+    assert mock_create.await_count == 2
@@ -0,0 +1,173 @@
+"""Unit tests for the local vector index."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from chat.services.vector_index import (
+    LocalVectorIndex,
+    build_snapshot,
+    normalize_rows,
+    write_snapshot,
+)
+
+DIMS = 8
+
+
+def _records(count: int, start: int = 0) -> list[dict]:
+    return [
+        {
+            "id": f"id-{i}",
+            "source": "serp",
+            "source_id": f"{i:016x}",
+            "metadata": {"name": f"Place {i}"},
+            "created_at": f"2025-01-01T00:00:{i % 60:02d}+00:00",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def _exact_top(vectors: np.ndarray, query: np.ndarray, k: int) -> list[int]:
+    scores = normalize_rows(vectors) @ normalize_rows(query)
+    return list(np.argsort(-scores)[:k])
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(1).standard_normal((50, DIMS)).astype(np.float32)
+
+
+def test_brute_force_matches_exact_cosine(tmp_path, vectors):
+    """Test small snapshots return exact top-k with RPC row shape."""
+    write_snapshot(tmp_path, _records(50), vectors)
+    index = LocalVectorIndex(tmp_path, dimensions=DIMS)
+    index.load()
+
+    query = vectors[7] + 0.01
+    results = index.search(query.tolist(), limit=5, similarity_threshold=-1.0)
+
+    assert [r["id"] for r in results] == [f"id-{i}" for i in _exact_top(vectors, query, 5)]
+    assert set(results[0]) == {"id", "source", "source_id", "metadata", "similarity"}
+    assert results[0]["similarity"] == pytest.approx(
+        float(normalize_rows(vectors[7]) @ normalize_rows(query)), abs=1e-5
+    )
+
+
+def test_threshold_is_exclusive(tmp_path, vectors):
+    """Test rows at or below the threshold are dropped, like the RPC."""
+    write_snapshot(tmp_path, _records(50), vectors)
+    index = LocalVectorIndex(tmp_path, dimensions=DIMS)
+    index.load()
+
+    results = index.search(vectors[3].tolist(), limit=50, similarity_threshold=0.9999)
+
+    assert [r["id"] for r in results] == ["id-3"]
+
+
+def test_snapshot_is_memory_mapped(tmp_path, vectors):
+    """Test the base matrix is a read-only mmap of the snapshot file."""
+    write_snapshot(tmp_path, _records(50), vectors)
+    index = LocalVectorIndex(tmp_path, dimensions=DIMS)
+    index.load()
+
+    assert isinstance(index._state.base, np.memmap)
+    assert index._state.base.dtype == np.float32
+
+
+def test_ivf_partition_for_large_snapshots(tmp_path):
+    """Test IVF search finds the nearest neighbour when probing all lists."""
+    vectors = np.random.default_rng(2).standard_normal((400, DIMS)).astype(np.float32)
+    write_snapshot(tmp_path, _records(400), vectors, brute_force_max_rows=100)
+
+    index = LocalVectorIndex(tmp_path, dimensions=DIMS, probes=1000)
+    index.load()
+    assert index._state.offsets is not None
+
+    query = vectors[123]
+    results = index.search(query.tolist(), limit=3, similarity_threshold=-1.0)
+
+    assert [r["id"] for r in results] == [f"id-{i}" for i in _exact_top(vectors, query, 3)]
+
+
+def test_refresh_appends_new_rows_and_replaces_keys(tmp_path, vectors):
+    """Test polling adds new rows and hides rows replaced by (source, source_id)."""
+    write_snapshot(tmp_path, _records(10), vectors[:10])
+    index = LocalVectorIndex(tmp_path, dimensions=DIMS)
+    index.load()
+
+    replacement = _records(1, start=2)[0] | {
+        "id": "id-2b",
+        "created_at": "2025-01-02T00:00:00+00:00",
+    }
+    fresh = _records(1, start=20)[0] | {"created_at": "2025-01-02T00:00:01+00:00"}
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.gte.return_value
+    query.order.return_value.order.return_value.range.return_value.execute.return_value = MagicMock(
+        data=[
+            replacement | {"embedding": str(vectors[20].tolist())},
+            fresh | {"embedding": vectors[21].tolist()},
+        ]
+    )
+
+    assert index.refresh(client) == 2
+    assert len(index) == 11
+    assert client.table.return_value.select.return_value.gte.call_args.args == (
+        "updated_at",
+        "2025-01-01T00:00:09+00:00",
+    )
+
+    ids = [r["id"] for r in index.search(vectors[20].tolist(), 20, -1.0)]
+    assert "id-2b" in ids and "id-2" not in ids
+
+
+def test_refresh_picks_up_rows_updated_in_place(tmp_path, vectors):
+    """Test an upsert that keeps id and created_at replaces the snapshot row."""
+    write_snapshot(tmp_path, _records(10), vectors[:10])
+    index = LocalVectorIndex(tmp_path, dimensions=DIMS)
+    index.load()
+
+    unchanged = _records(1, start=9)[0]
+    updated = _records(1, start=4)[0] | {
+        "metadata": {"name": "Renamed"},
+        "updated_at": "2025-01-03T00:00:00+00:00",
+    }
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.gte.return_value
+    query.order.return_value.order.return_value.range.return_value.execute.return_value = MagicMock(
+        data=[
+            unchanged | {"embedding": vectors[9].tolist()},
+            updated | {"embedding": vectors[30].tolist()},
+        ]
+    )
+
+    assert index.refresh(client) == 1
+    assert len(index) == 10
+    assert index._state.watermark == "2025-01-03T00:00:00+00:00"
+
+    top = index.search(vectors[30].tolist(), 1, -1.0)[0]
+    assert top["id"] == "id-4"
+    assert top["metadata"] == {"name": "Renamed"}
+
+    # Re-polling from the new watermark returns the same row version: no-op
+    assert index.refresh(client) == 0
+
+
+def test_load_missing_snapshot_raises(tmp_path):
+    """Test loading before a snapshot exists raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        LocalVectorIndex(tmp_path, dimensions=DIMS).load()
+
+
+def test_build_snapshot_pages_through_table(tmp_path, vectors):
+    """Test build_snapshot exports every page of places_embeddings."""
+    rows = [r | {"embedding": str(v.tolist())} for r, v in zip(_records(3), vectors, strict=False)]
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.order.return_value.order.return_value
+    query.range.return_value.execute.return_value = MagicMock(data=rows)
+
+    assert build_snapshot(client, tmp_path) == 3
+
+    index = LocalVectorIndex(tmp_path, dimensions=DIMS)
+    index.load()
+    assert len(index) == 3
@@ -0,0 +1,180 @@
+"""Unit tests for vector search as a result source."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from chat.schemas import NormalizedLocation, ParsedInput, SearchResult
+from chat.services import search_service, vector_search_service
+from chat.services.exact_rerank import RerankStats
+
+ROW = {
+    "id": "1",
+    "source": "reddit",
+    "source_id": "abc123",
+    "metadata": {
+        "name": "Secret Cave",
+        "description": "Hidden underground cavern",
+        "url": "https://reddit.com/r/kentucky/comments/abc123",
+        "location": "Pikeville, KY",
+    },
+    "similarity": 0.91,
+}
+
+
+@pytest.fixture
+def embedding_service():
+    with patch(
+        "chat.services.vector_search_service.get_async_embedding_service"
+    ) as mock_get_service:
+        service = mock_get_service.return_value
+        service.exact_rerank_oversample = 0
+        service.local_index = None
+        service.similarity_search = AsyncMock(return_value=[ROW])
+        yield service
+
+
+async def test_search_indexed_places_converts_rows(embedding_service):
+    """Test similarity rows become SearchResults with source="vector"."""
+    results = await vector_search_service.search_indexed_places("caves Pikeville, KY")
+
+    assert len(results) == 1
+    assert results[0].source == "vector"
+    assert results[0].name == "Secret Cave"
+    assert results[0].url == ROW["metadata"]["url"]
+    assert results[0].metadata["similarity"] == 0.91
+    assert results[0].metadata["indexed_source"] == "reddit"
+    embedding_service.similarity_search.assert_awaited_once_with(
+        "caves Pikeville, KY", limit=10, similarity_threshold=0.78
+    )
+
+
+async def test_search_indexed_places_reports_rerank_stats(embedding_service):
+    """Test two-stage search fills diagnostics with recall and latency."""
+    stats = RerankStats(
+        candidates=40, returned=1, approx_recall=0.9, candidate_ms=12.5, rerank_ms=1.2
+    )
+    embedding_service.exact_rerank_oversample = 4
+    embedding_service.similarity_search_reranked = AsyncMock(return_value=([ROW], stats))
+    diagnostics: dict = {}
+
+    results = await vector_search_service.search_indexed_places(
+        "caves Pikeville, KY", diagnostics=diagnostics
+    )
+
+    assert results[0].name == "Secret Cave"
+    assert diagnostics["rerank"]["approx_recall"] == 0.9
+    assert diagnostics["rerank"]["candidate_ms"] == 12.5
+    embedding_service.similarity_search.assert_not_awaited()
+
+    embedding_service.similarity_search_reranked.return_value = ([ROW], None)
+    await vector_search_service.search_indexed_places("caves", diagnostics=diagnostics)
+    assert diagnostics["rerank"] == {"cache": "hit"}
+
+
+async def test_search_indexed_places_filters_by_location(embedding_service):
+    """Test hits indexed for another location are dropped after oversampling."""
+    elsewhere = ROW | {"metadata": ROW["metadata"] | {"location": "Austin, TX"}}
+    unknown = ROW | {"metadata": {"name": "Nowhere Cave"}}
+    embedding_service.similarity_search.return_value = [elsewhere, unknown, ROW]
+
+    results = await vector_search_service.search_indexed_places("caves", "pikeville ky", limit=2)
+
+    assert [r.metadata["location"] for r in results] == ["Pikeville, KY"]
+    embedding_service.similarity_search.assert_awaited_once_with(
+        "caves", limit=8, similarity_threshold=0.78
+    )
+
+
+async def test_search_indexed_places_prefers_local_index(embedding_service):
+    """Test a loaded local index is searched even when exact rerank is configured."""
+    embedding_service.exact_rerank_oversample = 4
+    embedding_service.local_index = MagicMock(ready=True)
+    embedding_service.similarity_search_reranked = AsyncMock()
+
+    results = await vector_search_service.search_indexed_places("caves")
+
+    assert results[0].name == "Secret Cave"
+    embedding_service.similarity_search.assert_awaited_once()
+    embedding_service.similarity_search_reranked.assert_not_awaited()
+
+
+async def test_search_indexed_places_skips_rows_without_name(embedding_service):
+    """Test rows missing a name are dropped."""
+    embedding_service.similarity_search.return_value = [ROW | {"metadata": {"name": " "}}]
+
+    assert await vector_search_service.search_indexed_places("caves") == []
+
+
+async def test_search_indexed_places_empty_query(embedding_service):
+    """Test no query means no vector lookup."""
+    assert await vector_search_service.search_indexed_places(None) == []
+    assert await vector_search_service.search_indexed_places("  ") == []
+    embedding_service.similarity_search.assert_not_awaited()
+
+
+async def test_search_indexed_places_failure_returns_empty(embedding_service):
+    """Test vector store failures do not fail the search."""
+    embedding_service.similarity_search.side_effect = Exception("pgvector down")
+
+    assert await vector_search_service.search_indexed_places("caves") == []
+
+
+def test_drop_live_duplicates():
+    """Test vector hits already returned live (by URL or name) are removed."""
+    live = [
+        SearchResult(name="Secret Cave", description="", source="reddit"),
+        SearchResult(name="Mine Tour", description="", source="serp", url="https://x.test/mine"),
+    ]
+    vector = [
+        SearchResult(name="secret cave ", description="", source="vector"),
+        SearchResult(name="Old Mine", description="", source="vector", url="https://x.test/mine"),
+        SearchResult(name="Catacombs", description="", source="vector"),
+    ]
+
+    kept = vector_search_service.drop_live_duplicates(vector, live)
+
+    assert [r.name for r in kept] == ["Catacombs"]
+
+
+@pytest.mark.usefixtures("embedding_service")
+async def test_execute_search_queries_vector_source():
+    """Test execute_search gathers the vector source and scores its results."""
+    live = [SearchResult(name="Live Spot", description="local dive", source="serp")]
+
+    with (
+        patch.object(search_service.cache_service, "get_cached_search_results", AsyncMock()),
+        patch.object(search_service.cache_service, "set_cached_search_results", AsyncMock()),
+        patch.object(
+            search_service.openai_service,
+            "parse_user_input",
+            AsyncMock(return_value=ParsedInput(location="Pikeville", intent="caves", confidence=1)),
+        ),
+        patch.object(
+            search_service.openai_service, "generate_response", AsyncMock(return_value="ok")
+        ),
+        patch.object(
+            search_service.geocoding_service,
+            "normalize_location",
+            AsyncMock(return_value=NormalizedLocation(normalized="Pikeville, KY", confidence=1)),
+        ),
+        patch.object(
+            search_service.serp_service, "search_hidden_gems", AsyncMock(return_value=live)
+        ),
+        patch.object(
+            search_service.reddit_service, "search_reddit_rss", AsyncMock(return_value=[])
+        ),
+        patch.object(
+            search_service.eventbrite_service, "search_local_events", AsyncMock(return_value=[])
+        ),
+        patch.object(search_service.indexing_service, "index_search_results"),
+    ):
+        result = await search_service.execute_search(
+            "caves in Pikeville", force=True, vector_query="caves Pikeville, KY"
+        )
+
+    assert result["debug"]["source_stats"]["vector"] == {"count": 1, "status": "success"}
+    assert result["debug"]["llm"] == {"parse": {}, "generate": {}}
+    vector_place = next(p for p in result["places"] if p["source"] == "vector")
+    assert vector_place["name"] == "Secret Cave"
+    assert vector_place["score"] > 0
@@ -0,0 +1,51 @@
+"""Unit tests for the process-wide background loop."""
+
+import asyncio
+import threading
+
+import pytest
+
+from chat.utils.background import BackgroundLoop
+
+
+@pytest.fixture
+def background():
+    loop = BackgroundLoop(name="test-background")
+    yield loop
+    loop.stop()
+
+
+def test_submit_runs_on_background_thread(background):
+    """Test coroutines run on the loop's own daemon thread."""
+
+    async def thread_name() -> str:
+        return threading.current_thread().name
+
+    assert background.submit(thread_name()).result(timeout=2) == "test-background"
+
+
+def test_work_survives_the_submitting_loop(background):
+    """Test work submitted from a short-lived loop finishes after that loop closes."""
+    release = threading.Event()
+
+    async def slow() -> str:
+        await asyncio.to_thread(release.wait, 2)
+        return "done"
+
+    async def request():
+        return background.submit(slow())
+
+    future = asyncio.run(request())
+    release.set()
+
+    assert future.result(timeout=2) == "done"
+
+
+def test_stop_cancels_pending_work(background):
+    """Test stop() cancels unfinished coroutines and a later use restarts the loop."""
+    future = background.submit(asyncio.sleep(60))
+
+    background.stop()
+
+    assert future.cancelled()
+    assert background.submit(asyncio.sleep(0, result=1)).result(timeout=2) == 1
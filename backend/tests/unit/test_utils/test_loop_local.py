@@ -0,0 +1,43 @@
+"""Unit tests for per-event-loop values."""
+
+import asyncio
+
+import pytest
+
+from chat.utils.loop_local import LoopLocal
+
+
+def test_one_value_per_event_loop():
+    """Test values are shared within a loop and rebuilt for a new one."""
+    values = LoopLocal(object)
+
+    async def twice():
+        return values.get(), values.get()
+
+    first, again = asyncio.run(twice())
+    second, _ = asyncio.run(twice())
+
+    assert first is again
+    assert first is not second
+
+
+def test_set_and_peek_without_factory():
+    """Test stored values are only visible to their own loop."""
+    values: LoopLocal[str] = LoopLocal()
+
+    async def store():
+        assert values.peek() is None
+        values.set("client")
+        return values.get()
+
+    async def lookup():
+        return values.peek()
+
+    assert asyncio.run(store()) == "client"
+    assert asyncio.run(lookup()) is None
+
+
+async def test_get_without_factory_raises():
+    """Test a missing value without a factory raises LookupError."""
+    with pytest.raises(LookupError):
+        LoopLocal().get()
@@ -0,0 +1,49 @@
+"""Unit tests for in-process memory cache."""
+
+import pytest
+
+from chat.utils.memory_cache import MemoryCache
+
+
+def test_lru_eviction():
+    """Test least recently used entries are evicted first."""
+    cache: MemoryCache[int] = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_expiry(monkeypatch):
+    """Test entries expire after ttl_seconds."""
+    now = [100.0]
+    monkeypatch.setattr("chat.utils.memory_cache.time.monotonic", lambda: now[0])
+    cache: MemoryCache[str] = MemoryCache(maxsize=10, ttl_seconds=5)
+    cache.set("k", "v")
+
+    now[0] = 104.0
+    assert cache.get("k") == "v"
+
+    now[0] = 106.0
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_stats_track_hit_rate():
+    """Test hit/miss counters feed the hit rate."""
+    cache: MemoryCache[int] = MemoryCache(maxsize=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_invalid_maxsize():
+    """Test maxsize must be positive."""
+    with pytest.raises(ValueError, match="maxsize"):
+        MemoryCache(maxsize=0)
@@ -0,0 +1,66 @@
+"""Unit tests for AsyncRateLimiter."""
+
+import pytest
+
+from chat.utils import rate_limiter
+from chat.utils.rate_limiter import AsyncRateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+async def test_burst_within_budget_does_not_wait(clock):
+    """Test a full minute of requests can be issued immediately."""
+    limiter = AsyncRateLimiter(requests_per_minute=3)
+
+    for _ in range(3):
+        await limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+async def test_waits_for_request_refill(clock):
+    """Test the request over budget waits for one request to refill."""
+    limiter = AsyncRateLimiter(requests_per_minute=60)
+
+    for _ in range(61):
+        await limiter.acquire()
+
+    assert sum(clock.sleeps) == pytest.approx(1.0)
+
+
+async def test_waits_for_token_refill(clock):
+    """Test token budget throttles large requests."""
+    limiter = AsyncRateLimiter(requests_per_minute=1000, tokens_per_minute=600)
+
+    await limiter.acquire(tokens=600)
+    await limiter.acquire(tokens=300)
+
+    assert sum(clock.sleeps) == pytest.approx(30.0)
+
+
+def test_invalid_budgets():
+    """Test non-positive budgets are rejected."""
+    with pytest.raises(ValueError, match="requests_per_minute"):
+        AsyncRateLimiter(requests_per_minute=0)
+
+    with pytest.raises(ValueError, match="tokens_per_minute"):
+        AsyncRateLimiter(requests_per_minute=1, tokens_per_minute=0)
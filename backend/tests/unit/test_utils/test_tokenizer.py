@@ -0,0 +1,42 @@
+"""Unit tests for local token counting."""
+
+from unittest.mock import patch
+
+import pytest
+import tiktoken
+
+from chat.utils.tokenizer import count_tokens, truncate_to_tokens
+
+# Real tiktoken BPE with one token per word/space run; needs no encoding download
+WORD_ENCODING = tiktoken.Encoding(
+    name="test_words",
+    pat_str=r"\S+|\s+",
+    mergeable_ranks={bytes([i]): i for i in range(256)}
+    | {b"cave": 256, b" ": 257, b"jazz": 258, b"night": 259},
+    special_tokens={},
+)
+
+
+@pytest.fixture
+def word_encoding():
+    with patch("chat.utils.tokenizer.get_encoding", return_value=WORD_ENCODING):
+        yield
+
+
+@pytest.mark.usefixtures("word_encoding")
+def test_count_and_truncate_with_encoding():
+    """Test counts and cuts follow the BPE tokens, ending on a whole word."""
+    text = "cave jazz night"
+
+    assert count_tokens(text, "text-embedding-ada-002") == 5
+    assert truncate_to_tokens(text, 5, "text-embedding-ada-002") == text
+    assert truncate_to_tokens(text, 4, "text-embedding-ada-002") == "cave jazz"
+    assert truncate_to_tokens("<|endoftext|>", 100, "text-embedding-ada-002") == "<|endoftext|>"
+
+
+def test_fallback_estimate_without_encoding():
+    """Test the character estimate over-counts when no encoding is available."""
+    with patch("chat.utils.tokenizer.get_encoding", return_value=None):
+        assert count_tokens("a" * 10, "any-model") == 4
+        assert truncate_to_tokens("cave jazz night", 3, "any-model") == "cave"
+        assert truncate_to_tokens("cave", 3, "any-model") == "cave"
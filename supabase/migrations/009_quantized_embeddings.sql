@@ -0,0 +1,152 @@
+-- ============================================================================
+-- QUANTIZED EMBEDDING INDEXES
+-- ============================================================================
+-- Compact index copies of places_embeddings.embedding for the candidate scan.
+-- Full-precision vector(1536) values stay in the table and are used to rerank
+-- the oversampled candidates, so returned similarity scores are exact.
+--
+-- Requires pgvector >= 0.7.0 (halfvec type, binary_quantize()).
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+
+-- halfvec (float16) copy: half the index size of the full vector index
+CREATE INDEX IF NOT EXISTS idx_places_embeddings_halfvec
+ON app_embeddings.places_embeddings
+USING ivfflat((embedding::halfvec(1536)) halfvec_cosine_ops)
+WITH (lists = 100);
+
+-- Binary-quantized copy: 1 bit per dimension (~1/32 of the full vector index)
+CREATE INDEX IF NOT EXISTS idx_places_embeddings_binary
+ON app_embeddings.places_embeddings
+USING ivfflat((binary_quantize(embedding)::bit(1536)) bit_hamming_ops)
+WITH (lists = 100);
+
+-- ============================================================================
+-- QUANTIZED SIMILARITY SEARCH FUNCTION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION app_embeddings.search_places_by_similarity_quantized(
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 10,
+  storage_mode text DEFAULT 'halfvec',
+  oversample int DEFAULT 4
+)
+RETURNS TABLE (
+  id uuid,
+  source text,
+  source_id text,
+  metadata jsonb,
+  similarity float
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+BEGIN
+  -- Validate inputs
+  IF match_threshold < 0 OR match_threshold > 1 THEN
+    RAISE EXCEPTION 'match_threshold must be between 0 and 1, got %', match_threshold;
+  END IF;
+
+  IF match_count < 1 OR match_count > 100 THEN
+    RAISE EXCEPTION 'match_count must be between 1 and 100, got %', match_count;
+  END IF;
+
+  IF oversample < 1 OR oversample > 20 THEN
+    RAISE EXCEPTION 'oversample must be between 1 and 20, got %', oversample;
+  END IF;
+
+  IF storage_mode NOT IN ('halfvec', 'binary') THEN
+    RAISE EXCEPTION 'storage_mode must be halfvec or binary, got %', storage_mode;
+  END IF;
+
+  -- Stage 1: approximate candidate scan on the quantized index (match_count * oversample)
+  -- Stage 2: exact rerank of candidates against full-precision vectors
+  IF storage_mode = 'halfvec' THEN
+    RETURN QUERY
+    WITH candidates AS (
+      SELECT p.id, p.source, p.source_id, p.metadata, p.embedding
+      FROM app_embeddings.places_embeddings p
+      ORDER BY p.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+      LIMIT match_count * oversample
+    )
+    SELECT
+      c.id,
+      c.source,
+      c.source_id,
+      c.metadata,
+      1 - (c.embedding <=> query_embedding) AS similarity
+    FROM candidates c
+    WHERE 1 - (c.embedding <=> query_embedding) > match_threshold
+    ORDER BY c.embedding <=> query_embedding
+    LIMIT match_count;
+  ELSE
+    RETURN QUERY
+    WITH candidates AS (
+      SELECT p.id, p.source, p.source_id, p.metadata, p.embedding
+      FROM app_embeddings.places_embeddings p
+      ORDER BY binary_quantize(p.embedding)::bit(1536) <~> binary_quantize(query_embedding)
+      LIMIT match_count * oversample
+    )
+    SELECT
+      c.id,
+      c.source,
+      c.source_id,
+      c.metadata,
+      1 - (c.embedding <=> query_embedding) AS similarity
+    FROM candidates c
+    WHERE 1 - (c.embedding <=> query_embedding) > match_threshold
+    ORDER BY c.embedding <=> query_embedding
+    LIMIT match_count;
+  END IF;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.search_places_by_similarity_quantized TO app_readwrite, app_admin;
+
+COMMENT ON FUNCTION app_embeddings.search_places_by_similarity_quantized IS
+  'Two-stage search: oversampled candidate scan on the halfvec or binary-quantized index, then exact cosine rerank against full-precision vectors.';
+
+-- ============================================================================
+-- EMBEDDING INDEX STATISTICS FUNCTION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION app_monitoring.get_embedding_index_stats()
+RETURNS TABLE (
+  index_name text,
+  index_method text,
+  index_size_bytes bigint,
+  index_size_pretty text,
+  table_rows bigint
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, app_monitoring, pg_catalog, pg_temp
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    i.relname::text,
+    am.amname::text,
+    pg_relation_size(i.oid)::bigint,
+    pg_size_pretty(pg_relation_size(i.oid)),
+    t.reltuples::bigint
+  FROM pg_index x
+  JOIN pg_class i ON i.oid = x.indexrelid
+  JOIN pg_class t ON t.oid = x.indrelid
+  JOIN pg_namespace n ON n.oid = t.relnamespace
+  JOIN pg_am am ON am.oid = i.relam
+  WHERE n.nspname = 'app_embeddings'
+    AND t.relname = 'places_embeddings'
+    AND am.amname IN ('ivfflat', 'hnsw')
+  ORDER BY i.relname;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_monitoring.get_embedding_index_stats TO app_readonly, app_readwrite, app_admin;
+
+COMMENT ON FUNCTION app_monitoring.get_embedding_index_stats IS
+  'Returns on-disk size of each vector index on places_embeddings (full, halfvec, binary) for storage trade-off comparisons.';
@@ -0,0 +1,51 @@
+-- ============================================================================
+-- EMBEDDING CACHE TABLE
+-- ============================================================================
+-- Persistent tier of the content-hash embedding cache (backend/chat/services/embedding_cache.py).
+-- Key: SHA-256 of model + normalized text. Value: packed little-endian float32 array.
+-- bytea keeps each 1536-d embedding at ~6 KB (vs ~19 KB as JSON text).
+
+CREATE TABLE app_embeddings.embedding_cache (
+  content_hash text PRIMARY KEY CHECK (content_hash ~ '^[0-9a-f]{64}$'),
+  model text NOT NULL,
+  dimensions int NOT NULL CHECK (dimensions > 0),
+  embedding bytea NOT NULL,
+  created_at timestamptz DEFAULT now() NOT NULL,
+
+  -- 4 bytes per float32 dimension
+  CONSTRAINT embedding_cache_size_matches CHECK (octet_length(embedding) = dimensions * 4)
+);
+
+CREATE INDEX idx_embedding_cache_model ON app_embeddings.embedding_cache(model);
+CREATE INDEX idx_embedding_cache_created ON app_embeddings.embedding_cache(created_at DESC);
+
+COMMENT ON TABLE app_embeddings.embedding_cache IS
+  'Content-hash embedding cache. Entries never go stale for a given model; prune by created_at if needed.';
+COMMENT ON COLUMN app_embeddings.embedding_cache.embedding IS
+  'Little-endian float32 array (dimensions * 4 bytes).';
+
+-- ============================================================================
+-- ROW LEVEL SECURITY
+-- ============================================================================
+
+ALTER TABLE app_embeddings.embedding_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "app_readwrite can read embedding cache"
+  ON app_embeddings.embedding_cache
+  FOR SELECT
+  TO app_readwrite
+  USING (true);
+
+CREATE POLICY "app_admin full access to embedding cache"
+  ON app_embeddings.embedding_cache
+  FOR ALL
+  TO app_admin
+  USING (true)
+  WITH CHECK (model IS NOT NULL AND dimensions > 0);
+
+-- ============================================================================
+-- GRANT PRIVILEGES TO ROLES
+-- ============================================================================
+
+GRANT SELECT ON app_embeddings.embedding_cache TO app_readwrite;
+GRANT ALL ON app_embeddings.embedding_cache TO app_admin;
@@ -0,0 +1,119 @@
+-- ============================================================================
+-- HYBRID LEXICAL + VECTOR SEARCH
+-- ============================================================================
+-- Vector-only search ranks exact place names and rare tokens ("catacombs",
+-- a specific venue) poorly. This adds a full-text column over metadata
+-- name/description and one RPC that fuses full-text and vector candidates
+-- with reciprocal rank fusion (RRF) in a single round trip.
+
+-- ============================================================================
+-- FULL-TEXT COLUMN + INDEX
+-- ============================================================================
+
+-- Name matches (weight A) outrank description matches (weight B)
+ALTER TABLE app_embeddings.places_embeddings
+ADD COLUMN IF NOT EXISTS search_tsv tsvector
+GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(metadata->>'name', '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(metadata->>'description', '')), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_places_embeddings_search_tsv
+ON app_embeddings.places_embeddings
+USING gin(search_tsv);
+
+-- ============================================================================
+-- HYBRID SEARCH FUNCTION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION app_embeddings.search_places_hybrid(
+  query_text text,
+  query_embedding vector(1536),
+  match_count int DEFAULT 10,
+  candidate_count int DEFAULT 50,
+  rrf_k int DEFAULT 60,
+  full_text_weight float DEFAULT 1.0,
+  semantic_weight float DEFAULT 1.0
+)
+RETURNS TABLE (
+  id uuid,
+  source text,
+  source_id text,
+  metadata jsonb,
+  similarity float,
+  text_rank float,
+  rrf_score float
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+BEGIN
+  -- Validate inputs
+  IF match_count < 1 OR match_count > 100 THEN
+    RAISE EXCEPTION 'match_count must be between 1 and 100, got %', match_count;
+  END IF;
+
+  IF candidate_count < match_count OR candidate_count > 500 THEN
+    RAISE EXCEPTION 'candidate_count must be between match_count and 500, got %', candidate_count;
+  END IF;
+
+  IF rrf_k < 1 THEN
+    RAISE EXCEPTION 'rrf_k must be >= 1, got %', rrf_k;
+  END IF;
+
+  IF full_text_weight < 0 OR semantic_weight < 0 THEN
+    RAISE EXCEPTION 'weights must be >= 0, got % and %', full_text_weight, semantic_weight;
+  END IF;
+
+  -- RRF: score = sum over lists of weight / (rrf_k + rank); rows missing from
+  -- a list contribute 0 for it
+  RETURN QUERY
+  WITH full_text AS (
+    SELECT
+      p.id,
+      ts_rank_cd(p.search_tsv, websearch_to_tsquery('english', query_text))::float AS rank_score,
+      row_number() OVER (
+        ORDER BY ts_rank_cd(p.search_tsv, websearch_to_tsquery('english', query_text)) DESC
+      ) AS rank_ix
+    FROM app_embeddings.places_embeddings p
+    WHERE p.search_tsv @@ websearch_to_tsquery('english', query_text)
+    ORDER BY rank_ix
+    LIMIT candidate_count
+  ),
+  semantic AS (
+    SELECT
+      p.id,
+      row_number() OVER (ORDER BY p.embedding <=> query_embedding) AS rank_ix
+    FROM app_embeddings.places_embeddings p
+    ORDER BY p.embedding <=> query_embedding
+    LIMIT candidate_count
+  ),
+  fused AS (
+    SELECT
+      coalesce(f.id, s.id) AS id,
+      coalesce(f.rank_score, 0) AS text_rank,
+      coalesce(full_text_weight / (rrf_k + f.rank_ix), 0) +
+        coalesce(semantic_weight / (rrf_k + s.rank_ix), 0) AS rrf_score
+    FROM full_text f
+    FULL OUTER JOIN semantic s ON f.id = s.id
+  )
+  SELECT
+    p.id,
+    p.source,
+    p.source_id,
+    p.metadata,
+    1 - (p.embedding <=> query_embedding) AS similarity,
+    fu.text_rank,
+    fu.rrf_score
+  FROM fused fu
+  JOIN app_embeddings.places_embeddings p ON p.id = fu.id
+  ORDER BY fu.rrf_score DESC, p.id
+  LIMIT match_count;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.search_places_hybrid TO app_readwrite, app_admin;
+
+COMMENT ON FUNCTION app_embeddings.search_places_hybrid IS
+  'Hybrid search: full-text (websearch_to_tsquery over name/description) and vector candidate sets fused with reciprocal rank fusion. Returns rrf_score plus cosine similarity and text rank per row.';
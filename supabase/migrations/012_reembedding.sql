@@ -0,0 +1,229 @@
+-- ============================================================================
+-- RE-EMBEDDING (MODEL MIGRATION) SUPPORT
+-- ============================================================================
+-- Tooling for `python manage.py reembed_places` (backend/chat/services/reembedding_service.py):
+--
+-- 1. reembed_jobs: one checkpoint row per job (target model, keyset cursor, counters)
+-- 2. places_embeddings_shadow: new-model vectors written alongside the live column
+-- 3. swap_reembedded_embeddings(): replaces places_embeddings.embedding with the
+--    shadow vectors and rebuilds the vector indexes in a single transaction
+--
+-- Live search keeps using the old column until the swap starts; it then blocks
+-- (reads included) until the swap commits.
+--
+-- The target model must keep the live column's dimensions: the search RPCs
+-- (006, 009, 011, 013, 014) and the quantized indexes are typed vector(1536).
+-- The swap refuses a job whose dimensions differ.
+
+-- ============================================================================
+-- TABLES
+-- ============================================================================
+
+CREATE TABLE app_embeddings.reembed_jobs (
+  job_id text PRIMARY KEY CHECK (job_id ~ '^[a-z0-9_-]{1,64}$'),
+  model text NOT NULL,
+  dimensions int NOT NULL CHECK (dimensions BETWEEN 1 AND 2000),  -- ivfflat limit
+  last_id uuid,  -- Keyset cursor: every id <= last_id has a shadow row
+  processed bigint DEFAULT 0 NOT NULL,
+  failed bigint DEFAULT 0 NOT NULL,
+  status text DEFAULT 'running' NOT NULL CHECK (status IN ('running', 'swapped')),
+  created_at timestamptz DEFAULT now() NOT NULL,
+  updated_at timestamptz DEFAULT now() NOT NULL
+);
+
+-- Dimension-less vector: the target size is only known per job
+CREATE TABLE app_embeddings.places_embeddings_shadow (
+  job_id text NOT NULL REFERENCES app_embeddings.reembed_jobs(job_id) ON DELETE CASCADE,
+  id uuid NOT NULL REFERENCES app_embeddings.places_embeddings(id) ON DELETE CASCADE,
+  embedding vector NOT NULL,
+  created_at timestamptz DEFAULT now() NOT NULL,
+  PRIMARY KEY (job_id, id)
+);
+
+COMMENT ON TABLE app_embeddings.reembed_jobs IS
+  'Checkpoints for resumable re-embedding jobs (model migrations).';
+COMMENT ON TABLE app_embeddings.places_embeddings_shadow IS
+  'New-model embeddings written by reembed_places before the atomic swap.';
+
+-- ============================================================================
+-- ROW LEVEL SECURITY
+-- ============================================================================
+
+ALTER TABLE app_embeddings.reembed_jobs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE app_embeddings.places_embeddings_shadow ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "app_admin full access to reembed jobs"
+  ON app_embeddings.reembed_jobs
+  FOR ALL
+  TO app_admin
+  USING (true)
+  WITH CHECK (true);
+
+CREATE POLICY "app_admin full access to shadow embeddings"
+  ON app_embeddings.places_embeddings_shadow
+  FOR ALL
+  TO app_admin
+  USING (true)
+  WITH CHECK (true);
+
+GRANT ALL ON app_embeddings.reembed_jobs TO app_admin;
+GRANT ALL ON app_embeddings.places_embeddings_shadow TO app_admin;
+
+-- ============================================================================
+-- STRAGGLER LOOKUP FUNCTION
+-- ============================================================================
+-- Rows inserted behind the keyset cursor (uuid ids are random) are picked up by
+-- a final sweep over rows that still lack a shadow vector.
+
+CREATE OR REPLACE FUNCTION app_embeddings.get_reembed_missing(
+  p_job_id text,
+  p_limit int DEFAULT 500
+)
+RETURNS TABLE (
+  id uuid,
+  metadata jsonb
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, pg_temp
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT p.id, p.metadata
+  FROM app_embeddings.places_embeddings p
+  WHERE NOT EXISTS (
+    SELECT 1 FROM app_embeddings.places_embeddings_shadow s
+    WHERE s.job_id = p_job_id AND s.id = p.id
+  )
+  ORDER BY p.id
+  LIMIT p_limit;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.get_reembed_missing TO app_admin;
+
+-- ============================================================================
+-- ATOMIC SWAP FUNCTION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION app_embeddings.swap_reembedded_embeddings(
+  p_job_id text,
+  p_lists int DEFAULT 100
+)
+RETURNS TABLE (
+  rows_swapped bigint,
+  dimensions int
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+DECLARE
+  job app_embeddings.reembed_jobs%ROWTYPE;
+  live_dimensions int;
+  missing bigint;
+  swapped bigint;
+  had_halfvec boolean;
+  had_binary boolean;
+BEGIN
+  IF p_lists < 1 OR p_lists > 10000 THEN
+    RAISE EXCEPTION 'p_lists must be between 1 and 10000, got %', p_lists;
+  END IF;
+
+  SELECT * INTO job FROM app_embeddings.reembed_jobs WHERE job_id = p_job_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Unknown re-embed job %', p_job_id;
+  END IF;
+  IF job.status = 'swapped' THEN
+    RAISE EXCEPTION 'Re-embed job % was already swapped', p_job_id;
+  END IF;
+
+  -- ACCESS EXCLUSIVE blocks readers as well as writers until the transaction
+  -- commits, so searches stall for the whole swap (update + index builds).
+  -- Run it in a quiet window.
+  LOCK TABLE app_embeddings.places_embeddings IN ACCESS EXCLUSIVE MODE;
+
+  -- vector's typmod is its dimension count
+  SELECT a.atttypmod INTO live_dimensions
+  FROM pg_attribute a
+  WHERE a.attrelid = 'app_embeddings.places_embeddings'::regclass
+    AND a.attname = 'embedding'
+    AND NOT a.attisdropped;
+  IF job.dimensions <> live_dimensions THEN
+    RAISE EXCEPTION 'Re-embed job % has % dimensions but the live column has %; the search RPCs are typed vector(%)',
+      p_job_id, job.dimensions, live_dimensions, live_dimensions;
+  END IF;
+
+  SELECT count(*) INTO missing
+  FROM app_embeddings.places_embeddings p
+  WHERE NOT EXISTS (
+    SELECT 1 FROM app_embeddings.places_embeddings_shadow s
+    WHERE s.job_id = p_job_id AND s.id = p.id
+  );
+  IF missing > 0 THEN
+    RAISE EXCEPTION '% rows have no shadow embedding for job %; resume the job first',
+      missing, p_job_id;
+  END IF;
+
+  -- Dropping the column drops its indexes; recreate whichever existed.
+  -- Quantized indexes (migration 009) need pgvector >= 0.7 and may be absent.
+  had_halfvec := to_regclass('app_embeddings.idx_places_embeddings_halfvec') IS NOT NULL;
+  had_binary := to_regclass('app_embeddings.idx_places_embeddings_binary') IS NOT NULL;
+
+  DROP INDEX IF EXISTS app_embeddings.idx_places_embeddings_vector;
+  DROP INDEX IF EXISTS app_embeddings.idx_places_embeddings_halfvec;
+  DROP INDEX IF EXISTS app_embeddings.idx_places_embeddings_binary;
+
+  EXECUTE format(
+    'ALTER TABLE app_embeddings.places_embeddings ADD COLUMN embedding_next vector(%s)',
+    job.dimensions
+  );
+
+  EXECUTE format(
+    'UPDATE app_embeddings.places_embeddings p
+     SET embedding_next = s.embedding::vector(%s)
+     FROM app_embeddings.places_embeddings_shadow s
+     WHERE s.job_id = %L AND s.id = p.id',
+    job.dimensions, p_job_id
+  );
+  GET DIAGNOSTICS swapped = ROW_COUNT;
+
+  ALTER TABLE app_embeddings.places_embeddings DROP COLUMN embedding CASCADE;
+  ALTER TABLE app_embeddings.places_embeddings RENAME COLUMN embedding_next TO embedding;
+  ALTER TABLE app_embeddings.places_embeddings ALTER COLUMN embedding SET NOT NULL;
+
+  EXECUTE format(
+    'CREATE INDEX idx_places_embeddings_vector ON app_embeddings.places_embeddings
+     USING ivfflat(embedding vector_cosine_ops) WITH (lists = %s)',
+    p_lists
+  );
+
+  IF had_halfvec THEN
+    EXECUTE format(
+      'CREATE INDEX idx_places_embeddings_halfvec ON app_embeddings.places_embeddings
+       USING ivfflat((embedding::halfvec(%s)) halfvec_cosine_ops) WITH (lists = %s)',
+      job.dimensions, p_lists
+    );
+  END IF;
+
+  IF had_binary THEN
+    EXECUTE format(
+      'CREATE INDEX idx_places_embeddings_binary ON app_embeddings.places_embeddings
+       USING ivfflat((binary_quantize(embedding)::bit(%s)) bit_hamming_ops) WITH (lists = %s)',
+      job.dimensions, p_lists
+    );
+  END IF;
+
+  DELETE FROM app_embeddings.places_embeddings_shadow WHERE job_id = p_job_id;
+  UPDATE app_embeddings.reembed_jobs
+  SET status = 'swapped', updated_at = now()
+  WHERE job_id = p_job_id;
+
+  RETURN QUERY SELECT swapped, job.dimensions;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.swap_reembedded_embeddings TO app_admin;
+
+COMMENT ON FUNCTION app_embeddings.swap_reembedded_embeddings IS
+  'Atomically replaces places_embeddings.embedding with a completed re-embed job''s shadow vectors and rebuilds the full-precision and quantized ivfflat indexes. Raises if any row lacks a shadow vector or the job changes the column dimensions.';
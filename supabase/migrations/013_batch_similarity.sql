@@ -0,0 +1,79 @@
+-- ============================================================================
+-- MULTI-QUERY SIMILARITY SEARCH
+-- ============================================================================
+-- Itinerary-style requests and the semantic cache need several vector lookups
+-- per request. search_places_by_similarity_many() answers up to 32 query
+-- embeddings in one round trip; each query gets its own top-k (a LATERAL
+-- subquery per query, so every lookup still uses the ivfflat index) and rows
+-- are tagged with the 0-based query_index.
+--
+-- Embeddings are passed as a jsonb array of float arrays: PostgREST cannot
+-- build a vector[] from JSON, and jsonb keeps the function dimension-agnostic
+-- across re-embedding swaps (migration 012).
+
+CREATE OR REPLACE FUNCTION app_embeddings.search_places_by_similarity_many(
+  query_embeddings jsonb,
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 10
+)
+RETURNS TABLE (
+  query_index int,
+  id uuid,
+  source text,
+  source_id text,
+  metadata jsonb,
+  similarity float
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+BEGIN
+  -- Validate inputs
+  IF jsonb_typeof(query_embeddings) IS DISTINCT FROM 'array'
+     OR jsonb_array_length(query_embeddings) < 1
+     OR jsonb_array_length(query_embeddings) > 32 THEN
+    RAISE EXCEPTION 'query_embeddings must be an array of 1 to 32 embeddings';
+  END IF;
+
+  IF match_threshold < 0 OR match_threshold > 1 THEN
+    RAISE EXCEPTION 'match_threshold must be between 0 and 1, got %', match_threshold;
+  END IF;
+
+  IF match_count < 1 OR match_count > 100 THEN
+    RAISE EXCEPTION 'match_count must be between 1 and 100, got %', match_count;
+  END IF;
+
+  RETURN QUERY
+  WITH queries AS MATERIALIZED (
+    SELECT (q.ord - 1)::int AS query_index, (q.value::text)::vector AS embedding
+    FROM jsonb_array_elements(query_embeddings) WITH ORDINALITY AS q(value, ord)
+  )
+  SELECT
+    q.query_index,
+    m.id,
+    m.source,
+    m.source_id,
+    m.metadata,
+    m.similarity
+  FROM queries q
+  CROSS JOIN LATERAL (
+    SELECT
+      p.id,
+      p.source,
+      p.source_id,
+      p.metadata,
+      1 - (p.embedding <=> q.embedding) AS similarity
+    FROM app_embeddings.places_embeddings p
+    WHERE 1 - (p.embedding <=> q.embedding) > match_threshold
+    ORDER BY p.embedding <=> q.embedding
+    LIMIT match_count
+  ) m
+  ORDER BY q.query_index, m.similarity DESC;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.search_places_by_similarity_many TO app_readwrite, app_admin;
+
+COMMENT ON FUNCTION app_embeddings.search_places_by_similarity_many IS
+  'Batch cosine similarity search: top match_count places above match_threshold for each of up to 32 query embeddings (jsonb array), tagged with 0-based query_index.';
@@ -0,0 +1,95 @@
+-- ============================================================================
+-- APPROXIMATE CANDIDATES FOR CLIENT-SIDE EXACT RERANK
+-- ============================================================================
+-- Two-stage retrieval (backend/chat/services/exact_rerank.py):
+--
+-- 1. search_places_candidates() scans the ivfflat index for the configured
+--    storage mode (full, halfvec or binary) and returns up to 1000 candidates
+--    in approximate order, each with its full-precision vector
+-- 2. The backend reranks them by exact cosine similarity in NumPy and keeps
+--    the top k
+--
+-- This lifts the 100-row match_count cap of the single-stage RPCs. probes can be
+-- raised for the candidate scan only (transaction-local). Vectors are sent as
+-- base64 of pgvector's binary format: about 8 KB per 1536-d vector, against about
+-- 19 KB as text, and no float parsing on the client.
+
+CREATE OR REPLACE FUNCTION app_embeddings.search_places_candidates(
+  query_embedding vector(1536),
+  candidate_count int DEFAULT 40,
+  storage_mode text DEFAULT 'full',
+  probes int DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  source text,
+  source_id text,
+  metadata jsonb,
+  embedding_b64 text,
+  candidate_rank int
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+BEGIN
+  -- Validate inputs
+  IF candidate_count < 1 OR candidate_count > 1000 THEN
+    RAISE EXCEPTION 'candidate_count must be between 1 and 1000, got %', candidate_count;
+  END IF;
+
+  IF storage_mode NOT IN ('full', 'halfvec', 'binary') THEN
+    RAISE EXCEPTION 'storage_mode must be full, halfvec or binary, got %', storage_mode;
+  END IF;
+
+  IF probes IS NOT NULL THEN
+    IF probes < 1 OR probes > 1000 THEN
+      RAISE EXCEPTION 'probes must be between 1 and 1000, got %', probes;
+    END IF;
+    PERFORM set_config('ivfflat.probes', probes::text, true);
+  END IF;
+
+  IF storage_mode = 'full' THEN
+    RETURN QUERY
+    SELECT
+      p.id, p.source, p.source_id, p.metadata,
+      encode(vector_send(p.embedding), 'base64'),
+      (row_number() OVER (ORDER BY p.distance))::int
+    FROM (
+      SELECT c.*, c.embedding <=> query_embedding AS distance
+      FROM app_embeddings.places_embeddings c
+      ORDER BY distance
+      LIMIT candidate_count
+    ) p;
+  ELSIF storage_mode = 'halfvec' THEN
+    RETURN QUERY
+    SELECT
+      p.id, p.source, p.source_id, p.metadata,
+      encode(vector_send(p.embedding), 'base64'),
+      (row_number() OVER (ORDER BY p.distance))::int
+    FROM (
+      SELECT c.*, c.embedding::halfvec(1536) <=> query_embedding::halfvec(1536) AS distance
+      FROM app_embeddings.places_embeddings c
+      ORDER BY distance
+      LIMIT candidate_count
+    ) p;
+  ELSE
+    RETURN QUERY
+    SELECT
+      p.id, p.source, p.source_id, p.metadata,
+      encode(vector_send(p.embedding), 'base64'),
+      (row_number() OVER (ORDER BY p.distance))::int
+    FROM (
+      SELECT c.*, binary_quantize(c.embedding)::bit(1536) <~> binary_quantize(query_embedding) AS distance
+      FROM app_embeddings.places_embeddings c
+      ORDER BY distance
+      LIMIT candidate_count
+    ) p;
+  END IF;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.search_places_candidates TO app_readwrite, app_admin;
+
+COMMENT ON FUNCTION app_embeddings.search_places_candidates IS
+  'Approximate candidate scan (full, halfvec or binary ivfflat index, optional probes) returning full-precision vectors (base64 pgvector binary) for exact client-side rerank.';
@@ -0,0 +1,347 @@
+-- ============================================================================
+-- IVFFLAT INDEX TUNING
+-- ============================================================================
+-- idx_places_embeddings_vector was built with a fixed lists = 100, and ivfflat
+-- centroids only reflect the rows present at build time. Maintenance tooling
+-- (`python manage.py retune_vector_index`, backend/chat/services/index_tuning.py):
+--
+-- 1. index_tuning_status() reports row count, rows added since the last build
+--    and the live index's lists
+-- 2. When growth or drift crosses a threshold the command rebuilds the index
+--    CONCURRENTLY (outside any function: CONCURRENTLY cannot run in a
+--    transaction) with lists derived from the row count
+-- 3. record_index_tuning() stores lists, probes and the build watermark in
+--    index_tuning
+-- 4. The similarity RPCs read probes from index_tuning (apply_index_tuning)
+--    and set ivfflat.probes for their own transaction
+--
+-- Without an index_tuning row the server default probes (1) is used, as before.
+
+-- ============================================================================
+-- TABLE
+-- ============================================================================
+
+CREATE TABLE app_embeddings.index_tuning (
+  index_name text PRIMARY KEY,
+  lists int NOT NULL CHECK (lists BETWEEN 1 AND 32768),  -- ivfflat limit
+  probes int NOT NULL CHECK (probes >= 1),
+  rows_at_build bigint NOT NULL CHECK (rows_at_build >= 0),
+  built_at timestamptz NOT NULL,
+  updated_at timestamptz DEFAULT now() NOT NULL,
+  CHECK (probes <= lists)
+);
+
+COMMENT ON TABLE app_embeddings.index_tuning IS
+  'Build parameters of vector indexes (lists, rows at build time) and the ivfflat probes the search RPCs apply.';
+
+ALTER TABLE app_embeddings.index_tuning ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "app_admin full access to index tuning"
+  ON app_embeddings.index_tuning
+  FOR ALL
+  TO app_admin
+  USING (true)
+  WITH CHECK (true);
+
+GRANT ALL ON app_embeddings.index_tuning TO app_admin;
+
+-- ============================================================================
+-- STATUS + RECORD FUNCTIONS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION app_embeddings.index_tuning_status(
+  p_index_name text DEFAULT 'idx_places_embeddings_vector'
+)
+RETURNS TABLE (
+  total_rows bigint,
+  rows_since_build bigint,
+  index_lists int,
+  lists int,
+  probes int,
+  rows_at_build bigint,
+  built_at timestamptz
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, pg_temp
+AS $$
+DECLARE
+  tuning app_embeddings.index_tuning%ROWTYPE;
+BEGIN
+  SELECT * INTO tuning FROM app_embeddings.index_tuning t WHERE t.index_name = p_index_name;
+
+  RETURN QUERY
+  SELECT
+    (SELECT count(*) FROM app_embeddings.places_embeddings),
+    CASE WHEN tuning.built_at IS NULL THEN NULL ELSE (
+      SELECT count(*) FROM app_embeddings.places_embeddings p WHERE p.created_at > tuning.built_at
+    ) END,
+    (
+      SELECT o.option_value::int
+      FROM pg_class c
+      JOIN pg_namespace n ON n.oid = c.relnamespace
+      CROSS JOIN LATERAL pg_options_to_table(c.reloptions) o
+      WHERE n.nspname = 'app_embeddings' AND c.relname = p_index_name AND o.option_name = 'lists'
+    ),
+    tuning.lists,
+    tuning.probes,
+    tuning.rows_at_build,
+    tuning.built_at;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.index_tuning_status TO app_admin;
+
+COMMENT ON FUNCTION app_embeddings.index_tuning_status IS
+  'Row count, rows created since the last recorded build, live index lists (reloptions) and recorded tuning for a vector index.';
+
+CREATE OR REPLACE FUNCTION app_embeddings.record_index_tuning(
+  p_lists int,
+  p_probes int,
+  p_rows_at_build bigint,
+  p_built_at timestamptz,
+  p_index_name text DEFAULT 'idx_places_embeddings_vector'
+)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, pg_temp
+AS $$
+BEGIN
+  INSERT INTO app_embeddings.index_tuning AS t
+    (index_name, lists, probes, rows_at_build, built_at, updated_at)
+  VALUES (p_index_name, p_lists, p_probes, p_rows_at_build, p_built_at, now())
+  ON CONFLICT (index_name) DO UPDATE SET
+    lists = EXCLUDED.lists,
+    probes = EXCLUDED.probes,
+    rows_at_build = EXCLUDED.rows_at_build,
+    built_at = EXCLUDED.built_at,
+    updated_at = now();
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.record_index_tuning TO app_admin;
+
+COMMENT ON FUNCTION app_embeddings.record_index_tuning IS
+  'Upserts lists, probes and the build watermark (row count, start time) after an index rebuild or probes change.';
+
+-- Called at the top of the search RPCs. ivfflat.probes is set transaction-local,
+-- and PostgREST runs every RPC in its own transaction.
+CREATE OR REPLACE FUNCTION app_embeddings.apply_index_tuning(
+  p_index_name text DEFAULT 'idx_places_embeddings_vector'
+)
+RETURNS int
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, pg_temp
+AS $$
+DECLARE
+  tuned_probes int;
+BEGIN
+  SELECT t.probes INTO tuned_probes
+  FROM app_embeddings.index_tuning t
+  WHERE t.index_name = p_index_name;
+
+  IF tuned_probes IS NOT NULL THEN
+    PERFORM set_config('ivfflat.probes', tuned_probes::text, true);
+  END IF;
+
+  RETURN tuned_probes;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.apply_index_tuning TO app_readwrite, app_admin;
+
+COMMENT ON FUNCTION app_embeddings.apply_index_tuning IS
+  'Sets ivfflat.probes (transaction-local) from index_tuning; returns the probes applied or NULL.';
+
+-- ============================================================================
+-- SEARCH FUNCTIONS READ THE TUNED PROBES
+-- ============================================================================
+-- Bodies are unchanged from migrations 006, 013 and 014 apart from the
+-- apply_index_tuning() call.
+
+CREATE OR REPLACE FUNCTION app_embeddings.search_places_by_similarity(
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 10
+)
+RETURNS TABLE (
+  id uuid,
+  source text,
+  source_id text,
+  metadata jsonb,
+  similarity float
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, pg_temp
+AS $$
+BEGIN
+  -- Validate inputs
+  IF match_threshold < 0 OR match_threshold > 1 THEN
+    RAISE EXCEPTION 'match_threshold must be between 0 and 1, got %', match_threshold;
+  END IF;
+
+  IF match_count < 1 OR match_count > 100 THEN
+    RAISE EXCEPTION 'match_count must be between 1 and 100, got %', match_count;
+  END IF;
+
+  PERFORM app_embeddings.apply_index_tuning();
+
+  RETURN QUERY
+  SELECT
+    p.id,
+    p.source,
+    p.source_id,
+    p.metadata,
+    1 - (p.embedding <=> query_embedding) AS similarity
+  FROM app_embeddings.places_embeddings p
+  WHERE 1 - (p.embedding <=> query_embedding) > match_threshold
+  ORDER BY p.embedding <=> query_embedding
+  LIMIT match_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION app_embeddings.search_places_by_similarity_many(
+  query_embeddings jsonb,
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 10
+)
+RETURNS TABLE (
+  query_index int,
+  id uuid,
+  source text,
+  source_id text,
+  metadata jsonb,
+  similarity float
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+BEGIN
+  -- Validate inputs
+  IF jsonb_typeof(query_embeddings) IS DISTINCT FROM 'array'
+     OR jsonb_array_length(query_embeddings) < 1
+     OR jsonb_array_length(query_embeddings) > 32 THEN
+    RAISE EXCEPTION 'query_embeddings must be an array of 1 to 32 embeddings';
+  END IF;
+
+  IF match_threshold < 0 OR match_threshold > 1 THEN
+    RAISE EXCEPTION 'match_threshold must be between 0 and 1, got %', match_threshold;
+  END IF;
+
+  IF match_count < 1 OR match_count > 100 THEN
+    RAISE EXCEPTION 'match_count must be between 1 and 100, got %', match_count;
+  END IF;
+
+  PERFORM app_embeddings.apply_index_tuning();
+
+  RETURN QUERY
+  WITH queries AS MATERIALIZED (
+    SELECT (q.ord - 1)::int AS query_index, (q.value::text)::vector AS embedding
+    FROM jsonb_array_elements(query_embeddings) WITH ORDINALITY AS q(value, ord)
+  )
+  SELECT
+    q.query_index,
+    m.id,
+    m.source,
+    m.source_id,
+    m.metadata,
+    m.similarity
+  FROM queries q
+  CROSS JOIN LATERAL (
+    SELECT
+      p.id,
+      p.source,
+      p.source_id,
+      p.metadata,
+      1 - (p.embedding <=> q.embedding) AS similarity
+    FROM app_embeddings.places_embeddings p
+    WHERE 1 - (p.embedding <=> q.embedding) > match_threshold
+    ORDER BY p.embedding <=> q.embedding
+    LIMIT match_count
+  ) m
+  ORDER BY q.query_index, m.similarity DESC;
+END;
+$$;
+
+-- Explicit probes still win; NULL now means "tuned probes" instead of the
+-- server default
+CREATE OR REPLACE FUNCTION app_embeddings.search_places_candidates(
+  query_embedding vector(1536),
+  candidate_count int DEFAULT 40,
+  storage_mode text DEFAULT 'full',
+  probes int DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  source text,
+  source_id text,
+  metadata jsonb,
+  embedding_b64 text,
+  candidate_rank int
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+BEGIN
+  -- Validate inputs
+  IF candidate_count < 1 OR candidate_count > 1000 THEN
+    RAISE EXCEPTION 'candidate_count must be between 1 and 1000, got %', candidate_count;
+  END IF;
+
+  IF storage_mode NOT IN ('full', 'halfvec', 'binary') THEN
+    RAISE EXCEPTION 'storage_mode must be full, halfvec or binary, got %', storage_mode;
+  END IF;
+
+  IF probes IS NOT NULL THEN
+    IF probes < 1 OR probes > 1000 THEN
+      RAISE EXCEPTION 'probes must be between 1 and 1000, got %', probes;
+    END IF;
+    PERFORM set_config('ivfflat.probes', probes::text, true);
+  ELSIF storage_mode = 'full' THEN
+    PERFORM app_embeddings.apply_index_tuning();
+  END IF;
+
+  IF storage_mode = 'full' THEN
+    RETURN QUERY
+    SELECT
+      p.id, p.source, p.source_id, p.metadata,
+      encode(vector_send(p.embedding), 'base64'),
+      (row_number() OVER (ORDER BY p.distance))::int
+    FROM (
+      SELECT c.*, c.embedding <=> query_embedding AS distance
+      FROM app_embeddings.places_embeddings c
+      ORDER BY distance
+      LIMIT candidate_count
+    ) p;
+  ELSIF storage_mode = 'halfvec' THEN
+    RETURN QUERY
+    SELECT
+      p.id, p.source, p.source_id, p.metadata,
+      encode(vector_send(p.embedding), 'base64'),
+      (row_number() OVER (ORDER BY p.distance))::int
+    FROM (
+      SELECT c.*, c.embedding::halfvec(1536) <=> query_embedding::halfvec(1536) AS distance
+      FROM app_embeddings.places_embeddings c
+      ORDER BY distance
+      LIMIT candidate_count
+    ) p;
+  ELSE
+    RETURN QUERY
+    SELECT
+      p.id, p.source, p.source_id, p.metadata,
+      encode(vector_send(p.embedding), 'base64'),
+      (row_number() OVER (ORDER BY p.distance))::int
+    FROM (
+      SELECT c.*, binary_quantize(c.embedding)::bit(1536) <~> binary_quantize(query_embedding) AS distance
+      FROM app_embeddings.places_embeddings c
+      ORDER BY distance
+      LIMIT candidate_count
+    ) p;
+  END IF;
+END;
+$$;
@@ -0,0 +1,95 @@
+-- ============================================================================
+-- PARSE CACHE TABLE
+-- ============================================================================
+-- Persistent tier of the LLM parse cache (backend/chat/services/parse_cache.py).
+-- Key: SHA-256 of the parse model + normalized input (case, punctuation and
+-- whitespace folded), so "Hidden gems in Pikeville, KY!" and
+-- "hidden gems in pikeville ky" share one row.
+
+CREATE TABLE app_cache.parse_cache (
+  input_hash text PRIMARY KEY CHECK (input_hash ~ '^[0-9a-f]{64}$'),
+  normalized_input text NOT NULL,
+  location text NOT NULL,
+  intent text NOT NULL,
+  confidence float NOT NULL CHECK (confidence >= 0 AND confidence <= 1),
+  created_at timestamptz DEFAULT now() NOT NULL,
+  expires_at timestamptz NOT NULL,
+
+  CONSTRAINT valid_expiration CHECK (expires_at > created_at),
+  CONSTRAINT reasonable_ttl CHECK (expires_at < created_at + interval '60 days'),
+  CONSTRAINT reasonable_input_size CHECK (octet_length(normalized_input) < 4096)
+);
+
+CREATE INDEX idx_parse_cache_expires ON app_cache.parse_cache(expires_at);
+
+COMMENT ON TABLE app_cache.parse_cache IS
+  'LLM parse results (location + intent) keyed on normalized input, 60-day max TTL';
+
+-- ============================================================================
+-- ROW LEVEL SECURITY
+-- ============================================================================
+
+ALTER TABLE app_cache.parse_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "app_readonly can read valid parse cache"
+  ON app_cache.parse_cache
+  FOR SELECT
+  TO app_readonly
+  USING (expires_at > now());
+
+CREATE POLICY "app_readwrite can read all parse cache"
+  ON app_cache.parse_cache
+  FOR SELECT
+  TO app_readwrite
+  USING (true);
+
+CREATE POLICY "app_readwrite can insert parse cache"
+  ON app_cache.parse_cache
+  FOR INSERT
+  TO app_readwrite
+  WITH CHECK (
+    confidence >= 0 AND
+    confidence <= 1 AND
+    expires_at > now() AND
+    expires_at < now() + interval '60 days'
+  );
+
+CREATE POLICY "app_readwrite can update parse cache"
+  ON app_cache.parse_cache
+  FOR UPDATE
+  TO app_readwrite
+  USING (true)
+  WITH CHECK (
+    expires_at > now() AND
+    expires_at < now() + interval '60 days' AND
+    confidence >= 0 AND
+    confidence <= 1
+  );
+
+CREATE POLICY "app_admin full access to parse cache"
+  ON app_cache.parse_cache
+  FOR ALL
+  TO app_admin
+  USING (true)
+  WITH CHECK (true);
+
+GRANT SELECT ON app_cache.parse_cache TO app_readonly;
+GRANT SELECT, INSERT, UPDATE ON app_cache.parse_cache TO app_readwrite;
+GRANT ALL ON app_cache.parse_cache TO app_admin;
+
+-- ============================================================================
+-- CLEANUP FUNCTION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION app_cache.cleanup_expired()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_cache, pg_temp
+AS $$
+BEGIN
+  DELETE FROM app_cache.search_results WHERE expires_at < now();
+  DELETE FROM app_cache.location_cache WHERE expires_at < now();
+  DELETE FROM app_cache.parse_cache WHERE expires_at < now();
+END;
+$$;
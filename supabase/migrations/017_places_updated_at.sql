@@ -0,0 +1,50 @@
+-- ============================================================================
+-- PLACES EMBEDDINGS CHANGE TRACKING
+-- ============================================================================
+-- updated_at on places_embeddings, maintained by a trigger, so the local vector
+-- index (backend/chat/services/vector_index.py) can poll for changed rows, not
+-- only new ones. Upserts that overwrite an existing (source, source_id) keep
+-- the row's id and created_at, and the re-embedding swap (migration 012)
+-- rewrites every row, so polling created_at missed both.
+
+-- Safe to re-run: the backfill only touches rows without a value, so it never
+-- fires the trigger below over rows that already have one.
+
+ALTER TABLE app_embeddings.places_embeddings
+  ADD COLUMN IF NOT EXISTS updated_at timestamptz;
+
+UPDATE app_embeddings.places_embeddings
+SET updated_at = created_at
+WHERE updated_at IS NULL;
+
+ALTER TABLE app_embeddings.places_embeddings
+  ALTER COLUMN updated_at SET DEFAULT now(),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_places_embeddings_updated
+  ON app_embeddings.places_embeddings(updated_at, id);
+
+-- ============================================================================
+-- TRIGGER
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION app_embeddings.touch_places_embeddings()
+RETURNS trigger
+LANGUAGE plpgsql
+SET search_path = app_embeddings, pg_temp
+AS $$
+BEGIN
+  NEW.updated_at := now();
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS places_embeddings_touch ON app_embeddings.places_embeddings;
+
+CREATE TRIGGER places_embeddings_touch
+  BEFORE UPDATE ON app_embeddings.places_embeddings
+  FOR EACH ROW
+  EXECUTE FUNCTION app_embeddings.touch_places_embeddings();
+
+COMMENT ON COLUMN app_embeddings.places_embeddings.updated_at IS
+  'Last insert or update (trigger-maintained). Polled by the local vector index.';
@@ -0,0 +1,204 @@
+-- ============================================================================
+-- RE-EMBEDDING FRESHNESS AND TUNING RECORD
+-- ============================================================================
+-- Two gaps in the re-embedding swap (migration 012):
+--
+-- 1. A place upserted again after its chunk was re-embedded kept a shadow
+--    vector of its old text, and the swap installed it. Shadow rows now record
+--    the source row's updated_at (migration 017); a shadow row older than its
+--    source counts as missing, both for the straggler sweep and for the swap's
+--    completeness check.
+-- 2. The swap rebuilds the ivfflat indexes with p_lists but left the
+--    index_tuning row (migration 015) describing the previous build. It now
+--    records lists, probes and the build watermark in the same transaction.
+--
+-- Shadow rows written before this migration have no source_updated_at and are
+-- re-embedded by the next sweep.
+
+ALTER TABLE app_embeddings.places_embeddings_shadow
+  ADD COLUMN IF NOT EXISTS source_updated_at timestamptz;
+
+COMMENT ON COLUMN app_embeddings.places_embeddings_shadow.source_updated_at IS
+  'places_embeddings.updated_at of the row version that was embedded; older than the live row means stale.';
+
+-- ============================================================================
+-- STRAGGLER LOOKUP FUNCTION
+-- ============================================================================
+-- Rows without a current shadow vector: inserted behind the keyset cursor,
+-- failed earlier, or updated after they were re-embedded.
+
+-- The result columns change, which CREATE OR REPLACE cannot do
+DROP FUNCTION IF EXISTS app_embeddings.get_reembed_missing(text, int);
+
+CREATE FUNCTION app_embeddings.get_reembed_missing(
+  p_job_id text,
+  p_limit int DEFAULT 500
+)
+RETURNS TABLE (
+  id uuid,
+  metadata jsonb,
+  updated_at timestamptz
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, pg_temp
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT p.id, p.metadata, p.updated_at
+  FROM app_embeddings.places_embeddings p
+  WHERE NOT EXISTS (
+    SELECT 1 FROM app_embeddings.places_embeddings_shadow s
+    WHERE s.job_id = p_job_id
+      AND s.id = p.id
+      AND s.source_updated_at >= p.updated_at
+  )
+  ORDER BY p.id
+  LIMIT p_limit;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.get_reembed_missing TO app_admin;
+
+-- ============================================================================
+-- ATOMIC SWAP FUNCTION
+-- ============================================================================
+-- Same as migration 012 apart from the staleness check and the tuning record.
+
+-- The argument list changes (p_probes); drop the old overload
+DROP FUNCTION IF EXISTS app_embeddings.swap_reembedded_embeddings(text, int);
+
+CREATE FUNCTION app_embeddings.swap_reembedded_embeddings(
+  p_job_id text,
+  p_lists int DEFAULT 100,
+  p_probes int DEFAULT NULL  -- NULL: sqrt(p_lists), as recommended_probes()
+)
+RETURNS TABLE (
+  rows_swapped bigint,
+  dimensions int
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = app_embeddings, extensions, pg_temp
+AS $$
+DECLARE
+  job app_embeddings.reembed_jobs%ROWTYPE;
+  live_dimensions int;
+  missing bigint;
+  swapped bigint;
+  probes int;
+  built_at timestamptz;
+  had_halfvec boolean;
+  had_binary boolean;
+BEGIN
+  IF p_lists < 1 OR p_lists > 10000 THEN
+    RAISE EXCEPTION 'p_lists must be between 1 and 10000, got %', p_lists;
+  END IF;
+  probes := COALESCE(p_probes, greatest(1, least(round(sqrt(p_lists))::int, p_lists)));
+  IF probes < 1 OR probes > p_lists THEN
+    RAISE EXCEPTION 'p_probes must be between 1 and p_lists (%), got %', p_lists, probes;
+  END IF;
+
+  SELECT * INTO job FROM app_embeddings.reembed_jobs WHERE job_id = p_job_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Unknown re-embed job %', p_job_id;
+  END IF;
+  IF job.status = 'swapped' THEN
+    RAISE EXCEPTION 'Re-embed job % was already swapped', p_job_id;
+  END IF;
+
+  -- ACCESS EXCLUSIVE blocks readers as well as writers until the transaction
+  -- commits, so searches stall for the whole swap (update + index builds).
+  -- Run it in a quiet window.
+  LOCK TABLE app_embeddings.places_embeddings IN ACCESS EXCLUSIVE MODE;
+  built_at := clock_timestamp();
+
+  -- vector's typmod is its dimension count
+  SELECT a.atttypmod INTO live_dimensions
+  FROM pg_attribute a
+  WHERE a.attrelid = 'app_embeddings.places_embeddings'::regclass
+    AND a.attname = 'embedding'
+    AND NOT a.attisdropped;
+  IF job.dimensions <> live_dimensions THEN
+    RAISE EXCEPTION 'Re-embed job % has % dimensions but the live column has %; the search RPCs are typed vector(%)',
+      p_job_id, job.dimensions, live_dimensions, live_dimensions;
+  END IF;
+
+  SELECT count(*) INTO missing
+  FROM app_embeddings.places_embeddings p
+  WHERE NOT EXISTS (
+    SELECT 1 FROM app_embeddings.places_embeddings_shadow s
+    WHERE s.job_id = p_job_id
+      AND s.id = p.id
+      AND s.source_updated_at >= p.updated_at
+  );
+  IF missing > 0 THEN
+    RAISE EXCEPTION '% rows have no current shadow embedding for job %; resume the job first',
+      missing, p_job_id;
+  END IF;
+
+  -- Dropping the column drops its indexes; recreate whichever existed.
+  -- Quantized indexes (migration 009) need pgvector >= 0.7 and may be absent.
+  had_halfvec := to_regclass('app_embeddings.idx_places_embeddings_halfvec') IS NOT NULL;
+  had_binary := to_regclass('app_embeddings.idx_places_embeddings_binary') IS NOT NULL;
+
+  DROP INDEX IF EXISTS app_embeddings.idx_places_embeddings_vector;
+  DROP INDEX IF EXISTS app_embeddings.idx_places_embeddings_halfvec;
+  DROP INDEX IF EXISTS app_embeddings.idx_places_embeddings_binary;
+
+  EXECUTE format(
+    'ALTER TABLE app_embeddings.places_embeddings ADD COLUMN embedding_next vector(%s)',
+    job.dimensions
+  );
+
+  EXECUTE format(
+    'UPDATE app_embeddings.places_embeddings p
+     SET embedding_next = s.embedding::vector(%s)
+     FROM app_embeddings.places_embeddings_shadow s
+     WHERE s.job_id = %L AND s.id = p.id',
+    job.dimensions, p_job_id
+  );
+  GET DIAGNOSTICS swapped = ROW_COUNT;
+
+  ALTER TABLE app_embeddings.places_embeddings DROP COLUMN embedding CASCADE;
+  ALTER TABLE app_embeddings.places_embeddings RENAME COLUMN embedding_next TO embedding;
+  ALTER TABLE app_embeddings.places_embeddings ALTER COLUMN embedding SET NOT NULL;
+
+  EXECUTE format(
+    'CREATE INDEX idx_places_embeddings_vector ON app_embeddings.places_embeddings
+     USING ivfflat(embedding vector_cosine_ops) WITH (lists = %s)',
+    p_lists
+  );
+
+  IF had_halfvec THEN
+    EXECUTE format(
+      'CREATE INDEX idx_places_embeddings_halfvec ON app_embeddings.places_embeddings
+       USING ivfflat((embedding::halfvec(%s)) halfvec_cosine_ops) WITH (lists = %s)',
+      job.dimensions, p_lists
+    );
+  END IF;
+
+  IF had_binary THEN
+    EXECUTE format(
+      'CREATE INDEX idx_places_embeddings_binary ON app_embeddings.places_embeddings
+       USING ivfflat((binary_quantize(embedding)::bit(%s)) bit_hamming_ops) WITH (lists = %s)',
+      job.dimensions, p_lists
+    );
+  END IF;
+
+  -- The table is locked, so every row is in the new index; none count as drift
+  PERFORM app_embeddings.record_index_tuning(p_lists, probes, swapped, built_at);
+
+  DELETE FROM app_embeddings.places_embeddings_shadow WHERE job_id = p_job_id;
+  UPDATE app_embeddings.reembed_jobs
+  SET status = 'swapped', updated_at = now()
+  WHERE job_id = p_job_id;
+
+  RETURN QUERY SELECT swapped, job.dimensions;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION app_embeddings.swap_reembedded_embeddings TO app_admin;
+
+COMMENT ON FUNCTION app_embeddings.swap_reembedded_embeddings IS
+  'Atomically replaces places_embeddings.embedding with a completed re-embed job''s shadow vectors, rebuilds the full-precision and quantized ivfflat indexes and records the build in index_tuning. Raises if any row lacks a current shadow vector or the job changes the column dimensions.';